@@ -0,0 +1,157 @@
+"""
+Benchmark: raw page slice vs HtmlReducer for URL import.
+
+For each page, compares what reaches the model on the fetch_webpage tool
+result — the previous `page[:40000]` and the reduced text — on estimated
+input tokens (chars / 4), time to produce it, and whether the whole recipe
+(every ingredient line and the last instruction step) survived the cutoff.
+
+Pages come from a directory of saved HTML files when given; the expected
+recipe is read from each page's schema.org data, so pages without it are
+reported but not scored. Without a directory, a built-in corpus shaped like
+common recipe blogs is generated (framework scripts in <head>, nav, a long
+story with ad slots, the recipe card, a comment thread).
+
+Run from api/:
+    python benchmarks/bench_html_reduction.py [saved-pages-dir]
+"""
+import html
+import random
+import re
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from infrastructure.web.html_reducer import reduce_html  # noqa: E402
+from infrastructure.web.schema_org import extract_recipe_draft  # noqa: E402
+
+LEGACY_CAP = 40_000
+CHARS_PER_TOKEN = 4
+REPEAT = 20
+
+WORDS = (
+    "the this winter grandmother kitchen weeknight family simple flavour crispy golden "
+    "comforting leftovers favourite oven skillet weekend dinner easy quick batch freezer"
+).split()
+
+
+def sentence(rng: random.Random, n: int = 18) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(n)).capitalize() + "."
+
+
+def synthetic_page(
+    seed: int, story_paragraphs: int, comments: int, card_classes: bool, json_ld: bool
+) -> Tuple[str, List[str], List[str]]:
+    """A blog-shaped page plus the ingredient lines and steps it contains."""
+    rng = random.Random(seed)
+    ingredients = [
+        f"{rng.randint(1, 4)} {rng.choice(['cups', 'tbsp', 'lbs', 'cloves'])} ingredient {i}"
+        for i in range(rng.randint(8, 14))
+    ]
+    steps = [f"Step {i}: {sentence(rng, 14)}" for i in range(rng.randint(5, 9))]
+
+    head = "".join(
+        f"<script>window.__chunk{i}=" + "{" + ",".join(f'"k{j}":{j}' for j in range(400)) + "};</script>"
+        for i in range(8)
+    ) + "<style>" + "".join(f".c{i}{{margin:{i}px}}" for i in range(1500)) + "</style>"
+    if json_ld:
+        head += (
+            '<script type="application/ld+json">{"@type":"Recipe","name":"Test Dish",'
+            '"recipeIngredient":[' + ",".join(f'"{line}"' for line in ingredients) + "]}</script>"
+        )
+    nav = "<header><nav><ul>" + "".join(f"<li><a href='/c/{i}'>Category {i}</a>" for i in range(60)) + "</ul></nav></header>"
+    story = "".join(
+        f"<p>{sentence(rng, 40)} {sentence(rng, 30)}</p>"
+        + (f"<div class='ad-slot'><script>ads.push({i})</script>Advertisement</div>" if i % 3 == 0 else "")
+        for i in range(story_paragraphs)
+    )
+    card_cls = (" class='tasty-recipes'", " class='tasty-recipes-ingredients'", " class='tasty-recipes-instructions'")
+    if not card_classes:
+        card_cls = ("", "", "")
+    card = (
+        f"<div{card_cls[0]}><h2>Test Dish</h2><div{card_cls[1]}><h3>Ingredients</h3><ul>"
+        + "".join(f"<li>{line}</li>" for line in ingredients)
+        + f"</ul></div><div{card_cls[2]}><h3>Instructions</h3><ol>"
+        + "".join(f"<li>{step}</li>" for step in steps)
+        + "</ol></div></div>"
+    )
+    thread = "<section class='comments'>" + "".join(
+        f"<div class='comment'><p>{sentence(rng, 25)}</p><form><textarea></textarea></form></div>"
+        for _ in range(comments)
+    ) + "</section>"
+    page = (
+        f"<html><head><title>Test Dish</title>{head}</head><body>{nav}"
+        f"<main><article><h1>The Best Test Dish</h1>{story}{card}{thread}</article></main>"
+        "<footer>" + "<a href='#'>Footer link</a>" * 80 + "</footer></body></html>"
+    )
+    return page, ingredients, steps
+
+
+def builtin_corpus() -> List[Tuple[str, str, List[str]]]:
+    corpus = []
+    for name, kwargs in [
+        ("short blog", dict(story_paragraphs=4, comments=5, card_classes=True, json_ld=True)),
+        ("long story", dict(story_paragraphs=60, comments=20, card_classes=True, json_ld=False)),
+        ("long, no card classes", dict(story_paragraphs=45, comments=10, card_classes=False, json_ld=False)),
+        ("huge comment thread", dict(story_paragraphs=10, comments=400, card_classes=True, json_ld=True)),
+    ]:
+        page, ingredients, steps = synthetic_page(seed=len(corpus), **kwargs)
+        corpus.append((name, page, ingredients + steps[-1:]))
+    return corpus
+
+
+def saved_corpus(directory: Path) -> List[Tuple[str, str, Optional[List[str]]]]:
+    corpus = []
+    for path in sorted(directory.glob("*.htm*")):
+        page = path.read_text(encoding="utf-8", errors="replace")
+        draft = extract_recipe_draft(page, str(path))
+        expected = None
+        if draft is not None:
+            expected = draft.ingredient_lines + draft.instructions[-1:]
+        corpus.append((path.name, page, expected))
+    return corpus
+
+
+def visible(text: str) -> str:
+    text = re.sub(r"<[^>]+>", " ", html.unescape(text))
+    return " ".join(text.split()).lower()
+
+
+def survived(text: str, expected: Optional[List[str]]) -> str:
+    if not expected:
+        return "n/a"
+    haystack = visible(text)
+    kept = sum(visible(line) in haystack for line in expected)
+    return "yes" if kept == len(expected) else f"{kept}/{len(expected)}"
+
+
+def timed(fn, page: str) -> float:
+    samples = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        fn(page)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    corpus = saved_corpus(Path(sys.argv[1])) if len(sys.argv) > 1 else builtin_corpus()
+    print(f"{'page':<24} {'page KB':>8} {'raw tok':>8} {'reduced tok':>12} {'reduce ms':>10} "
+          f"{'raw kept':>9} {'reduced kept':>13}")
+    for name, page, expected in corpus:
+        legacy = page[:LEGACY_CAP]
+        reduced = reduce_html(page)
+        print(
+            f"{name[:24]:<24} {len(page.encode()) / 1024:>8.0f} "
+            f"{len(legacy) // CHARS_PER_TOKEN:>8} {len(reduced) // CHARS_PER_TOKEN:>12} "
+            f"{timed(reduce_html, page):>10.1f} "
+            f"{survived(legacy, expected):>9} {survived(reduced, expected):>13}"
+        )
+
+
+if __name__ == "__main__":
+    main()
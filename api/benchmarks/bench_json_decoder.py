@@ -0,0 +1,119 @@
+"""
+Benchmark: model-output JSON decoding.
+
+Compares the previous parse path (strip code fences, json.loads the whole
+buffer) with IncrementalJSONDecoder on large suggestion responses shaped like
+real recorded ones — fenced, prose-prefixed, 3 options per slot, 6-10
+ingredients per recipe — fed whole and as streaming-sized text deltas.
+Also reports time-to-first-slot and how many recipes survive a truncated tail.
+
+Run from api/:
+    python benchmarks/bench_json_decoder.py
+"""
+import json
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from infrastructure.ai.json_stream import IncrementalJSONDecoder, decode_json_array  # noqa: E402
+
+CATEGORIES = ["produce", "meat", "dairy", "pantry", "frozen", "bakery", "other"]
+UNITS = ["lbs", "oz", "cups", "tbsp", "tsp", "whole", "cloves", "slices", "cans"]
+REPEAT = 50
+DELTA_SIZE = 24  # roughly one streaming text delta
+
+
+def recorded_response(n_slots: int, seed: int) -> str:
+    rng = random.Random(seed)
+
+    def recipe(s: int, i: int) -> dict:
+        return {
+            "name": f"Slot {s} Option {i} — Lemon \"Herb\" Chicken [v{i}]",
+            "emoji": "🍗",
+            "prep_time": rng.randint(15, 75),
+            "key_ingredients": [f"ing{k}" for k in range(3)],
+            "ingredients": [
+                {
+                    "name": f"ingredient {k}",
+                    "quantity": round(rng.uniform(0.1, 2.0), 2),
+                    "unit": rng.choice(UNITS),
+                    "category": rng.choice(CATEGORIES),
+                }
+                for k in range(rng.randint(6, 10))
+            ],
+        }
+
+    body = json.dumps(
+        [[recipe(s, i) for i in range(3)] for s in range(n_slots)],
+        ensure_ascii=False,
+        indent=2,
+    )
+    return "Here are this week's options:\n```json\n" + body + "\n```"
+
+
+def legacy_parse(raw: str) -> list:
+    raw = raw.strip()
+    if raw.startswith("```"):
+        raw = raw.split("```")[1]
+        if raw.startswith("json"):
+            raw = raw[4:]
+        raw = raw.strip()
+    else:
+        raw = raw[raw.index("[") : raw.rindex("]") + 1]
+    return json.loads(raw)
+
+
+def decoder_whole(raw: str) -> list:
+    return decode_json_array(raw, recover_depth=2)
+
+
+def decoder_streamed(raw: str) -> tuple[list, int]:
+    """Returns the decoded value and the character offset at which slot 0 was available."""
+    decoder = IncrementalJSONDecoder(root="[", emit_depths=(2,), recover_depth=2)
+    first_at = -1
+    for i in range(0, len(raw), DELTA_SIZE):
+        if decoder.feed(raw[i : i + DELTA_SIZE]) and first_at < 0:
+            first_at = i + DELTA_SIZE
+    return decoder.finish(), first_at
+
+
+def timed(fn, raw: str) -> float:
+    samples = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        fn(raw)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    print(f"{'slots':>5} {'bytes':>8} {'legacy ms':>10} {'whole ms':>9} "
+          f"{'stream ms':>10} {'1st slot at':>12} {'trunc kept':>11}")
+    for n_slots in (3, 5, 8, 12):
+        raw = recorded_response(n_slots, seed=n_slots)
+        assert legacy_parse(raw) == decoder_whole(raw)
+
+        _, first_at = decoder_streamed(raw)
+        truncated = raw[: int(len(raw) * 0.8)]
+        try:
+            legacy_parse(truncated)
+            legacy_kept = "all"
+        except ValueError:
+            legacy_kept = 0
+        kept = sum(len(g) for g in decoder_whole(truncated))
+
+        print(
+            f"{n_slots:>5} {len(raw.encode()):>8} "
+            f"{timed(legacy_parse, raw):>10.2f} {timed(decoder_whole, raw):>9.2f} "
+            f"{timed(lambda r: decoder_streamed(r), raw):>10.2f} "
+            f"{first_at / len(raw):>11.0%} "
+            f"{kept:>4}/{n_slots * 3:<3} (legacy {legacy_kept})"
+        )
+
+
+if __name__ == "__main__":
+    main()
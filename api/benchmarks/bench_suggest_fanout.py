@@ -0,0 +1,96 @@
+"""
+Benchmark: single-call vs per-slot fan-out suggestions.
+
+Drives ClaudeAdapter.suggest_recipes against a simulated model whose latency
+is time-to-first-token plus output tokens at a fixed generation rate — the
+cost model that makes the single prompt grow linearly with template size.
+Simulated seconds are compressed by TIME_SCALE so the run takes a few seconds;
+the table reports them un-scaled.
+
+Run from api/:
+    python benchmarks/bench_suggest_fanout.py
+"""
+import asyncio
+import json
+import re
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from uuid import uuid4
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from application.ports.ai_port import SuggestionRequest  # noqa: E402
+from domain.entities.meal_plan import DayOfWeek, MealSlot, MealType  # noqa: E402
+from infrastructure.ai.claude_adapter import ClaudeAdapter  # noqa: E402
+
+TTFT_SECONDS = 1.2
+OUTPUT_TOKENS_PER_SECOND = 70.0
+TOKENS_PER_RECIPE = 190
+TIME_SCALE = 0.01
+
+
+class SimulatedMessages:
+    """Answers in the shape the adapter asked for: a forced tool call, or plain JSON text."""
+
+    async def create(self, **kwargs):
+        prompt = "\n".join(block["text"] for block in kwargs["messages"][-1]["content"])
+        n_slots = int(re.search(r"exactly (\d+) (?:slot lists|inner arrays)", prompt).group(1))
+        output_tokens = n_slots * 3 * TOKENS_PER_RECIPE
+        await asyncio.sleep((TTFT_SECONDS + output_tokens / OUTPUT_TOKENS_PER_SECOND) * TIME_SCALE)
+        recipe = {
+            "name": "Simulated",
+            "emoji": "🍲",
+            "prep_time": 30,
+            "key_ingredients": [],
+            "ingredients": [],
+        }
+        slots = [[recipe] * 3 for _ in range(n_slots)]
+        if "tool_choice" in kwargs:
+            block = SimpleNamespace(
+                type="tool_use", id="toolu_bench", name=kwargs["tool_choice"]["name"], input={"slots": slots}
+            )
+            return SimpleNamespace(content=[block], stop_reason="tool_use", usage=None)
+        text = SimpleNamespace(type="text", text=json.dumps(slots))
+        return SimpleNamespace(content=[text], stop_reason="end_turn", usage=None)
+
+
+def make_request(n_slots: int) -> SuggestionRequest:
+    return SuggestionRequest(
+        slots=[
+            MealSlot(uuid4(), f"Slot {i}", MealType.DINNER, [DayOfWeek.MON], [])
+            for i in range(n_slots)
+        ],
+        members=[],
+        disliked_ingredients=[],
+        liked_ingredients=[],
+        cuisine_preferences=[],
+    )
+
+
+async def simulated_seconds(adapter: ClaudeAdapter, n_slots: int) -> float:
+    adapter._client = SimpleNamespace(messages=SimulatedMessages())
+    start = time.perf_counter()
+    await adapter.suggest_recipes(make_request(n_slots))
+    return (time.perf_counter() - start) / TIME_SCALE
+
+
+async def main() -> None:
+    configs = [
+        ("single", dict(suggest_mode="single")),
+        ("fanout x1", dict(suggest_mode="fanout", fanout_chunk_size=1, fanout_concurrency=4)),
+        ("fanout x2", dict(suggest_mode="fanout", fanout_chunk_size=2, fanout_concurrency=4)),
+        ("fanout x1 c8", dict(suggest_mode="fanout", fanout_chunk_size=1, fanout_concurrency=8)),
+    ]
+    print(f"{'slots':>5} " + " ".join(f"{name:>13}" for name, _ in configs) + "   (simulated s)")
+    for n_slots in (2, 3, 5, 6, 8):
+        row = []
+        for _, kwargs in configs:
+            adapter = ClaudeAdapter(api_key="bench", **kwargs)
+            row.append(await simulated_seconds(adapter, n_slots))
+        print(f"{n_slots:>5} " + " ".join(f"{secs:>13.1f}" for secs in row))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -2,6 +2,8 @@
 Pure functions that convert between domain entities and API schemas.
 No business logic — just field mapping.
 """
+from uuid import uuid4
+
 from domain.entities.grocery import GroceryListItem
 from domain.entities.household import HouseholdMember
 from domain.entities.meal_plan import DayOfWeek, MealPlanTemplate, MealSlot, MealType
@@ -115,6 +117,20 @@ def recipe_input_to_ingredients(items: list) -> list:
     ]
 
 
+def recipe_input_to_recipe(body: RecipeInputSchema) -> Recipe:
+    """A new recipe from a create payload — always a fresh id."""
+    return Recipe(
+        id=uuid4(),
+        name=body.name,
+        emoji=body.emoji,
+        prep_time=body.prep_time,
+        key_ingredients=body.key_ingredients,
+        ingredients=recipe_input_to_ingredients(body.ingredients),
+        source_url=body.source_url,
+        cooking_instructions=body.cooking_instructions,
+    )
+
+
 # ---------------------------------------------------------------------------
 # Meal plan
 # ---------------------------------------------------------------------------
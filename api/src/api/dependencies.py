@@ -3,16 +3,23 @@ Dependency injection — wires domain interfaces to concrete implementations.
 Swap any implementation by changing only this file.
 """
 import os
-from typing import Annotated, AsyncGenerator, Optional
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Annotated, AsyncGenerator, Dict, List, Optional
 from uuid import UUID
 
-from fastapi import Depends, Header, HTTPException
+from anthropic import APIError
+from fastapi import BackgroundTasks, Depends, Header, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from application.ports.ai_port import AIPort
 from application.use_cases.build_grocery_list import BuildGroceryListUseCase
+from application.use_cases.bulk_import_recipes import BulkImportRecipesUseCase
 from application.use_cases.confirm_plan import ConfirmPlanUseCase
 from application.use_cases.create_recipe import CreateRecipeUseCase
 from application.use_cases.delete_recipe import DeleteRecipeUseCase
+from application.use_cases.dislike_guard import DislikeGuard, DislikeGuardStats
+from application.use_cases.draft_plan_session import DraftPlanSessionUseCase
 from application.use_cases.full_update_recipe import FullUpdateRecipeUseCase
 from application.use_cases.generate_instructions import GenerateInstructionsUseCase
 from application.use_cases.get_recipe import GetRecipeUseCase
@@ -24,22 +31,41 @@ from application.use_cases.refine_recipes import RefineRecipesUseCase
 from application.use_cases.suggest_recipes import SuggestRecipesUseCase
 from application.use_cases.toggle_favorite import ToggleFavoriteUseCase
 from application.use_cases.update_recipe import UpdateRecipeUseCase
+from api.instruction_prewarm import BackgroundInstructionQueue
+from api.pregeneration import PregenerationScheduler
 from api.rate_limiter import RateLimiter
+from api.usage_flush import UsageLedgerFlusher
+from domain.entities.ai_usage import AIUsageRecord
+from domain.entities.recipe import Recipe
 from domain.services.grocery_list_service import GroceryListService
 from domain.services.meal_plan_service import MealPlanService
 from domain.services.serving_calculator import ServingCalculator
+from infrastructure.ai.cassette import Cassette, RecordingAIAdapter, ReplayAIAdapter
+from infrastructure.ai.circuit_breaker import BreakerPolicy, CircuitBreaker, CircuitBreakingAIAdapter
 from infrastructure.ai.claude_adapter import ClaudeAdapter
+from infrastructure.ai.clients import get_ai_clients
+from infrastructure.ai.prompt_budget import PromptBudget
+from infrastructure.ai.single_flight import CoalescingAIAdapter, SingleFlight
+from infrastructure.ai.suggestion_cache import CachingAIAdapter, SuggestionCache
+from infrastructure.ai.usage_ledger import bind_household, household_context
+from infrastructure.db.postgres.ai_usage_repo import PostgresAIUsageRepository
 from infrastructure.db.postgres.auth_repo import AuthRepository
 from infrastructure.db.postgres.database import get_session_factory
 from infrastructure.db.postgres.household_repo import PostgresHouseholdRepository
+from infrastructure.db.postgres.import_cache_repo import PostgresImportCacheRepository
 from infrastructure.db.postgres.meal_plan_repo import (
     PostgresMealPlanTemplateRepository,
     PostgresWeeklyPlanRepository,
 )
+from infrastructure.db.postgres.pregenerated_suggestion_repo import (
+    PostgresPregeneratedSuggestionRepository,
+)
 from infrastructure.db.postgres.preference_repo import PostgresPreferenceRepository
 from infrastructure.db.postgres.recipe_repo import PostgresRecipeRepository
+from infrastructure.sessions.memory_draft_store import DEFAULT_TTL_SECONDS, InMemoryDraftSessionStore
 from infrastructure.export.csv_adapter import CsvExportAdapter
 from infrastructure.export.sheets_adapter import GoogleSheetsAdapter
+from infrastructure.web.page_reader import HttpRecipePageReader
 
 
 # ---------------------------------------------------------------------------
@@ -56,6 +82,15 @@ async def get_session() -> AsyncGenerator[AsyncSession, None]:
 SessionDep = Annotated[AsyncSession, Depends(get_session)]
 
 
+async def release_session(session: AsyncSession) -> None:
+    """
+    Commit the request's transaction before a long SSE body starts, so its
+    pooled connection is not held for the whole stream. The stream itself
+    must not use the session after this.
+    """
+    await session.commit()
+
+
 # ---------------------------------------------------------------------------
 # Auth dependencies
 # ---------------------------------------------------------------------------
@@ -77,6 +112,8 @@ async def get_household_id(
     auth_repo = AuthRepository(session)
     if not await auth_repo.household_exists(household_uuid):
         raise HTTPException(status_code=401, detail="Unknown household")
+    # Model calls made for this request (and tasks it spawns) are billed to it
+    bind_household(household_uuid)
     return household_uuid
 
 
@@ -126,8 +163,128 @@ def get_preference_repo(
 # Service / adapter singletons (stateless — safe to reuse across requests)
 # ---------------------------------------------------------------------------
 
-def get_ai_adapter() -> ClaudeAdapter:
-    return ClaudeAdapter(api_key=os.environ["ANTHROPIC_API_KEY"])
+def _env_flag(name: str) -> bool:
+    return os.environ.get(name, "").lower() in ("1", "true", "yes")
+
+
+# Process-wide: cached suggestions must outlive the request that produced them
+_suggestion_cache = SuggestionCache(
+    ttl_seconds=float(os.environ.get("AI_SUGGESTION_CACHE_TTL_SECONDS", "1800")),
+    shared_enabled=_env_flag("AI_SUGGESTION_CACHE_SHARED"),
+)
+
+
+def _env_seconds(name: str) -> Optional[float]:
+    value = os.environ.get(name)
+    return float(value) if value else None
+
+
+# Process-wide: identical calls from concurrent requests share one model call
+_single_flight = SingleFlight()
+
+
+def get_suggestion_cache() -> SuggestionCache:
+    return _suggestion_cache
+
+
+def get_single_flight() -> SingleFlight:
+    return _single_flight
+
+
+# Process-wide: AI options replaced for containing a household's disliked ingredients
+_dislike_guard_stats = DislikeGuardStats()
+
+
+def get_dislike_guard_stats() -> DislikeGuardStats:
+    return _dislike_guard_stats
+
+
+# Process-wide: every request shares one view of the API's health, one breaker
+# per kind of call so background instruction jobs cannot open suggest's (empty: disabled)
+_breaker_policy = BreakerPolicy.from_env("AI_BREAKER")
+_circuit_breakers: Dict[str, CircuitBreaker] = (
+    {"suggest": CircuitBreaker(_breaker_policy), "instructions": CircuitBreaker(_breaker_policy)}
+    if _breaker_policy
+    else {}
+)
+
+
+def get_circuit_breakers() -> Dict[str, CircuitBreaker]:
+    return _circuit_breakers
+
+
+SuggestionCacheDep = Annotated[SuggestionCache, Depends(get_suggestion_cache)]
+
+
+# AI_ADAPTER: "claude" (default), "record" (claude, saving every exchange to
+# the cassette) or "replay" (answers from the cassette: no network, no tokens)
+AI_ADAPTERS = ("claude", "record", "replay")
+
+# Process-wide: one cassette file, and one replay RNG so sampled latencies vary per call
+_cassette: Optional[Cassette] = None
+_replay_adapter: Optional[ReplayAIAdapter] = None
+
+
+def _ai_adapter_mode() -> str:
+    mode = os.environ.get("AI_ADAPTER", "claude")
+    if mode not in AI_ADAPTERS:
+        raise RuntimeError(f"Unknown AI_ADAPTER {mode!r}; expected one of {AI_ADAPTERS}")
+    return mode
+
+
+def _get_cassette() -> Cassette:
+    global _cassette
+    if _cassette is None:
+        _cassette = Cassette(Path(os.environ.get("AI_CASSETTE_PATH", "cassettes/ai.jsonl")))
+    return _cassette
+
+
+def _get_replay_adapter() -> ReplayAIAdapter:
+    global _replay_adapter
+    if _replay_adapter is None:
+        _replay_adapter = ReplayAIAdapter(
+            _get_cassette(),
+            latency=os.environ.get("AI_CASSETTE_LATENCY", "recorded"),
+            latency_scale=float(os.environ.get("AI_CASSETTE_LATENCY_SCALE", "1")),
+            seed=int(os.environ.get("AI_CASSETTE_SEED", "0")),
+        )
+    return _replay_adapter
+
+
+def get_ai_adapter() -> AIPort:
+    mode = _ai_adapter_mode()
+    if mode == "replay":
+        inner: AIPort = _get_replay_adapter()
+    else:
+        inner = _claude_adapter()
+        if mode == "record":
+            inner = RecordingAIAdapter(inner, _get_cassette())
+    if _circuit_breakers:
+        # Inside the cache: cached answers are still served while the circuit is open
+        inner = CircuitBreakingAIAdapter(
+            inner, _circuit_breakers["suggest"], instructions_breaker=_circuit_breakers["instructions"]
+        )
+    return CoalescingAIAdapter(CachingAIAdapter(inner, _suggestion_cache), _single_flight)
+
+
+def _claude_adapter() -> ClaudeAdapter:
+    clients = get_ai_clients()  # pooled, created by the app lifespan
+    return ClaudeAdapter(
+        client=clients.anthropic,
+        http_client=clients.fetch_http,
+        usage=clients.usage,
+        hedger=clients.hedger,
+        ledger=clients.ledger,
+        repair_stats=clients.repair,
+        router=clients.router,
+        prompt_budget=PromptBudget.from_env("AI_PROMPT"),
+        budget_stats=clients.budget,
+        deadline_seconds=_env_seconds("AI_DEADLINE_SECONDS"),
+        suggest_mode=os.environ.get("AI_SUGGEST_MODE", "single"),
+        fanout_chunk_size=int(os.environ.get("AI_FANOUT_CHUNK_SIZE", "1")),
+        fanout_concurrency=int(os.environ.get("AI_FANOUT_CONCURRENCY", "4")),
+        slot_output=os.environ.get("AI_SLOT_OUTPUT", "tool"),
+    )
 
 
 def get_grocery_service() -> GroceryListService:
@@ -157,6 +314,20 @@ def get_rate_limiter() -> RateLimiter:
 RateLimiterDep = Annotated[RateLimiter, Depends(get_rate_limiter)]
 
 
+# ---------------------------------------------------------------------------
+# Draft plan sessions
+# ---------------------------------------------------------------------------
+
+# Process-wide: a draft outlives the request that started it
+_draft_store = InMemoryDraftSessionStore(
+    ttl_seconds=_env_seconds("DRAFT_SESSION_TTL_SECONDS") or DEFAULT_TTL_SECONDS,
+)
+
+
+def get_draft_store() -> InMemoryDraftSessionStore:
+    return _draft_store
+
+
 # ---------------------------------------------------------------------------
 # Use case dependencies
 # ---------------------------------------------------------------------------
@@ -176,39 +347,78 @@ def get_manage_template(
     )
 
 
-def get_suggest_recipes(
-    template_repo: Annotated[PostgresMealPlanTemplateRepository, Depends(get_template_repo)],
-    household_repo: Annotated[PostgresHouseholdRepository, Depends(get_household_repo)],
-    preference_repo: Annotated[PostgresPreferenceRepository, Depends(get_preference_repo)],
-    recipe_repo: Annotated[PostgresRecipeRepository, Depends(get_recipe_repo)],
-) -> SuggestRecipesUseCase:
+def _dislike_guard(ai_adapter: AIPort, recipe_repo: PostgresRecipeRepository) -> DislikeGuard:
+    return DislikeGuard(
+        ai_adapter, recipe_repo=recipe_repo, stats=_dislike_guard_stats, provider_errors=(APIError,)
+    )
+
+
+def build_suggest_recipes(session: AsyncSession, household_id: UUID) -> SuggestRecipesUseCase:
+    """Also used outside a request, by the pre-generation scheduler."""
+    ai_adapter = get_ai_adapter()
+    recipe_repo = PostgresRecipeRepository(session, household_id)
     return SuggestRecipesUseCase(
-        ai_adapter=get_ai_adapter(),
-        template_repo=template_repo,
-        household_repo=household_repo,
-        preference_repo=preference_repo,
+        ai_adapter=ai_adapter,
+        template_repo=PostgresMealPlanTemplateRepository(session, household_id),
+        household_repo=PostgresHouseholdRepository(session, household_id),
+        preference_repo=PostgresPreferenceRepository(session, household_id),
         recipe_repo=recipe_repo,
+        household_id=household_id,
+        library_options_per_slot=int(os.environ.get("SUGGEST_LIBRARY_OPTIONS_PER_SLOT", "0")),
+        pregenerated_repo=PostgresPregeneratedSuggestionRepository(session, household_id),
+        deadline_seconds=_env_seconds("AI_SUGGEST_DEADLINE_SECONDS"),
+        dislike_guard=_dislike_guard(ai_adapter, recipe_repo),
+        reserve_per_slot=int(os.environ.get("SUGGEST_RESERVE_PER_SLOT", "0")),
     )
 
 
+def get_suggest_recipes(session: SessionDep, household_id: HouseholdIdDep) -> SuggestRecipesUseCase:
+    return build_suggest_recipes(session, household_id)
+
+
 def get_refine_recipes(
     template_repo: Annotated[PostgresMealPlanTemplateRepository, Depends(get_template_repo)],
     household_repo: Annotated[PostgresHouseholdRepository, Depends(get_household_repo)],
     preference_repo: Annotated[PostgresPreferenceRepository, Depends(get_preference_repo)],
+    recipe_repo: Annotated[PostgresRecipeRepository, Depends(get_recipe_repo)],
 ) -> RefineRecipesUseCase:
+    ai_adapter = get_ai_adapter()
     return RefineRecipesUseCase(
-        ai_adapter=get_ai_adapter(),
+        ai_adapter=ai_adapter,
         template_repo=template_repo,
         household_repo=household_repo,
         preference_repo=preference_repo,
+        deadline_seconds=_env_seconds("AI_REFINE_DEADLINE_SECONDS"),
+        dislike_guard=_dislike_guard(ai_adapter, recipe_repo),
+    )
+
+
+def get_draft_sessions(
+    recipe_repo: Annotated[PostgresRecipeRepository, Depends(get_recipe_repo)],
+    template_repo: Annotated[PostgresMealPlanTemplateRepository, Depends(get_template_repo)],
+    household_id: HouseholdIdDep,
+) -> DraftPlanSessionUseCase:
+    return DraftPlanSessionUseCase(
+        store=get_draft_store(),
+        recipe_repo=recipe_repo,
+        template_repo=template_repo,
+        household_id=household_id,
     )
 
 
 def get_confirm_plan(
     plan_repo: Annotated[PostgresWeeklyPlanRepository, Depends(get_plan_repo)],
     recipe_repo: Annotated[PostgresRecipeRepository, Depends(get_recipe_repo)],
+    background_tasks: BackgroundTasks,
+    household_id: HouseholdIdDep,
 ) -> ConfirmPlanUseCase:
-    return ConfirmPlanUseCase(plan_repo=plan_repo, recipe_repo=recipe_repo)
+    return ConfirmPlanUseCase(
+        plan_repo=plan_repo,
+        recipe_repo=recipe_repo,
+        instruction_queue=BackgroundInstructionQueue(
+            background_tasks, household_id, _generate_instructions_for_household
+        ),
+    )
 
 
 def get_list_recipes(
@@ -247,10 +457,37 @@ def get_generate_instructions(
     return GenerateInstructionsUseCase(recipe_repo=recipe_repo, ai_port=get_ai_adapter())
 
 
+def build_import_recipe(session: AsyncSession) -> ImportRecipeUseCase:
+    # Cassette modes send every import through the AI port, so replay covers what was recorded
+    page_port = None
+    if _ai_adapter_mode() == "claude":
+        page_port = HttpRecipePageReader(get_ai_clients().fetch_http)
+    return ImportRecipeUseCase(
+        ai_port=get_ai_adapter(),
+        page_port=page_port,
+        cache=PostgresImportCacheRepository(session),
+        fresh_for=timedelta(seconds=float(os.environ.get("IMPORT_CACHE_FRESH_SECONDS", "86400"))),
+        max_cached=int(os.environ.get("IMPORT_CACHE_MAX_ENTRIES", "5000")),
+    )
+
+
+def get_import_recipe(session: SessionDep) -> ImportRecipeUseCase:
+    return build_import_recipe(session)
+
 
+async def _import_in_own_session(url: str) -> Recipe:
+    """One bulk-import URL in its own session: the imports run concurrently."""
+    async with get_session_factory()() as session:
+        async with session.begin():
+            return await build_import_recipe(session).execute(url)
 
-def get_import_recipe() -> ImportRecipeUseCase:
-    return ImportRecipeUseCase(ai_port=get_ai_adapter())
+
+def get_bulk_import_recipes() -> BulkImportRecipesUseCase:
+    return BulkImportRecipesUseCase(
+        import_one=_import_in_own_session,
+        concurrency=int(os.environ.get("BULK_IMPORT_CONCURRENCY", "4")),
+        max_attempts=int(os.environ.get("BULK_IMPORT_ATTEMPTS", "2")),
+    )
 
 
 def get_create_recipe(
@@ -278,3 +515,66 @@ def get_build_grocery_list(
         recipe_repo=recipe_repo,
         grocery_service=get_grocery_service(),
     )
+
+
+# ---------------------------------------------------------------------------
+# Eager instructions (background task queued by plan confirmation)
+# ---------------------------------------------------------------------------
+
+async def _generate_instructions_for_household(household_id: UUID, recipe_ids: List[UUID]) -> int:
+    """Runs after the confirm request, in its own session."""
+    async with get_session_factory()() as session:
+        async with session.begin():
+            use_case = GenerateInstructionsUseCase(
+                recipe_repo=PostgresRecipeRepository(session, household_id),
+                ai_port=get_ai_adapter(),
+            )
+            return await use_case.execute_many(recipe_ids)
+
+
+# ---------------------------------------------------------------------------
+# Off-peak pre-generation (started by the app lifespan)
+# ---------------------------------------------------------------------------
+
+async def _active_households(since: datetime) -> List[UUID]:
+    async with get_session_factory()() as session:
+        return await AuthRepository(session).active_household_ids(since)
+
+
+async def _pregenerate_household(household_id: UUID, week_start_date: str) -> bool:
+    with household_context(household_id):
+        async with get_session_factory()() as session:
+            async with session.begin():
+                return await build_suggest_recipes(session, household_id).pregenerate(week_start_date)
+
+
+def build_pregeneration_scheduler() -> Optional[PregenerationScheduler]:
+    """None unless PREGENERATION_ENABLED is set."""
+    if not _env_flag("PREGENERATION_ENABLED"):
+        return None
+    start, end = os.environ.get("PREGENERATION_QUIET_HOURS_UTC", "2-6").split("-")
+    return PregenerationScheduler(
+        list_households=_active_households,
+        pregenerate=_pregenerate_household,
+        concurrency=int(os.environ.get("PREGENERATION_CONCURRENCY", "2")),
+        quiet_hours=(int(start), int(end)),
+        interval_seconds=float(os.environ.get("PREGENERATION_INTERVAL_SECONDS", "1800")),
+    )
+
+
+# ---------------------------------------------------------------------------
+# AI usage ledger writer (started by the app lifespan)
+# ---------------------------------------------------------------------------
+
+async def _write_usage(records: List[AIUsageRecord]) -> None:
+    async with get_session_factory()() as session:
+        async with session.begin():
+            await PostgresAIUsageRepository(session).add_many(records)
+
+
+def build_usage_flusher() -> UsageLedgerFlusher:
+    return UsageLedgerFlusher(
+        get_ai_clients().ledger,
+        _write_usage,
+        interval_seconds=float(os.environ.get("AI_USAGE_FLUSH_SECONDS", "30")),
+    )
@@ -0,0 +1,44 @@
+"""
+Eager instruction generation after a plan is confirmed.
+
+ConfirmPlanUseCase enqueues the confirmed recipes that have no instructions;
+this queue runs the generation as a FastAPI background task, which starts
+after the response is sent and the request's session has committed, so the
+job's own session sees the newly saved recipes.
+"""
+import logging
+from typing import Awaitable, Callable, List
+from uuid import UUID
+
+from fastapi import BackgroundTasks
+
+from application.ports.instruction_queue import InstructionQueuePort
+
+GenerateForHousehold = Callable[[UUID, List[UUID]], Awaitable[int]]
+
+logger = logging.getLogger(__name__)
+
+
+class BackgroundInstructionQueue(InstructionQueuePort):
+    def __init__(
+        self,
+        background_tasks: BackgroundTasks,
+        household_id: UUID,
+        generate: GenerateForHousehold,
+    ) -> None:
+        self._background_tasks = background_tasks
+        self._household_id = household_id
+        self._generate = generate
+
+    def enqueue(self, recipe_ids: List[UUID]) -> None:
+        self._background_tasks.add_task(self._run, list(recipe_ids))
+
+    async def _run(self, recipe_ids: List[UUID]) -> None:
+        try:
+            await self._generate(self._household_id, recipe_ids)
+        except Exception:
+            # Best effort: the detail page still generates lazily on first view
+            logger.warning(
+                "Instruction prewarm failed for %d recipe(s) of household %s",
+                len(recipe_ids), self._household_id, exc_info=True,
+            )
@@ -1,16 +1,68 @@
+import math
 import os
+from contextlib import asynccontextmanager
+from dataclasses import asdict
 
 from dotenv import load_dotenv
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
 load_dotenv()
 
 from infrastructure.db.postgres.database import init_db  # noqa: E402 (must be after load_dotenv)
+from application.ports.ai_port import AIDeadlineExceeded, AIUnavailable  # noqa: E402
+from infrastructure.ai.hedging import HedgePolicy  # noqa: E402
+from infrastructure.ai.model_routing import RoutingPolicy  # noqa: E402
+from infrastructure.ai.clients import (  # noqa: E402
+    ANTHROPIC_POOL,
+    FETCH_POOL,
+    PoolConfig,
+    close_ai_clients,
+    get_ai_clients,
+    init_ai_clients,
+)
 
+from api.dependencies import (  # noqa: E402
+    build_pregeneration_scheduler,
+    build_usage_flusher,
+    get_circuit_breakers,
+    get_dislike_guard_stats,
+    get_single_flight,
+)
 from api.routers import auth, grocery, household, plan, preferences, recipes, template  # noqa: E402
 
-app = FastAPI(title="Dinner Solved API", version="1.0.0")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    database_url = os.environ.get("DATABASE_URL")
+    if database_url:
+        init_db(database_url)
+    api_key = os.environ.get("ANTHROPIC_API_KEY")
+    if api_key:
+        init_ai_clients(
+            api_key,
+            anthropic_pool=PoolConfig.from_env("AI_HTTP", ANTHROPIC_POOL),
+            fetch_pool=PoolConfig.from_env("FETCH_HTTP", FETCH_POOL),
+            hedge_policy=HedgePolicy.from_env("AI_HEDGE"),
+            routing_policy=RoutingPolicy.from_env("AI_ROUTE"),
+        )
+    scheduler = build_pregeneration_scheduler() if database_url and api_key else None
+    app.state.pregeneration = scheduler
+    if scheduler:
+        scheduler.start()
+    usage_flusher = build_usage_flusher() if database_url and api_key else None
+    if usage_flusher:
+        usage_flusher.start()
+    yield
+    if scheduler:
+        await scheduler.stop()
+    if usage_flusher:
+        await usage_flusher.stop()  # writes what is still buffered
+    await close_ai_clients()
+
+
+app = FastAPI(title="Dinner Solved API", version="1.0.0", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -20,6 +72,19 @@ app.add_middleware(
     expose_headers=["X-Household-ID"],
 )
 
+@app.exception_handler(AIDeadlineExceeded)
+async def ai_deadline_exceeded(request: Request, exc: AIDeadlineExceeded):
+    return JSONResponse(status_code=504, content={"detail": str(exc)})
+
+
+@app.exception_handler(AIUnavailable)
+async def ai_unavailable(request: Request, exc: AIUnavailable):
+    headers = {}
+    if exc.retry_after_seconds is not None:
+        headers["Retry-After"] = str(math.ceil(exc.retry_after_seconds))
+    return JSONResponse(status_code=503, content={"detail": str(exc)}, headers=headers)
+
+
 app.include_router(auth.router, prefix="/api/auth", tags=["auth"])
 app.include_router(household.router, prefix="/api/household", tags=["household"])
 app.include_router(template.router, prefix="/api/template", tags=["template"])
@@ -29,13 +94,33 @@ app.include_router(preferences.router, prefix="/api/preferences", tags=["prefere
 app.include_router(recipes.router, prefix="/api/recipes", tags=["recipes"])
 
 
-@app.on_event("startup")
-async def startup() -> None:
-    database_url = os.environ.get("DATABASE_URL")
-    if database_url:
-        init_db(database_url)
-
-
 @app.get("/health")
 async def health():
     return {"status": "ok"}
+
+
+async def ai_metrics():
+    """
+    Connection pools, tokens, per-use-case usage and routing, hedging,
+    single-flight, dislike-guard and circuit-breaker stats.
+
+    Process-wide and unauthenticated, so only mounted with AI_METRICS_ENABLED
+    (for a deployment that keeps it off the public network).
+    """
+    try:
+        stats = get_ai_clients().stats()
+    except RuntimeError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    stats["single_flight"] = asdict(get_single_flight().stats)
+    stats["dislike_guard"] = asdict(get_dislike_guard_stats())
+    breakers = get_circuit_breakers()
+    if breakers:
+        stats["circuit_breaker"] = {name: asdict(b.snapshot()) for name, b in breakers.items()}
+    scheduler = getattr(app.state, "pregeneration", None)
+    if scheduler and scheduler.last_run:
+        stats["pregeneration"] = asdict(scheduler.last_run)
+    return stats
+
+
+if os.environ.get("AI_METRICS_ENABLED", "").lower() in ("1", "true", "yes"):
+    app.add_api_route("/metrics/ai", ai_metrics, methods=["GET"], include_in_schema=False)
@@ -0,0 +1,112 @@
+"""
+Off-peak pre-generation of next week's suggestions.
+
+Sunday evening is when most households plan, and that is when the per-household
+budget and the Anthropic throughput limits both bite. During configured quiet
+hours this scheduler walks the active households and asks the AI for next
+week's options, with a small concurrency cap, so the first /api/plan/suggest
+of the week is answered from storage. Pre-generation never touches a
+household's rate-limit budget, and each household is generated at most once
+while its stored set is still valid (see SuggestRecipesUseCase.pregenerate).
+"""
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from typing import Awaitable, Callable, List, Optional, Tuple
+from uuid import UUID
+
+ListHouseholds = Callable[[datetime], Awaitable[List[UUID]]]
+PregenerateHousehold = Callable[[UUID, str], Awaitable[bool]]
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PregenerationRun:
+    started_at: datetime
+    week_start_date: str
+    households: int = 0
+    generated: int = 0
+    skipped: int = 0  # library covers every slot, or a valid set is already stored
+    failed: int = 0
+
+
+def next_week_start(today: date) -> str:
+    """ISO date of the Monday after `today`."""
+    return (today + timedelta(days=7 - today.weekday())).isoformat()
+
+
+class PregenerationScheduler:
+    def __init__(
+        self,
+        list_households: ListHouseholds,
+        pregenerate: PregenerateHousehold,
+        concurrency: int = 2,
+        quiet_hours: Tuple[int, int] = (2, 6),  # UTC [start, end); may wrap midnight
+        interval_seconds: float = 1800,
+        active_within_days: int = 28,
+        clock: Callable[[], datetime] = lambda: datetime.now(timezone.utc),
+    ) -> None:
+        self._list_households = list_households
+        self._pregenerate = pregenerate
+        self._concurrency = max(1, concurrency)
+        self._quiet_hours = quiet_hours
+        self._interval = interval_seconds
+        self._active_within = timedelta(days=active_within_days)
+        self._clock = clock
+        self._task: Optional[asyncio.Task] = None
+        self.last_run: Optional[PregenerationRun] = None
+
+    def in_quiet_hours(self, now: datetime) -> bool:
+        start, end = self._quiet_hours
+        if start <= end:
+            return start <= now.hour < end
+        return now.hour >= start or now.hour < end
+
+    async def run_once(self) -> PregenerationRun:
+        now = self._clock()
+        run = PregenerationRun(started_at=now, week_start_date=next_week_start(now.date()))
+        household_ids = await self._list_households(now - self._active_within)
+        run.households = len(household_ids)
+        semaphore = asyncio.Semaphore(self._concurrency)
+
+        async def one(household_id: UUID) -> None:
+            async with semaphore:
+                try:
+                    generated = await self._pregenerate(household_id, run.week_start_date)
+                except Exception:
+                    run.failed += 1  # one household's failure must not stop the run
+                    logger.warning("Pre-generation failed for household %s", household_id, exc_info=True)
+                    return
+                if generated:
+                    run.generated += 1
+                else:
+                    run.skipped += 1
+
+        await asyncio.gather(*(one(h) for h in household_ids))
+        self.last_run = run
+        return run
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _loop(self) -> None:
+        while True:
+            if self.in_quiet_hours(self._clock()):
+                try:
+                    await self.run_once()
+                except Exception:
+                    # e.g. database unavailable — try again next interval
+                    logger.exception("Pre-generation run failed")
+            await asyncio.sleep(self._interval)
@@ -20,6 +20,13 @@ class RateLimiter:
         # household_id (str) -> list of (timestamp: float, cost: float)
         self._events: dict[str, list[tuple[float, float]]] = {}
 
+    async def remaining(self, household_id: str) -> float:
+        """Budget left in the current window, without consuming any."""
+        async with self._lock:
+            cutoff = time.time() - WINDOW_SECONDS
+            used = sum(c for ts, c in self._events.get(household_id, []) if ts > cutoff)
+            return BUDGET - used
+
     async def check_and_consume(
         self, household_id: str, cost: float
     ) -> tuple[bool, float, Optional[datetime]]:
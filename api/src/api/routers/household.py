@@ -5,7 +5,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 
 from application.use_cases.manage_household import ManageHouseholdUseCase
 from api.converters import member_to_schema, schema_to_member
-from api.dependencies import get_manage_household
+from api.dependencies import HouseholdIdDep, SuggestionCacheDep, get_manage_household
 from api.schemas.household import HouseholdMemberSchema, MembersResponse, SaveMembersRequest
 
 router = APIRouter()
@@ -20,9 +20,15 @@ async def get_members(use_case: HouseholdDep):
 
 
 @router.post("/members", response_model=MembersResponse, status_code=status.HTTP_200_OK)
-async def save_members(body: SaveMembersRequest, use_case: HouseholdDep):
+async def save_members(
+    body: SaveMembersRequest,
+    use_case: HouseholdDep,
+    household_id: HouseholdIdDep,
+    suggestion_cache: SuggestionCacheDep,
+):
     members = [schema_to_member(s) for s in body.members]
     await use_case.save_members(members)
+    suggestion_cache.invalidate_household(household_id)
     return MembersResponse(members=body.members)
 
 
@@ -1,33 +1,45 @@
 from datetime import datetime, timezone
-from typing import Annotated
+from typing import Annotated, AsyncIterator
+from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi.responses import Response
 
+from application.ports.ai_port import AIDeadlineExceeded, AIUnavailable
+from application.ports.draft_session_store import DraftRecipeUnknown, DraftSession, DraftSessionExpired
 from application.use_cases.confirm_plan import ConfirmPlanUseCase
+from application.use_cases.draft_plan_session import DraftPlanSessionUseCase
 from application.use_cases.refine_recipes import RefineRecipesUseCase
-from application.use_cases.suggest_recipes import RecipeSuggestion, SuggestRecipesUseCase
+from application.use_cases.suggest_recipes import RecipeSuggestion, SlotOptions, SuggestRecipesUseCase
 from api.converters import recipe_to_list_item, schema_to_recipe, schema_to_slot, slot_options_to_schema
 from api.dependencies import (
     HouseholdIdDep,
     RateLimiterDep,
+    SessionDep,
     get_confirm_plan,
+    get_draft_sessions,
     get_plan_repo,
     get_recipe_repo,
     get_refine_recipes,
     get_suggest_recipes,
     get_template_repo,
+    release_session,
 )
+from api.rate_limiter import RateLimiter
+from api.sse import sse_error, sse_event, sse_response
 from api.schemas.plan import (
     ConfirmRequest,
     ConfirmedAssignmentSchema,
     ConfirmedPlanSchema,
+    RecipeOptionsSchema,
     RefineRequest,
     RegenerateSlotRequest,
     SlotOptionsResponse,
     SuggestRequest,
     WeeklyPlanSchema,
 )
+from api.schemas.recipe import RecipeSchema
+from domain.entities.recipe import Recipe
 from infrastructure.db.postgres.meal_plan_repo import PostgresMealPlanTemplateRepository, PostgresWeeklyPlanRepository
 from infrastructure.db.postgres.recipe_repo import PostgresRecipeRepository
 from infrastructure.export.pdf_adapter import DAY_LABELS, build_plan_pdf
@@ -37,6 +49,7 @@ router = APIRouter()
 SuggestDep = Annotated[SuggestRecipesUseCase, Depends(get_suggest_recipes)]
 RefineDep = Annotated[RefineRecipesUseCase, Depends(get_refine_recipes)]
 ConfirmDep = Annotated[ConfirmPlanUseCase, Depends(get_confirm_plan)]
+DraftsDep = Annotated[DraftPlanSessionUseCase, Depends(get_draft_sessions)]
 PlanRepoDep = Annotated[PostgresWeeklyPlanRepository, Depends(get_plan_repo)]
 RecipeRepoDep = Annotated[PostgresRecipeRepository, Depends(get_recipe_repo)]
 TemplateRepoDep = Annotated[PostgresMealPlanTemplateRepository, Depends(get_template_repo)]
@@ -56,6 +69,116 @@ def _rate_limit_error(remaining: float, resets_at: datetime | None) -> HTTPExcep
     )
 
 
+async def _open_draft(drafts: DraftPlanSessionUseCase, session_id: UUID | None) -> DraftSession:
+    """The request's draft session (a new one without session_id); 404 once it has expired."""
+    try:
+        return await drafts.open(session_id)
+    except DraftSessionExpired as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+async def _chosen_recipes(
+    drafts: DraftPlanSessionUseCase,
+    session: DraftSession,
+    chosen: dict[str, UUID],
+    uploaded: dict[str, RecipeSchema],
+) -> dict[str, Recipe]:
+    """
+    slot_id -> Recipe: ids resolved from the draft, plus full recipes from
+    clients without one. An id the draft does not hold is a 404, like an
+    expired draft, so the client retries with the full recipes.
+    """
+    recipes = {slot_id: schema_to_recipe(schema) for slot_id, schema in uploaded.items()}
+    try:
+        recipes.update(await drafts.resolve(session, chosen))
+    except DraftRecipeUnknown as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return recipes
+
+
+async def _slot_option_events(
+    options_iter: AsyncIterator[SlotOptions],
+    remaining: float,
+    resets_at: datetime | None,
+    drafts: DraftPlanSessionUseCase,
+    session: DraftSession,
+) -> AsyncIterator[str]:
+    """
+    SSE body for the streaming suggest routes.
+
+    Emits one `slot_options` event (a RecipeOptionsSchema) per slot as soon as
+    the AI finishes it, then a final `done` event carrying the same
+    SlotOptionsResponse the non-streaming route returns. AI failures (including
+    a missed deadline) after the stream has started are reported as an `error`
+    event. Whatever was streamed is recorded in the draft session.
+    """
+    offered: list[SlotOptions] = []
+    collected: list[RecipeOptionsSchema] = []
+    try:
+        async for so in options_iter:
+            offered.append(so)
+            schema = slot_options_to_schema(so)
+            collected.append(schema)
+            yield sse_event("slot_options", schema.model_dump_json())
+    except (ValueError, AIDeadlineExceeded, AIUnavailable) as e:
+        await drafts.record(session, offered)
+        yield sse_error(str(e))
+        return
+    await drafts.record(session, offered)
+    final = SlotOptionsResponse(
+        slot_options=collected,
+        budget_remaining=remaining,
+        budget_resets_at=resets_at,
+        session_id=session.id,
+        degraded=any(so.degraded for so in offered),
+    )
+    yield sse_event("done", final.model_dump_json())
+
+
+async def _peek_cached(body: SuggestRequest, use_case: SuggestRecipesUseCase) -> list[SlotOptions] | None:
+    """Suggestions servable without a model call — such hits cost no budget."""
+    if body.fresh:
+        return None
+    try:
+        return await use_case.peek(week_context=body.week_context, week_start_date=body.week_start_date)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+
+def _from_reserve(
+    body: RegenerateSlotRequest,
+    drafts: DraftPlanSessionUseCase,
+    session: DraftSession,
+    existing_chosen: dict[str, Recipe],
+) -> SlotOptions | None:
+    """Regenerated options held back from an earlier answer — no model call, no budget."""
+    if body.week_context:
+        return None  # a new request needs a new answer
+    return drafts.from_reserve(session, body.slot_id, existing_chosen)
+
+
+async def _charge(
+    rate_limiter: RateLimiter, household_id: UUID, cost: float, use_case: SuggestRecipesUseCase
+) -> tuple[bool, float, datetime | None]:
+    """Consume budget for a suggestion; free while the AI is down and the library answers instead."""
+    if not use_case.ai_available:
+        return True, await rate_limiter.remaining(str(household_id)), None
+    return await rate_limiter.check_and_consume(str(household_id), cost=cost)
+
+
+def _require_ai(use_case: RefineRecipesUseCase) -> None:
+    """Refining has no library fallback: refuse before charging budget while the AI is down."""
+    if not use_case.ai_available:
+        raise HTTPException(status_code=503, detail="AI is temporarily unavailable; try again shortly.")
+
+
+async def _iterate(slot_options: list[SlotOptions]) -> AsyncIterator[SlotOptions]:
+    for so in slot_options:
+        yield so
+
+
 @router.get("/{week_start_date}", response_model=ConfirmedPlanSchema)
 async def get_confirmed_plan(
     week_start_date: str,
@@ -117,44 +240,92 @@ async def export_plan_pdf(
 async def suggest_recipes(
     body: SuggestRequest,
     use_case: SuggestDep,
+    drafts: DraftsDep,
     rate_limiter: RateLimiterDep,
     household_id: HouseholdIdDep,
 ):
-    allowed, remaining, resets_at = await rate_limiter.check_and_consume(
-        str(household_id), cost=1.0
-    )
+    session = await _open_draft(drafts, body.session_id)
+    cached = await _peek_cached(body, use_case)
+    if cached is not None:
+        await drafts.record(session, cached)
+        return SlotOptionsResponse(
+            slot_options=[slot_options_to_schema(so) for so in cached],
+            budget_remaining=await rate_limiter.remaining(str(household_id)),
+            session_id=session.id,
+        )
+
+    allowed, remaining, resets_at = await _charge(rate_limiter, household_id, 1.0, use_case)
     if not allowed:
         raise _rate_limit_error(remaining, resets_at)
 
     try:
-        slot_options = await use_case.execute(week_context=body.week_context)
+        slot_options = await use_case.execute(
+            week_context=body.week_context, fresh=body.fresh, week_start_date=body.week_start_date
+        )
     except ValueError as e:
         raise HTTPException(status_code=422, detail=str(e))
 
+    await drafts.record(session, slot_options)
     return SlotOptionsResponse(
         slot_options=[slot_options_to_schema(so) for so in slot_options],
         budget_remaining=remaining,
         budget_resets_at=resets_at,
+        session_id=session.id,
+        degraded=any(so.degraded for so in slot_options),
     )
 
 
+@router.post("/suggest/stream")
+async def suggest_recipes_stream(
+    body: SuggestRequest,
+    use_case: SuggestDep,
+    drafts: DraftsDep,
+    rate_limiter: RateLimiterDep,
+    household_id: HouseholdIdDep,
+    db: SessionDep,
+):
+    """Like /suggest, but streams each slot's options as Server-Sent Events."""
+    session = await _open_draft(drafts, body.session_id)
+    cached = await _peek_cached(body, use_case)
+    if cached is not None:
+        remaining = await rate_limiter.remaining(str(household_id))
+        await release_session(db)
+        return sse_response(_slot_option_events(_iterate(cached), remaining, None, drafts, session))
+
+    allowed, remaining, resets_at = await _charge(rate_limiter, household_id, 1.0, use_case)
+    if not allowed:
+        raise _rate_limit_error(remaining, resets_at)
+
+    try:
+        options_iter = await use_case.stream(
+            week_context=body.week_context, fresh=body.fresh, week_start_date=body.week_start_date
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+    await release_session(db)
+    return sse_response(_slot_option_events(options_iter, remaining, resets_at, drafts, session))
+
+
 @router.post("/refine", response_model=SlotOptionsResponse)
 async def refine_recipes(
     body: RefineRequest,
     use_case: RefineDep,
+    drafts: DraftsDep,
     rate_limiter: RateLimiterDep,
     household_id: HouseholdIdDep,
 ):
+    # Resolved before charging: an expired draft costs no budget
+    session = await _open_draft(drafts, body.session_id)
+    existing = await _chosen_recipes(drafts, session, body.chosen, body.existing_assignments)
+
+    _require_ai(use_case)
     allowed, remaining, resets_at = await rate_limiter.check_and_consume(
         str(household_id), cost=1.0
     )
     if not allowed:
         raise _rate_limit_error(remaining, resets_at)
 
-    existing = {
-        slot_id: schema_to_recipe(recipe_schema)
-        for slot_id, recipe_schema in body.existing_assignments.items()
-    }
     try:
         slot_options = await use_case.execute(
             existing_assignments=existing,
@@ -164,30 +335,73 @@ async def refine_recipes(
     except ValueError as e:
         raise HTTPException(status_code=422, detail=str(e))
 
+    await drafts.record(session, slot_options)
     return SlotOptionsResponse(
         slot_options=[slot_options_to_schema(so) for so in slot_options],
         budget_remaining=remaining,
         budget_resets_at=resets_at,
+        session_id=session.id,
+        degraded=any(so.degraded for so in slot_options),
     )
 
 
+@router.post("/refine/stream")
+async def refine_recipes_stream(
+    body: RefineRequest,
+    use_case: RefineDep,
+    drafts: DraftsDep,
+    rate_limiter: RateLimiterDep,
+    household_id: HouseholdIdDep,
+    db: SessionDep,
+):
+    """Like /refine, but streams each unlocked slot's options as Server-Sent Events."""
+    # Resolved before charging: an expired draft costs no budget
+    session = await _open_draft(drafts, body.session_id)
+    existing = await _chosen_recipes(drafts, session, body.chosen, body.existing_assignments)
+
+    _require_ai(use_case)
+    allowed, remaining, resets_at = await rate_limiter.check_and_consume(
+        str(household_id), cost=1.0
+    )
+    if not allowed:
+        raise _rate_limit_error(remaining, resets_at)
+
+    try:
+        options_iter = await use_case.stream(
+            existing_assignments=existing,
+            user_message=body.user_message,
+            locked_slot_ids=body.locked_slot_ids,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+    await release_session(db)
+    return sse_response(_slot_option_events(options_iter, remaining, resets_at, drafts, session))
+
+
 @router.post("/suggest-slot", response_model=SlotOptionsResponse)
 async def suggest_slot(
     body: RegenerateSlotRequest,
     use_case: SuggestDep,
+    drafts: DraftsDep,
     rate_limiter: RateLimiterDep,
     household_id: HouseholdIdDep,
 ):
-    allowed, remaining, resets_at = await rate_limiter.check_and_consume(
-        str(household_id), cost=0.5
-    )
+    session = await _open_draft(drafts, body.session_id)
+    existing_chosen = await _chosen_recipes(drafts, session, body.chosen, body.existing_chosen)
+    reserved = _from_reserve(body, drafts, session, existing_chosen)
+    if reserved is not None:
+        await drafts.record(session, [reserved])
+        return SlotOptionsResponse(
+            slot_options=[slot_options_to_schema(reserved)],
+            budget_remaining=await rate_limiter.remaining(str(household_id)),
+            session_id=session.id,
+        )
+
+    allowed, remaining, resets_at = await _charge(rate_limiter, household_id, 0.5, use_case)
     if not allowed:
         raise _rate_limit_error(remaining, resets_at)
 
-    existing_chosen = {
-        slot_id: schema_to_recipe(recipe_schema)
-        for slot_id, recipe_schema in body.existing_chosen.items()
-    }
     try:
         slot_option = await use_case.execute_for_slot(
             slot_id=body.slot_id,
@@ -197,26 +411,79 @@ async def suggest_slot(
     except ValueError as e:
         raise HTTPException(status_code=422, detail=str(e))
 
+    await drafts.record(session, [slot_option])
     return SlotOptionsResponse(
         slot_options=[slot_options_to_schema(slot_option)],
         budget_remaining=remaining,
         budget_resets_at=resets_at,
+        session_id=session.id,
+        degraded=slot_option.degraded,
     )
 
 
-@router.post("/confirm", response_model=WeeklyPlanSchema)
-async def confirm_plan(body: ConfirmRequest, use_case: ConfirmDep, household_id: HouseholdIdDep):
-    suggestions = [
-        RecipeSuggestion(
-            slot=schema_to_slot(s.slot),
-            recipe=schema_to_recipe(s.recipe),
+@router.post("/suggest-slot/stream")
+async def suggest_slot_stream(
+    body: RegenerateSlotRequest,
+    use_case: SuggestDep,
+    drafts: DraftsDep,
+    rate_limiter: RateLimiterDep,
+    household_id: HouseholdIdDep,
+    db: SessionDep,
+):
+    """Like /suggest-slot, but delivers the slot's options as Server-Sent Events."""
+    session = await _open_draft(drafts, body.session_id)
+    existing_chosen = await _chosen_recipes(drafts, session, body.chosen, body.existing_chosen)
+    reserved = _from_reserve(body, drafts, session, existing_chosen)
+    if reserved is not None:
+        remaining = await rate_limiter.remaining(str(household_id))
+        await release_session(db)
+        return sse_response(_slot_option_events(_iterate([reserved]), remaining, None, drafts, session))
+
+    allowed, remaining, resets_at = await _charge(rate_limiter, household_id, 0.5, use_case)
+    if not allowed:
+        raise _rate_limit_error(remaining, resets_at)
+
+    try:
+        options_iter = await use_case.stream_for_slot(
+            slot_id=body.slot_id,
+            existing_chosen=existing_chosen,
+            week_context=body.week_context,
         )
-        for s in body.suggestions
-    ]
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+    await release_session(db)
+    return sse_response(_slot_option_events(options_iter, remaining, resets_at, drafts, session))
+
+
+@router.post("/confirm", response_model=WeeklyPlanSchema)
+async def confirm_plan(
+    body: ConfirmRequest, use_case: ConfirmDep, drafts: DraftsDep, household_id: HouseholdIdDep
+):
+    session = None
+    if body.session_id is not None:
+        # The chosen recipes are already on the server: a lookup, not a re-upload
+        session = await _open_draft(drafts, body.session_id)
+        try:
+            suggestions = await drafts.suggestions(session, body.chosen)
+        except DraftRecipeUnknown as e:
+            raise HTTPException(status_code=404, detail=str(e))
+        except ValueError as e:
+            raise HTTPException(status_code=422, detail=str(e))
+    else:
+        suggestions = [
+            RecipeSuggestion(
+                slot=schema_to_slot(s.slot),
+                recipe=schema_to_recipe(s.recipe),
+            )
+            for s in body.suggestions
+        ]
     plan = await use_case.execute(
         week_start_date=body.week_start_date,
         suggestions=suggestions,
     )
+    if session is not None:
+        await drafts.close(session)
     return WeeklyPlanSchema(
         id=plan.id,
         week_start_date=plan.week_start_date,
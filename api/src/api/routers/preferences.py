@@ -5,7 +5,7 @@ from fastapi import APIRouter, Depends, HTTPException
 
 from domain.repositories.preference_repository import PreferenceRepository
 from api.converters import prefs_to_schema, schema_to_prefs
-from api.dependencies import get_preference_repo
+from api.dependencies import HouseholdIdDep, SuggestionCacheDep, get_preference_repo
 from api.schemas.preferences import PreferencesSchema, SavePreferencesRequest
 from infrastructure.db.postgres.preference_repo import PostgresPreferenceRepository
 
@@ -23,7 +23,13 @@ async def get_preferences(repo: PrefsDep):
 
 
 @router.post("", response_model=PreferencesSchema)
-async def save_preferences(body: SavePreferencesRequest, repo: PrefsDep):
+async def save_preferences(
+    body: SavePreferencesRequest,
+    repo: PrefsDep,
+    household_id: HouseholdIdDep,
+    suggestion_cache: SuggestionCacheDep,
+):
     domain_prefs = schema_to_prefs(body.preferences)
     await repo.save_preferences(domain_prefs)
+    suggestion_cache.invalidate_household(household_id)
     return body.preferences
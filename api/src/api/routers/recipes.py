@@ -1,30 +1,45 @@
-from typing import Annotated
-from uuid import UUID, uuid4
+from typing import Annotated, AsyncIterator
+from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi.responses import Response
 from pydantic import BaseModel
 
-from api.converters import recipe_input_to_ingredients, recipe_to_detail, recipe_to_list_item
+from api.converters import (
+    recipe_input_to_ingredients,
+    recipe_input_to_recipe,
+    recipe_to_detail,
+    recipe_to_list_item,
+)
 from api.dependencies import (
     HouseholdIdDep,
+    SessionDep,
     get_create_recipe,
     get_delete_recipe,
     get_full_update_recipe,
     get_generate_instructions,
     get_get_recipe,
+    get_bulk_import_recipes,
     get_import_recipe,
     get_list_recipes,
     get_toggle_favorite,
     get_update_recipe,
+    release_session,
 )
 from infrastructure.export.pdf_adapter import build_recipe_pdf
+from api.sse import sse_event, sse_response
 from api.schemas.recipe import (
+    BulkCreateRecipesRequest,
+    BulkCreateRecipesResponse,
+    BulkImportDoneSchema,
+    BulkImportItemSchema,
+    BulkImportRequest,
     ImportRecipeRequest,
     RecipeDetailSchema,
     RecipeInputSchema,
     RecipeListItemSchema,
 )
+from application.use_cases.bulk_import_recipes import BulkImportItem, BulkImportRecipesUseCase
 from application.use_cases.create_recipe import CreateRecipeUseCase
 from application.use_cases.delete_recipe import DeleteRecipeUseCase
 from application.use_cases.full_update_recipe import FullUpdateRecipeUseCase
@@ -34,7 +49,6 @@ from application.use_cases.import_recipe import ImportRecipeUseCase
 from application.use_cases.list_recipes import ListRecipesUseCase
 from application.use_cases.toggle_favorite import ToggleFavoriteUseCase
 from application.use_cases.update_recipe import UpdateRecipeUseCase
-from domain.entities.recipe import Recipe
 
 router = APIRouter()
 
@@ -45,6 +59,7 @@ DeleteRecipeDep = Annotated[DeleteRecipeUseCase, Depends(get_delete_recipe)]
 UpdateRecipeDep = Annotated[UpdateRecipeUseCase, Depends(get_update_recipe)]
 GenerateInstructionsDep = Annotated[GenerateInstructionsUseCase, Depends(get_generate_instructions)]
 ImportRecipeDep = Annotated[ImportRecipeUseCase, Depends(get_import_recipe)]
+BulkImportDep = Annotated[BulkImportRecipesUseCase, Depends(get_bulk_import_recipes)]
 CreateRecipeDep = Annotated[CreateRecipeUseCase, Depends(get_create_recipe)]
 FullUpdateRecipeDep = Annotated[FullUpdateRecipeUseCase, Depends(get_full_update_recipe)]
 
@@ -90,23 +105,61 @@ async def create_recipe(
     household_id: HouseholdIdDep,
 ):
     """Create a new recipe (manual entry or confirmed URL import)."""
-    new_recipe = Recipe(
-        id=uuid4(),
-        name=body.name,
-        emoji=body.emoji,
-        prep_time=body.prep_time,
-        key_ingredients=body.key_ingredients,
-        ingredients=recipe_input_to_ingredients(body.ingredients),
-        source_url=body.source_url,
-        cooking_instructions=body.cooking_instructions,
-    )
     try:
-        saved = await use_case.execute(new_recipe)
+        saved = await use_case.execute(recipe_input_to_recipe(body))
     except ValueError as e:
         raise HTTPException(status_code=409, detail=str(e))
     return recipe_to_detail(saved)
 
 
+@router.post("/import/bulk")
+async def bulk_import_recipes(
+    body: BulkImportRequest,
+    use_case: BulkImportDep,
+    household_id: HouseholdIdDep,
+    db: SessionDep,
+):
+    """
+    Import many URLs at once, streamed as Server-Sent Events: one `item` event
+    (BulkImportItemSchema) per URL as it finishes, in completion order, then a
+    `done` event with the counts. Drafts are not saved — POST them to /bulk.
+    """
+    try:
+        items = use_case.execute(body.urls)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    await release_session(db)  # each URL is imported in its own session
+    return sse_response(_bulk_import_events(items))
+
+
+async def _bulk_import_events(items: AsyncIterator[BulkImportItem]) -> AsyncIterator[str]:
+    imported = failed = 0
+    async for item in items:
+        imported += item.ok
+        failed += not item.ok
+        schema = BulkImportItemSchema(
+            index=item.index,
+            url=item.url,
+            status="imported" if item.ok else "failed",
+            recipe=recipe_to_detail(item.recipe) if item.ok else None,
+            error=item.error,
+            attempts=item.attempts,
+        )
+        yield sse_event("item", schema.model_dump_json())
+    yield sse_event("done", BulkImportDoneSchema(imported=imported, failed=failed).model_dump_json())
+
+
+@router.post("/bulk", response_model=BulkCreateRecipesResponse, status_code=201)
+async def bulk_create_recipes(
+    body: BulkCreateRecipesRequest,
+    use_case: CreateRecipeDep,
+    household_id: HouseholdIdDep,
+):
+    """Save several recipes (e.g. bulk-import drafts); names that already exist are skipped."""
+    saved, skipped = await use_case.execute_many([recipe_input_to_recipe(r) for r in body.recipes])
+    return BulkCreateRecipesResponse(saved=[recipe_to_detail(r) for r in saved], skipped=skipped)
+
+
 # ---------------------------------------------------------------------------
 # Item routes (with /{recipe_id})
 # ---------------------------------------------------------------------------
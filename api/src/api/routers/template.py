@@ -4,7 +4,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 
 from application.use_cases.manage_template import ManageTemplateUseCase
 from api.converters import schema_to_template, template_to_schema
-from api.dependencies import get_manage_template
+from api.dependencies import HouseholdIdDep, SuggestionCacheDep, get_manage_template
 from api.schemas.plan import MealPlanTemplateSchema, SaveTemplateRequest
 
 router = APIRouter()
@@ -21,10 +21,16 @@ async def get_template(use_case: TemplateDep):
 
 
 @router.post("", response_model=MealPlanTemplateSchema, status_code=status.HTTP_200_OK)
-async def save_template(body: SaveTemplateRequest, use_case: TemplateDep):
+async def save_template(
+    body: SaveTemplateRequest,
+    use_case: TemplateDep,
+    household_id: HouseholdIdDep,
+    suggestion_cache: SuggestionCacheDep,
+):
     try:
         domain_template = schema_to_template(body.template)
         await use_case.save_template(domain_template)
+        suggestion_cache.invalidate_household(household_id)
     except ValueError as e:
         raise HTTPException(status_code=422, detail=str(e))
     return body.template
@@ -24,7 +24,7 @@ class SaveTemplateRequest(BaseModel):
 
 
 # ---------------------------------------------------------------------------
-# Confirm — unchanged: frontend sends 1 chosen recipe per slot
+# Confirm — 1 chosen recipe per slot: by id within a draft session, or in full
 # ---------------------------------------------------------------------------
 
 class RecipeSuggestionSchema(BaseModel):
@@ -34,7 +34,9 @@ class RecipeSuggestionSchema(BaseModel):
 
 class ConfirmRequest(BaseModel):
     week_start_date: str
-    suggestions: list[RecipeSuggestionSchema]
+    session_id: UUID | None = None
+    chosen: dict[str, UUID] = {}  # slot_id -> recipe id, resolved from the session
+    suggestions: list[RecipeSuggestionSchema] = []  # without a session
 
 
 class WeeklyPlanSchema(BaseModel):
@@ -66,19 +68,32 @@ class SlotOptionsResponse(BaseModel):
     slot_options: list[RecipeOptionsSchema]
     budget_remaining: float
     budget_resets_at: datetime | None = None
+    session_id: UUID | None = None  # draft session holding these options
+    degraded: bool = False  # AI unavailable: options are saved recipes only
 
 
+# Within a draft session (session_id from an earlier response) recipes are sent
+# as ids in `chosen`; the full-recipe fields are for clients without one, or
+# whose session expired (404).
+
 class SuggestRequest(BaseModel):
     week_context: str | None = None
+    fresh: bool = False  # True skips the suggestion cache ("Regenerate All")
+    session_id: UUID | None = None
+    week_start_date: str | None = None  # Monday being planned; pregenerated options need it
 
 
 class RegenerateSlotRequest(BaseModel):
     slot_id: str
-    existing_chosen: dict[str, RecipeSchema]  # slot_id -> currently chosen recipe
+    session_id: UUID | None = None
+    chosen: dict[str, UUID] = {}  # slot_id -> currently chosen recipe id
+    existing_chosen: dict[str, RecipeSchema] = {}  # slot_id -> currently chosen recipe
     week_context: str | None = None
 
 
 class RefineRequest(BaseModel):
-    existing_assignments: dict[str, RecipeSchema]  # slot_id -> recipe
     user_message: str
+    session_id: UUID | None = None
+    chosen: dict[str, UUID] = {}  # slot_id -> recipe id
+    existing_assignments: dict[str, RecipeSchema] = {}  # slot_id -> recipe
     locked_slot_ids: list[str] = []
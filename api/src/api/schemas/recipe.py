@@ -26,6 +26,15 @@ class ImportRecipeRequest(BaseModel):
     url: str
 
 
+class BulkImportRequest(BaseModel):
+    urls: list[str]
+
+
+class BulkCreateRecipesRequest(BaseModel):
+    """Drafts from a bulk import (possibly edited) to save in one go."""
+    recipes: list[RecipeInputSchema]
+
+
 class RecipeSchema(BaseModel):
     """Lightweight schema used in the planning flow (suggest / refine / confirm)."""
     id: UUID
@@ -63,3 +72,23 @@ class RecipeDetailSchema(BaseModel):
     last_used_at: datetime | None = None
     cooking_instructions: list[str] | None = None
     source_url: str | None = None
+
+
+class BulkImportItemSchema(BaseModel):
+    """One `item` event of the bulk import stream."""
+    index: int  # position in the submitted list
+    url: str
+    status: str  # "imported" | "failed"
+    recipe: RecipeDetailSchema | None = None  # draft — not yet saved
+    error: str | None = None
+    attempts: int
+
+
+class BulkImportDoneSchema(BaseModel):
+    imported: int
+    failed: int
+
+
+class BulkCreateRecipesResponse(BaseModel):
+    saved: list[RecipeDetailSchema]
+    skipped: list[str]  # names that already exist in the household
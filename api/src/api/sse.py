@@ -0,0 +1,28 @@
+"""
+Server-Sent Events helpers for streaming routes.
+
+Each event is framed as `event: <name>\ndata: <json>\n\n`. Browsers read these
+with fetch() + a stream reader (EventSource cannot POST).
+"""
+import json
+from typing import AsyncIterator
+
+from fastapi.responses import StreamingResponse
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "X-Accel-Buffering": "no",  # stop proxies (nginx, Render) from buffering the stream
+}
+
+
+def sse_event(event: str, data: str) -> str:
+    """Frame a pre-serialised JSON payload as a single SSE event."""
+    return f"event: {event}\ndata: {data}\n\n"
+
+
+def sse_error(detail: str) -> str:
+    return sse_event("error", json.dumps({"detail": detail}))
+
+
+def sse_response(events: AsyncIterator[str]) -> StreamingResponse:
+    return StreamingResponse(events, media_type="text/event-stream", headers=SSE_HEADERS)
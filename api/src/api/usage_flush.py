@@ -0,0 +1,67 @@
+"""
+Background writer for the AI usage ledger.
+
+ClaudeAdapter records each model call in memory (UsageLedger); this task
+drains the buffer every interval and writes it to the ai_usage_ledger table
+in batches, so a model call never waits on a ledger INSERT. A failed write is
+put back and retried next interval; shutdown flushes what is left.
+"""
+import asyncio
+from typing import Awaitable, Callable, List
+
+from domain.entities.ai_usage import AIUsageRecord
+from infrastructure.ai.usage_ledger import UsageLedger
+
+WriteUsage = Callable[[List[AIUsageRecord]], Awaitable[None]]
+
+
+class UsageLedgerFlusher:
+    def __init__(
+        self,
+        ledger: UsageLedger,
+        write: WriteUsage,
+        interval_seconds: float = 30.0,
+        batch_size: int = 500,
+    ) -> None:
+        self._ledger = ledger
+        self._write = write
+        self._interval = interval_seconds
+        self._batch_size = batch_size
+        self._task = None
+        self.written = 0
+        self.failed_writes = 0
+
+    async def flush(self) -> int:
+        """Write everything pending; returns the records written. Stops at the first failed batch."""
+        written = 0
+        while True:
+            batch = self._ledger.drain(self._batch_size)
+            if not batch:
+                return written
+            try:
+                await self._write(batch)
+            except Exception:
+                self._ledger.requeue(batch)
+                self.failed_writes += 1
+                return written
+            written += len(batch)
+            self.written += len(batch)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    async def _loop(self) -> None:
+        while True:
+            await asyncio.sleep(self._interval)
+            await self.flush()
@@ -1,10 +1,26 @@
+import hashlib
+import json
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional
+from typing import AsyncIterator, Dict, List, Optional
+from uuid import UUID
 
 from domain.entities.household import HouseholdMember
 from domain.entities.meal_plan import MealSlot
 from domain.entities.recipe import Recipe
+from .recipe_page_port import RecipeDraft
+
+
+class AIDeadlineExceeded(TimeoutError):
+    """An AI call did not finish within its deadline budget; the call was cancelled."""
+
+
+class AIUnavailable(Exception):
+    """The AI was not called: recent calls failed or ran slow and the circuit is open."""
+
+    def __init__(self, message: str, retry_after_seconds: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after_seconds = retry_after_seconds
 
 
 @dataclass
@@ -16,6 +32,57 @@ class SuggestionRequest:
     cuisine_preferences: List[str]
     week_context: Optional[str] = None
     recent_recipe_names: List[str] = field(default_factory=list)
+    options_per_slot: int = 3  # fewer when the rest come from the household's library
+    # Routing metadata — not sent to the model and not part of the fingerprint
+    household_id: Optional[UUID] = None
+    allow_cached: bool = True  # False forces a fresh generation ("regenerate all")
+    deadline_seconds: Optional[float] = None  # overall budget; None uses the adapter default
+
+    @property
+    def is_context_free(self) -> bool:
+        """True when nothing household-specific would shape the suggestions."""
+        return not (
+            self.disliked_ingredients
+            or self.liked_ingredients
+            or self.cuisine_preferences
+            or (self.week_context or "").strip()
+            or self.recent_recipe_names
+        )
+
+    def fingerprint(self, shared: bool = False) -> str:
+        """
+        Stable hash of everything that shapes the model's answer.
+
+        Lists are normalised (trimmed, lower-cased, de-duplicated, sorted) so
+        cosmetic differences do not split the key; slot order is kept because
+        results come back in slot order. `shared=True` drops member names and
+        ids so identical context-free requests from different households match.
+        """
+        def norm(values: List[str]) -> List[str]:
+            return sorted({v.strip().lower() for v in values if v.strip()})
+
+        payload = {
+            "slots": [
+                [
+                    s.name.strip().lower(),
+                    s.meal_type.value,
+                    sorted(d.value for d in s.days),
+                    [] if shared else sorted(str(m) for m in s.member_ids),
+                ]
+                for s in self.slots
+            ],
+            "members": [] if shared else sorted(
+                [m.name.strip().lower(), m.serving_size] for m in self.members
+            ),
+            "disliked": norm(self.disliked_ingredients),
+            "liked": norm(self.liked_ingredients),
+            "cuisines": norm(self.cuisine_preferences),
+            "week_context": " ".join((self.week_context or "").lower().split()),
+            "recent": norm(self.recent_recipe_names),
+            "options_per_slot": self.options_per_slot,
+        }
+        encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(encoded.encode()).hexdigest()
 
 
 @dataclass
@@ -29,6 +96,7 @@ class RefinementRequest:
     user_message: str  # e.g. "swap the pasta for something lighter"
     week_context: Optional[str] = None
     locked_slot_ids: List[str] = field(default_factory=list)
+    deadline_seconds: Optional[float] = None  # overall budget; None uses the adapter default
 
 
 class AIPort(ABC):
@@ -42,6 +110,40 @@ class AIPort(ABC):
         """Return 3 options for each *unlocked* slot only."""
         ...
 
+    async def peek_suggestions(
+        self, request: SuggestionRequest
+    ) -> Optional[List[List[Recipe]]]:
+        """
+        Return suggestions for `request` that are available without a model call
+        (e.g. from a cache), or None. Callers use this to skip rate-limit charges.
+        """
+        return None
+
+    def available(self) -> bool:
+        """
+        False while model calls are being refused (they would raise
+        AIUnavailable). Callers use this to fall back before charging budget.
+        """
+        return True
+
+    async def stream_suggest_recipes(
+        self, request: SuggestionRequest
+    ) -> AsyncIterator[List[Recipe]]:
+        """
+        Yield each slot's 3 options as soon as they are available, in slot order.
+        Adapters that cannot stream fall back to this default, which waits for
+        suggest_recipes and then yields every group at once.
+        """
+        for options in await self.suggest_recipes(request):
+            yield options
+
+    async def stream_refine_recipes(
+        self, request: RefinementRequest
+    ) -> AsyncIterator[List[Recipe]]:
+        """Streaming counterpart of refine_recipes (unlocked slots only)."""
+        for options in await self.refine_recipes(request):
+            yield options
+
     @abstractmethod
     async def generate_instructions(self, recipe: Recipe) -> List[str]:
         """
@@ -50,6 +152,14 @@ class AIPort(ABC):
         """
         ...
 
+    async def generate_instructions_batch(self, recipes: List[Recipe]) -> List[List[str]]:
+        """
+        Instructions for several recipes, in order. May return fewer entries than
+        recipes (e.g. a truncated response); callers fall back to
+        generate_instructions for the rest. The default makes one call per recipe.
+        """
+        return [await self.generate_instructions(r) for r in recipes]
+
     @abstractmethod
     async def parse_recipe_from_url(self, url: str) -> Recipe:
         """
@@ -58,3 +168,11 @@ class AIPort(ABC):
         Raises ValueError if no recipe is found on the page.
         """
         ...
+
+    async def complete_recipe_draft(self, draft: RecipeDraft) -> Recipe:
+        """
+        Turn a structured-data draft the import could not normalise locally
+        (unknown servings, unparseable ingredient lines) into a Recipe, without
+        re-reading the page. The default falls back to a full page parse.
+        """
+        return await self.parse_recipe_from_url(draft.source_url)
@@ -0,0 +1,67 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+from uuid import UUID
+
+from domain.entities.meal_plan import MealSlot
+from domain.entities.recipe import Recipe
+
+
+class DraftSessionExpired(ValueError):
+    """The draft session is unknown, expired, or belongs to another household."""
+
+
+class DraftRecipeUnknown(ValueError):
+    """
+    A chosen recipe id the draft never offered and the library does not hold
+    (e.g. one kept by the client from an earlier draft): send the full recipe.
+    """
+
+
+@dataclass
+class DraftSession:
+    """
+    A week being planned, held server-side between calls: the options offered
+    per slot and every recipe offered so far, so refine, regenerate and confirm
+    can name recipes by id instead of re-uploading them.
+    """
+    id: UUID
+    household_id: UUID
+    slots: Dict[str, MealSlot] = field(default_factory=dict)  # slot_id -> slot, as offered
+    options: Dict[str, List[Recipe]] = field(default_factory=dict)  # slot_id -> latest options
+    reserve: Dict[str, List[Recipe]] = field(default_factory=dict)  # slot_id -> surplus not yet shown
+    recipes: Dict[UUID, Recipe] = field(default_factory=dict)  # every recipe offered, by id
+    chosen: Dict[str, UUID] = field(default_factory=dict)  # slot_id -> recipe id, as last sent
+    updated_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+
+    def offer(self, slot: MealSlot, options: List[Recipe], reserve: List[Recipe] = ()) -> None:
+        """
+        Record a slot's new options and replace its reserve; earlier options
+        stay resolvable by id.
+        """
+        slot_id = str(slot.id)
+        self.slots[slot_id] = slot
+        self.options[slot_id] = list(options)
+        self.reserve[slot_id] = list(reserve)
+        for recipe in options:
+            self.recipes[recipe.id] = recipe
+        self.updated_at = datetime.now(timezone.utc)
+
+
+class DraftSessionStore(ABC):
+    """Short-lived storage for draft sessions; entries expire after a TTL."""
+
+    @abstractmethod
+    async def get(self, session_id: UUID) -> Optional[DraftSession]:
+        """The session, or None when it is unknown or has expired."""
+        ...
+
+    @abstractmethod
+    async def save(self, session: DraftSession) -> None:
+        """Store the session and restart its TTL."""
+        ...
+
+    @abstractmethod
+    async def delete(self, session_id: UUID) -> None:
+        ...
@@ -0,0 +1,13 @@
+from abc import ABC, abstractmethod
+from typing import List
+from uuid import UUID
+
+
+class InstructionQueuePort(ABC):
+    @abstractmethod
+    def enqueue(self, recipe_ids: List[UUID]) -> None:
+        """
+        Schedule background instruction generation for these recipes.
+        Returns immediately; the work runs after the current request commits.
+        """
+        ...
@@ -0,0 +1,39 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+
+@dataclass
+class RecipeDraft:
+    """A recipe as published in a page's structured data (schema.org), before normalisation."""
+
+    source_url: str
+    name: str
+    ingredient_lines: List[str]  # free text, e.g. "1 ½ cups flour, sifted"
+    instructions: List[str] = field(default_factory=list)
+    servings: Optional[int] = None  # from recipeYield; None when the page does not say
+    prep_time: Optional[int] = None  # minutes, from totalTime or prepTime + cookTime
+
+
+@dataclass
+class RecipePage:
+    """One fetch of a recipe page."""
+
+    draft: Optional[RecipeDraft]  # None when the page has no structured recipe
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    not_modified: bool = False  # the server answered a conditional fetch with 304
+
+
+class RecipePagePort(ABC):
+    @abstractmethod
+    async def read_recipe(
+        self, url: str, etag: Optional[str] = None, last_modified: Optional[str] = None
+    ) -> RecipePage:
+        """
+        Fetch the page and return the recipe embedded in its structured data
+        (JSON-LD or microdata) with the page's cache validators. Given a
+        previous etag / last_modified, the fetch is conditional and an unchanged
+        page comes back as not_modified with no draft.
+        """
+        ...
@@ -0,0 +1,104 @@
+import asyncio
+from dataclasses import dataclass, replace
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+from domain.entities.recipe import Recipe
+from domain.services.url_canonical import canonical_url
+
+MAX_BULK_URLS = 50
+BULK_IMPORT_CONCURRENCY = 4
+BULK_IMPORT_ATTEMPTS = 2
+BULK_IMPORT_RETRY_DELAY_SECONDS = 1.0
+
+# One URL through ImportRecipeUseCase, in its own unit of work: imports run
+# concurrently and a database session must not be shared between them.
+ImportOne = Callable[[str], Awaitable[Recipe]]
+
+
+@dataclass
+class BulkImportItem:
+    index: int  # position in the submitted list
+    url: str
+    recipe: Optional[Recipe] = None  # draft, not yet persisted
+    error: Optional[str] = None
+    attempts: int = 0
+
+    @property
+    def ok(self) -> bool:
+        return self.recipe is not None
+
+
+class BulkImportRecipesUseCase:
+    """
+    Import a list of URLs, at most `concurrency` at a time, yielding each
+    result as it finishes (completion order, not list order). Duplicate URLs —
+    by canonical form — are imported once and reported at every position.
+
+    Failures other than ValueError (timeouts, network and API errors) are
+    retried up to `max_attempts`; a ValueError means the page has no usable
+    recipe and another attempt would cost a model call for the same answer.
+    """
+
+    def __init__(
+        self,
+        import_one: ImportOne,
+        concurrency: int = BULK_IMPORT_CONCURRENCY,
+        max_attempts: int = BULK_IMPORT_ATTEMPTS,
+        retry_delay_seconds: float = BULK_IMPORT_RETRY_DELAY_SECONDS,
+    ):
+        self._import_one = import_one
+        self._concurrency = max(1, concurrency)
+        self._max_attempts = max(1, max_attempts)
+        self._retry_delay = retry_delay_seconds
+
+    def execute(self, urls: List[str]) -> AsyncIterator[BulkImportItem]:
+        """Raises ValueError up front for an empty or oversized list."""
+        urls = [u.strip() for u in urls]
+        if not any(urls):
+            raise ValueError("No URLs to import.")
+        if len(urls) > MAX_BULK_URLS:
+            raise ValueError(f"At most {MAX_BULK_URLS} URLs can be imported at once.")
+        return self._run(urls)
+
+    async def _run(self, urls: List[str]) -> AsyncIterator[BulkImportItem]:
+        positions: Dict[str, List[int]] = {}
+        for index, url in enumerate(urls):
+            if url:
+                positions.setdefault(canonical_url(url), []).append(index)
+
+        results: asyncio.Queue = asyncio.Queue()
+        slots = asyncio.Semaphore(self._concurrency)
+
+        async def work(indices: List[int]) -> None:
+            async with slots:
+                item = await self._import(urls[indices[0]])
+            for index in indices:
+                results.put_nowait(replace(item, index=index, url=urls[index]))
+
+        tasks = [asyncio.create_task(work(indices)) for indices in positions.values()]
+        for index, url in enumerate(urls):
+            if not url:
+                results.put_nowait(BulkImportItem(index=index, url=url, error="Empty URL."))
+        try:
+            for _ in range(len(urls)):
+                yield await results.get()
+        finally:
+            for task in tasks:  # the client went away: stop spending on the rest
+                task.cancel()
+
+    async def _import(self, url: str) -> BulkImportItem:
+        item = BulkImportItem(index=0, url=url)
+        while item.attempts < self._max_attempts:
+            item.attempts += 1
+            try:
+                item.recipe = await self._import_one(url)
+                item.error = None
+                return item
+            except ValueError as exc:
+                item.error = str(exc)
+                return item
+            except Exception as exc:
+                item.error = str(exc) or type(exc).__name__
+                if item.attempts < self._max_attempts:
+                    await asyncio.sleep(self._retry_delay * item.attempts)
+        return item
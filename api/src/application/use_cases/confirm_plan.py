@@ -1,20 +1,29 @@
-from typing import List
+from typing import List, Optional
 from uuid import uuid4
 
 from domain.entities.meal_plan import SlotAssignment, WeeklyPlan
 from domain.repositories.meal_plan_repository import WeeklyPlanRepository
 from domain.repositories.recipe_repository import RecipeRepository
+from application.ports.instruction_queue import InstructionQueuePort
 from application.use_cases.suggest_recipes import RecipeSuggestion
 
 
 class ConfirmPlanUseCase:
+    """
+    With an instruction_queue, confirmed recipes that have no cooking
+    instructions yet are queued for eager generation, so opening them on
+    cooking night does not wait for a model call.
+    """
+
     def __init__(
         self,
         plan_repo: WeeklyPlanRepository,
         recipe_repo: RecipeRepository,
+        instruction_queue: Optional[InstructionQueuePort] = None,
     ):
         self._plan_repo = plan_repo
         self._recipe_repo = recipe_repo
+        self._instruction_queue = instruction_queue
 
     async def execute(
         self,
@@ -38,4 +47,8 @@ class ConfirmPlanUseCase:
             assignments=assignments,
         )
         await self._plan_repo.save_plan(plan)
+
+        missing = list(dict.fromkeys(r.id for _, r in saved if r.cooking_instructions is None))
+        if self._instruction_queue is not None and missing:
+            self._instruction_queue.enqueue(missing)
         return plan
@@ -1,3 +1,5 @@
+from typing import List, Tuple
+
 from domain.entities.recipe import Recipe
 from domain.repositories.recipe_repository import RecipeRepository
 
@@ -14,3 +16,12 @@ class CreateRecipeUseCase:
         Raises ValueError on name collision.
         """
         return await self._recipe_repo.create_recipe(recipe)
+
+    async def execute_many(self, recipes: List[Recipe]) -> Tuple[List[Recipe], List[str]]:
+        """
+        Saves a batch (e.g. the drafts from a bulk import) in one round trip.
+        Returns (saved, names skipped because they already exist).
+        """
+        saved = await self._recipe_repo.create_recipes(recipes)
+        saved_ids = {r.id for r in saved}
+        return saved, [r.name for r in recipes if r.id not in saved_ids]
@@ -0,0 +1,193 @@
+import logging
+from dataclasses import dataclass, replace
+from datetime import datetime, timezone
+from typing import AsyncIterator, Dict, List, Optional, Tuple, Type
+
+from domain.entities.meal_plan import MealSlot
+from domain.entities.recipe import Recipe
+from domain.repositories.recipe_repository import RecipeRepository
+from domain.services.dislike_matcher import DislikeMatcher, dislike_matcher
+from domain.services.library_ranker import LibraryRanker
+from application.ports.ai_port import AIDeadlineExceeded, AIPort, AIUnavailable, SuggestionRequest
+
+logger = logging.getLogger(__name__)
+
+# Failures of the replacement call that leave the clean options standing
+_REPLACEMENT_ERRORS: Tuple[Type[BaseException], ...] = (ValueError, AIUnavailable, AIDeadlineExceeded)
+
+
+@dataclass
+class DislikeGuardStats:
+    """Process-wide counts of AI options that ignored the household's dislikes."""
+    checked: int = 0  # slot groups checked
+    violations: int = 0  # options that contained a disliked ingredient
+    from_library: int = 0  # replaced by a saved recipe
+    from_ai: int = 0  # replaced by the targeted AI call
+    replacement_calls: int = 0
+    unresolved: int = 0  # dropped: no clean replacement was found
+
+
+class DislikeGuard:
+    """
+    Checks AI option groups against the household's dislikes before they are
+    sent and swaps out the options that slipped through, so the household
+    never spends rate-limit budget regenerating past an ignored dislike.
+
+    Replacements come from the saved library first (when a recipe repository
+    is given), then from one small AI call for every slot still short. Options
+    with no clean replacement are dropped rather than shown.
+
+    provider_errors are the exceptions the AI client raises for a failed call
+    (anthropic.APIError in production); like unusable answers, deadlines and
+    an open circuit, they cost only the replacements. Anything else propagates.
+    """
+
+    def __init__(
+        self,
+        ai_adapter: AIPort,
+        recipe_repo: Optional[RecipeRepository] = None,
+        ranker: Optional[LibraryRanker] = None,
+        stats: Optional[DislikeGuardStats] = None,
+        provider_errors: Tuple[Type[BaseException], ...] = (),
+    ):
+        self._ai = ai_adapter
+        self._replacement_errors = _REPLACEMENT_ERRORS + tuple(provider_errors)
+        self._recipe_repo = recipe_repo
+        self._library: Optional[List[Recipe]] = None
+        self._ranker = ranker or LibraryRanker()
+        self.stats = stats if stats is not None else DislikeGuardStats()
+
+    async def clean(
+        self,
+        slots: List[MealSlot],
+        groups: List[List[Recipe]],
+        request: SuggestionRequest,
+        shown: Optional[int] = None,
+    ) -> List[List[Recipe]]:
+        """
+        `groups` (one per slot, in order) with every disliked option dropped.
+        Replacements are looked for only while a group has fewer than `shown`
+        clean options (default: its full size); past that, the surplus held
+        as reserve just gets shorter.
+        """
+        matcher = dislike_matcher(request.disliked_ingredients)
+        if not matcher:
+            return groups
+        self.stats.checked += len(groups)
+        kept = [[r for r in group if matcher.allows(r)] for group in groups]
+        violations = sum(len(group) - len(kept[i]) for i, group in enumerate(groups))
+        if not violations:
+            return groups
+        self.stats.violations += violations
+        # slot index -> options still to replace
+        wanted = [len(group) if shown is None else min(shown, len(group)) for group in groups]
+        short = {i: wanted[i] - len(kept[i]) for i in range(len(groups)) if len(kept[i]) < wanted[i]}
+
+        await self._from_library(slots, kept, short, matcher, request)
+        await self._from_ai(slots, kept, short, matcher, request)
+        self.stats.unresolved += sum(short.values())
+        return kept
+
+    async def prepare(self, request: SuggestionRequest) -> None:
+        """
+        Load the saved library now, while the caller still holds its database
+        session, so that stream() never reads from the database.
+        """
+        if self._recipe_repo is not None and self._library is None and dislike_matcher(
+            request.disliked_ingredients
+        ):
+            self._library = await self._recipe_repo.get_recipes(sort="most_used")
+
+    async def stream(
+        self,
+        slots: List[MealSlot],
+        groups: AsyncIterator[List[Recipe]],
+        request: SuggestionRequest,
+        shown: Optional[int] = None,
+    ) -> AsyncIterator[List[Recipe]]:
+        """
+        Streaming variant: each group is cleaned as it arrives (a bad one waits
+        for its replacement). Call prepare() first to keep the database out of it.
+        """
+        index = 0
+        async for group in groups:
+            if index >= len(slots):
+                break
+            (cleaned,) = await self.clean([slots[index]], [group], request, shown)
+            index += 1
+            yield cleaned
+
+    async def _from_library(
+        self,
+        slots: List[MealSlot],
+        kept: List[List[Recipe]],
+        short: Dict[int, int],
+        matcher: DislikeMatcher,
+        request: SuggestionRequest,
+    ) -> None:
+        if self._recipe_repo is None:
+            return
+        offered = {r.name.strip().lower() for group in kept for r in group}
+        saved = self._library
+        if saved is None:
+            saved = await self._recipe_repo.get_recipes(sort="most_used")
+        library = [r for r in saved if r.name.strip().lower() not in offered and matcher.allows(r)]
+        if not library:
+            return
+        needy = sorted(short)
+        picks = self._ranker.pick(
+            [slots[i] for i in needy],
+            library,
+            per_slot=max(short.values()),
+            liked=request.liked_ingredients,
+            disliked=request.disliked_ingredients,
+            recent_names=request.recent_recipe_names,
+            now=datetime.now(timezone.utc),
+        )
+        for i in needy:
+            taken = picks.get(slots[i].id, [])[: short[i]]
+            self.stats.from_library += len(taken)
+            _fill(i, taken, kept, short)
+
+    async def _from_ai(
+        self,
+        slots: List[MealSlot],
+        kept: List[List[Recipe]],
+        short: Dict[int, int],
+        matcher: DislikeMatcher,
+        request: SuggestionRequest,
+    ) -> None:
+        if not short:
+            return
+        needy = sorted(short)
+        notes = [request.week_context] if request.week_context else []
+        notes.append(f"Must not contain any of: {', '.join(matcher.terms)}")
+        offered = ", ".join(r.name for i in needy for r in kept[i])
+        if offered:
+            notes.append(f"Already offered: {offered} — suggest something different")
+        self.stats.replacement_calls += 1
+        try:
+            groups = await self._ai.suggest_recipes(
+                replace(
+                    request,
+                    slots=[slots[i] for i in needy],
+                    options_per_slot=max(short.values()),
+                    week_context="; ".join(notes),
+                    allow_cached=False,
+                )
+            )
+        except self._replacement_errors as exc:
+            # The clean options still go out; the rest count as unresolved
+            logger.warning("Dislike replacement call failed for %d slot(s): %r", len(needy), exc)
+            return
+        for i, group in zip(needy, groups):
+            taken = [r for r in group if matcher.allows(r)][: short[i]]
+            self.stats.from_ai += len(taken)
+            _fill(i, taken, kept, short)
+
+
+def _fill(index: int, recipes: List[Recipe], kept: List[List[Recipe]], short: Dict[int, int]) -> None:
+    kept[index].extend(recipes)
+    short[index] -= len(recipes)
+    if not short[index]:
+        del short[index]
@@ -0,0 +1,97 @@
+from typing import Dict, List, Optional
+from uuid import UUID, uuid4
+
+from application.ports.draft_session_store import (
+    DraftRecipeUnknown,
+    DraftSession,
+    DraftSessionExpired,
+    DraftSessionStore,
+)
+from application.use_cases.suggest_recipes import OPTIONS_PER_SLOT, RecipeSuggestion, SlotOptions
+from domain.entities.recipe import Recipe
+from domain.repositories.meal_plan_repository import MealPlanTemplateRepository
+from domain.repositories.recipe_repository import RecipeRepository
+
+
+class DraftPlanSessionUseCase:
+    """
+    Server-held draft of the week being planned.
+
+    Suggest, refine and regenerate record the options they return in the
+    household's draft session; later calls send only slot ids and recipe ids,
+    which resolve here. A recipe that was never offered in the session (one
+    assigned from the saved library) is looked up in the recipe repository.
+
+    The surplus options of each answer are kept as the slot's reserve, so
+    regenerating a slot is served from it until it runs out.
+    """
+
+    def __init__(
+        self,
+        store: DraftSessionStore,
+        recipe_repo: RecipeRepository,
+        template_repo: MealPlanTemplateRepository,
+        household_id: UUID,
+    ):
+        self._store = store
+        self._recipe_repo = recipe_repo
+        self._template_repo = template_repo
+        self._household_id = household_id
+
+    async def open(self, session_id: Optional[UUID]) -> DraftSession:
+        """The household's session, or a new one when session_id is None."""
+        if session_id is None:
+            return DraftSession(id=uuid4(), household_id=self._household_id)
+        session = await self._store.get(session_id)
+        if session is None or session.household_id != self._household_id:
+            raise DraftSessionExpired(f"Draft session '{session_id}' not found or expired.")
+        return session
+
+    async def record(self, session: DraftSession, slot_options: List[SlotOptions]) -> None:
+        """Add the options just returned to the session and restart its TTL."""
+        for so in slot_options:
+            session.offer(so.slot, so.options, so.reserve)
+        await self._store.save(session)
+
+    def from_reserve(
+        self, session: DraftSession, slot_id: str, existing_chosen: Dict[str, Recipe]
+    ) -> Optional[SlotOptions]:
+        """
+        Fresh options for slot_id from its reserve, skipping recipes already
+        chosen for other slots, or None once the reserve has run out. Record
+        the result to take it out of the reserve.
+        """
+        slot = session.slots.get(slot_id)
+        taken = {r.name.strip().lower() for r in existing_chosen.values()}
+        reserve = [r for r in session.reserve.get(slot_id, []) if r.name.strip().lower() not in taken]
+        if slot is None or not reserve:
+            return None
+        return SlotOptions(slot=slot, options=reserve[:OPTIONS_PER_SLOT], reserve=reserve[OPTIONS_PER_SLOT:])
+
+    async def resolve(self, session: DraftSession, chosen: Dict[str, UUID]) -> Dict[str, Recipe]:
+        """slot_id -> recipe id, as the client has them chosen, to slot_id -> Recipe."""
+        resolved: Dict[str, Recipe] = {}
+        for slot_id, recipe_id in chosen.items():
+            recipe = session.recipes.get(recipe_id) or await self._recipe_repo.get_recipe(recipe_id)
+            if recipe is None:
+                raise DraftRecipeUnknown(f"Recipe '{recipe_id}' for slot '{slot_id}' is not in this draft.")
+            resolved[slot_id] = recipe
+        session.chosen = dict(chosen)
+        return resolved
+
+    async def suggestions(self, session: DraftSession, chosen: Dict[str, UUID]) -> List[RecipeSuggestion]:
+        """The chosen recipes paired with their slots, ready for ConfirmPlanUseCase."""
+        recipes = await self.resolve(session, chosen)
+        slots = dict(session.slots)
+        if any(slot_id not in slots for slot_id in recipes):
+            # Slots filled from the library before any suggestions were offered
+            template = await self._template_repo.get_template()
+            slots.update({str(s.id): s for s in (template.slots if template else [])})
+        missing = [slot_id for slot_id in recipes if slot_id not in slots]
+        if missing:
+            raise ValueError(f"Slot '{missing[0]}' not found in template.")
+        return [RecipeSuggestion(slot=slots[slot_id], recipe=recipe) for slot_id, recipe in recipes.items()]
+
+    async def close(self, session: DraftSession) -> None:
+        """The week is confirmed; the draft is no longer needed."""
+        await self._store.delete(session.id)
@@ -1,17 +1,25 @@
+import logging
 from dataclasses import replace
-from typing import Optional
+from typing import List, Optional
 from uuid import UUID
 
 from application.ports.ai_port import AIPort
 from domain.entities.recipe import Recipe
 from domain.repositories.recipe_repository import RecipeRepository
 
+# Recipes per batched prompt; a full week's worth fits in two or three calls
+# while each response stays well inside the output token limit.
+INSTRUCTION_BATCH_SIZE = 8
+
+logger = logging.getLogger(__name__)
+
 
 class GenerateInstructionsUseCase:
     """Generate cooking instructions for a recipe that has none yet.
 
     This is intentionally separate from GetRecipeUseCase so that the detail
     page can load instantly and then call this endpoint in the background.
+    execute_many() is the eager path run after a plan is confirmed.
     """
 
     def __init__(self, recipe_repo: RecipeRepository, ai_port: AIPort):
@@ -29,3 +37,42 @@ class GenerateInstructionsUseCase:
             recipe = replace(recipe, cooking_instructions=instructions)
 
         return recipe
+
+    async def execute_many(self, recipe_ids: List[UUID]) -> int:
+        """
+        Fill in instructions for every listed recipe that lacks them, using one
+        batched prompt per INSTRUCTION_BATCH_SIZE recipes. Recipes the batch does
+        not cover (failed or truncated response) are generated one at a time; a
+        recipe that still fails is left for the lazy path. Returns how many were saved.
+        """
+        pending: List[Recipe] = []
+        for recipe_id in dict.fromkeys(recipe_ids):
+            recipe = await self._recipe_repo.get_recipe(recipe_id)
+            if recipe is not None and recipe.cooking_instructions is None:
+                pending.append(recipe)
+
+        saved = 0
+        for start in range(0, len(pending), INSTRUCTION_BATCH_SIZE):
+            chunk = pending[start : start + INSTRUCTION_BATCH_SIZE]
+            try:
+                batch = await self._ai_port.generate_instructions_batch(chunk)
+            except Exception:
+                logger.warning(
+                    "Batched instructions failed for %d recipe(s); generating one at a time",
+                    len(chunk), exc_info=True,
+                )
+                batch = []
+            for recipe, instructions in zip(chunk, batch):
+                await self._recipe_repo.save_instructions(recipe.id, instructions)
+                saved += 1
+            for recipe in chunk[len(batch):]:
+                try:
+                    instructions = await self._ai_port.generate_instructions(recipe)
+                except Exception:
+                    logger.warning(
+                        "Instructions failed for recipe %s; left for the lazy path", recipe.id, exc_info=True
+                    )
+                    continue
+                await self._recipe_repo.save_instructions(recipe.id, instructions)
+                saved += 1
+        return saved
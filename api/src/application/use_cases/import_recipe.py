@@ -1,16 +1,148 @@
+from dataclasses import replace
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+from uuid import uuid4
+
 from application.ports.ai_port import AIPort
-from domain.entities.recipe import Recipe
+from application.ports.recipe_page_port import RecipeDraft, RecipePage, RecipePagePort
+from domain.entities.import_cache import CachedImport
+from domain.entities.recipe import GroceryCategory, Ingredient, Recipe
+from domain.repositories.import_cache_repository import ImportCacheRepository
+from domain.services.ingredient_parser import guess_category, parse_ingredient_line
+from domain.services.url_canonical import canonical_url
+
+DEFAULT_EMOJI = "🍽️"
+DEFAULT_PREP_TIME = 30
+# Within this window a cached import is served without touching the site
+IMPORT_CACHE_FRESH_FOR = timedelta(hours=24)
+IMPORT_CACHE_MAX_ENTRIES = 5000
 
 
 class ImportRecipeUseCase:
-    """Parse a recipe from a URL via AI — returns a draft Recipe, not yet persisted."""
+    """
+    Parse a recipe from a URL — returns a draft Recipe, not yet persisted.
+
+    With a page_port, the page's schema.org data is read first. A draft whose
+    servings and ingredient lines all parse locally becomes the Recipe with no
+    model call; otherwise the AI only fills the gaps from the draft. Pages
+    without structured data (or that fail to load) go to the AI's full parse.
+
+    With a cache, results are shared across households by canonical URL. A
+    fresh entry is served as-is; a stale one is revalidated with a conditional
+    fetch and only re-parsed when the page changed (or the site is down: then
+    the stale entry is served).
+    """
 
-    def __init__(self, ai_port: AIPort):
+    def __init__(
+        self,
+        ai_port: AIPort,
+        page_port: Optional[RecipePagePort] = None,
+        cache: Optional[ImportCacheRepository] = None,
+        fresh_for: timedelta = IMPORT_CACHE_FRESH_FOR,
+        max_cached: int = IMPORT_CACHE_MAX_ENTRIES,
+    ):
         self._ai_port = ai_port
+        self._page_port = page_port
+        self._cache = cache
+        self._fresh_for = fresh_for
+        self._max_cached = max_cached
 
     async def execute(self, url: str) -> Recipe:
         """
         Returns a Recipe domain object populated from the webpage.
         Raises ValueError if no recipe is found.
         """
-        return await self._ai_port.parse_recipe_from_url(url)
+        key = canonical_url(url)
+        entry = await self._cache.get(key) if self._cache is not None else None
+        now = datetime.now(timezone.utc)
+        if entry is not None and now - entry.fetched_at < self._fresh_for:
+            return await self._serve(entry, url, now)
+
+        page = await self._read_page(url, entry)
+        if entry is not None and self._page_port is not None:
+            if page is None:  # site unreachable: stale beats nothing
+                return await self._serve(entry, url, now)
+            if page.not_modified:
+                entry.fetched_at = now
+                return await self._serve(entry, url, now)
+
+        recipe = await self._parse(url, page.draft if page else None)
+        if self._cache is not None:
+            await self._cache.save(CachedImport(
+                url_key=key,
+                recipe=recipe,
+                etag=page.etag if page else None,
+                last_modified=page.last_modified if page else None,
+                fetched_at=now,
+                last_hit_at=now,
+                hits=entry.hits if entry else 0,
+            ))
+            if entry is None:
+                await self._cache.prune(self._max_cached)
+        return recipe
+
+    async def _parse(self, url: str, draft: Optional[RecipeDraft]) -> Recipe:
+        if draft is None:
+            return await self._ai_port.parse_recipe_from_url(url)
+        recipe = recipe_from_draft(draft)
+        if recipe is not None:
+            return recipe
+        return await self._ai_port.complete_recipe_draft(draft)
+
+    async def _read_page(self, url: str, entry: Optional[CachedImport]) -> Optional[RecipePage]:
+        if self._page_port is None:
+            return None
+        try:
+            if entry is None:
+                return await self._page_port.read_recipe(url)
+            return await self._page_port.read_recipe(url, entry.etag, entry.last_modified)
+        except Exception:
+            return None  # the AI path fetches the page itself and reports errors
+
+    async def _serve(self, entry: CachedImport, url: str, now: datetime) -> Recipe:
+        entry.hits += 1
+        entry.last_hit_at = now
+        await self._cache.save(entry)
+        # Every import is its own draft: new id, and the URL this household used
+        return replace(entry.recipe, id=uuid4(), source_url=url)
+
+
+def recipe_from_draft(draft: RecipeDraft) -> Optional[Recipe]:
+    """
+    The draft as a Recipe with per-serving quantities, or None when that needs
+    the AI: servings unknown, no ingredients, or a line that does not parse.
+    """
+    if not draft.name or not draft.servings or not draft.ingredient_lines:
+        return None
+    ingredients: List[Ingredient] = []
+    for line in draft.ingredient_lines:
+        parsed = parse_ingredient_line(line)
+        if parsed is None:
+            return None
+        ingredients.append(
+            Ingredient(
+                name=parsed.name,
+                quantity=round(parsed.quantity / draft.servings, 3),
+                unit=parsed.unit,
+                category=guess_category(parsed.name),
+            )
+        )
+    return Recipe(
+        id=uuid4(),
+        name=draft.name,
+        emoji=DEFAULT_EMOJI,
+        prep_time=draft.prep_time or DEFAULT_PREP_TIME,
+        ingredients=ingredients,
+        key_ingredients=_key_ingredients(ingredients),
+        source_url=draft.source_url,
+        cooking_instructions=list(draft.instructions) or None,
+    )
+
+
+def _key_ingredients(ingredients: List[Ingredient], limit: int = 3) -> List[str]:
+    # Measured, non-staple items say most about a dish; pantry basics rarely do
+    main = [
+        i.name for i in ingredients
+        if i.quantity > 0 and i.category not in (GroceryCategory.PANTRY, GroceryCategory.OTHER)
+    ]
+    return (main or [i.name for i in ingredients])[:limit]
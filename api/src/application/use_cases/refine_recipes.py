@@ -1,25 +1,41 @@
-from typing import Dict, List, Optional
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 
+from domain.entities.meal_plan import MealSlot
 from domain.entities.recipe import Recipe
 from domain.repositories.household_repository import HouseholdRepository
 from domain.repositories.meal_plan_repository import MealPlanTemplateRepository
 from domain.repositories.preference_repository import PreferenceRepository
-from application.ports.ai_port import AIPort, RefinementRequest
-from application.use_cases.suggest_recipes import SlotOptions
+from application.ports.ai_port import AIPort, RefinementRequest, SuggestionRequest
+from application.use_cases.dislike_guard import DislikeGuard
+from application.use_cases.suggest_recipes import SlotOptions, pair_with_slots
 
 
 class RefineRecipesUseCase:
+    """
+    With a dislike_guard, refined options containing a disliked ingredient are
+    replaced (library first, then one targeted suggest call) before they are returned.
+    """
+
     def __init__(
         self,
         ai_adapter: AIPort,
         template_repo: MealPlanTemplateRepository,
         household_repo: HouseholdRepository,
         preference_repo: PreferenceRepository,
+        deadline_seconds: Optional[float] = None,
+        dislike_guard: Optional[DislikeGuard] = None,
     ):
         self._ai = ai_adapter
         self._template_repo = template_repo
         self._household_repo = household_repo
         self._preference_repo = preference_repo
+        self._deadline_seconds = deadline_seconds
+        self._guard = dislike_guard
+
+    @property
+    def ai_available(self) -> bool:
+        """False while model calls are refused; refining has no fallback, so callers answer 503."""
+        return self._ai.available()
 
     async def execute(
         self,
@@ -31,6 +47,49 @@ class RefineRecipesUseCase:
         Refine recipes for unlocked slots only.
         Returns SlotOptions only for the unlocked slots.
         """
+        unlocked_slots, request = await self._build_request(
+            existing_assignments, user_message, locked_slot_ids
+        )
+
+        # The AI adapter handles filtering; it returns options for unlocked slots only
+        options_lists = await self._ai.refine_recipes(request)
+        if self._guard is not None:
+            options_lists = await self._guard.clean(
+                unlocked_slots, options_lists, _replacement_request(request, unlocked_slots)
+            )
+
+        return [
+            SlotOptions(slot=slot, options=options)
+            for slot, options in zip(unlocked_slots, options_lists)
+        ]
+
+    async def stream(
+        self,
+        existing_assignments: Dict[str, Recipe],
+        user_message: str,
+        locked_slot_ids: Optional[List[str]] = None,
+    ) -> AsyncIterator[SlotOptions]:
+        """
+        Streaming variant of execute. Context is loaded before this returns, so
+        the iterator needs no database; it yields SlotOptions for each unlocked
+        slot as it arrives.
+        """
+        unlocked_slots, request = await self._build_request(
+            existing_assignments, user_message, locked_slot_ids
+        )
+        groups = self._ai.stream_refine_recipes(request)
+        if self._guard is not None:
+            guard_request = _replacement_request(request, unlocked_slots)
+            await self._guard.prepare(guard_request)
+            groups = self._guard.stream(unlocked_slots, groups, guard_request)
+        return pair_with_slots(unlocked_slots, groups)
+
+    async def _build_request(
+        self,
+        existing_assignments: Dict[str, Recipe],
+        user_message: str,
+        locked_slot_ids: Optional[List[str]],
+    ) -> Tuple[List[MealSlot], RefinementRequest]:
         if locked_slot_ids is None:
             locked_slot_ids = []
 
@@ -50,16 +109,22 @@ class RefineRecipesUseCase:
             existing_assignments=existing_assignments,
             user_message=user_message,
             locked_slot_ids=locked_slot_ids,
+            deadline_seconds=self._deadline_seconds,
         )
-
-        # The AI adapter handles filtering; it returns options for unlocked slots only
-        options_lists = await self._ai.refine_recipes(request)
-
         unlocked_slots = [
             s for s in template.slots if str(s.id) not in locked_slot_ids
         ]
+        return unlocked_slots, request
 
-        return [
-            SlotOptions(slot=slot, options=options)
-            for slot, options in zip(unlocked_slots, options_lists)
-        ]
+
+def _replacement_request(request: RefinementRequest, unlocked_slots: List[MealSlot]) -> SuggestionRequest:
+    """What the dislike guard asks for when replacing refined options: same household, same ask."""
+    return SuggestionRequest(
+        slots=unlocked_slots,
+        members=request.members,
+        disliked_ingredients=request.disliked_ingredients,
+        liked_ingredients=request.liked_ingredients,
+        cuisine_preferences=request.cuisine_preferences,
+        week_context=f'User request: "{request.user_message}"',
+        deadline_seconds=request.deadline_seconds,
+    )
@@ -1,13 +1,27 @@
-from dataclasses import dataclass
-from typing import Dict, List, Optional
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, Dict, List, Optional, Tuple, TypeVar
+from uuid import UUID
 
 from domain.entities.meal_plan import MealSlot
+from domain.entities.pregenerated_suggestions import PregeneratedSuggestions
 from domain.entities.recipe import Recipe
 from domain.repositories.household_repository import HouseholdRepository
 from domain.repositories.meal_plan_repository import MealPlanTemplateRepository
+from domain.repositories.pregenerated_suggestion_repository import (
+    PregeneratedSuggestionRepository,
+)
 from domain.repositories.preference_repository import PreferenceRepository
 from domain.repositories.recipe_repository import RecipeRepository
-from application.ports.ai_port import AIPort, SuggestionRequest
+from domain.services.library_ranker import LibraryRanker
+from application.ports.ai_port import AIPort, AIUnavailable, SuggestionRequest
+from application.use_cases.dislike_guard import DislikeGuard
+
+T = TypeVar("T")
+
+OPTIONS_PER_SLOT = 3
+# Pre-generated options older than this are ignored even if nothing changed
+PREGENERATED_MAX_AGE = timedelta(days=7)
 
 
 @dataclass
@@ -21,9 +35,96 @@ class RecipeSuggestion:
 class SlotOptions:
     slot: MealSlot
     options: List[Recipe]  # always 3 candidates
+    # Surplus candidates from the same answer, held in the draft session so
+    # regenerating the slot can be served without a model call
+    reserve: List[Recipe] = field(default_factory=list)
+    degraded: bool = False  # AI unavailable: options are saved recipes only
+
+
+def split_options(slot: MealSlot, group: List[Recipe]) -> SlotOptions:
+    """The first OPTIONS_PER_SLOT of a group are shown; the rest go to the reserve."""
+    return SlotOptions(slot=slot, options=group[:OPTIONS_PER_SLOT], reserve=group[OPTIONS_PER_SLOT:])
+
+
+async def pair_with_slots(
+    slots: List[MealSlot], options_iter: AsyncIterator[List[Recipe]]
+) -> AsyncIterator[SlotOptions]:
+    """Zip a stream of per-slot option groups with the slots they were requested for."""
+    slot_iter = iter(slots)
+    async for options in options_iter:
+        slot = next(slot_iter, None)
+        if slot is None:
+            break
+        yield split_options(slot, options)
+
+
+@dataclass
+class _SuggestionPlan:
+    """
+    Library picks per slot plus the AI request covering whatever they leave
+    unfilled (None when the library fills every slot).
+    """
+    slots: List[MealSlot]
+    ai_request: Optional[SuggestionRequest]
+    picks: Dict[UUID, List[Recipe]] = field(default_factory=dict)
+
+    def needs_ai(self, slot: MealSlot) -> bool:
+        return len(self.picks.get(slot.id, [])) < OPTIONS_PER_SLOT
+
+    def _fill(self, slot: MealSlot, ai_options: List[Recipe]) -> SlotOptions:
+        picked = self.picks.get(slot.id, [])
+        return split_options(slot, picked + ai_options)
+
+    def merge(self, ai_groups: List[List[Recipe]]) -> List[SlotOptions]:
+        groups = iter(ai_groups)
+        merged: List[SlotOptions] = []
+        for slot in self.slots:
+            ai_options: List[Recipe] = []
+            if self.needs_ai(slot):
+                ai_options = next(groups, None)
+                if ai_options is None:
+                    break
+            merged.append(self._fill(slot, ai_options))
+        return merged
+
+    async def stream(
+        self, ai_groups: Optional[AsyncIterator[List[Recipe]]]
+    ) -> AsyncIterator[SlotOptions]:
+        """Yield in template order; library-filled slots go out without waiting for the AI."""
+        for slot in self.slots:
+            ai_options: List[Recipe] = []
+            if self.needs_ai(slot):
+                ai_options = await anext(ai_groups, None)
+                if ai_options is None:
+                    break
+            yield self._fill(slot, ai_options)
 
 
 class SuggestRecipesUseCase:
+    """
+    library_options_per_slot (0-3) turns on library-first suggestions: that
+    many options per slot come from the household's saved recipes, ranked
+    locally by LibraryRanker, and the AI is asked only for the rest. With 3
+    and a big enough library no model call is made at all.
+
+    With a pregenerated_repo, options stored by pregenerate() are served once,
+    in place of a model call, to a suggest for the week they were generated for
+    while the request fingerprint still matches.
+
+    deadline_seconds bounds interactive model calls; the adapter raises
+    AIDeadlineExceeded when it runs out.
+
+    With a dislike_guard, AI options containing a disliked ingredient are
+    replaced (library first, then one targeted AI call) before they are returned.
+
+    reserve_per_slot asks the AI for that many extra options per slot in the
+    same call; they come back as SlotOptions.reserve, for the draft session to
+    serve when the slot is regenerated.
+
+    While the AI adapter is unavailable (its circuit is open), suggestions are
+    built from the household's saved recipes alone and flagged degraded.
+    """
+
     def __init__(
         self,
         ai_adapter: AIPort,
@@ -31,38 +132,127 @@ class SuggestRecipesUseCase:
         household_repo: HouseholdRepository,
         preference_repo: PreferenceRepository,
         recipe_repo: RecipeRepository,
+        household_id: Optional[UUID] = None,
+        library_options_per_slot: int = 0,
+        library_ranker: Optional[LibraryRanker] = None,
+        pregenerated_repo: Optional[PregeneratedSuggestionRepository] = None,
+        deadline_seconds: Optional[float] = None,
+        dislike_guard: Optional[DislikeGuard] = None,
+        reserve_per_slot: int = 0,
     ):
         self._ai = ai_adapter
         self._template_repo = template_repo
         self._household_repo = household_repo
         self._preference_repo = preference_repo
         self._recipe_repo = recipe_repo
+        self._household_id = household_id
+        self._library_per_slot = max(0, min(library_options_per_slot, OPTIONS_PER_SLOT))
+        self._ranker = library_ranker or LibraryRanker()
+        self._pregenerated_repo = pregenerated_repo
+        self._deadline_seconds = deadline_seconds
+        self._guard = dislike_guard
+        self._reserve_per_slot = max(0, reserve_per_slot)
 
-    async def execute(self, week_context: Optional[str] = None) -> List[SlotOptions]:
-        template = await self._template_repo.get_template()
-        if not template or not template.slots:
-            raise ValueError("No meal plan template configured.")
+    @property
+    def ai_available(self) -> bool:
+        """False while model calls are refused; suggestions then come from the library."""
+        return self._ai.available()
 
-        members = await self._household_repo.get_members()
-        preferences = await self._preference_repo.get_preferences()
-        recent_names = await self._recipe_repo.get_recent_recipe_names(days=14)
+    async def execute(
+        self,
+        week_context: Optional[str] = None,
+        fresh: bool = False,
+        week_start_date: Optional[str] = None,
+    ) -> List[SlotOptions]:
+        """
+        fresh=True skips any cached answer and the library, and always asks the AI.
+        week_start_date is the Monday being planned; without it pregenerated
+        options are never served.
+        """
+        plan = await self._plan(week_context, fresh)
+        ai_groups: Optional[List[List[Recipe]]] = []
+        if plan.ai_request is not None:
+            ai_groups = await self._take_pregenerated(plan.ai_request, week_start_date)
+            if ai_groups is None:
+                try:
+                    ai_groups = await self._ai.suggest_recipes(plan.ai_request)
+                except AIUnavailable as e:
+                    return await self._from_library(plan.slots, plan.ai_request, error=e)
+            ai_groups = await self._checked(plan.ai_request, ai_groups)
+        return plan.merge(ai_groups)
 
-        request = SuggestionRequest(
-            slots=template.slots,
-            members=members,
-            disliked_ingredients=preferences.disliked_ingredients if preferences else [],
-            liked_ingredients=preferences.liked_ingredients if preferences else [],
-            cuisine_preferences=preferences.cuisine_preferences if preferences else [],
-            week_context=week_context,
-            recent_recipe_names=recent_names,
-        )
+    async def peek(
+        self, week_context: Optional[str] = None, week_start_date: Optional[str] = None
+    ) -> Optional[List[SlotOptions]]:
+        """
+        Return suggestions that can be served without a model call (cache hit,
+        pregenerated set, or a library that fills every slot), or None. Lets the
+        caller skip the rate-limit charge for repeat requests. A pregenerated
+        set returned here counts as served.
+        """
+        plan = await self._plan(week_context, fresh=False)
+        ai_groups: Optional[List[List[Recipe]]] = []
+        if plan.ai_request is not None:
+            ai_groups = await self._take_pregenerated(plan.ai_request, week_start_date)
+            if ai_groups is None:
+                ai_groups = await self._ai.peek_suggestions(plan.ai_request)
+        if ai_groups is None:
+            return None
+        if plan.ai_request is not None:
+            ai_groups = await self._checked(plan.ai_request, ai_groups)
+        return plan.merge(ai_groups)
+
+    async def stream(
+        self,
+        week_context: Optional[str] = None,
+        fresh: bool = False,
+        week_start_date: Optional[str] = None,
+    ) -> AsyncIterator[SlotOptions]:
+        """
+        Streaming variant of execute.
 
-        options_lists = await self._ai.suggest_recipes(request)
+        Household context is loaded before this returns, so configuration errors
+        (no template) raise ValueError here rather than mid-stream, and the
+        returned iterator needs no database. It yields one SlotOptions per slot,
+        in template order, as the AI produces them.
+        """
+        plan = await self._plan(week_context, fresh)
+        if plan.ai_request is None:
+            return plan.stream(None)
+        stored = await self._take_pregenerated(plan.ai_request, week_start_date)
+        if stored is not None:
+            return plan.stream(await self._checked_stream(plan.ai_request, _iterate(stored)))
+        if not self.ai_available:
+            return _iterate(await self._from_library(plan.slots, plan.ai_request))
+        return plan.stream(
+            await self._checked_stream(plan.ai_request, self._ai.stream_suggest_recipes(plan.ai_request))
+        )
 
-        return [
-            SlotOptions(slot=slot, options=options)
-            for slot, options in zip(template.slots, options_lists)
-        ]
+    async def pregenerate(self, week_start_date: str) -> bool:
+        """
+        Generate and store suggestions ahead of time (off-peak scheduler).
+        Returns False without calling the AI when the library covers every
+        slot or a still-valid set for the week is already stored, served or not.
+        """
+        if self._pregenerated_repo is None:
+            raise ValueError("No pre-generated suggestion store configured.")
+        plan = await self._plan(week_context=None, fresh=False)
+        if plan.ai_request is None:
+            return False
+        if await self._pregenerated(plan.ai_request, week_start_date, include_served=True) is not None:
+            return False
+        plan.ai_request.allow_cached = False
+        plan.ai_request.deadline_seconds = None  # nobody is waiting; use the adapter default
+        groups = await self._ai.suggest_recipes(plan.ai_request)
+        await self._pregenerated_repo.save(
+            PregeneratedSuggestions(
+                week_start_date=week_start_date,
+                fingerprint=plan.ai_request.fingerprint(),
+                options=groups,
+                created_at=datetime.now(timezone.utc),
+            )
+        )
+        return True
 
     async def execute_for_slot(
         self,
@@ -71,18 +261,164 @@ class SuggestRecipesUseCase:
         week_context: Optional[str] = None,
     ) -> SlotOptions:
         """Suggest 3 fresh options for a single slot, using existing assignments as context."""
+        slot, request = await self._build_slot_request(slot_id, existing_chosen, week_context)
+        try:
+            options_lists = await self._ai.suggest_recipes(request)
+        except AIUnavailable as e:
+            (slot_options,) = await self._from_library([slot], request, existing_chosen, error=e)
+            return slot_options
+        options_lists = await self._checked(request, options_lists)
+        return split_options(slot, options_lists[0])
+
+    async def stream_for_slot(
+        self,
+        slot_id: str,
+        existing_chosen: Dict[str, Recipe],
+        week_context: Optional[str] = None,
+    ) -> AsyncIterator[SlotOptions]:
+        """Streaming variant of execute_for_slot (yields a single SlotOptions)."""
+        slot, request = await self._build_slot_request(slot_id, existing_chosen, week_context)
+        if not self.ai_available:
+            return _iterate(await self._from_library([slot], request, existing_chosen))
+        groups = await self._checked_stream(request, self._ai.stream_suggest_recipes(request))
+        return pair_with_slots([slot], groups)
+
+    # ------------------------------------------------------------------
+    # Private helpers
+    # ------------------------------------------------------------------
+
+    async def _get_slots(self) -> List[MealSlot]:
         template = await self._template_repo.get_template()
         if not template or not template.slots:
             raise ValueError("No meal plan template configured.")
+        return template.slots
+
+    async def _checked(self, request: SuggestionRequest, groups: List[List[Recipe]]) -> List[List[Recipe]]:
+        if self._guard is None:
+            return groups
+        return await self._guard.clean(request.slots, groups, request, shown=self._shown(request))
+
+    async def _checked_stream(
+        self, request: SuggestionRequest, groups: AsyncIterator[List[Recipe]]
+    ) -> AsyncIterator[List[Recipe]]:
+        if self._guard is None:
+            return groups
+        await self._guard.prepare(request)
+        return self._guard.stream(request.slots, groups, request, shown=self._shown(request))
+
+    def _shown(self, request: SuggestionRequest) -> int:
+        """Options per AI group that are shown; a disliked one past these only shortens the reserve."""
+        return request.options_per_slot - self._reserve_per_slot
+
+    async def _from_library(
+        self,
+        slots: List[MealSlot],
+        request: SuggestionRequest,
+        existing_chosen: Optional[Dict[str, Recipe]] = None,
+        error: Optional[AIUnavailable] = None,
+    ) -> List[SlotOptions]:
+        """
+        Degraded suggestions while the AI is unavailable: saved recipes only,
+        ranked locally. Raises AIUnavailable (the outage) if any slot is left
+        without an option, rather than answer with an empty slot.
+        """
+        taken = {r.name.strip().lower() for r in (existing_chosen or {}).values()}
+        library = [
+            r for r in await self._recipe_repo.get_recipes(sort="most_used")
+            if r.name.strip().lower() not in taken
+        ]
+        picks = self._ranker.pick(
+            slots,
+            library,
+            per_slot=OPTIONS_PER_SLOT,
+            liked=request.liked_ingredients,
+            disliked=request.disliked_ingredients,
+            recent_names=request.recent_recipe_names,
+            now=datetime.now(timezone.utc),
+        )
+        if not all(picks.get(s.id) for s in slots):
+            raise error or AIUnavailable("AI is temporarily unavailable and no saved recipes fit.")
+        return [SlotOptions(slot=s, options=picks.get(s.id, []), degraded=True) for s in slots]
+
+    async def _pregenerated(
+        self, request: SuggestionRequest, week_start_date: Optional[str], include_served: bool = False
+    ) -> Optional[PregeneratedSuggestions]:
+        """
+        The stored set for this week and this exact request, unless stale
+        (fingerprint changed or too old) or already served.
+        """
+        if self._pregenerated_repo is None or not request.allow_cached or week_start_date is None:
+            return None
+        stored = await self._pregenerated_repo.get()
+        if stored is None or stored.week_start_date != week_start_date:
+            return None
+        if stored.fingerprint != request.fingerprint() or (stored.served_at and not include_served):
+            return None
+        if datetime.now(timezone.utc) - stored.created_at > PREGENERATED_MAX_AGE:
+            return None
+        return stored
+
+    async def _take_pregenerated(
+        self, request: SuggestionRequest, week_start_date: Optional[str]
+    ) -> Optional[List[List[Recipe]]]:
+        """Stored options for this request, marked served so a second suggest asks the AI."""
+        stored = await self._pregenerated(request, week_start_date)
+        if stored is None:
+            return None
+        await self._pregenerated_repo.save(replace(stored, served_at=datetime.now(timezone.utc)))
+        return stored.options
+
+    async def _plan(self, week_context: Optional[str], fresh: bool) -> _SuggestionPlan:
+        slots = await self._get_slots()
+        request = await self._suggestion_request(slots, week_context)
+        request.allow_cached = not fresh
+        request.options_per_slot = OPTIONS_PER_SLOT + self._reserve_per_slot
+        if fresh or self._library_per_slot == 0:
+            return _SuggestionPlan(slots=slots, ai_request=request)
+
+        library = await self._recipe_repo.get_recipes(sort="most_used")
+        picks = self._ranker.pick(
+            slots,
+            library,
+            per_slot=self._library_per_slot,
+            liked=request.liked_ingredients,
+            disliked=request.disliked_ingredients,
+            recent_names=request.recent_recipe_names,
+            now=datetime.now(timezone.utc),
+        )
+        plan = _SuggestionPlan(slots=slots, ai_request=None, picks=picks)
+        ai_slots = [s for s in slots if plan.needs_ai(s)]
+        if not ai_slots:
+            return plan
+
+        context_parts = [week_context] if week_context else []
+        offered = [r.name for recipes in picks.values() for r in recipes]
+        if offered:
+            context_parts.append(
+                f"Already offered from the household's saved recipes: {', '.join(offered)} "
+                "— suggest something different"
+            )
+        plan.ai_request = replace(
+            request,
+            slots=ai_slots,
+            options_per_slot=(
+                max(OPTIONS_PER_SLOT - len(picks[s.id]) for s in ai_slots) + self._reserve_per_slot
+            ),
+            week_context="; ".join(context_parts) if context_parts else None,
+        )
+        return plan
 
-        slot = next((s for s in template.slots if str(s.id) == slot_id), None)
+    async def _build_slot_request(
+        self,
+        slot_id: str,
+        existing_chosen: Dict[str, Recipe],
+        week_context: Optional[str],
+    ) -> Tuple[MealSlot, SuggestionRequest]:
+        slots = await self._get_slots()
+        slot = next((s for s in slots if str(s.id) == slot_id), None)
         if not slot:
             raise ValueError(f"Slot '{slot_id}' not found in template.")
 
-        members = await self._household_repo.get_members()
-        preferences = await self._preference_repo.get_preferences()
-        recent_names = await self._recipe_repo.get_recent_recipe_names(days=14)
-
         # Incorporate existing chosen recipes as context to avoid duplication
         context_parts: List[str] = []
         if week_context:
@@ -93,15 +429,34 @@ class SuggestRecipesUseCase:
                 f"Other slots already have: {names} — suggest something different"
             )
 
-        request = SuggestionRequest(
-            slots=[slot],
+        request = await self._suggestion_request(
+            [slot], "; ".join(context_parts) if context_parts else None
+        )
+        # Regenerating a slot always means "show me something new"
+        request.allow_cached = False
+        request.options_per_slot = OPTIONS_PER_SLOT + self._reserve_per_slot
+        return slot, request
+
+    async def _suggestion_request(
+        self, slots: List[MealSlot], week_context: Optional[str]
+    ) -> SuggestionRequest:
+        members = await self._household_repo.get_members()
+        preferences = await self._preference_repo.get_preferences()
+        recent_names = await self._recipe_repo.get_recent_recipe_names(days=14)
+
+        return SuggestionRequest(
+            slots=slots,
             members=members,
             disliked_ingredients=preferences.disliked_ingredients if preferences else [],
             liked_ingredients=preferences.liked_ingredients if preferences else [],
             cuisine_preferences=preferences.cuisine_preferences if preferences else [],
-            week_context="; ".join(context_parts) if context_parts else None,
+            week_context=week_context,
             recent_recipe_names=recent_names,
+            household_id=self._household_id,
+            deadline_seconds=self._deadline_seconds,
         )
 
-        options_lists = await self._ai.suggest_recipes(request)
-        return SlotOptions(slot=slot, options=options_lists[0])
+
+async def _iterate(items: List[T]) -> AsyncIterator[T]:
+    for item in items:
+        yield item
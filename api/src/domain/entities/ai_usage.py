@@ -0,0 +1,25 @@
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Optional
+from uuid import UUID
+
+
+@dataclass
+class AIUsageRecord:
+    """One model call: what it was for, what it cost and how it went."""
+    use_case: str  # "suggest", "refine", "instructions", "import", ...
+    model: str
+    household_id: Optional[UUID]  # None for calls outside a household's request
+    latency_ms: int
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cache_read_input_tokens: int = 0
+    cache_creation_input_tokens: int = 0
+    stop_reason: Optional[str] = None
+    attempts: int = 1  # 2 when the call was hedged
+    streamed: bool = False
+    parse_failed: bool = False  # the model answered but the output was unusable
+    error: Optional[str] = None  # exception type when the call itself failed
+    estimated_input_tokens: Optional[int] = None  # local estimate made before sending
+    output_format: Optional[str] = None  # suggest/refine answers: "tool" or "text"
+    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
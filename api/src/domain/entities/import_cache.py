@@ -0,0 +1,17 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+from .recipe import Recipe
+
+
+@dataclass
+class CachedImport:
+    """A parsed URL import, shared by every household that imports the same page."""
+    url_key: str  # canonical_url() of the imported URL
+    recipe: Recipe
+    etag: Optional[str]  # validators from the last full fetch, for conditional GETs
+    last_modified: Optional[str]
+    fetched_at: datetime  # last full fetch or successful revalidation
+    last_hit_at: datetime  # eviction order: least recently imported goes first
+    hits: int = 0
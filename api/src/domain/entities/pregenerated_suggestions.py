@@ -0,0 +1,15 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List, Optional
+
+from .recipe import Recipe
+
+
+@dataclass
+class PregeneratedSuggestions:
+    """AI options produced ahead of time for a household's upcoming week."""
+    week_start_date: str  # ISO date of the Monday they were generated for
+    fingerprint: str  # SuggestionRequest.fingerprint() at generation time
+    options: List[List[Recipe]]  # one group per AI-filled slot, template order
+    created_at: datetime
+    served_at: Optional[datetime] = None  # a set is served once, then kept only as a marker
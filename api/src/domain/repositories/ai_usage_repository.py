@@ -0,0 +1,11 @@
+from abc import ABC, abstractmethod
+from typing import List
+
+from ..entities.ai_usage import AIUsageRecord
+
+
+class AIUsageRepository(ABC):
+    """Append-only ledger of model calls; each record carries its own household."""
+
+    @abstractmethod
+    async def add_many(self, records: List[AIUsageRecord]) -> None: ...
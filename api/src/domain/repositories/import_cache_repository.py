@@ -0,0 +1,21 @@
+from abc import ABC, abstractmethod
+from typing import Optional
+
+from ..entities.import_cache import CachedImport
+
+
+class ImportCacheRepository(ABC):
+    """Cross-household cache of URL imports; not scoped to a household."""
+
+    @abstractmethod
+    async def get(self, url_key: str) -> Optional[CachedImport]: ...
+
+    @abstractmethod
+    async def save(self, entry: CachedImport) -> None:
+        """Insert or replace the entry for entry.url_key."""
+        ...
+
+    @abstractmethod
+    async def prune(self, max_entries: int) -> int:
+        """Evict least recently hit entries beyond max_entries; returns how many went."""
+        ...
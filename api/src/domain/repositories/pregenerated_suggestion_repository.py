@@ -0,0 +1,17 @@
+from abc import ABC, abstractmethod
+from typing import Optional
+
+from ..entities.pregenerated_suggestions import PregeneratedSuggestions
+
+
+class PregeneratedSuggestionRepository(ABC):
+    """At most one stored set per household; saving replaces it."""
+
+    @abstractmethod
+    async def get(self) -> Optional[PregeneratedSuggestions]: ...
+
+    @abstractmethod
+    async def save(self, suggestions: PregeneratedSuggestions) -> None: ...
+
+    @abstractmethod
+    async def delete(self) -> None: ...
@@ -65,6 +65,15 @@ class RecipeRepository(ABC):
         """
         ...
 
+    @abstractmethod
+    async def create_recipes(self, recipes: List[Recipe]) -> List[Recipe]:
+        """
+        Insert several new user-added recipes in one round trip. Recipes whose
+        name already exists (in the household, or earlier in the batch) are
+        skipped rather than raising. Returns the recipes created, in order.
+        """
+        ...
+
     @abstractmethod
     async def full_update_recipe(
         self,
@@ -0,0 +1,113 @@
+from collections import deque
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from ..entities.recipe import Recipe
+
+# Plural endings a disliked term may carry and still match ("olive" -> "olives")
+_PLURAL_SUFFIXES = ("s", "es")
+
+
+class DislikeMatcher:
+    """
+    Finds a household's disliked ingredients in recipe text.
+
+    The terms are compiled into one Aho-Corasick automaton, so checking an
+    ingredient name costs a single pass over its characters however many
+    dislikes there are. A term matches whole words only, optionally
+    pluralised: "pea" matches "peas" and "snap peas" but not "peanut".
+    Matching is case-insensitive.
+    """
+
+    def __init__(self, terms: Iterable[str]):
+        self.terms: Tuple[str, ...] = tuple(dict.fromkeys(t.strip().lower() for t in terms if t.strip()))
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[str]] = [[]]  # terms ending at each state, fail chain included
+        for term in self.terms:
+            self._add(term)
+        self._link()
+
+    def __bool__(self) -> bool:
+        return bool(self.terms)
+
+    def find(self, text: str) -> Optional[str]:
+        """The first disliked term found in `text` as a whole word, or None."""
+        text = text.lower()
+        state = 0
+        for end, char in enumerate(text, start=1):
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            for term in self._out[state]:
+                if _is_word(text, end - len(term), end):
+                    return term
+        return None
+
+    def matches(self, recipe: Recipe) -> List[str]:
+        """Distinct terms found in the recipe's name, ingredient names and key ingredients."""
+        found = []
+        for text in (recipe.name, *(i.name for i in recipe.ingredients), *recipe.key_ingredients):
+            term = self.find(text)
+            if term is not None and term not in found:
+                found.append(term)
+        return found
+
+    def violations(self, recipe: Recipe) -> List[str]:
+        """Disliked terms in the recipe (for a matcher built from dislikes)."""
+        return self.matches(recipe)
+
+    def allows(self, recipe: Recipe) -> bool:
+        return not self.violations(recipe)
+
+    def _add(self, term: str) -> None:
+        state = 0
+        for char in term:
+            nxt = self._goto[state].get(char)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][char] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = nxt
+        self._out[state].append(term)
+
+    def _link(self) -> None:
+        """Breadth-first failure links; each state also reports the terms of its fail state."""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(char, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+
+def _is_word(text: str, start: int, end: int) -> bool:
+    if start > 0 and text[start - 1].isalnum():
+        return False
+    if end == len(text) or not text[end].isalnum():
+        return True
+    for suffix in _PLURAL_SUFFIXES:
+        stop = end + len(suffix)
+        if text.startswith(suffix, end) and (stop == len(text) or not text[stop].isalnum()):
+            return True
+    return False
+
+
+@lru_cache(maxsize=1024)
+def _compiled(terms: Tuple[str, ...]) -> DislikeMatcher:
+    return DislikeMatcher(terms)
+
+
+def term_matcher(terms: Sequence[str]) -> DislikeMatcher:
+    """The compiled matcher for a set of ingredient terms, built once and reused across requests."""
+    return _compiled(tuple(sorted({t.strip().lower() for t in terms if t.strip()})))
+
+
+def dislike_matcher(disliked: Sequence[str]) -> DislikeMatcher:
+    return term_matcher(disliked)
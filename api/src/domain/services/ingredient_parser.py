@@ -0,0 +1,163 @@
+import re
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+from ..entities.recipe import GroceryCategory
+
+_UNICODE_FRACTIONS = {
+    "½": "1/2", "⅓": "1/3", "⅔": "2/3", "¼": "1/4", "¾": "3/4", "⅕": "1/5",
+    "⅖": "2/5", "⅗": "3/5", "⅘": "4/5", "⅙": "1/6", "⅚": "5/6", "⅛": "1/8",
+    "⅜": "3/8", "⅝": "5/8", "⅞": "7/8",
+}
+
+# Alias -> canonical unit, in the spelling the rest of the app uses
+UNIT_ALIASES: Dict[str, str] = {
+    **dict.fromkeys(["cup", "cups", "c"], "cups"),
+    **dict.fromkeys(["tablespoon", "tablespoons", "tbsp", "tbsps", "tbs", "tbl", "T"], "tbsp"),
+    **dict.fromkeys(["teaspoon", "teaspoons", "tsp", "tsps", "t"], "tsp"),
+    **dict.fromkeys(["pound", "pounds", "lb", "lbs"], "lbs"),
+    **dict.fromkeys(["ounce", "ounces", "oz"], "oz"),
+    **dict.fromkeys(["gram", "grams", "g", "gr"], "g"),
+    **dict.fromkeys(["kilogram", "kilograms", "kg", "kgs"], "kg"),
+    **dict.fromkeys(["milliliter", "milliliters", "millilitre", "millilitres", "ml"], "ml"),
+    **dict.fromkeys(["liter", "liters", "litre", "litres", "l"], "l"),
+    **dict.fromkeys(["pint", "pints", "pt"], "pints"),
+    **dict.fromkeys(["quart", "quarts", "qt"], "quarts"),
+    **dict.fromkeys(["clove", "cloves"], "cloves"),
+    **dict.fromkeys(["can", "cans", "tin", "tins"], "cans"),
+    **dict.fromkeys(["package", "packages", "pkg", "packet", "packets"], "packages"),
+    **dict.fromkeys(["slice", "slices"], "slices"),
+    **dict.fromkeys(["stick", "sticks"], "sticks"),
+    **dict.fromkeys(["bunch", "bunches"], "bunches"),
+    **dict.fromkeys(["head", "heads"], "heads"),
+    **dict.fromkeys(["sprig", "sprigs"], "sprigs"),
+    **dict.fromkeys(["pinch", "pinches"], "pinch"),
+    **dict.fromkeys(["dash", "dashes"], "dash"),
+}
+
+# Words that mark an ingredient with no measurable amount
+_UNMEASURED = re.compile(r"\b(to taste|as needed|for (serving|garnish|frying|greasing)|optional)\b", re.I)
+
+_NUMBER = r"(?:\d+\s+\d+/\d+|\d+/\d+|\d+(?:\.\d+)?)"
+_QUANTITY = re.compile(rf"^\s*({_NUMBER})(?:\s*(?:-|–|to)\s*({_NUMBER}))?\s*")
+
+_CATEGORY_KEYWORDS: Tuple[Tuple[GroceryCategory, Tuple[str, ...]], ...] = (
+    (GroceryCategory.PANTRY, (
+        "peanut butter", "black pepper", "coconut milk", "tomato paste", "tomato sauce",
+        "broth", "stock", "oil", "vinegar", "flour", "sugar", "salt", "pepper", "rice",
+        "pasta", "spaghetti", "noodle", "bean", "lentil", "chickpea", "sauce", "paste",
+        "honey", "syrup", "spice", "cumin", "paprika", "oregano", "cinnamon", "powder",
+        "baking soda", "yeast", "canned", "oats", "nut", "almond", "peanut", "seed",
+        "mustard", "ketchup", "mayonnaise", "vanilla", "cocoa", "chocolate", "wine",
+    )),
+    (GroceryCategory.DAIRY, (
+        "milk", "butter", "cheese", "cream", "yogurt", "yoghurt", "parmesan",
+        "mozzarella", "cheddar", "ricotta", "feta", "egg",
+    )),
+    (GroceryCategory.MEAT, (
+        "chicken", "beef", "pork", "lamb", "turkey", "bacon", "sausage", "ham",
+        "steak", "mince", "salmon", "shrimp", "prawn", "fish", "tuna", "cod", "chorizo",
+    )),
+    (GroceryCategory.BAKERY, ("bread", "bun", "roll", "tortilla", "pita", "baguette", "naan")),
+    (GroceryCategory.PRODUCE, (
+        "onion", "garlic", "shallot", "tomato", "potato", "carrot", "celery",
+        "lettuce", "spinach", "kale", "cabbage", "broccoli", "cauliflower", "zucchini",
+        "courgette", "mushroom", "lemon", "lime", "orange", "apple", "banana", "berry",
+        "avocado", "cucumber", "ginger", "cilantro", "parsley", "basil", "thyme",
+        "rosemary", "mint", "scallion", "leek", "squash", "corn", "pea", "chili",
+        "bell pepper", "jalapeño", "jalapeno",
+    )),
+)
+_KEYWORD_PATTERNS = [
+    (re.compile(rf"\b{re.escape(keyword)}"), len(keyword), category)
+    for category, keywords in _CATEGORY_KEYWORDS
+    for keyword in keywords
+]
+
+
+@dataclass(frozen=True)
+class ParsedIngredient:
+    quantity: float  # as written (whole recipe); 0 for "to taste" items
+    unit: str
+    name: str
+
+
+def parse_ingredient_line(line: str) -> Optional[ParsedIngredient]:
+    """
+    Split a free-text ingredient line ("1 ½ cups flour, sifted") into quantity,
+    canonical unit and name. Lines with no amount are only accepted when they say
+    so ("salt, to taste"); anything else returns None.
+    """
+    text = _normalise(line)
+    if not text:
+        return None
+    match = _QUANTITY.match(text)
+    if match is None:
+        if _UNMEASURED.search(text):
+            return ParsedIngredient(0.0, "to taste", _clean_name(text))
+        return None
+
+    low = _to_number(match.group(1))
+    high = _to_number(match.group(2)) if match.group(2) else low
+    quantity = (low + high) / 2
+    rest = text[match.end():]
+
+    # "1 (14 oz) can tomatoes" — the parenthetical describes the unit, not the amount
+    rest = re.sub(r"^\([^)]*\)\s*", "", rest)
+    unit = "whole"
+    word = re.match(r"([A-Za-z]+)\.?(?:\s+|$)", rest)
+    if word:
+        alias = word.group(1)
+        canonical = UNIT_ALIASES.get(alias) or UNIT_ALIASES.get(alias.lower())
+        if canonical:
+            unit = canonical
+            rest = rest[word.end():]
+    name = _clean_name(rest)
+    if not name:
+        return None
+    return ParsedIngredient(round(quantity, 3), unit, name)
+
+
+def guess_category(name: str) -> GroceryCategory:
+    """
+    Best-effort grocery aisle from keywords; OTHER when nothing matches. The
+    head noun usually comes last ("chicken stock" is stock), so the keyword
+    ending latest wins, then the longer one ("bell pepper" over "pepper").
+    """
+    lowered = name.lower()
+    if re.search(r"\bfrozen\b", lowered):
+        return GroceryCategory.FROZEN
+    best = None
+    for pattern, length, category in _KEYWORD_PATTERNS:
+        for match in pattern.finditer(lowered):
+            rank = (match.start() + length, length)
+            if best is None or rank > best[0]:
+                best = (rank, category)
+    return best[1] if best else GroceryCategory.OTHER
+
+
+def _normalise(line: str) -> str:
+    text = " ".join(line.split())
+    for symbol, fraction in _UNICODE_FRACTIONS.items():
+        text = re.sub(rf"(\d)\s*{symbol}", rf"\1 {fraction}", text)  # "1½" -> "1 1/2"
+        text = text.replace(symbol, fraction)
+    return text.strip()
+
+
+def _to_number(value: str) -> float:
+    total = 0.0
+    for part in value.split():
+        if "/" in part:
+            numerator, denominator = part.split("/")
+            total += float(numerator) / float(denominator) if float(denominator) else 0.0
+        else:
+            total += float(part)
+    return total
+
+
+def _clean_name(text: str) -> str:
+    text = re.sub(r"\([^)]*\)", "", text)  # notes in parentheses
+    text = _UNMEASURED.sub("", text)
+    text = text.split(",")[0]  # "onion, finely diced" -> "onion"
+    text = re.sub(r"^(of|x)\s+", "", text.strip(), flags=re.I)
+    return " ".join(text.split()).strip(" .;:-")
@@ -0,0 +1,141 @@
+import math
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Dict, List, Sequence, Set, Tuple
+from uuid import UUID
+
+from ..entities.meal_plan import MealSlot, MealType
+from ..entities.recipe import Recipe
+from .dislike_matcher import dislike_matcher, term_matcher
+
+# Typical prep-time window (minutes) per meal type. Recipes don't record a meal
+# type, so prep time is the signal for how well a saved recipe fits a slot.
+MEAL_TYPE_PREP_MINUTES: Dict[MealType, Tuple[int, int]] = {
+    MealType.BREAKFAST: (0, 20),
+    MealType.LUNCH: (0, 30),
+    MealType.DINNER: (20, 75),
+    MealType.SNACK: (0, 15),
+}
+_FIT_FALLOFF_MINUTES = 30  # fit drops linearly to 0 this far outside the window
+
+
+@dataclass(frozen=True)
+class RankingWeights:
+    favorite: float = 3.0
+    usage: float = 2.0  # log-scaled times_used, relative to the most-used recipe
+    staleness: float = 1.0  # rises with days since last cooked, capped at stale_days
+    liked: float = 1.5  # share of liked ingredients the recipe uses (capped at 3)
+    meal_fit: float = 2.0
+
+
+class LibraryRanker:
+    """
+    Scores a household's saved recipes as suggestion candidates.
+
+    Recipes containing a disliked ingredient, or cooked within the recent
+    window, are never candidates. The slot-independent features are computed
+    once per library, so ranking for every slot in a template is one pass.
+    """
+
+    def __init__(
+        self,
+        weights: RankingWeights = RankingWeights(),
+        recent_days: int = 14,
+        stale_days: int = 60,
+    ):
+        self._w = weights
+        self._recent_days = recent_days
+        self._stale_days = stale_days
+
+    def pick(
+        self,
+        slots: Sequence[MealSlot],
+        recipes: Sequence[Recipe],
+        per_slot: int,
+        liked: Sequence[str],
+        disliked: Sequence[str],
+        recent_names: Sequence[str],
+        now: datetime,
+    ) -> Dict[UUID, List[Recipe]]:
+        """
+        Up to `per_slot` library recipes for each slot, best first. Slots are
+        filled in template order and a recipe is offered for at most one slot.
+        """
+        base = self._base_scores(recipes, liked, disliked, recent_names, now)
+        by_meal_type: Dict[MealType, List[Tuple[float, Recipe]]] = {}
+        taken: Set[UUID] = set()
+        picks: Dict[UUID, List[Recipe]] = {}
+        for slot in slots:
+            ranked = by_meal_type.get(slot.meal_type)
+            if ranked is None:
+                ranked = sorted(
+                    (
+                        (score + self._w.meal_fit * meal_fit(r, slot.meal_type), r)
+                        for score, r in base
+                    ),
+                    key=lambda pair: (-pair[0], pair[1].name),
+                )
+                by_meal_type[slot.meal_type] = ranked
+            chosen = [r for _, r in ranked if r.id not in taken][:per_slot]
+            taken.update(r.id for r in chosen)
+            picks[slot.id] = chosen
+        return picks
+
+    def _base_scores(
+        self,
+        recipes: Sequence[Recipe],
+        liked: Sequence[str],
+        disliked: Sequence[str],
+        recent_names: Sequence[str],
+        now: datetime,
+    ) -> List[Tuple[float, Recipe]]:
+        recent = {n.strip().lower() for n in recent_names}
+        # Whole-word matching, the same rule the dislike guard applies to AI options
+        disliked_matcher = dislike_matcher(disliked)
+        liked_matcher = term_matcher(liked)
+        now = _as_utc(now)
+
+        candidates = [
+            r
+            for r in recipes
+            if r.name.strip().lower() not in recent
+            and not self._cooked_within(r, now, self._recent_days)
+            and disliked_matcher.allows(r)
+        ]
+        max_usage = math.log1p(max((r.times_used for r in candidates), default=0)) or 1.0
+
+        scored = []
+        for r in candidates:
+            liked_hits = len(liked_matcher.matches(r)) if liked_matcher else 0
+            score = (
+                self._w.favorite * (1.0 if r.is_favorite else 0.0)
+                + self._w.usage * math.log1p(r.times_used) / max_usage
+                + self._w.staleness * self._staleness(r, now)
+                + self._w.liked * min(liked_hits, 3) / 3
+            )
+            scored.append((score, r))
+        return scored
+
+    def _staleness(self, recipe: Recipe, now: datetime) -> float:
+        if recipe.last_used_at is None:
+            return 1.0
+        days = (now - _as_utc(recipe.last_used_at)).days
+        return min(max(days, 0), self._stale_days) / self._stale_days
+
+    @staticmethod
+    def _cooked_within(recipe: Recipe, now: datetime, days: int) -> bool:
+        if recipe.last_used_at is None:
+            return False
+        return (now - _as_utc(recipe.last_used_at)).days < days
+
+
+def meal_fit(recipe: Recipe, meal_type: MealType) -> float:
+    """1.0 when prep time is inside the meal type's usual window, falling to 0 outside it."""
+    low, high = MEAL_TYPE_PREP_MINUTES[meal_type]
+    distance = max(low - recipe.prep_time, recipe.prep_time - high, 0)
+    return max(0.0, 1.0 - distance / _FIT_FALLOFF_MINUTES)
+
+
+def _as_utc(value: datetime) -> datetime:
+    # The recipes table stores naive UTC timestamps
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
@@ -0,0 +1,335 @@
+"""
+Record/replay ("cassette") AIPort for benchmarks and load tests.
+
+RecordingAIAdapter wraps the real adapter and appends every exchange (the
+request's key, the result or its ValueError, and how long it took; for
+streams, when each slot group arrived) to a JSON-lines cassette.
+ReplayAIAdapter serves those exchanges back with no network and no tokens,
+so the whole API can be benchmarked locally and deterministically.
+
+Replay looks an exchange up by exact key first (request fingerprint, URL,
+recipe name), then by shape (operation and slot count), cycling through the
+matching recordings so load tests with synthetic households still get real
+answers of the right size. Latency is injected per `latency` mode:
+"recorded" replays each exchange's own timing, "sampled" draws from the
+operation's recorded distribution with a seeded RNG, "none" answers at once;
+`latency_scale` stretches or shrinks it. Recipes come back with fresh ids.
+"""
+import asyncio
+import hashlib
+import json
+import random
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Dict, List
+from uuid import uuid4
+
+from application.ports.ai_port import AIPort, RefinementRequest, SuggestionRequest
+from application.ports.recipe_page_port import RecipeDraft
+from domain.entities.recipe import Recipe
+from domain.services.url_canonical import canonical_url
+from infrastructure.db.postgres.recipe_json import recipe_from_json, recipe_to_json
+from .forwarding import ForwardingAIAdapter
+
+LATENCY_MODES = ("recorded", "sampled", "none")
+
+
+class CassetteMiss(ValueError):
+    """Replay found no recorded exchange for this call."""
+
+
+@dataclass
+class CassetteStats:
+    recorded: int = 0
+    exact_hits: int = 0
+    shape_hits: int = 0
+    misses: int = 0
+
+
+class Cassette:
+    """The exchanges of one JSON-lines file, indexed by exact key and by shape."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self.stats = CassetteStats()
+        self._by_key: Dict[str, List[dict]] = {}
+        self._by_shape: Dict[str, List[dict]] = {}
+        self._latencies: Dict[str, List[float]] = {}
+        self._turns: Dict[str, int] = {}
+        if self.path.exists():
+            with self.path.open(encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        self._index(json.loads(line))
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self._by_key.values())
+
+    def append(self, entry: dict) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, separators=(",", ":")) + "\n")
+        self._index(entry)
+        self.stats.recorded += 1
+
+    def find(self, key: str, shape: str) -> dict:
+        """The exact recording for `key`, else the next recording of the same shape."""
+        entries = self._by_key.get(key)
+        if entries:
+            self.stats.exact_hits += 1
+            return self._next(key, entries)
+        entries = self._by_shape.get(shape)
+        if entries:
+            self.stats.shape_hits += 1
+            return self._next(shape, entries)
+        self.stats.misses += 1
+        raise CassetteMiss(f"No recorded AI exchange for {shape}")
+
+    def latencies(self, op: str) -> List[float]:
+        return self._latencies.get(op, [])
+
+    def _next(self, name: str, entries: List[dict]) -> dict:
+        # Round-robin, so repeated calls cycle through every matching recording
+        turn = self._turns.get(name, 0)
+        self._turns[name] = turn + 1
+        return entries[turn % len(entries)]
+
+    def _index(self, entry: dict) -> None:
+        self._by_key.setdefault(entry["key"], []).append(entry)
+        self._by_shape.setdefault(entry["shape"], []).append(entry)
+        self._latencies.setdefault(entry["op"], []).append(entry["latency_ms"])
+
+
+# ---------------------------------------------------------------------------
+# Keys: exact (what shapes the answer) and shape (what the caller relies on)
+# ---------------------------------------------------------------------------
+
+def _digest(value: Any) -> str:
+    encoded = json.dumps(value, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode()).hexdigest()[:32]
+
+
+def _suggest_keys(op: str, request: SuggestionRequest) -> tuple:
+    shape = f"{op}:{len(request.slots)}x{request.options_per_slot}"
+    return f"{shape}:{request.fingerprint()}", shape
+
+
+def _refine_keys(op: str, request: RefinementRequest) -> tuple:
+    unlocked = [s for s in request.slots if str(s.id) not in request.locked_slot_ids]
+    shape = f"{op}:{len(unlocked)}"
+    key = _digest([
+        [s.name.strip().lower() for s in unlocked],
+        sorted(r.name for r in request.existing_assignments.values()),
+        " ".join(request.user_message.lower().split()),
+        request.disliked_ingredients,
+    ])
+    return f"{shape}:{key}", shape
+
+
+def _names_keys(op: str, recipes: List[Recipe]) -> tuple:
+    shape = f"{op}:{len(recipes)}" if op == "instructions_batch" else op
+    return f"{shape}:{_digest([r.name.strip().lower() for r in recipes])}", shape
+
+
+def _url_keys(op: str, url: str) -> tuple:
+    return f"{op}:{canonical_url(url)}", op
+
+
+def _groups_to_json(groups: List[List[Recipe]]) -> list:
+    return [[recipe_to_json(r) for r in group] for group in groups]
+
+
+def _fresh(data: dict) -> Recipe:
+    return recipe_from_json({**data, "id": str(uuid4())})
+
+
+def _groups_from_json(data: list) -> List[List[Recipe]]:
+    return [[_fresh(r) for r in group] for group in data]
+
+
+# ---------------------------------------------------------------------------
+# Recording
+# ---------------------------------------------------------------------------
+
+class RecordingAIAdapter(ForwardingAIAdapter):
+    """Forwards to the real adapter and appends each exchange to the cassette."""
+
+    def __init__(self, inner: AIPort, cassette: Cassette, clock: Callable[[], float] = time.monotonic):
+        super().__init__(inner)
+        self._cassette = cassette
+        self._clock = clock
+
+    async def suggest_recipes(self, request: SuggestionRequest) -> List[List[Recipe]]:
+        return await self._record(
+            "suggest", *_suggest_keys("suggest", request),
+            lambda: self._inner.suggest_recipes(request), _groups_to_json,
+        )
+
+    async def stream_suggest_recipes(self, request: SuggestionRequest) -> AsyncIterator[List[Recipe]]:
+        async for group in self._record_stream(
+            "stream_suggest", *_suggest_keys("stream_suggest", request),
+            self._inner.stream_suggest_recipes(request),
+        ):
+            yield group
+
+    async def refine_recipes(self, request: RefinementRequest) -> List[List[Recipe]]:
+        return await self._record(
+            "refine", *_refine_keys("refine", request),
+            lambda: self._inner.refine_recipes(request), _groups_to_json,
+        )
+
+    async def stream_refine_recipes(self, request: RefinementRequest) -> AsyncIterator[List[Recipe]]:
+        async for group in self._record_stream(
+            "stream_refine", *_refine_keys("stream_refine", request),
+            self._inner.stream_refine_recipes(request),
+        ):
+            yield group
+
+    async def generate_instructions(self, recipe: Recipe) -> List[str]:
+        return await self._record(
+            "instructions", *_names_keys("instructions", [recipe]),
+            lambda: self._inner.generate_instructions(recipe), list,
+        )
+
+    async def generate_instructions_batch(self, recipes: List[Recipe]) -> List[List[str]]:
+        return await self._record(
+            "instructions_batch", *_names_keys("instructions_batch", recipes),
+            lambda: self._inner.generate_instructions_batch(recipes), list,
+        )
+
+    async def parse_recipe_from_url(self, url: str) -> Recipe:
+        return await self._record(
+            "import", *_url_keys("import", url),
+            lambda: self._inner.parse_recipe_from_url(url), recipe_to_json,
+        )
+
+    async def complete_recipe_draft(self, draft: RecipeDraft) -> Recipe:
+        return await self._record(
+            "import_draft", *_url_keys("import_draft", draft.source_url),
+            lambda: self._inner.complete_recipe_draft(draft), recipe_to_json,
+        )
+
+    async def _record(self, op: str, key: str, shape: str, call, encode):
+        started = self._clock()
+        try:
+            result = await call()
+        except ValueError as exc:  # "no recipe on this page" is part of the behaviour to replay
+            self._append(op, key, shape, started, error=str(exc))
+            raise
+        self._append(op, key, shape, started, result=encode(result))
+        return result
+
+    async def _record_stream(
+        self, op: str, key: str, shape: str, groups: AsyncIterator[List[Recipe]]
+    ) -> AsyncIterator[List[Recipe]]:
+        started = self._clock()
+        received: List[List[Recipe]] = []
+        offsets: List[int] = []
+        async for group in groups:
+            received.append(group)
+            offsets.append(round((self._clock() - started) * 1000))
+            yield group
+        # Only complete streams are worth replaying
+        self._append(op, key, shape, started, result=_groups_to_json(received), offsets_ms=offsets)
+
+    def _append(self, op: str, key: str, shape: str, started: float, **outcome) -> None:
+        self._cassette.append({
+            "op": op,
+            "key": key,
+            "shape": shape,
+            "latency_ms": round((self._clock() - started) * 1000),
+            **outcome,
+        })
+
+
+# ---------------------------------------------------------------------------
+# Replay
+# ---------------------------------------------------------------------------
+
+class ReplayAIAdapter(AIPort):
+    """Serves recorded exchanges; never touches the network."""
+
+    def __init__(
+        self,
+        cassette: Cassette,
+        latency: str = "recorded",
+        latency_scale: float = 1.0,
+        seed: int = 0,
+        sleep: Callable[[float], Any] = asyncio.sleep,
+    ):
+        if latency not in LATENCY_MODES:
+            raise ValueError(f"Unknown latency mode {latency!r}; expected one of {LATENCY_MODES}")
+        self._cassette = cassette
+        self._latency = latency
+        self._scale = latency_scale
+        self._rng = random.Random(seed)
+        self._sleep = sleep
+
+    async def suggest_recipes(self, request: SuggestionRequest) -> List[List[Recipe]]:
+        entry = await self._play("suggest", *_suggest_keys("suggest", request))
+        return _groups_from_json(entry["result"])
+
+    async def stream_suggest_recipes(self, request: SuggestionRequest) -> AsyncIterator[List[Recipe]]:
+        async for group in self._play_stream(*_suggest_keys("stream_suggest", request)):
+            yield group
+
+    async def refine_recipes(self, request: RefinementRequest) -> List[List[Recipe]]:
+        entry = await self._play("refine", *_refine_keys("refine", request))
+        return _groups_from_json(entry["result"])
+
+    async def stream_refine_recipes(self, request: RefinementRequest) -> AsyncIterator[List[Recipe]]:
+        async for group in self._play_stream(*_refine_keys("stream_refine", request)):
+            yield group
+
+    async def generate_instructions(self, recipe: Recipe) -> List[str]:
+        entry = await self._play("instructions", *_names_keys("instructions", [recipe]))
+        return list(entry["result"])
+
+    async def generate_instructions_batch(self, recipes: List[Recipe]) -> List[List[str]]:
+        entry = await self._play("instructions_batch", *_names_keys("instructions_batch", recipes))
+        return list(entry["result"])
+
+    async def parse_recipe_from_url(self, url: str) -> Recipe:
+        entry = await self._play("import", *_url_keys("import", url))
+        recipe = _fresh(entry["result"])
+        recipe.source_url = url
+        return recipe
+
+    async def complete_recipe_draft(self, draft: RecipeDraft) -> Recipe:
+        entry = await self._play("import_draft", *_url_keys("import_draft", draft.source_url))
+        recipe = _fresh(entry["result"])
+        recipe.source_url = draft.source_url
+        return recipe
+
+    async def _play(self, op: str, key: str, shape: str) -> dict:
+        entry = self._cassette.find(key, shape)
+        await self._wait(self._delay(op, entry))
+        if "error" in entry:
+            raise ValueError(entry["error"])
+        return entry
+
+    async def _play_stream(self, key: str, shape: str) -> AsyncIterator[List[Recipe]]:
+        entry = self._cassette.find(key, shape)
+        total = self._delay(entry["op"], entry)
+        recorded_total = entry["latency_ms"] or 1
+        elapsed = 0.0
+        for group, offset in zip(entry["result"], entry["offsets_ms"]):
+            # Keep the recorded rhythm, stretched to the chosen total
+            at = total * offset / recorded_total
+            await self._wait(at - elapsed)
+            elapsed = max(elapsed, at)
+            yield [_fresh(r) for r in group]
+
+    def _delay(self, op: str, entry: dict) -> float:
+        """Seconds this replay should take."""
+        if self._latency == "none":
+            return 0.0
+        if self._latency == "sampled":
+            pool = self._cassette.latencies(op) or [entry["latency_ms"]]
+            return self._rng.choice(pool) / 1000 * self._scale
+        return entry["latency_ms"] / 1000 * self._scale
+
+    async def _wait(self, seconds: float) -> None:
+        if seconds > 0:
+            await self._sleep(seconds)
@@ -0,0 +1,242 @@
+"""
+Circuit breaker in front of the model calls of AIPort.
+
+When the Anthropic API is erroring or slow, waiting out every call ties up
+the worker (and the request's DB session) for nothing. The breaker tracks the
+outcome of recent calls; once enough of them fail or run slow it opens, and
+calls fail fast with AIUnavailable so suggest can answer from the household's
+library instead. After open_seconds one probe call is let through
+(half-open): success closes the circuit, failure keeps it open for another
+round.
+
+Only failures that say the API is unhealthy count: a ValueError means the
+model answered but the answer was unusable, which the adapter already
+retries. Callers that stop reading a stream early are not counted at all.
+URL imports are not guarded, since their failures are mostly the recipe site's.
+
+Instruction calls, most of them background prewarm jobs, get a breaker of
+their own, so a run of failed background work cannot push interactive
+suggest requests into the library fallback.
+"""
+import os
+import time
+from collections import deque
+from dataclasses import dataclass
+from enum import Enum
+from typing import AsyncIterator, Awaitable, Callable, Deque, List, Optional, Tuple, TypeVar
+
+from application.ports.ai_port import AIPort, AIUnavailable, RefinementRequest, SuggestionRequest
+from application.ports.recipe_page_port import RecipeDraft
+from domain.entities.recipe import Recipe
+from .forwarding import ForwardingAIAdapter
+
+T = TypeVar("T")
+
+
+class CircuitState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+@dataclass(frozen=True)
+class BreakerPolicy:
+    failure_rate: float = 0.5  # open when this share of recent calls failed or ran slow
+    min_calls: int = 10  # ...and at least this many calls finished in the window
+    window_seconds: float = 60.0
+    slow_call_seconds: float = 45.0  # a call (or a stream's first slot) slower than this counts as failed
+    open_seconds: float = 30.0  # how long to fail fast before probing again
+
+    @classmethod
+    def from_env(cls, prefix: str = "AI_BREAKER") -> Optional["BreakerPolicy"]:
+        """None unless <prefix>_ENABLED; reads _FAILURE_RATE, _MIN_CALLS, _WINDOW_SECONDS,
+        _SLOW_CALL_SECONDS and _OPEN_SECONDS."""
+        if os.environ.get(f"{prefix}_ENABLED", "").lower() not in ("1", "true", "yes"):
+            return None
+        defaults = cls()
+        return cls(
+            failure_rate=float(os.environ.get(f"{prefix}_FAILURE_RATE", defaults.failure_rate)),
+            min_calls=int(os.environ.get(f"{prefix}_MIN_CALLS", defaults.min_calls)),
+            window_seconds=float(os.environ.get(f"{prefix}_WINDOW_SECONDS", defaults.window_seconds)),
+            slow_call_seconds=float(
+                os.environ.get(f"{prefix}_SLOW_CALL_SECONDS", defaults.slow_call_seconds)
+            ),
+            open_seconds=float(os.environ.get(f"{prefix}_OPEN_SECONDS", defaults.open_seconds)),
+        )
+
+
+@dataclass
+class BreakerStats:
+    state: str = CircuitState.CLOSED.value
+    calls: int = 0  # calls that reached the API
+    failures: int = 0  # errors and slow calls among them
+    slow_calls: int = 0
+    opened: int = 0  # times the circuit opened
+    rejected: int = 0  # calls refused while open
+    probes: int = 0  # half-open trial calls
+
+
+class CircuitBreaker:
+    """Process-wide call health for one upstream. One event loop per worker, so no locking."""
+
+    def __init__(self, policy: BreakerPolicy = BreakerPolicy(), clock: Callable[[], float] = time.monotonic):
+        self.policy = policy
+        self.clock = clock
+        self.stats = BreakerStats()
+        self._outcomes: Deque[Tuple[float, bool]] = deque()  # (finished at, failed)
+        self._opened_at: Optional[float] = None
+        self._probing = False
+
+    @property
+    def state(self) -> CircuitState:
+        if self._opened_at is None:
+            return CircuitState.CLOSED
+        if self.clock() - self._opened_at < self.policy.open_seconds:
+            return CircuitState.OPEN
+        return CircuitState.HALF_OPEN
+
+    def available(self) -> bool:
+        """Whether a call made now would be let through."""
+        state = self.state
+        return state is CircuitState.CLOSED or (state is CircuitState.HALF_OPEN and not self._probing)
+
+    def retry_after(self) -> float:
+        if self._opened_at is None:
+            return 0.0
+        return max(0.0, self._opened_at + self.policy.open_seconds - self.clock())
+
+    def acquire(self) -> None:
+        """Admit a call or raise AIUnavailable. In half-open only one probe runs at a time."""
+        if not self.available():
+            self.stats.rejected += 1
+            raise AIUnavailable(
+                "AI is temporarily unavailable; try again shortly.",
+                retry_after_seconds=self.retry_after() or self.policy.open_seconds,
+            )
+        if self.state is CircuitState.HALF_OPEN:
+            self._probing = True
+            self.stats.probes += 1
+
+    def record(self, elapsed: float, error: Optional[BaseException] = None) -> None:
+        """Outcome of an admitted call."""
+        slow = elapsed > self.policy.slow_call_seconds
+        failed = slow or (error is not None and not isinstance(error, ValueError))
+        self.stats.calls += 1
+        self.stats.failures += failed
+        self.stats.slow_calls += slow
+        if self._probing:
+            self._probing = False
+            if failed:
+                self._open()
+            else:
+                self._opened_at = None
+                self._outcomes.clear()
+            self._sync_state()
+            return
+        now = self.clock()
+        self._outcomes.append((now, failed))
+        while self._outcomes and self._outcomes[0][0] <= now - self.policy.window_seconds:
+            self._outcomes.popleft()
+        failures = sum(f for _, f in self._outcomes)
+        if (
+            self._opened_at is None
+            and len(self._outcomes) >= self.policy.min_calls
+            and failures >= self.policy.failure_rate * len(self._outcomes)
+        ):
+            self._open()
+        self._sync_state()
+
+    def snapshot(self) -> BreakerStats:
+        """Stats with the current state (open turns half-open with time, not with a call)."""
+        self._sync_state()
+        return self.stats
+
+    def release(self) -> None:
+        """An admitted call was abandoned by its caller: no outcome, but free the probe slot."""
+        self._probing = False
+
+    def _open(self) -> None:
+        self._opened_at = self.clock()
+        self._outcomes.clear()
+        self.stats.opened += 1
+
+    def _sync_state(self) -> None:
+        self.stats.state = self.state.value
+
+
+class CircuitBreakingAIAdapter(ForwardingAIAdapter):
+    """
+    AIPort decorator that fails fast with AIUnavailable while the breaker is
+    open. Instruction calls use instructions_breaker when given; available()
+    reports the suggest breaker only.
+    """
+
+    def __init__(
+        self, inner: AIPort, breaker: CircuitBreaker, instructions_breaker: Optional[CircuitBreaker] = None
+    ):
+        super().__init__(inner)
+        self._breaker = breaker
+        self._instructions_breaker = instructions_breaker or breaker
+
+    def available(self) -> bool:
+        return self._breaker.available() and self._inner.available()
+
+    async def suggest_recipes(self, request: SuggestionRequest) -> List[List[Recipe]]:
+        return await self._call(lambda: self._inner.suggest_recipes(request))
+
+    async def stream_suggest_recipes(self, request: SuggestionRequest) -> AsyncIterator[List[Recipe]]:
+        async for group in self._stream(lambda: self._inner.stream_suggest_recipes(request)):
+            yield group
+
+    async def refine_recipes(self, request: RefinementRequest) -> List[List[Recipe]]:
+        return await self._call(lambda: self._inner.refine_recipes(request))
+
+    async def stream_refine_recipes(self, request: RefinementRequest) -> AsyncIterator[List[Recipe]]:
+        async for group in self._stream(lambda: self._inner.stream_refine_recipes(request)):
+            yield group
+
+    async def generate_instructions(self, recipe: Recipe) -> List[str]:
+        return await self._call(
+            lambda: self._inner.generate_instructions(recipe), self._instructions_breaker
+        )
+
+    async def generate_instructions_batch(self, recipes: List[Recipe]) -> List[List[str]]:
+        return await self._call(
+            lambda: self._inner.generate_instructions_batch(recipes), self._instructions_breaker
+        )
+
+    async def complete_recipe_draft(self, draft: RecipeDraft) -> Recipe:
+        return await self._call(lambda: self._inner.complete_recipe_draft(draft))
+
+    async def _call(self, call: Callable[[], Awaitable[T]], breaker: Optional[CircuitBreaker] = None) -> T:
+        breaker = breaker or self._breaker
+        breaker.acquire()
+        started = breaker.clock()
+        try:
+            result = await call()
+        except Exception as exc:
+            breaker.record(breaker.clock() - started, exc)
+            raise
+        except BaseException:  # cancelled: the caller went away, not the API
+            breaker.release()
+            raise
+        breaker.record(breaker.clock() - started)
+        return result
+
+    async def _stream(self, start: Callable[[], AsyncIterator[List[Recipe]]]) -> AsyncIterator[List[Recipe]]:
+        """Latency is time to the first group; an error at any point counts as a failure."""
+        self._breaker.acquire()
+        started = self._breaker.clock()
+        first: Optional[float] = None
+        try:
+            async for group in start():
+                if first is None:
+                    first = self._breaker.clock()
+                yield group
+        except Exception as exc:
+            self._breaker.record((first or self._breaker.clock()) - started, exc)
+            raise
+        except BaseException:  # cancelled, or the consumer closed the stream early
+            self._breaker.release()
+            raise
+        self._breaker.record((first or self._breaker.clock()) - started)
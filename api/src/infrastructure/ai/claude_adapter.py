@@ -1,12 +1,30 @@
-import json
-from typing import List
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass, replace
+from typing import Any, AsyncIterator, Callable, List, Optional, Union
 from uuid import uuid4
 
 import httpx
-from anthropic import AsyncAnthropic
+from anthropic import APIConnectionError, APIStatusError, AsyncAnthropic
 
 from application.ports.ai_port import AIPort, RefinementRequest, SuggestionRequest
+from application.ports.recipe_page_port import RecipeDraft
+from domain.entities.ai_usage import AIUsageRecord
 from domain.entities.recipe import GroceryCategory, Ingredient, Recipe
+from infrastructure.web.html_reducer import reduce_html_stream
+from infrastructure.web.page_reader import USER_AGENT
+from .hedging import Hedger
+from .json_stream import IncrementalJSONDecoder, decode_json_array, decode_json_object
+from .model_routing import ModelRouter
+from .prompt_budget import (
+    PromptBudget,
+    PromptBudgetExceeded,
+    PromptBudgetStats,
+    PromptContext,
+    estimate_call_tokens,
+)
+from .usage_ledger import UsageLedger, current_household
 
 _VALID_CATEGORIES = {c.value for c in GroceryCategory}
 
@@ -16,28 +34,62 @@ def _safe_category(value: str) -> GroceryCategory:
     return GroceryCategory(value) if value in _VALID_CATEGORIES else GroceryCategory.OTHER
 
 
-def _extract_json_object(text: str) -> str:
-    """
-    Robustly extract the first top-level JSON object from a string.
-    Handles:
-    - Pure JSON: '{"key": "value"}'
-    - Code-fenced JSON: '```json\n{...}\n```'
-    - JSON with surrounding prose: 'Here is the recipe:\n{...}'
-    Raises ValueError if no JSON object is found.
-    """
-    start = text.find("{")
-    end = text.rfind("}")
-    if start == -1 or end == -1 or end <= start:
-        raise ValueError(f"No JSON object found in AI response. Raw output: {text[:200]!r}")
-    return text[start : end + 1]
+# Slot responses may keep whole slots and whole recipes from a truncated tail,
+# never a recipe cut off mid-ingredient-list.
+_SLOT_RECOVER_DEPTH = 2
 
+# Shared by URL import and draft completion
+_RECIPE_JSON_SPEC = (
+    "The JSON must follow this exact structure:\n"
+    "{\n"
+    '  "name": "Recipe Name",\n'
+    '  "emoji": "🍝",\n'
+    '  "prep_time": 30,\n'
+    '  "key_ingredients": ["ingredient1", "ingredient2", "ingredient3"],\n'
+    '  "ingredients": [\n'
+    '    {"name": "ingredient name", "quantity": 1.5, "unit": "lbs", "category": "meat"}\n'
+    "  ],\n"
+    '  "cooking_instructions": ["Step 1...", "Step 2..."]\n'
+    "}\n\n"
+    "IMPORTANT: All ingredient quantities must be for exactly 1 standard serving.\n"
+    "Valid category values: produce, meat, dairy, pantry, frozen, bakery, other\n"
+)
 
 # The model ID must match an available Claude model.
 DEFAULT_MODEL = "claude-sonnet-4-6"
 
+# Suggestion modes:
+#   "single" — one prompt covers every slot (fewest input tokens)
+#   "fanout" — slots are split into chunks requested in parallel (lowest latency
+#              for large templates, since output generation is no longer serial)
+SUGGEST_MODES = ("single", "fanout")
+
+# Parallel chunks cannot see each other's answers, so each one is nudged
+# towards a different lane to keep the week varied.
+_FANOUT_VARIETY_LANES = [
+    "poultry",
+    "seafood",
+    "vegetarian",
+    "beef or pork",
+    "pasta, rice or grain bowls",
+    "beans and legumes",
+]
+
+# How suggest and refine answers come back:
+#   "tool" — as the input of a forced submit_recipe_options call, so the answer
+#            is structured by the API instead of by instruction-following
+#   "text" — a free-text JSON array the adapter decodes (and tolerates fences,
+#            prose and truncation in); kept to compare parse-failure rates
+SLOT_OUTPUTS = ("tool", "text")
+
+_RECIPE_GUIDANCE = """IMPORTANT: All ingredient quantities must be scaled for exactly 1 standard serving.
+The app handles all scaling for household size automatically.
+All quantities must reflect the raw, pre-cooking weight or volume as it would be purchased at the grocery store.
+Account for cooking loss — for example, meat quantities should be raw weight (chicken loses ~25% when cooked, ground beef ~20%), and vegetables should be unprepped weight."""
+
 SYSTEM_PROMPT = """You are a meal planning assistant for Dinner Solved.
 When asked to suggest recipes, respond ONLY with a valid JSON array of arrays.
-Each inner array contains exactly 3 distinct recipe options for one slot.
+Each inner array contains the requested number of distinct recipe options for one slot (3 unless told otherwise).
 Structure: [[option1, option2, option3], [option1, option2, option3], ...]
 
 Each recipe must follow this exact structure:
@@ -55,55 +107,313 @@ Each recipe must follow this exact structure:
     }
   ]
 }
-IMPORTANT: All ingredient quantities must be scaled for exactly 1 standard serving.
-The app handles all scaling for household size automatically.
-All quantities must reflect the raw, pre-cooking weight or volume as it would be purchased at the grocery store.
-Account for cooking loss — for example, meat quantities should be raw weight (chicken loses ~25% when cooked, ground beef ~20%), and vegetables should be unprepped weight.
+""" + _RECIPE_GUIDANCE + """
 Valid category values: produce, meat, dairy, pantry, frozen, bakery, other
 Valid unit examples: lbs, oz, cups, tbsp, tsp, whole, cloves, slices, cans
-The 3 options per slot must be meaningfully different from each other.
+The options for a slot must be meaningfully different from each other.
 No additional text outside the JSON array."""
 
+_SLOT_TOOL_NAME = "submit_recipe_options"
+
+TOOL_SYSTEM_PROMPT = """You are a meal planning assistant for Dinner Solved.
+When asked to suggest recipes, answer by calling the """ + _SLOT_TOOL_NAME + """ tool.
+Give one list per slot, in the order the slots are listed, each with the requested number of distinct recipe options (3 unless told otherwise).
+""" + _RECIPE_GUIDANCE + """
+Valid unit examples: lbs, oz, cups, tbsp, tsp, whole, cloves, slices, cans
+The options for a slot must be meaningfully different from each other."""
+
+# Mirrors _parse_recipe: the fields it reads and the GroceryCategory values
+_INGREDIENT_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "name": {"type": "string"},
+        "quantity": {"type": "number", "description": "For exactly 1 serving, raw purchase weight or volume"},
+        "unit": {"type": "string"},
+        "category": {"type": "string", "enum": [c.value for c in GroceryCategory]},
+    },
+    "required": ["name", "quantity", "unit", "category"],
+}
+
+_RECIPE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "name": {"type": "string"},
+        "emoji": {"type": "string"},
+        "prep_time": {"type": "integer", "description": "Minutes"},
+        "key_ingredients": {"type": "array", "items": {"type": "string"}},
+        "ingredients": {"type": "array", "items": _INGREDIENT_SCHEMA},
+    },
+    "required": ["name", "emoji", "prep_time", "key_ingredients", "ingredients"],
+}
+
+_SLOT_TOOL = {
+    "name": _SLOT_TOOL_NAME,
+    "description": "Submit the recipe options for every requested meal slot.",
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            "slots": {
+                "type": "array",
+                "description": "One list of recipe options per slot, in the order the slots were listed",
+                "items": {"type": "array", "items": _RECIPE_SCHEMA},
+            },
+        },
+        "required": ["slots"],
+    },
+}
+
+# Prompt caching: stable prefixes (system prompt, household context, the current
+# plan during refinement) are marked as cache breakpoints and everything that
+# changes per call goes after them. A prefix shorter than the model's minimum
+# cacheable length is simply sent uncached, so these markers are always safe.
+_CACHE_CONTROL = {"type": "ephemeral"}
+_SYSTEM_BLOCKS = [{"type": "text", "text": SYSTEM_PROMPT, "cache_control": _CACHE_CONTROL}]
+
+# Tools precede the system prompt in the cached prefix, so the breakpoint
+# above covers the tool schema too. tool_choice forces the call.
+_SLOT_PARAMS = {
+    "tool": dict(
+        system=[{"type": "text", "text": TOOL_SYSTEM_PROMPT, "cache_control": _CACHE_CONTROL}],
+        tools=[_SLOT_TOOL],
+        tool_choice={"type": "tool", "name": _SLOT_TOOL_NAME},
+    ),
+    "text": dict(system=_SYSTEM_BLOCKS),
+}
+
+
+@dataclass
+class TokenUsage:
+    """Running token totals for one adapter; cache_* fields show whether prompt caching is hitting."""
+    calls: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cache_read_input_tokens: int = 0
+    cache_creation_input_tokens: int = 0
+
+    def record(self, usage) -> None:
+        self.calls += 1
+        if usage is None:
+            return
+        self.input_tokens += getattr(usage, "input_tokens", None) or 0
+        self.output_tokens += getattr(usage, "output_tokens", None) or 0
+        self.cache_read_input_tokens += getattr(usage, "cache_read_input_tokens", None) or 0
+        self.cache_creation_input_tokens += getattr(usage, "cache_creation_input_tokens", None) or 0
+
+
+# What a model answer that cannot be turned into recipes raises while parsing
+_PARSE_ERRORS = (ValueError, KeyError, TypeError)
+
+# Exceptions that mean the caller stopped waiting, not that the call failed
+_CALLER_GONE = ("CancelledError", "GeneratorExit")
+
+# Builds the user content that asks again for just these slots (indices into the call's slots)
+RepairContent = Callable[[List[int]], List[dict]]
+
+
+@dataclass
+class SlotRepairStats:
+    """Multi-slot answers kept by re-requesting only the slots that failed validation."""
+    responses: int = 0  # answers checked slot by slot
+    repaired: int = 0  # answers that needed a repair call
+    slots_repaired: int = 0
+    repair_failures: int = 0  # the repair was unusable too, so the request failed
+
+    @property
+    def repair_rate(self) -> float:
+        return self.repaired / self.responses if self.responses else 0.0
+
+
+def _is_upstream_failure(exc: BaseException) -> bool:
+    """Overloaded, rate limited, 5xx or unreachable: worth trying the next model tier."""
+    if isinstance(exc, APIConnectionError):
+        return True
+    return isinstance(exc, APIStatusError) and (exc.status_code == 429 or exc.status_code >= 500)
+
+
+async def _resolved(item: Union[List[Recipe], asyncio.Task]) -> List[List[Recipe]]:
+    """A kept slot group, or the groups of a finished repair task."""
+    if isinstance(item, asyncio.Task):
+        return await item
+    return [item]
+
+
+def _estimated_input(params: dict) -> int:
+    return estimate_call_tokens(params.get("system"), params.get("messages", ()), params.get("tools"))
+
+
+def _user_content(stable: str, variable: str) -> List[dict]:
+    """User turn as two text blocks: a cache breakpoint after `stable`, then `variable`."""
+    return [
+        {"type": "text", "text": stable, "cache_control": _CACHE_CONTROL},
+        {"type": "text", "text": variable},
+    ]
+
 
 class ClaudeAdapter(AIPort):
-    def __init__(self, api_key: str, model: str = DEFAULT_MODEL):
-        self._client = AsyncAnthropic(api_key=api_key)
+    """
+    Pass `client`, `http_client`, `usage`, `hedger`, `ledger`, `repair_stats`
+    and `router` to borrow the process-wide ones (see infrastructure.ai.clients);
+    otherwise the adapter creates its own.
+
+    `model` serves every call kind the router has no route for (see
+    model_routing); routed kinds use their tiers and fall back on upstream errors.
+
+    Model calls run through the hedger: each is bounded by the request's
+    deadline_seconds (or `deadline_seconds` here for instructions and imports)
+    and non-streaming calls may be hedged when they run slow.
+
+    Every call, streamed or not, is recorded in the usage ledger: tokens,
+    latency, stop_reason, attempts, parse failures and the bound household.
+
+    Suggest and refine answers are validated slot by slot: one bad group (wrong
+    option count, bad ingredient) is re-requested on its own instead of
+    discarding the whole answer.
+
+    Prompts are sized against `prompt_budget` (see prompt_budget): preference
+    lists are trimmed to fit, max_tokens follows the slots asked for, and a
+    request whose answer would not fit one call is split across several.
+
+    With `slot_output="tool"` (the default) suggest and refine answers are the
+    input of a forced tool call; "text" keeps the free-text JSON answer. The
+    ledger records which one each call used, so their parse-failure rates can
+    be compared.
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        model: str = DEFAULT_MODEL,
+        suggest_mode: str = "single",
+        fanout_chunk_size: int = 1,
+        fanout_concurrency: int = 4,
+        client: Optional[AsyncAnthropic] = None,
+        http_client: Optional[httpx.AsyncClient] = None,
+        usage: Optional[TokenUsage] = None,
+        hedger: Optional[Hedger] = None,
+        deadline_seconds: Optional[float] = None,
+        ledger: Optional[UsageLedger] = None,
+        repair_stats: Optional[SlotRepairStats] = None,
+        router: Optional[ModelRouter] = None,
+        prompt_budget: Optional[PromptBudget] = None,
+        budget_stats: Optional[PromptBudgetStats] = None,
+        slot_output: str = "tool",
+    ):
+        if suggest_mode not in SUGGEST_MODES:
+            raise ValueError(f"Unknown suggest_mode {suggest_mode!r}; expected one of {SUGGEST_MODES}")
+        if slot_output not in SLOT_OUTPUTS:
+            raise ValueError(f"Unknown slot_output {slot_output!r}; expected one of {SLOT_OUTPUTS}")
+        self._client = client or AsyncAnthropic(api_key=api_key)
+        self._http_client = http_client
         self._model = model
+        self._suggest_mode = suggest_mode
+        self._fanout_chunk_size = max(1, fanout_chunk_size)
+        self._fanout_concurrency = max(1, fanout_concurrency)
+        self.usage = usage if usage is not None else TokenUsage()
+        self._hedger = hedger if hedger is not None else Hedger()
+        self._deadline_seconds = deadline_seconds
+        self.ledger = ledger if ledger is not None else UsageLedger()
+        self.repair_stats = repair_stats if repair_stats is not None else SlotRepairStats()
+        self.router = router if router is not None else ModelRouter()
+        self._budget = prompt_budget or PromptBudget()
+        self.budget_stats = budget_stats if budget_stats is not None else PromptBudgetStats()
+        self._slot_output = slot_output
+        self._slot_params = _SLOT_PARAMS[slot_output]
 
     async def suggest_recipes(self, request: SuggestionRequest) -> List[List[Recipe]]:
-        prompt = self._build_suggestion_prompt(request)
-        return await self._call_and_parse(prompt, expected_slot_count=len(request.slots))
+        deadline = self._deadline(request)
+        chunks = self._fanout_chunks(request)
+        if len(chunks) > 1:
+            async with self._hedger.deadline(deadline):
+                return await self._gather_chunks(self._fanout_tasks(request, chunks))
+        content = self._suggestion_content(request)
+        return await self._call_and_parse(
+            content,
+            expected_slot_count=len(request.slots),
+            options_per_slot=request.options_per_slot,
+            deadline_seconds=deadline,
+            repair=self._suggestion_repair(request, request.slots),
+        )
+
+    async def stream_suggest_recipes(
+        self, request: SuggestionRequest
+    ) -> AsyncIterator[List[Recipe]]:
+        chunks = self._fanout_chunks(request)
+        if len(chunks) > 1:
+            groups = self._stream_chunks(lambda: self._fanout_tasks(request, chunks))
+        else:
+            groups = self._stream_and_parse(
+                self._suggestion_content(request),
+                expected_slot_count=len(request.slots),
+                options_per_slot=request.options_per_slot,
+                repair=self._suggestion_repair(request, request.slots),
+            )
+        async for options in self._hedger.bounded(groups, self._deadline(request)):
+            yield options
 
     async def generate_instructions(self, recipe: Recipe) -> List[str]:
-        ingredients_text = "\n".join(
-            f"- {ing.quantity} {ing.unit} {ing.name}" for ing in recipe.ingredients
-        )
         prompt = (
-            f"Recipe: {recipe.name}\n"
-            f"Prep time: {recipe.prep_time} minutes\n"
-            f"Ingredients (per serving):\n{ingredients_text}\n\n"
+            f"{self._describe_for_instructions(recipe)}\n\n"
             "Return step-by-step cooking instructions as a JSON array of strings. "
             "Each string is one step (1-3 sentences). Aim for 6-10 steps total."
         )
-        response = await self._client.messages.create(
-            model=self._model,
-            max_tokens=1024,
+        # A truncated tail still yields every step that was fully written
+        return await self._create(
+            "instructions",
+            self._deadline_seconds,
+            parse=lambda r: [
+                str(s) for s in decode_json_array(r.content[0].text, recover_depth=1, elements='"')
+            ],
+            max_tokens=self._budget.instructions_tokens(1),
             system=(
                 "You are a cooking assistant. Return cooking instructions as a JSON array of step strings. "
                 "Respond ONLY with the JSON array. No additional text."
             ),
             messages=[{"role": "user", "content": prompt}],
         )
-        raw = response.content[0].text.strip()
-        if raw.startswith("```"):
-            raw = raw.split("```")[1]
-            if raw.startswith("json"):
-                raw = raw[4:]
-            raw = raw.strip()
-        steps = json.loads(raw)
-        if not isinstance(steps, list):
-            raise ValueError("Expected JSON array from generate_instructions")
-        return [str(s) for s in steps]
+
+    async def generate_instructions_batch(self, recipes: List[Recipe]) -> List[List[str]]:
+        if not recipes:
+            return []
+        described = "\n\n".join(
+            f"#{i + 1}\n{self._describe_for_instructions(r)}" for i, r in enumerate(recipes)
+        )
+        prompt = (
+            f"{described}\n\n"
+            f"Return cooking instructions for all {len(recipes)} recipes as a JSON array with "
+            "one entry per recipe, in the order given. Each entry is an array of step "
+            "strings (1-3 sentences each, 6-10 steps)."
+        )
+        # Keep every recipe that was fully written; the caller retries the rest one by one
+        data = await self._create(
+            "instructions-batch",
+            self._deadline_seconds,
+            parse=lambda r: decode_json_array(r.content[0].text, recover_depth=1, elements="["),
+            max_tokens=self._budget.instructions_tokens(len(recipes)),
+            system=(
+                "You are a cooking assistant. Return cooking instructions as a JSON array of "
+                "arrays of step strings. Respond ONLY with the JSON array. No additional text."
+            ),
+            messages=[{"role": "user", "content": prompt}],
+        )
+        if len(data) > len(recipes):
+            raise ValueError(f"Expected {len(recipes)} instruction lists from AI, got {len(data)}")
+        results = []
+        for steps in data:
+            if not isinstance(steps, list) or not steps:
+                break  # order is all that ties entries to recipes; stop at the first bad one
+            results.append([str(s) for s in steps])
+        return results
+
+    @staticmethod
+    def _describe_for_instructions(recipe: Recipe) -> str:
+        ingredients_text = "\n".join(
+            f"- {ing.quantity} {ing.unit} {ing.name}" for ing in recipe.ingredients
+        )
+        return (
+            f"Recipe: {recipe.name}\n"
+            f"Prep time: {recipe.prep_time} minutes\n"
+            f"Ingredients (per serving):\n{ingredients_text}"
+        )
 
     async def refine_recipes(self, request: RefinementRequest) -> List[List[Recipe]]:
         unlocked_slots = [
@@ -111,48 +421,347 @@ class ClaudeAdapter(AIPort):
         ]
         if not unlocked_slots:
             return []
-        prompt = self._build_refinement_prompt(request, unlocked_slots)
-        return await self._call_and_parse(prompt, expected_slot_count=len(unlocked_slots))
+        deadline = self._deadline(request)
+        chunks = self._chunks(unlocked_slots, options_per_slot=3)
+        if len(chunks) > 1:
+            async with self._hedger.deadline(deadline):
+                return await self._gather_chunks(self._refine_tasks(request, chunks))
+        content = self._refinement_content(request, unlocked_slots)
+        return await self._call_and_parse(
+            content,
+            expected_slot_count=len(unlocked_slots),
+            kind="refine",
+            deadline_seconds=deadline,
+            repair=self._refinement_repair(request, unlocked_slots),
+        )
+
+    async def stream_refine_recipes(
+        self, request: RefinementRequest
+    ) -> AsyncIterator[List[Recipe]]:
+        unlocked_slots = [
+            s for s in request.slots if str(s.id) not in request.locked_slot_ids
+        ]
+        if not unlocked_slots:
+            return
+        chunks = self._chunks(unlocked_slots, options_per_slot=3)
+        if len(chunks) > 1:
+            groups = self._stream_chunks(lambda: self._refine_tasks(request, chunks))
+        else:
+            groups = self._stream_and_parse(
+                self._refinement_content(request, unlocked_slots),
+                expected_slot_count=len(unlocked_slots),
+                kind="refine",
+                repair=self._refinement_repair(request, unlocked_slots),
+            )
+        async for options in self._hedger.bounded(groups, self._deadline(request)):
+            yield options
+
+    # ------------------------------------------------------------------
+    # Deadlines and hedging
+    # ------------------------------------------------------------------
+
+    def _deadline(self, request) -> Optional[float]:
+        if request.deadline_seconds is not None:
+            return request.deadline_seconds
+        return self._deadline_seconds
+
+    async def _create(
+        self,
+        kind: str,
+        deadline_seconds: Optional[float],
+        parse: Optional[Callable[[Any], Any]] = None,
+        output_format: Optional[str] = None,
+        **params,
+    ):
+        """
+        messages.create through the hedger on the routed model; records the
+        winning call's token usage and a ledger entry. An upstream failure moves
+        on to the next model tier within the same deadline. With `parse`,
+        returns parse(response) instead, and a parse error is recorded as a
+        parse failure before it propagates.
+        """
+        tiers = self.router.tiers(kind, self._model)
+        estimated = _estimated_input(params)
+        first_started = time.monotonic()
+        for position, model in enumerate(tiers):
+            attempts = 0
+
+            def call():
+                nonlocal attempts
+                attempts += 1  # a hedged call sends a second request
+                return self._client.messages.create(model=model, **params)
+
+            remaining = deadline_seconds
+            if deadline_seconds is not None:
+                remaining = max(0.0, deadline_seconds - (time.monotonic() - first_started))
+            started = time.monotonic()
+            try:
+                response = await self._hedger.run(kind, call, remaining)
+                break
+            except BaseException as exc:
+                self._record(
+                    kind, started, None, model, attempts=attempts, error=type(exc).__name__,
+                    estimated_input_tokens=estimated, output_format=output_format,
+                )
+                if position + 1 < len(tiers) and _is_upstream_failure(exc):
+                    continue
+                raise
+        latency = time.monotonic() - started
+        self.usage.record(getattr(response, "usage", None))
+        recorded = dict(
+            attempts=attempts, latency=latency, estimated_input_tokens=estimated, output_format=output_format
+        )
+        if parse is None:
+            self._record(kind, started, response, model, **recorded)
+            return response
+        try:
+            result = parse(response)
+        except _PARSE_ERRORS:
+            self._record(kind, started, response, model, parse_failed=True, **recorded)
+            raise
+        self._record(kind, started, response, model, **recorded)
+        return result
+
+    def _record(
+        self,
+        kind: str,
+        started: float,
+        response,
+        model: str,
+        attempts: int = 1,
+        streamed: bool = False,
+        parse_failed: bool = False,
+        error: Optional[str] = None,
+        latency: Optional[float] = None,
+        estimated_input_tokens: Optional[int] = None,
+        output_format: Optional[str] = None,
+    ) -> None:
+        """
+        One ledger entry, plus the outcome for the router's tier health; the use
+        case is the call kind without its size suffix ("suggest:3"). Latency
+        runs to now unless given (model time, not parsing).
+        """
+        usage = getattr(response, "usage", None)
+        if latency is None:
+            latency = time.monotonic() - started
+        if error not in _CALLER_GONE:  # the caller leaving says nothing about the model
+            self.router.record(
+                kind,
+                model,
+                latency,
+                failed=error is not None or parse_failed,
+                input_tokens=getattr(usage, "input_tokens", None) or 0,
+                output_tokens=getattr(usage, "output_tokens", None) or 0,
+            )
+        self.ledger.record(AIUsageRecord(
+            use_case=kind.split(":")[0],
+            model=model,
+            household_id=current_household(),
+            latency_ms=round(latency * 1000),
+            input_tokens=getattr(usage, "input_tokens", None) or 0,
+            output_tokens=getattr(usage, "output_tokens", None) or 0,
+            cache_read_input_tokens=getattr(usage, "cache_read_input_tokens", None) or 0,
+            cache_creation_input_tokens=getattr(usage, "cache_creation_input_tokens", None) or 0,
+            stop_reason=getattr(response, "stop_reason", None),
+            attempts=max(1, attempts),
+            streamed=streamed,
+            parse_failed=parse_failed,
+            error=error,
+            estimated_input_tokens=estimated_input_tokens,
+            output_format=output_format,
+        ))
+
+    # ------------------------------------------------------------------
+    # Fan-out and downshift
+    # ------------------------------------------------------------------
+
+    def _chunks(self, slots: list, options_per_slot: int, size: Optional[int] = None) -> List[list]:
+        """
+        `slots` in chunks of at most `size` (default: all in one), never more
+        than one call's max_output_tokens can answer. Raises
+        PromptBudgetExceeded when not even one slot fits.
+        """
+        per_call = self._budget.slots_per_call(options_per_slot)
+        if per_call < 1:
+            self.budget_stats.rejected += 1
+            raise PromptBudgetExceeded(
+                f"{options_per_slot} recipe options for one slot do not fit in "
+                f"{self._budget.max_output_tokens} output tokens"
+            )
+        wanted = size or len(slots)
+        if wanted > per_call and len(slots) > per_call:
+            self.budget_stats.downshifted += 1
+        size = max(1, min(wanted, per_call))
+        return [slots[i : i + size] for i in range(0, len(slots), size)]
+
+    def _fanout_chunks(self, request: SuggestionRequest) -> List[list]:
+        # Single mode is one chunk unless the answer is too long for one call
+        size = self._fanout_chunk_size if self._suggest_mode == "fanout" else None
+        return self._chunks(request.slots, request.options_per_slot, size)
+
+    def _fanout_contents(self, request: SuggestionRequest, chunks: List[list]) -> List[List[dict]]:
+        # Every chunk shares the system prompt and household block, so after the
+        # first call the parallel siblings read that prefix from the cache.
+        contents = []
+        for i, chunk in enumerate(chunks):
+            chunk_ids = {s.id for s in chunk}
+            contents.append(
+                self._suggestion_content(
+                    replace(request, slots=chunk),
+                    parallel_slots=[s for s in request.slots if s.id not in chunk_ids],
+                    variety_lane=_FANOUT_VARIETY_LANES[i % len(_FANOUT_VARIETY_LANES)],
+                )
+            )
+        return contents
+
+    def _fanout_tasks(self, request: SuggestionRequest, chunks: List[list]) -> List[asyncio.Task]:
+        semaphore = asyncio.Semaphore(self._fanout_concurrency)
+
+        async def run(content: List[dict], chunk: list) -> List[List[Recipe]]:
+            async with semaphore:
+                return await self._call_and_parse(
+                    content,
+                    expected_slot_count=len(chunk),
+                    options_per_slot=request.options_per_slot,
+                    repair=self._suggestion_repair(request, chunk),
+                )
+
+        return [
+            asyncio.create_task(run(content, chunk))
+            for content, chunk in zip(self._fanout_contents(request, chunks), chunks)
+        ]
+
+    def _refine_tasks(self, request: RefinementRequest, chunks: List[list]) -> List[asyncio.Task]:
+        """One refine call per chunk of unlocked slots; the plan block is shared, so it stays cached."""
+        semaphore = asyncio.Semaphore(self._fanout_concurrency)
+
+        async def run(chunk: list) -> List[List[Recipe]]:
+            async with semaphore:
+                return await self._call_and_parse(
+                    self._refinement_content(request, chunk),
+                    expected_slot_count=len(chunk),
+                    kind="refine",
+                    repair=self._refinement_repair(request, chunk),
+                )
+
+        return [asyncio.create_task(run(chunk)) for chunk in chunks]
+
+    @staticmethod
+    async def _gather_chunks(tasks: List[asyncio.Task]) -> List[List[Recipe]]:
+        """Wait for every chunk (bounded by the caller's deadline) and merge back in slot order."""
+        try:
+            results = await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()  # no-op for finished tasks; stops siblings after a failure
+        return [group for chunk_result in results for group in chunk_result]
+
+    @staticmethod
+    async def _stream_chunks(
+        start: Callable[[], List[asyncio.Task]]
+    ) -> AsyncIterator[List[Recipe]]:
+        """Yield chunk results in slot order; later chunks keep running meanwhile."""
+        tasks = start()
+        try:
+            for task in tasks:
+                for group in await task:
+                    yield group
+        finally:
+            for task in tasks:
+                task.cancel()
 
     # ------------------------------------------------------------------
     # Prompt builders
     # ------------------------------------------------------------------
 
+    def _suggestion_content(
+        self,
+        request: SuggestionRequest,
+        parallel_slots: Optional[list] = None,
+        variety_lane: Optional[str] = None,
+    ) -> List[dict]:
+        return self._budgeted_content(
+            self._build_household_context(request),
+            self._build_suggestion_prompt(request, parallel_slots, variety_lane)
+            + self._answer_line(len(request.slots), request.options_per_slot),
+        )
+
+    def _budgeted_content(self, context: PromptContext, variable: str) -> List[dict]:
+        """
+        User content with the stable block trimmed to the context budget.
+        Raises PromptBudgetExceeded, before anything is sent, when the whole
+        prompt is still over max_input_tokens.
+        """
+        stable, dropped = context.build(self._budget.context_tokens)
+        if dropped:
+            self.budget_stats.trimmed_prompts += 1
+            self.budget_stats.trimmed_items += dropped
+        content = _user_content(stable, variable)
+        estimated = estimate_call_tokens(
+            self._slot_params["system"], [{"role": "user", "content": content}], self._slot_params.get("tools")
+        )
+        if estimated > self._budget.max_input_tokens:
+            self.budget_stats.rejected += 1
+            raise PromptBudgetExceeded(
+                f"Prompt needs about {estimated} input tokens, over the budget of "
+                f"{self._budget.max_input_tokens}"
+            )
+        return content
+
+    @staticmethod
+    def _build_household_context(request: SuggestionRequest) -> PromptContext:
+        """The part of a suggestion prompt that stays the same between a household's calls."""
+        context = PromptContext()
+        context.line("Household context:")
+        context.line(f"- Members: {[m.name for m in request.members]}")
+        # Dislikes can be allergies, so they are never trimmed. Preferences are,
+        # recent names first; those come newest first, so the oldest go.
+        context.items(request.disliked_ingredients, lambda v: f"- Disliked ingredients: {v}")
+        context.items(request.liked_ingredients, lambda v: f"- Liked ingredients: {v}", priority=3)
+        context.items(request.cuisine_preferences, lambda v: f"- Preferred cuisines: {v}", priority=2)
+        context.items(
+            request.recent_recipe_names,
+            lambda v: f"- Used in the last 2 weeks (aim for variety): {', '.join(v)}",
+            priority=1,
+        )
+        return context
+
     @staticmethod
-    def _build_suggestion_prompt(request: SuggestionRequest) -> str:
+    def _build_suggestion_prompt(
+        request: SuggestionRequest,
+        parallel_slots: Optional[list] = None,
+        variety_lane: Optional[str] = None,
+    ) -> str:
+        """The per-call part of a suggestion prompt: slots, this week's notes, output shape."""
         slots_desc = "\n".join(
             f"- {s.name} ({s.meal_type.value}, {s.day_count} days)"
             for s in request.slots
         )
-        member_names = [m.name for m in request.members]
-        lines = [
-            f"Suggest 3 different recipe options for each of these meal slots:\n{slots_desc}",
-            "",
-            "Household context:",
-            f"- Members: {member_names}",
-        ]
-        if request.disliked_ingredients:
-            lines.append(f"- Disliked ingredients: {request.disliked_ingredients}")
-        if request.liked_ingredients:
-            lines.append(f"- Liked ingredients: {request.liked_ingredients}")
-        if request.cuisine_preferences:
-            lines.append(f"- Preferred cuisines: {request.cuisine_preferences}")
+        n = request.options_per_slot
+        lines = [f"Suggest {n} different recipe options for each of these meal slots:\n{slots_desc}"]
         if request.week_context:
             lines.append(f"- This week: {request.week_context}")
-        if request.recent_recipe_names:
-            names = ", ".join(request.recent_recipe_names)
-            lines.append(f"- Used in the last 2 weeks (aim for variety): {names}")
-        lines.append("")
-        lines.append(
-            f"Return a JSON array of arrays with exactly {len(request.slots)} inner arrays, "
-            f"each containing exactly 3 recipe objects."
-        )
+        if parallel_slots:
+            others = ", ".join(f"{s.name} ({s.meal_type.value})" for s in parallel_slots)
+            lines.append(
+                f"- Other slots this week are being planned separately: {others}. "
+                "Avoid the most obvious picks for those meals so the week does not repeat itself."
+            )
+        if variety_lane:
+            lines.append(f"- For variety, lean towards {variety_lane} for at least one option per slot.")
         return "\n".join(lines)
 
+    def _refinement_content(
+        self, request: RefinementRequest, unlocked_slots: list
+    ) -> List[dict]:
+        return self._budgeted_content(
+            self._build_plan_context(request),
+            self._build_refinement_prompt(request, unlocked_slots) + self._answer_line(len(unlocked_slots), 3),
+        )
+
     @staticmethod
-    def _build_refinement_prompt(
-        request: RefinementRequest, unlocked_slots: list
-    ) -> str:
+    def _build_plan_context(request: RefinementRequest) -> PromptContext:
+        """The current plan and locked slots — unchanged across the turns of a refine chat."""
         existing_desc = "\n".join(
             f"- {slot_id}: {recipe.name}"
             for slot_id, recipe in request.existing_assignments.items()
@@ -163,68 +772,304 @@ class ClaudeAdapter(AIPort):
             for s in request.slots
             if str(s.id) in locked_ids
         )
+        context = PromptContext()
+        context.line("Current meal plan:")
+        context.line(existing_desc)
+        if locked_desc:
+            context.line("")
+            context.line("Locked slots (keep as-is):")
+            context.line(locked_desc)
+        return context
+
+    @staticmethod
+    def _build_refinement_prompt(
+        request: RefinementRequest, unlocked_slots: list
+    ) -> str:
+        """The per-turn part of a refinement prompt: the user's message and what to fill."""
         unlocked_desc = "\n".join(
             f"- {s.name} ({s.meal_type.value}, {s.day_count} days)"
             for s in unlocked_slots
         )
         lines = [
             f'User request: "{request.user_message}"',
-            "",
-            "Current meal plan:",
-            existing_desc,
-        ]
-        if locked_desc:
-            lines += ["", "Locked slots (keep as-is):", locked_desc]
-        lines += [
             "",
             f"Provide 3 options for each of these {len(unlocked_slots)} unlocked slot(s):",
             unlocked_desc,
-            "",
-            f"Return a JSON array of arrays with exactly {len(unlocked_slots)} inner arrays, "
-            f"each containing exactly 3 recipe objects.",
         ]
         return "\n".join(lines)
 
+    def _answer_line(self, slot_count: int, options_per_slot: int) -> str:
+        """The closing instruction on the answer's shape, for the configured slot output."""
+        if self._slot_output == "tool":
+            return (
+                f"\n\nCall {_SLOT_TOOL_NAME} with exactly {slot_count} slot lists, "
+                f"each containing exactly {options_per_slot} recipes."
+            )
+        return (
+            f"\n\nReturn a JSON array of arrays with exactly {slot_count} inner arrays, "
+            f"each containing exactly {options_per_slot} recipe objects."
+        )
+
+    def _suggestion_repair(self, request: SuggestionRequest, slots: list) -> RepairContent:
+        """Re-ask for some of `slots`; the household block is unchanged, so it is still a cache hit."""
+        def content(indices: List[int]) -> List[dict]:
+            chosen = [slots[i] for i in indices]
+            chosen_ids = {s.id for s in chosen}
+            return self._suggestion_content(
+                replace(request, slots=chosen),
+                parallel_slots=[s for s in request.slots if s.id not in chosen_ids],
+            )
+        return content
+
+    def _refinement_repair(self, request: RefinementRequest, unlocked_slots: list) -> RepairContent:
+        return lambda indices: self._refinement_content(request, [unlocked_slots[i] for i in indices])
+
     # ------------------------------------------------------------------
     # API call + parsing
     # ------------------------------------------------------------------
 
     async def _call_and_parse(
-        self, prompt: str, expected_slot_count: int
+        self,
+        content: List[dict],
+        expected_slot_count: int,
+        options_per_slot: int = 3,
+        kind: str = "suggest",
+        deadline_seconds: Optional[float] = None,
+        repair: Optional[RepairContent] = None,
     ) -> List[List[Recipe]]:
-        response = await self._client.messages.create(
-            model=self._model,
-            max_tokens=8192,
-            system=SYSTEM_PROMPT,
-            messages=[{"role": "user", "content": prompt}],
+        """
+        One call for every slot. With `repair`, slots are checked one by one:
+        valid groups are kept and only the broken or missing ones are asked for
+        again in a single follow-up call. Without it, any bad slot fails the call.
+        """
+        started = time.monotonic()
+
+        def parse(response) -> List[Optional[List[Recipe]]]:
+            data = self._slot_answer(response)
+            # Order is all that ties groups to slots: a short answer keeps its head, a long one is unusable
+            if len(data) > expected_slot_count or (repair is None and len(data) != expected_slot_count):
+                raise ValueError(
+                    f"Expected {expected_slot_count} slot groups from AI, got {len(data)}"
+                )
+            if repair is None:
+                return [
+                    self._parse_slot_group(i, inner, options_per_slot) for i, inner in enumerate(data)
+                ]
+            groups = [self._checked_slot_group(i, inner, options_per_slot) for i, inner in enumerate(data)]
+            return groups + [None] * (expected_slot_count - len(groups))
+
+        # Latency scales with output size, so hedge thresholds are kept per slot count
+        groups = await self._create(
+            f"{kind}:{expected_slot_count}",
+            deadline_seconds,
+            parse=parse,
+            output_format=self._slot_output,
+            max_tokens=self._budget.slot_tokens(expected_slot_count, options_per_slot),
+            messages=[{"role": "user", "content": content}],
+            **self._slot_params,
         )
-        raw = response.content[0].text.strip()
-
-        # Strip markdown code fences if the model wrapped the JSON
-        if raw.startswith("```"):
-            raw = raw.split("```")[1]
-            if raw.startswith("json"):
-                raw = raw[4:]
-            raw = raw.strip()
-
-        data = json.loads(raw)
-        if not isinstance(data, list):
-            raise ValueError(f"Expected JSON array from AI, got: {type(data)}")
-        if len(data) != expected_slot_count:
-            raise ValueError(
-                f"Expected {expected_slot_count} slot groups from AI, got {len(data)}"
+        if repair is None:
+            return groups
+        self.repair_stats.responses += 1
+        broken = [i for i, group in enumerate(groups) if group is None]
+        if broken:
+            self.repair_stats.repaired += 1
+            remaining = None
+            if deadline_seconds is not None:
+                remaining = max(0.0, deadline_seconds - (time.monotonic() - started))
+            for index, group in zip(
+                broken, await self._repair_slots(kind, broken, repair, options_per_slot, remaining)
+            ):
+                groups[index] = group
+        return groups
+
+    async def _repair_slots(
+        self,
+        kind: str,
+        indices: List[int],
+        repair: RepairContent,
+        options_per_slot: int,
+        deadline_seconds: Optional[float] = None,
+    ) -> List[List[Recipe]]:
+        """Re-request just these slots; a repair that is itself unusable fails the request."""
+        self.repair_stats.slots_repaired += len(indices)
+        try:
+            return await self._call_and_parse(
+                repair(indices),
+                expected_slot_count=len(indices),
+                options_per_slot=options_per_slot,
+                kind=f"{kind}-repair",
+                deadline_seconds=deadline_seconds,
             )
+        except _PARSE_ERRORS:
+            self.repair_stats.repair_failures += 1
+            raise
+
+    async def _stream_and_parse(
+        self,
+        content: List[dict],
+        expected_slot_count: int,
+        options_per_slot: int = 3,
+        kind: str = "suggest",
+        repair: Optional[RepairContent] = None,
+    ) -> AsyncIterator[List[Recipe]]:
+        """
+        Stream the response and yield each slot group as its inner array closes.
 
-        result: List[List[Recipe]] = []
-        for i, inner in enumerate(data):
-            if not isinstance(inner, list) or len(inner) != 3:
-                count = len(inner) if isinstance(inner, list) else "non-list"
+        With `repair`, a broken group is re-requested in the background while
+        the stream carries on; groups are still yielded in slot order, so the
+        ones after it wait for the repair. Slots missing from a short answer
+        are repaired together once the stream ends.
+        """
+        if repair is None:
+            async for group in self._stream_slot_groups(
+                content, expected_slot_count, options_per_slot, kind, strict=True
+            ):
+                yield group
+            return
+
+        self.repair_stats.responses += 1
+        # Slot groups and repair tasks, in slot order, not yet yielded
+        pending: deque = deque()
+        count = 0
+        repair_calls = 0
+
+        def start_repair(indices: List[int]) -> asyncio.Task:
+            nonlocal repair_calls
+            if not repair_calls:
+                self.repair_stats.repaired += 1  # counted once per answer
+            repair_calls += 1
+            return asyncio.create_task(self._repair_slots(kind, indices, repair, options_per_slot))
+
+        try:
+            async for group in self._stream_slot_groups(
+                content, expected_slot_count, options_per_slot, kind, strict=False
+            ):
+                pending.append(group if group is not None else start_repair([count]))
+                count += 1
+                while pending and (not isinstance(pending[0], asyncio.Task) or pending[0].done()):
+                    for ready in await _resolved(pending.popleft()):
+                        yield ready
+            if count < expected_slot_count:
+                pending.append(start_repair(list(range(count, expected_slot_count))))
+            while pending:
+                for ready in await _resolved(pending.popleft()):
+                    yield ready
+        finally:
+            for item in pending:
+                if isinstance(item, asyncio.Task):
+                    item.cancel()
+
+    async def _stream_slot_groups(
+        self,
+        content: List[dict],
+        expected_slot_count: int,
+        options_per_slot: int,
+        kind: str,
+        strict: bool,
+    ) -> AsyncIterator[Optional[List[Recipe]]]:
+        """
+        The streamed call itself. Strict: any bad or missing slot raises.
+        Otherwise a bad slot comes out as None and a short answer just ends early.
+        """
+        if self._slot_output == "tool":
+            # {"slots": [[recipe, ...], ...]}: slot groups close at depth 3
+            decoder = IncrementalJSONDecoder(root="{", emit_depths=(3,))
+        else:
+            decoder = IncrementalJSONDecoder(root="[", emit_depths=(2,), elements="[")
+        count = 0
+        final = None
+        outcome: dict = {"output_format": self._slot_output}
+        # No mid-stream fallback: the best available tier serves the whole stream
+        model = self.router.tiers(f"{kind}:{expected_slot_count}", self._model)[0]
+        params = dict(
+            max_tokens=self._budget.slot_tokens(expected_slot_count, options_per_slot),
+            messages=[{"role": "user", "content": content}],
+            **self._slot_params,
+        )
+        outcome["estimated_input_tokens"] = _estimated_input(params)
+        started = time.monotonic()
+        try:
+            async with self._client.messages.stream(model=model, **params) as stream:
+                async for delta in self._answer_deltas(stream):
+                    for _, inner in decoder.feed(delta):
+                        if count >= expected_slot_count:
+                            raise ValueError(
+                                f"Expected {expected_slot_count} slot groups from AI, got more"
+                            )
+                        if strict:
+                            yield self._parse_slot_group(count, inner, options_per_slot)
+                        else:
+                            yield self._checked_slot_group(count, inner, options_per_slot)
+                        count += 1
+                final = await stream.get_final_message()
+                self.usage.record(getattr(final, "usage", None))
+            if strict and count != expected_slot_count:
                 raise ValueError(
-                    f"Slot {i}: expected 3 recipe options, got {count}"
+                    f"Expected {expected_slot_count} slot groups from AI, got {count}"
                 )
-            result.append([self._parse_recipe(item) for item in inner])
+        except _PARSE_ERRORS:
+            outcome["parse_failed"] = True
+            raise
+        except BaseException as exc:  # includes the consumer closing the stream early
+            outcome["error"] = type(exc).__name__
+            raise
+        finally:
+            self._record(
+                f"{kind}:{expected_slot_count}", started, final, model, streamed=True, **outcome
+            )
 
-        return result
+    def _slot_answer(self, response) -> list:
+        """
+        The slot groups of a non-streamed suggest or refine answer, still unparsed.
+
+        A tool answer cut off at max_tokens keeps only its complete slots (the
+        last one may be partial), like the recovering text decoder does; the
+        caller's repair path asks again for the rest.
+        """
+        if self._slot_output == "text":
+            return decode_json_array(
+                response.content[0].text, recover_depth=_SLOT_RECOVER_DEPTH, elements="["
+            )
+        truncated = getattr(response, "stop_reason", None) == "max_tokens"
+        for block in response.content:
+            if getattr(block, "type", None) == "tool_use" and block.name == _SLOT_TOOL_NAME:
+                slots = block.input.get("slots") if isinstance(block.input, dict) else None
+                if isinstance(slots, str):  # the array sent as a JSON string
+                    slots = decode_json_array(slots, recover_depth=_SLOT_RECOVER_DEPTH, elements="[")
+                if isinstance(slots, list):
+                    return slots[:-1] if truncated else slots
+                if truncated:
+                    return []  # cut off before any slot was complete
+                raise ValueError(f"{_SLOT_TOOL_NAME} input has no slots array")
+        if truncated:
+            return []
+        raise ValueError(f"AI response did not call {_SLOT_TOOL_NAME}")
+
+    async def _answer_deltas(self, stream) -> AsyncIterator[str]:
+        """The streamed answer's JSON text: tool input deltas, or plain text deltas."""
+        if self._slot_output == "text":
+            async for text in stream.text_stream:
+                yield text
+            return
+        async for event in stream:
+            if event.type == "input_json":
+                yield event.partial_json
+
+    def _parse_slot_group(self, index: int, inner, options_per_slot: int = 3) -> List[Recipe]:
+        if not isinstance(inner, list) or len(inner) != options_per_slot:
+            count = len(inner) if isinstance(inner, list) else "non-list"
+            raise ValueError(
+                f"Slot {index}: expected {options_per_slot} recipe options, got {count}"
+            )
+        return [self._parse_recipe(item) for item in inner]
+
+    def _checked_slot_group(self, index: int, inner, options_per_slot: int = 3) -> Optional[List[Recipe]]:
+        """_parse_slot_group, or None when the group is unusable and needs a repair."""
+        try:
+            return self._parse_slot_group(index, inner, options_per_slot)
+        except _PARSE_ERRORS:
+            return None
 
     async def parse_recipe_from_url(self, url: str) -> Recipe:
         """Fetch a webpage via tool use and extract a recipe from it."""
@@ -242,49 +1087,37 @@ class ClaudeAdapter(AIPort):
         system = (
             "You are a recipe parser for Dinner Solved. Use the fetch_webpage tool to retrieve "
             "the page, then extract the recipe and return it as a single JSON object.\n\n"
-            "The JSON must follow this exact structure:\n"
-            "{\n"
-            '  "name": "Recipe Name",\n'
-            '  "emoji": "🍝",\n'
-            '  "prep_time": 30,\n'
-            '  "key_ingredients": ["ingredient1", "ingredient2", "ingredient3"],\n'
-            '  "ingredients": [\n'
-            '    {"name": "ingredient name", "quantity": 1.5, "unit": "lbs", "category": "meat"}\n'
-            "  ],\n"
-            '  "cooking_instructions": ["Step 1...", "Step 2..."]\n'
-            "}\n\n"
-            "IMPORTANT: All ingredient quantities must be for exactly 1 standard serving.\n"
-            "Valid category values: produce, meat, dairy, pantry, frozen, bakery, other\n"
+            f"{_RECIPE_JSON_SPEC}"
             'If the page contains no recipe, return {"error": "No recipe found"}.\n'
             "Respond ONLY with the JSON object. No additional text."
         )
+
+        async with self._hedger.deadline(self._deadline_seconds):
+            return await self._parse_recipe_loop(url, system, fetch_tool)
+
+    async def _parse_recipe_loop(self, url: str, system: str, fetch_tool: dict) -> Recipe:
         messages: list = [{"role": "user", "content": f"Extract the recipe from this URL: {url}"}]
 
         # Agentic loop — let Claude call the tool until it produces a final response
         for _ in range(5):  # max 5 turns (in practice 2: fetch + parse)
-            response = await self._client.messages.create(
-                model=self._model,
+            response, data = await self._create(
+                "import",
+                None,  # the whole loop shares one deadline
+                parse=lambda r: (r, self._final_json(r)),
                 max_tokens=4096,
                 system=system,
                 tools=[fetch_tool],
                 messages=messages,
             )
 
-            if response.stop_reason == "tool_use":
+            if data is None:  # stop_reason == "tool_use"
                 # Collect all tool calls in this turn
                 tool_results = []
                 for block in response.content:
                     if block.type == "tool_use" and block.name == "fetch_webpage":
                         fetch_url = block.input.get("url", url)
                         try:
-                            async with httpx.AsyncClient(
-                                follow_redirects=True, timeout=15.0
-                            ) as client:
-                                r = await client.get(
-                                    fetch_url,
-                                    headers={"User-Agent": "Mozilla/5.0 (compatible; DinnerSolvedBot/1.0)"},
-                                )
-                                content = r.text[:40000]  # cap to ~10k tokens
+                            content = await self._fetch_page(fetch_url)
                         except Exception as exc:
                             content = f"Error fetching URL: {exc}"
                         tool_results.append(
@@ -296,12 +1129,6 @@ class ClaudeAdapter(AIPort):
                 messages.append({"role": "user", "content": tool_results})
                 continue
 
-            # stop_reason == "end_turn" — extract and parse the JSON response
-            raw = next(
-                (b.text for b in response.content if b.type == "text"), ""
-            ).strip()
-            raw = _extract_json_object(raw)
-            data = json.loads(raw)
             if "error" in data:
                 raise ValueError(data["error"])
             recipe = self._parse_recipe_with_instructions(data)
@@ -310,6 +1137,58 @@ class ClaudeAdapter(AIPort):
 
         raise ValueError("Failed to extract recipe after multiple attempts")
 
+    @staticmethod
+    def _final_json(response) -> Optional[dict]:
+        """The JSON object of a final import turn; None while the model is still calling tools."""
+        if response.stop_reason == "tool_use":
+            return None
+        raw = next((b.text for b in response.content if b.type == "text"), "")
+        return decode_json_object(raw)
+
+    async def complete_recipe_draft(self, draft: RecipeDraft) -> Recipe:
+        """Normalise a structured-data draft from its text alone — no page fetch, no tools."""
+        servings = (
+            f"{draft.servings}" if draft.servings
+            else "not stated — estimate a sensible number from the quantities"
+        )
+        prompt = "\n".join([
+            f"Recipe: {draft.name}",
+            f"Servings: {servings}",
+            *([f"Total time: {draft.prep_time} minutes"] if draft.prep_time else []),
+            "Ingredients (as published, for all servings):",
+            *(f"- {line}" for line in draft.ingredient_lines),
+        ])
+        data = await self._create(
+            "import-draft",
+            self._deadline_seconds,
+            parse=lambda r: decode_json_object(r.content[0].text),
+            max_tokens=2048,
+            system=(
+                "You are a recipe parser for Dinner Solved. You are given a recipe read from a "
+                "web page's structured data. Convert it to a single JSON object, dividing every "
+                "quantity by the number of servings.\n\n"
+                f"{_RECIPE_JSON_SPEC}"
+                "Omit cooking_instructions. Respond ONLY with the JSON object. No additional text."
+            ),
+            messages=[{"role": "user", "content": prompt}],
+        )
+        recipe = self._parse_recipe_with_instructions({**data, "name": data.get("name") or draft.name})
+        recipe.cooking_instructions = list(draft.instructions) or None
+        recipe.source_url = draft.source_url
+        return recipe
+
+    async def _fetch_page(self, url: str) -> str:
+        """The page reduced to its recipe text while it downloads (see html_reducer)."""
+        if self._http_client is not None:
+            return await self._read_reduced(self._http_client, url)
+        async with httpx.AsyncClient(follow_redirects=True, timeout=15.0) as client:
+            return await self._read_reduced(client, url)
+
+    @staticmethod
+    async def _read_reduced(client: httpx.AsyncClient, url: str) -> str:
+        async with client.stream("GET", url, headers={"User-Agent": USER_AGENT}) as r:
+            return await reduce_html_stream(r.aiter_text())
+
     @staticmethod
     def _parse_recipe(data: dict) -> Recipe:
         ingredients = [
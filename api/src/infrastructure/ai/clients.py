@@ -0,0 +1,151 @@
+"""
+Process-wide HTTP clients for the AI adapters.
+
+Created once by the FastAPI lifespan via init_ai_clients() and closed on
+shutdown, so requests reuse warm keep-alive connections to the Anthropic API
+and to recipe sites instead of paying for TCP + TLS setup on every call.
+Adapters are still built per request; they borrow these clients.
+"""
+import os
+from dataclasses import asdict, dataclass
+from typing import Optional
+
+import httpx
+from anthropic import AsyncAnthropic, DefaultAsyncHttpxClient
+
+from .claude_adapter import SlotRepairStats, TokenUsage
+from .hedging import HedgePolicy, Hedger
+from .model_routing import ModelRouter, RoutingPolicy
+from .prompt_budget import PromptBudgetStats
+from .usage_ledger import UsageLedger
+
+
+@dataclass(frozen=True)
+class PoolConfig:
+    max_connections: int
+    max_keepalive_connections: int
+    keepalive_expiry: float  # seconds an idle connection is kept open
+    timeout: float  # seconds per request
+
+    @classmethod
+    def from_env(cls, prefix: str, defaults: "PoolConfig") -> "PoolConfig":
+        """Read <prefix>_MAX_CONNECTIONS, _MAX_KEEPALIVE, _KEEPALIVE_EXPIRY_SECONDS, _TIMEOUT_SECONDS."""
+        return cls(
+            max_connections=int(os.environ.get(f"{prefix}_MAX_CONNECTIONS", defaults.max_connections)),
+            max_keepalive_connections=int(
+                os.environ.get(f"{prefix}_MAX_KEEPALIVE", defaults.max_keepalive_connections)
+            ),
+            keepalive_expiry=float(
+                os.environ.get(f"{prefix}_KEEPALIVE_EXPIRY_SECONDS", defaults.keepalive_expiry)
+            ),
+            timeout=float(os.environ.get(f"{prefix}_TIMEOUT_SECONDS", defaults.timeout)),
+        )
+
+    def limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
+
+# Suggestion calls can generate for over a minute, so the API timeout is generous.
+ANTHROPIC_POOL = PoolConfig(
+    max_connections=20, max_keepalive_connections=10, keepalive_expiry=30.0, timeout=300.0
+)
+FETCH_POOL = PoolConfig(
+    max_connections=10, max_keepalive_connections=5, keepalive_expiry=15.0, timeout=15.0
+)
+
+
+class AIClients:
+    """
+    The shared clients plus what every adapter borrows: token totals, hedger,
+    usage ledger, slot-repair stats, model router and prompt-budget stats.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        anthropic_pool: PoolConfig = ANTHROPIC_POOL,
+        fetch_pool: PoolConfig = FETCH_POOL,
+        hedge_policy: Optional[HedgePolicy] = None,
+        routing_policy: Optional[RoutingPolicy] = None,
+    ) -> None:
+        self._pools = {"anthropic": anthropic_pool, "fetch": fetch_pool}
+        self.anthropic_http = DefaultAsyncHttpxClient(
+            limits=anthropic_pool.limits(), timeout=anthropic_pool.timeout
+        )
+        self.anthropic = AsyncAnthropic(api_key=api_key, http_client=self.anthropic_http)
+        self.fetch_http = httpx.AsyncClient(
+            follow_redirects=True, limits=fetch_pool.limits(), timeout=fetch_pool.timeout
+        )
+        self.usage = TokenUsage()
+        self.hedger = Hedger(hedge_policy)
+        self.ledger = UsageLedger()
+        self.repair = SlotRepairStats()
+        self.router = ModelRouter(routing_policy)
+        self.budget = PromptBudgetStats()
+
+    async def aclose(self) -> None:
+        await self.anthropic.close()
+        await self.fetch_http.aclose()
+
+    def stats(self) -> dict:
+        return {
+            "pools": {
+                "anthropic": _pool_stats(self.anthropic_http, self._pools["anthropic"]),
+                "fetch": _pool_stats(self.fetch_http, self._pools["fetch"]),
+            },
+            "tokens": asdict(self.usage),
+            "hedging": self.hedger.snapshot(),
+            "usage": self.ledger.snapshot(),
+            "slot_repair": {**asdict(self.repair), "repair_rate": self.repair.repair_rate},
+            "routing": self.router.snapshot(),
+            "prompt_budget": asdict(self.budget),
+        }
+
+
+def _pool_stats(client, config: PoolConfig) -> dict:
+    """Connection counts from the client's transport pool (httpcore), alongside its limits."""
+    pool = getattr(getattr(client, "_transport", None), "_pool", None)
+    connections = list(getattr(pool, "connections", []))
+    idle = sum(1 for c in connections if c.is_idle())
+    return {
+        **asdict(config),
+        "connections": len(connections),
+        "active": len(connections) - idle,
+        "idle": idle,
+        "queued_requests": sum(1 for r in getattr(pool, "_requests", []) if r.is_queued()),
+    }
+
+
+# Created at startup via init_ai_clients(); adapters receive them via DI.
+_clients: Optional[AIClients] = None
+
+
+def init_ai_clients(
+    api_key: str,
+    anthropic_pool: PoolConfig = ANTHROPIC_POOL,
+    fetch_pool: PoolConfig = FETCH_POOL,
+    hedge_policy: Optional[HedgePolicy] = None,
+    routing_policy: Optional[RoutingPolicy] = None,
+) -> AIClients:
+    """Call once at application startup."""
+    global _clients
+    _clients = AIClients(api_key, anthropic_pool, fetch_pool, hedge_policy, routing_policy)
+    return _clients
+
+
+def get_ai_clients() -> AIClients:
+    if _clients is None:
+        raise RuntimeError("AI clients not initialised. Call init_ai_clients() first.")
+    return _clients
+
+
+async def close_ai_clients() -> None:
+    """Call once at shutdown; safe when the clients were never created."""
+    global _clients
+    if _clients is not None:
+        await _clients.aclose()
+        _clients = None
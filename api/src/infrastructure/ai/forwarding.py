@@ -0,0 +1,54 @@
+"""
+Base class for AIPort decorators (caching, coalescing, circuit breaking...).
+
+Every port method forwards to the wrapped adapter; subclasses override only
+the calls they change, so adding a port method means touching one place.
+"""
+from typing import AsyncIterator, List, Optional
+
+from application.ports.ai_port import AIPort, RefinementRequest, SuggestionRequest
+from application.ports.recipe_page_port import RecipeDraft
+from domain.entities.recipe import Recipe
+
+
+class ForwardingAIAdapter(AIPort):
+    def __init__(self, inner: AIPort):
+        self._inner = inner
+
+    async def suggest_recipes(self, request: SuggestionRequest) -> List[List[Recipe]]:
+        return await self._inner.suggest_recipes(request)
+
+    async def peek_suggestions(
+        self, request: SuggestionRequest
+    ) -> Optional[List[List[Recipe]]]:
+        return await self._inner.peek_suggestions(request)
+
+    def available(self) -> bool:
+        return self._inner.available()
+
+    async def stream_suggest_recipes(
+        self, request: SuggestionRequest
+    ) -> AsyncIterator[List[Recipe]]:
+        async for group in self._inner.stream_suggest_recipes(request):
+            yield group
+
+    async def refine_recipes(self, request: RefinementRequest) -> List[List[Recipe]]:
+        return await self._inner.refine_recipes(request)
+
+    async def stream_refine_recipes(
+        self, request: RefinementRequest
+    ) -> AsyncIterator[List[Recipe]]:
+        async for group in self._inner.stream_refine_recipes(request):
+            yield group
+
+    async def generate_instructions(self, recipe: Recipe) -> List[str]:
+        return await self._inner.generate_instructions(recipe)
+
+    async def generate_instructions_batch(self, recipes: List[Recipe]) -> List[List[str]]:
+        return await self._inner.generate_instructions_batch(recipes)
+
+    async def parse_recipe_from_url(self, url: str) -> Recipe:
+        return await self._inner.parse_recipe_from_url(url)
+
+    async def complete_recipe_draft(self, draft: RecipeDraft) -> Recipe:
+        return await self._inner.complete_recipe_draft(draft)
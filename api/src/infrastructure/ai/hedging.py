@@ -0,0 +1,220 @@
+"""
+Deadlines and hedged requests for model calls.
+
+Every call runs under a deadline; past it, AIDeadlineExceeded is raised and
+the call is cancelled. With a HedgePolicy, a call that is still running when it
+passes the chosen latency percentile for its kind (e.g. "suggest:3", a
+3-slot suggestion) gets a second, identical request. Whichever finishes first
+wins and the other is cancelled. Percentiles come from a rolling window of
+recent successful latencies, so the hedge threshold follows the upstream.
+"""
+import asyncio
+import os
+import time
+from bisect import bisect_right, insort
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass
+from typing import AsyncIterator, Awaitable, Callable, Dict, Optional, TypeVar
+
+from application.ports.ai_port import AIDeadlineExceeded
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class HedgePolicy:
+    percentile: float = 0.95  # hedge calls slower than this share of recent calls
+    min_samples: int = 20  # no hedging until a call kind has this much history
+    min_delay_seconds: float = 2.0  # never hedge sooner than this
+    window: int = 200  # recent latencies kept per call kind
+
+    @classmethod
+    def from_env(cls, prefix: str = "AI_HEDGE") -> Optional["HedgePolicy"]:
+        """None unless <prefix>_ENABLED; reads _PERCENTILE, _MIN_SAMPLES, _MIN_DELAY_SECONDS."""
+        if os.environ.get(f"{prefix}_ENABLED", "").lower() not in ("1", "true", "yes"):
+            return None
+        defaults = cls()
+        return cls(
+            percentile=float(os.environ.get(f"{prefix}_PERCENTILE", defaults.percentile)),
+            min_samples=int(os.environ.get(f"{prefix}_MIN_SAMPLES", defaults.min_samples)),
+            min_delay_seconds=float(
+                os.environ.get(f"{prefix}_MIN_DELAY_SECONDS", defaults.min_delay_seconds)
+            ),
+        )
+
+
+@dataclass
+class HedgeStats:
+    calls: int = 0
+    hedged: int = 0
+    hedge_wins: int = 0
+    deadline_exceeded: int = 0
+    # Estimated from the latency history: how much longer the cancelled primary
+    # would likely have taken, summed over hedge wins.
+    latency_saved_seconds: float = 0.0
+
+    @property
+    def hedge_rate(self) -> float:
+        return self.hedged / self.calls if self.calls else 0.0
+
+    @property
+    def win_rate(self) -> float:
+        return self.hedge_wins / self.hedged if self.hedged else 0.0
+
+
+class LatencyTracker:
+    """Rolling window of latencies with cheap percentile lookups."""
+
+    def __init__(self, window: int = 200) -> None:
+        self._recent: deque = deque(maxlen=window)
+        self._sorted: list = []
+
+    def __len__(self) -> int:
+        return len(self._recent)
+
+    def record(self, seconds: float) -> None:
+        if len(self._recent) == self._recent.maxlen:
+            oldest = self._recent[0]
+            del self._sorted[bisect_right(self._sorted, oldest) - 1]
+        self._recent.append(seconds)
+        insort(self._sorted, seconds)
+
+    def percentile(self, p: float) -> Optional[float]:
+        if not self._sorted:
+            return None
+        index = min(len(self._sorted) - 1, int(p * len(self._sorted)))
+        return self._sorted[index]
+
+    def expected_remaining(self, elapsed: float) -> float:
+        """Mean further wait for a call already running `elapsed` seconds (0 if never seen)."""
+        slower = self._sorted[bisect_right(self._sorted, elapsed):]
+        if not slower:
+            return 0.0
+        return sum(slower) / len(slower) - elapsed
+
+
+class Hedger:
+    """Process-wide (shared through AIClients) so latency history and stats span requests."""
+
+    def __init__(
+        self,
+        policy: Optional[HedgePolicy] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._policy = policy
+        self._clock = clock
+        self._trackers: Dict[str, LatencyTracker] = {}
+        self.stats = HedgeStats()
+
+    def snapshot(self) -> dict:
+        return {
+            **asdict(self.stats),
+            "hedge_rate": self.stats.hedge_rate,
+            "win_rate": self.stats.win_rate,
+            "thresholds": {key: self._hedge_delay(key) for key in sorted(self._trackers)},
+        }
+
+    @asynccontextmanager
+    async def deadline(self, seconds: Optional[float]) -> AsyncIterator[None]:
+        """Cancel the block after `seconds` (None = no limit) and raise AIDeadlineExceeded."""
+        try:
+            async with asyncio.timeout(seconds):
+                yield
+        except TimeoutError:
+            if seconds is None:
+                raise
+            self.stats.deadline_exceeded += 1
+            raise AIDeadlineExceeded(f"AI request did not finish within {seconds:g}s") from None
+
+    async def bounded(
+        self, items: AsyncIterator[T], deadline_seconds: Optional[float]
+    ) -> AsyncIterator[T]:
+        """Re-yield a stream, raising AIDeadlineExceeded once its overall deadline passes."""
+        if deadline_seconds is None:
+            async for item in items:
+                yield item
+            return
+        deadline_at = self._clock() + deadline_seconds
+        iterator = items.__aiter__()
+        try:
+            while True:
+                try:
+                    item = await asyncio.wait_for(
+                        iterator.__anext__(), max(0.0, deadline_at - self._clock())
+                    )
+                except StopAsyncIteration:
+                    return
+                except TimeoutError:
+                    self.stats.deadline_exceeded += 1
+                    raise AIDeadlineExceeded(
+                        f"AI response did not finish within {deadline_seconds:g}s"
+                    ) from None
+                yield item
+        finally:
+            aclose = getattr(iterator, "aclose", None)
+            if aclose is not None:
+                await aclose()
+
+    async def run(
+        self,
+        kind: str,
+        call: Callable[[], Awaitable[T]],
+        deadline_seconds: Optional[float] = None,
+    ) -> T:
+        """Run `call`, hedging once if it is slow for its `kind`, within an overall deadline."""
+        self.stats.calls += 1
+        start = self._clock()
+        tasks = [asyncio.create_task(call())]
+        try:
+            async with self.deadline(deadline_seconds):
+                delay = self._hedge_delay(kind)
+                if delay is not None:
+                    done, _ = await asyncio.wait(tasks, timeout=delay)
+                    if not done:
+                        self.stats.hedged += 1
+                        tasks.append(asyncio.create_task(call()))
+                hedge_start = self._clock()
+                winner = await _first_success(tasks)
+        finally:
+            for task in tasks:
+                task.cancel()  # the loser, or everything after a deadline/failure
+
+        elapsed = self._clock() - start
+        tracker = self._tracker(kind)
+        if winner is tasks[0]:
+            tracker.record(elapsed)
+        else:
+            self.stats.hedge_wins += 1
+            self.stats.latency_saved_seconds += tracker.expected_remaining(elapsed)
+            tracker.record(self._clock() - hedge_start)
+        return winner.result()
+
+    def _tracker(self, kind: str) -> LatencyTracker:
+        tracker = self._trackers.get(kind)
+        if tracker is None:
+            window = self._policy.window if self._policy else 200
+            tracker = self._trackers[kind] = LatencyTracker(window)
+        return tracker
+
+    def _hedge_delay(self, kind: str) -> Optional[float]:
+        if self._policy is None:
+            return None
+        tracker = self._trackers.get(kind)
+        if tracker is None or len(tracker) < self._policy.min_samples:
+            return None
+        return max(self._policy.min_delay_seconds, tracker.percentile(self._policy.percentile))
+
+
+async def _first_success(tasks: list) -> asyncio.Task:
+    """The first task to succeed; if every task fails, re-raise the first failure."""
+    pending = set(tasks)
+    first_error: Optional[BaseException] = None
+    while pending:
+        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        for task in sorted(done, key=tasks.index):
+            if task.exception() is None:
+                return task
+            first_error = first_error or task.exception()
+    raise first_error
+
@@ -0,0 +1,257 @@
+"""
+Incremental, tolerant decoding of JSON produced by the model.
+
+Every ClaudeAdapter parse path goes through this module. IncrementalJSONDecoder is fed
+text (all at once, or delta by delta from the streaming API) and:
+
+- skips anything before the root value — code fences, "Here are your recipes:",
+  and bracketed prose such as "see [1]" when told what the root's elements
+  start with
+- hands back nested containers at chosen depths the moment they close, e.g.
+  each slot's inner array (depth 2) or each recipe object (depth 3)
+- ignores anything after the root value closes (closing fence, sign-off prose)
+- on truncated output, rebuilds the root from every element that completed
+  before the cut instead of discarding the whole paid response
+
+Depths count from the root container (depth 1). Only structural characters
+are inspected, via regex jumps. Text that has been scanned and is not part of
+a watched container still open is moved out of the scan buffer, so each delta
+costs its own length plus the open container's, not the whole response so far.
+"""
+import json
+import re
+from typing import Any, List, Optional, Tuple
+
+_STRUCTURAL = re.compile(r'[\[\]{}",]')
+_STRING_SPECIAL = re.compile(r'["\\]')
+_TRAILING_COMMA = re.compile(r",\s*([\]}])")
+_NON_SPACE = re.compile(r"\S")
+
+_CLOSER = {"[": "]", "{": "}"}
+_RAW_DECODER = json.JSONDecoder()
+
+
+class IncrementalJSONDecoder:
+    """
+    Args:
+        root: "[" or "{" — the kind of value the model was asked for.
+        emit_depths: container depths to return from feed() as they close.
+        recover_depth: deepest array whose completed elements may be kept when
+            the output is truncated. None disables recovery. For a slot
+            response, 2 keeps whole slots and whole recipes but never a recipe
+            with a half-written ingredient list.
+        elements: characters the root's first element may start with, e.g.
+            "[" for an array of slot arrays. A bracket followed by anything
+            else is prose and skipped. Defaults to '"' for an object (its
+            keys), anything for an array.
+    """
+
+    def __init__(
+        self,
+        root: str = "[",
+        emit_depths: Tuple[int, ...] = (),
+        recover_depth: Optional[int] = None,
+        elements: Optional[str] = None,
+    ) -> None:
+        if root not in _CLOSER:
+            raise ValueError(f"root must be '[' or '{{', got {root!r}")
+        self._root = root
+        self._elements = _root_elements(root, elements)
+        self._emit_depths = frozenset(emit_depths)
+        self._recover_depth = recover_depth
+        # Scan buffer: the text from absolute offset _base on; scanned text
+        # before it lives in _done, kept only for finish()
+        self._text = ""
+        self._base = 0
+        self._done: List[str] = []
+        self._pos = 0  # relative to _text
+        # Offsets below are absolute (from the start of the response)
+        self._root_start: Optional[int] = None
+        self._root_end: Optional[int] = None
+        self._stack: List[Tuple[str, int]] = []  # (opener, start offset)
+        self._in_string = False
+        self._safe_cut: Optional[Tuple[int, str]] = None  # (offset, closing brackets)
+
+    @property
+    def complete(self) -> bool:
+        """True once the root value has closed."""
+        return self._root_end is not None
+
+    def feed(self, chunk: str) -> List[Tuple[int, Any]]:
+        """Consume a text delta; return (depth, value) for each watched container it completed."""
+        text = self._text + chunk
+        base = self._base
+        n = len(text)
+        pos = self._pos
+        completed: List[Tuple[int, Any]] = []
+
+        while pos < n and self._root_end is None:
+            if self._root_start is None:
+                i = _find_root(text, pos, self._root, self._elements)
+                if i is None:
+                    pos = n
+                    break
+                if i < 0:
+                    pos = -i - 1  # its first element is in a later delta
+                    break
+                self._root_start = base + i
+                self._stack.append((self._root, base + i))
+                pos = i + 1
+                continue
+
+            if self._in_string:
+                m = _STRING_SPECIAL.search(text, pos)
+                if m is None:
+                    pos = n
+                    break
+                if m.group() == "\\":
+                    if m.end() >= n:
+                        pos = m.start()  # escape split across chunks — wait for more
+                        break
+                    pos = m.end() + 1
+                    continue
+                self._in_string = False
+                pos = m.end()
+                continue
+
+            m = _STRUCTURAL.search(text, pos)
+            if m is None:
+                pos = n
+                break
+            ch, i, pos = m.group(), m.start(), m.end()
+            if ch == '"':
+                self._in_string = True
+            elif ch in "[{":
+                self._stack.append((ch, base + i))
+            elif ch in "]}":
+                if not self._stack:
+                    continue
+                depth = len(self._stack)
+                _, start = self._stack.pop()
+                if not self._stack:
+                    self._root_end = base + pos
+                    break
+                if depth in self._emit_depths:
+                    completed.append((depth, _loads(text[start - base : pos])))
+                if self._stack[-1][0] == "[":
+                    self._mark_safe(base + pos)
+            elif ch == "," and self._stack[-1][0] == "[":
+                self._mark_safe(base + i)
+
+        # Keep only what a later delta may still need: the outermost watched
+        # container that is open, or the unscanned rest
+        keep = pos
+        for depth, (_, start) in enumerate(self._stack, start=1):
+            if depth in self._emit_depths:
+                keep = min(keep, start - base)
+                break
+        if keep:
+            self._done.append(text[:keep])
+            text = text[keep:]
+            self._base = base + keep
+            pos -= keep
+        self._text = text
+        self._pos = pos
+        return completed
+
+    def _full_text(self) -> str:
+        return "".join(self._done) + self._text
+
+    def finish(self) -> Any:
+        """
+        Return the decoded root value.
+
+        If the output was cut off, the root is rebuilt from every element that
+        completed before the cut (see recover_depth). Raises ValueError when no
+        JSON value was found or nothing could be recovered.
+        """
+        text = self._full_text()
+        if self._root_start is None:
+            raise ValueError(
+                f"No JSON {'array' if self._root == '[' else 'object'} found in AI response. "
+                f"Raw output: {text[:200]!r}"
+            )
+        if self._root_end is not None:
+            return _loads(text[self._root_start : self._root_end])
+        if self._safe_cut is None:
+            raise ValueError(
+                f"AI response was truncated before any complete element. "
+                f"Raw output: {text[:200]!r}"
+            )
+        cut, closers = self._safe_cut
+        return _loads(text[self._root_start : cut] + closers)
+
+    def _mark_safe(self, offset: int) -> None:
+        if self._recover_depth is None or len(self._stack) > self._recover_depth:
+            return
+        closers = "".join(_CLOSER[opener] for opener, _ in reversed(self._stack))
+        self._safe_cut = (offset, closers)
+
+
+def _loads(text: str) -> Any:
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        # Models occasionally leave a trailing comma before a closing bracket
+        return json.loads(_TRAILING_COMMA.sub(r"\1", text))
+
+
+def _root_elements(root: str, elements: Optional[str]) -> Optional[str]:
+    if elements is None and root == "{":
+        elements = '"'
+    return None if elements is None else elements + _CLOSER[root]  # empty root is fine too
+
+
+def _find_root(text: str, pos: int, root: str, elements: Optional[str]) -> Optional[int]:
+    """
+    Offset of the first root opener from pos whose first element starts with
+    one of `elements`; None if there is none. -1 - offset when the text ends
+    before that first element, so the caller can wait for more.
+    """
+    while True:
+        i = text.find(root, pos)
+        if i == -1:
+            return None
+        if elements is None:
+            return i
+        m = _NON_SPACE.search(text, i + 1)
+        if m is None:
+            return -1 - i
+        if m.group() in elements:
+            return i
+        pos = i + 1
+
+
+def _fast_decode(text: str, root: str, elements: Optional[str]) -> Any:
+    """
+    Well-formed responses decode in C via raw_decode. None (no root of the
+    expected shape, or it does not decode) sends us down the scanning path.
+    """
+    start = _find_root(text, 0, root, _root_elements(root, elements))
+    if start is None or start < 0:
+        return None
+    try:
+        value, _ = _RAW_DECODER.raw_decode(text, start)
+    except json.JSONDecodeError:
+        return None
+    return value
+
+
+def decode_json_array(text: str, recover_depth: Optional[int] = 1, elements: Optional[str] = None) -> list:
+    """Decode a complete model response whose payload is a JSON array."""
+    value = _fast_decode(text, "[", elements)
+    if value is not None:
+        return value
+    decoder = IncrementalJSONDecoder(root="[", recover_depth=recover_depth, elements=elements)
+    decoder.feed(text)
+    return decoder.finish()
+
+
+def decode_json_object(text: str) -> dict:
+    """Decode a complete model response whose payload is a JSON object (no truncation recovery)."""
+    value = _fast_decode(text, "{", None)
+    if value is not None:
+        return value
+    decoder = IncrementalJSONDecoder(root="{")
+    decoder.feed(text)
+    return decoder.finish()
@@ -0,0 +1,188 @@
+"""
+Per-use-case model routing.
+
+A RoutingPolicy maps call kinds to an ordered list of model tiers, e.g.
+"instructions" -> haiku, "suggest" -> sonnet then haiku. Keys match the
+hedger's call kinds: "suggest:1" (single-slot regeneration) is looked up
+before "suggest", so one slot count can be routed on its own. Kinds with no
+route use the adapter's model, as before.
+
+ModelRouter keeps a rolling window of outcomes per (route, model). When a
+tier's recent p95 latency or error rate goes over the policy's budget it is
+downgraded: calls go to the next tier for `cooldown_seconds`, after which the
+tier is tried again. A call that fails upstream (overloaded, 5xx, connection)
+moves on to the next tier straight away. snapshot() shows, per route,
+which model is serving and each model's calls, errors, latency and tokens,
+with an estimated cost where the model's price is known.
+"""
+import os
+import time
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .hedging import LatencyTracker
+
+# USD per million (input, output) tokens, for the cost estimate in snapshot()
+MODEL_PRICES_PER_MTOK: Dict[str, Tuple[float, float]] = {
+    "claude-opus-4-6": (5.0, 25.0),
+    "claude-sonnet-4-6": (3.0, 15.0),
+    "claude-sonnet-4-5": (3.0, 15.0),
+    "claude-haiku-4-5": (1.0, 5.0),
+}
+
+
+@dataclass(frozen=True)
+class RoutingPolicy:
+    routes: Dict[str, Tuple[str, ...]] = field(default_factory=dict)  # kind -> model tiers, best first
+    latency_budget_seconds: Optional[float] = None  # p95 over this downgrades a tier
+    error_budget: float = 0.2  # share of failed calls in the window that downgrades a tier
+    min_samples: int = 10  # no downgrade on less history than this
+    window: int = 50  # recent outcomes kept per route and model
+    cooldown_seconds: float = 300.0  # how long a downgraded tier is skipped
+
+    @classmethod
+    def from_env(cls, prefix: str = "AI_ROUTE") -> Optional["RoutingPolicy"]:
+        """
+        None unless <prefix>S is set, as "kind=model[,fallback...];kind=...".
+        Also reads _LATENCY_BUDGET_SECONDS, _ERROR_BUDGET, _MIN_SAMPLES, _COOLDOWN_SECONDS.
+        """
+        spec = os.environ.get(f"{prefix}S", "").strip()
+        if not spec:
+            return None
+        defaults = cls()
+        budget = os.environ.get(f"{prefix}_LATENCY_BUDGET_SECONDS")
+        return cls(
+            routes=parse_routes(spec),
+            latency_budget_seconds=float(budget) if budget else None,
+            error_budget=float(os.environ.get(f"{prefix}_ERROR_BUDGET", defaults.error_budget)),
+            min_samples=int(os.environ.get(f"{prefix}_MIN_SAMPLES", defaults.min_samples)),
+            cooldown_seconds=float(
+                os.environ.get(f"{prefix}_COOLDOWN_SECONDS", defaults.cooldown_seconds)
+            ),
+        )
+
+
+def parse_routes(spec: str) -> Dict[str, Tuple[str, ...]]:
+    """ "instructions=claude-haiku-4-5;suggest=claude-sonnet-4-6,claude-haiku-4-5" -> routes."""
+    routes = {}
+    for entry in spec.split(";"):
+        if not entry.strip():
+            continue
+        kind, sep, models = entry.partition("=")
+        tiers = tuple(m.strip() for m in models.split(",") if m.strip())
+        if not sep or not kind.strip() or not tiers:
+            raise ValueError(f"Bad model route {entry!r}; expected kind=model[,fallback...]")
+        routes[kind.strip()] = tiers
+    return routes
+
+
+@dataclass
+class TierStats:
+    calls: int = 0
+    errors: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    downgrades: int = 0
+
+
+class _TierHealth:
+    def __init__(self, window: int) -> None:
+        self.stats = TierStats()
+        self.outcomes: deque = deque(maxlen=window)  # True = failed
+        self.latency = LatencyTracker(window)
+        self.downgraded_until = 0.0
+
+
+class ModelRouter:
+    """Process-wide (shared through AIClients) so tier health is learned from every request."""
+
+    def __init__(
+        self,
+        policy: Optional[RoutingPolicy] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.policy = policy or RoutingPolicy()
+        self._clock = clock
+        self._health: Dict[Tuple[str, str], _TierHealth] = {}
+
+    def route(self, kind: str) -> Optional[str]:
+        """The route key for a call kind: "suggest:1", else "suggest", else None (unrouted)."""
+        if kind in self.policy.routes:
+            return kind
+        use_case = kind.split(":")[0]
+        return use_case if use_case in self.policy.routes else None
+
+    def tiers(self, kind: str, default_model: str) -> List[str]:
+        """Models to try for this call, best available first; downgraded tiers go last."""
+        route = self.route(kind)
+        if route is None:
+            return [default_model]
+        now = self._clock()
+        models = list(self.policy.routes[route])
+        healthy = [m for m in models if self._health_of(route, m).downgraded_until <= now]
+        return healthy + [m for m in models if m not in healthy]
+
+    def record(
+        self,
+        kind: str,
+        model: str,
+        latency_seconds: float,
+        failed: bool,
+        input_tokens: int = 0,
+        output_tokens: int = 0,
+    ) -> None:
+        route = self.route(kind) or kind.split(":")[0]
+        health = self._health_of(route, model)
+        health.stats.calls += 1
+        health.stats.errors += failed
+        health.stats.input_tokens += input_tokens
+        health.stats.output_tokens += output_tokens
+        health.outcomes.append(failed)
+        if not failed:
+            health.latency.record(latency_seconds)
+        if route in self.policy.routes and self._over_budget(health):
+            health.downgraded_until = self._clock() + self.policy.cooldown_seconds
+            health.stats.downgrades += 1
+            # Judge the tier afresh when it comes back
+            health.outcomes.clear()
+            health.latency = LatencyTracker(self.policy.window)
+
+    def snapshot(self) -> dict:
+        now = self._clock()
+        routes: Dict[str, dict] = {}
+        for (route, model), health in sorted(self._health.items()):
+            entry = routes.setdefault(route, {"serving": None, "models": {}})
+            entry["models"][model] = {
+                **asdict(health.stats),
+                "latency_p50_seconds": health.latency.percentile(0.5),
+                "latency_p95_seconds": health.latency.percentile(0.95),
+                "estimated_cost_usd": estimated_cost(model, health.stats),
+                "downgraded": health.downgraded_until > now,
+            }
+        for route, entry in routes.items():
+            if route in self.policy.routes:
+                entry["serving"] = self.tiers(route, "")[0]
+        return {"routes": routes}
+
+    def _over_budget(self, health: _TierHealth) -> bool:
+        if len(health.outcomes) < self.policy.min_samples:
+            return False
+        if sum(health.outcomes) / len(health.outcomes) > self.policy.error_budget:
+            return True
+        budget = self.policy.latency_budget_seconds
+        p95 = health.latency.percentile(0.95)
+        return budget is not None and len(health.latency) >= self.policy.min_samples and p95 > budget
+
+    def _health_of(self, route: str, model: str) -> _TierHealth:
+        health = self._health.get((route, model))
+        if health is None:
+            health = self._health[(route, model)] = _TierHealth(self.policy.window)
+        return health
+
+
+def estimated_cost(model: str, stats: TierStats) -> Optional[float]:
+    price = MODEL_PRICES_PER_MTOK.get(model)
+    if price is None:
+        return None
+    return round((stats.input_tokens * price[0] + stats.output_tokens * price[1]) / 1_000_000, 4)
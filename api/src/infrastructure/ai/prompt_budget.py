@@ -0,0 +1,184 @@
+"""
+Token budgets for suggest and refine prompts.
+
+Prompts are sized locally, before anything is sent: estimate_tokens() is a
+character-count estimate (no tokenizer round trip), and the usage ledger keeps
+each call's estimate next to the input tokens the API reported, so the
+estimate can be checked per use case.
+
+- Input: the household/plan block is assembled with PromptContext. Lines that
+  must reach the model (members, dislikes, the current plan) are always kept;
+  preference lists are cut from the end, lowest priority first, until the
+  block fits `context_tokens`. A whole prompt still over `max_input_tokens` is
+  rejected with PromptBudgetExceeded instead of being sent.
+- Output: max_tokens is sized from the slots and options asked for rather than
+  a flat 8192. When the answer would not fit `max_output_tokens`, the adapter
+  downshifts: the slots are split across several smaller calls.
+"""
+import json
+import math
+import os
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, List, Optional, Tuple
+
+# Claude's tokenizer averages a little under 4 characters per token on English
+# prose; JSON and names run shorter, so the estimate errs on the high side.
+CHARS_PER_TOKEN = 3.5
+_MESSAGE_OVERHEAD_TOKENS = 4  # role and block framing per message
+_OUTPUT_FRAMING_TOKENS = 32  # outer JSON array, stray whitespace
+
+
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text) / CHARS_PER_TOKEN) if text else 0
+
+
+def estimate_call_tokens(system=None, messages: Iterable[dict] = (), tools=None) -> int:
+    """Estimated input tokens of a messages.create call, from its parameters."""
+    total = _content_tokens(system) if system else 0
+    for message in messages:
+        total += _MESSAGE_OVERHEAD_TOKENS + _content_tokens(message.get("content"))
+    if tools:
+        total += estimate_tokens(json.dumps(tools))
+    return total
+
+
+def _content_tokens(content) -> int:
+    if isinstance(content, str):
+        return estimate_tokens(content)
+    total = 0
+    for block in content or ():
+        if not isinstance(block, dict):  # SDK content blocks echoed back in tool loops
+            block = {"text": getattr(block, "text", None), "input": getattr(block, "input", None)}
+        if block.get("text"):
+            total += estimate_tokens(block["text"])
+        if block.get("input"):
+            total += estimate_tokens(json.dumps(block["input"]))
+        if block.get("content"):
+            total += _content_tokens(block["content"])
+    return total
+
+
+class PromptBudgetExceeded(ValueError):
+    """The request cannot be asked within the token budget, even after trimming and splitting."""
+
+
+@dataclass(frozen=True)
+class PromptBudget:
+    max_input_tokens: int = 6000  # whole prompt, system included; over this a call is rejected
+    context_tokens: int = 1500  # household/plan block; preference lists are trimmed to fit
+    max_output_tokens: int = 8192  # ceiling for one call's max_tokens
+    min_output_tokens: int = 1024  # floor, so small answers are never cut short
+    tokens_per_recipe: int = 250  # one recipe option as JSON, ingredients included
+    tokens_per_instructions: int = 300  # one recipe's steps
+    headroom: float = 0.25  # extra share of max_tokens over the expected output
+
+    @classmethod
+    def from_env(cls, prefix: str = "AI_PROMPT") -> "PromptBudget":
+        """Read <prefix>_MAX_INPUT_TOKENS, _CONTEXT_TOKENS, _MAX_OUTPUT_TOKENS, _TOKENS_PER_RECIPE."""
+        defaults = cls()
+        return cls(
+            max_input_tokens=int(os.environ.get(f"{prefix}_MAX_INPUT_TOKENS", defaults.max_input_tokens)),
+            context_tokens=int(os.environ.get(f"{prefix}_CONTEXT_TOKENS", defaults.context_tokens)),
+            max_output_tokens=int(
+                os.environ.get(f"{prefix}_MAX_OUTPUT_TOKENS", defaults.max_output_tokens)
+            ),
+            tokens_per_recipe=int(
+                os.environ.get(f"{prefix}_TOKENS_PER_RECIPE", defaults.tokens_per_recipe)
+            ),
+        )
+
+    def _sized(self, expected: float) -> int:
+        wanted = math.ceil(expected * (1 + self.headroom)) + _OUTPUT_FRAMING_TOKENS
+        return max(self.min_output_tokens, wanted)
+
+    def slot_tokens(self, slot_count: int, options_per_slot: int) -> int:
+        """max_tokens for an answer of slot_count groups of options_per_slot recipes."""
+        return min(self.max_output_tokens, self._sized(slot_count * options_per_slot * self.tokens_per_recipe))
+
+    def instructions_tokens(self, recipe_count: int) -> int:
+        return min(self.max_output_tokens, self._sized(recipe_count * self.tokens_per_instructions))
+
+    def slots_per_call(self, options_per_slot: int) -> int:
+        """Most slots one call can answer within max_output_tokens; 0 when not even one fits."""
+        per_slot = options_per_slot * self.tokens_per_recipe * (1 + self.headroom)
+        if per_slot <= 0:
+            return 0
+        return max(0, int((self.max_output_tokens - _OUTPUT_FRAMING_TOKENS) // per_slot))
+
+
+@dataclass
+class PromptBudgetStats:
+    """Process-wide counts of what the budget changed; token estimates live in the usage ledger."""
+    trimmed_prompts: int = 0
+    trimmed_items: int = 0  # preference-list entries left out
+    downshifted: int = 0  # requests split into smaller calls to fit max_output_tokens
+    rejected: int = 0  # prompts over max_input_tokens, never sent
+
+
+@dataclass
+class _Part:
+    render: Callable[[List[str]], str]
+    items: List[str] = field(default_factory=list)
+    priority: Optional[int] = None  # None: always kept whole; higher survives longer
+
+
+class PromptContext:
+    """
+    The lines of one prompt block, in order. Required lines are kept as
+    written; list lines lose items from the end (callers put the most relevant
+    first) and are left out when empty.
+    """
+
+    def __init__(self) -> None:
+        self._parts: List[_Part] = []
+
+    def line(self, text: str) -> None:
+        self._parts.append(_Part(render=lambda _, text=text: text))
+
+    def items(
+        self,
+        items: List[str],
+        render: Callable[[List[str]], str],
+        priority: Optional[int] = None,
+    ) -> None:
+        """A list line such as "- Liked ingredients: [...]"; skipped when `items` is empty."""
+        if items:
+            self._parts.append(_Part(render=render, items=list(items), priority=priority))
+
+    def build(self, budget_tokens: int) -> Tuple[str, int]:
+        """The block's text within budget_tokens (required lines permitting), and the items left out."""
+        kept = {i: part.items for i, part in enumerate(self._parts)}
+        remaining = budget_tokens - sum(
+            self._line_tokens(part.render(part.items)) for part in self._parts if part.priority is None
+        )
+        optional = sorted(
+            (i for i, part in enumerate(self._parts) if part.priority is not None),
+            key=lambda i: -self._parts[i].priority,
+        )
+        dropped = 0
+        for i in optional:
+            part = self._parts[i]
+            count = self._fitting_count(part, remaining)
+            kept[i] = part.items[:count]
+            dropped += len(part.items) - count
+            if count:
+                remaining -= self._line_tokens(part.render(kept[i]))
+        text = "\n".join(
+            part.render(kept[i]) for i, part in enumerate(self._parts) if kept[i] or not part.items
+        )
+        return text, dropped
+
+    def _fitting_count(self, part: _Part, remaining: int) -> int:
+        """Longest prefix of part.items whose line fits in `remaining` tokens (binary search)."""
+        low, high = 0, len(part.items)
+        while low < high:
+            mid = (low + high + 1) // 2
+            if self._line_tokens(part.render(part.items[:mid])) <= remaining:
+                low = mid
+            else:
+                high = mid - 1
+        return low
+
+    @staticmethod
+    def _line_tokens(text: str) -> int:
+        return estimate_tokens(text + "\n")
@@ -0,0 +1,153 @@
+"""
+Single-flight coalescing in front of AIPort.
+
+Concurrent identical calls share one upstream request: the first caller
+starts it and later callers with the same key wait on the same result. Keys:
+- generate_instructions: the recipe id (detail page loaded twice)
+- suggest_recipes / stream_suggest_recipes: household + request fingerprint
+  (double-submitted suggest or regenerate)
+
+Only work that is in flight is shared; once it finishes the key is free again
+(caching finished results is SuggestionCache's job). The shared work runs as
+its own task, so a caller that disconnects does not cancel it for the others.
+"""
+import asyncio
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional, TypeVar
+
+from application.ports.ai_port import AIPort, SuggestionRequest
+from domain.entities.recipe import Recipe
+from .forwarding import ForwardingAIAdapter
+
+T = TypeVar("T")
+
+
+@dataclass
+class SingleFlightStats:
+    leaders: int = 0  # upstream calls made
+    coalesced: int = 0  # calls that joined one in flight instead (work saved)
+    by_kind: Dict[str, int] = field(default_factory=dict)  # coalesced per call kind
+
+
+class _Broadcast:
+    """One inner stream replayed to every subscriber, late joiners included."""
+
+    def __init__(self, source: AsyncIterator[List[Recipe]]):
+        self._items: List[List[Recipe]] = []
+        self._error: Optional[BaseException] = None
+        self._finished = False
+        self._changed = asyncio.Condition()
+        self.task = asyncio.create_task(self._pump(source))
+
+    async def _pump(self, source: AsyncIterator[List[Recipe]]) -> None:
+        try:
+            async for item in source:
+                async with self._changed:
+                    self._items.append(item)
+                    self._changed.notify_all()
+        except Exception as exc:  # re-raised in every subscriber
+            self._error = exc
+        finally:
+            async with self._changed:
+                self._finished = True
+                self._changed.notify_all()
+
+    async def subscribe(self) -> AsyncIterator[List[Recipe]]:
+        index = 0
+        while True:
+            async with self._changed:
+                await self._changed.wait_for(
+                    lambda: index < len(self._items) or self._finished
+                )
+                ready = self._items[index:]
+                finished = self._finished
+            for item in ready:
+                yield list(item)
+            index += len(ready)
+            if finished and index >= len(self._items):
+                if self._error is not None:
+                    raise self._error
+                return
+
+
+class SingleFlight:
+    """Process-wide registry of in-flight calls. One event loop per worker."""
+
+    def __init__(self) -> None:
+        self._calls: Dict[str, asyncio.Task] = {}
+        self._streams: Dict[str, _Broadcast] = {}
+        self.stats = SingleFlightStats()
+
+    def in_flight(self) -> int:
+        return len(self._calls) + len(self._streams)
+
+    async def do(self, key: str, call: Callable[[], Awaitable[T]]) -> T:
+        """Run `call` unless the same key is already running; either way return its result."""
+        task = self._calls.get(key)
+        if task is None:
+            self.stats.leaders += 1
+            task = asyncio.create_task(call())
+            self._calls[key] = task
+            task.add_done_callback(lambda _: self._calls.pop(key, None))
+        else:
+            self._count(key)
+        return await asyncio.shield(task)
+
+    async def stream(
+        self, key: str, start: Callable[[], AsyncIterator[List[Recipe]]]
+    ) -> AsyncIterator[List[Recipe]]:
+        """Streaming counterpart of do(): joiners get every item from the start."""
+        broadcast = self._streams.get(key)
+        if broadcast is None:
+            self.stats.leaders += 1
+            broadcast = _Broadcast(start())
+            self._streams[key] = broadcast
+            broadcast.task.add_done_callback(lambda _: self._streams.pop(key, None))
+        else:
+            self._count(key)
+        async for item in broadcast.subscribe():
+            yield item
+
+    def _count(self, key: str) -> None:
+        kind = key.split(":", 1)[0]
+        self.stats.coalesced += 1
+        self.stats.by_kind[kind] = self.stats.by_kind.get(kind, 0) + 1
+
+
+class CoalescingAIAdapter(ForwardingAIAdapter):
+    """AIPort decorator sharing in-flight instruction and suggestion calls; others pass through."""
+
+    def __init__(self, inner: AIPort, single_flight: SingleFlight):
+        super().__init__(inner)
+        self._flight = single_flight
+
+    async def generate_instructions(self, recipe: Recipe) -> List[str]:
+        steps = await self._flight.do(
+            f"instructions:{recipe.id}", lambda: self._inner.generate_instructions(recipe)
+        )
+        return list(steps)
+
+    async def suggest_recipes(self, request: SuggestionRequest) -> List[List[Recipe]]:
+        key = _suggestion_key("suggest", request)
+        if key is None:
+            return await self._inner.suggest_recipes(request)
+        groups = await self._flight.do(key, lambda: self._inner.suggest_recipes(request))
+        return [list(group) for group in groups]
+
+    async def stream_suggest_recipes(
+        self, request: SuggestionRequest
+    ) -> AsyncIterator[List[Recipe]]:
+        key = _suggestion_key("suggest-stream", request)
+        if key is None:
+            groups = self._inner.stream_suggest_recipes(request)
+        else:
+            groups = self._flight.stream(key, lambda: self._inner.stream_suggest_recipes(request))
+        async for group in groups:
+            yield group
+
+
+def _suggestion_key(kind: str, request: SuggestionRequest) -> Optional[str]:
+    # Without a household two identical fingerprints may belong to different people
+    if request.household_id is None:
+        return None
+    return f"{kind}:{request.household_id}:{request.fingerprint()}:{request.allow_cached}"
@@ -0,0 +1,176 @@
+"""
+Fingerprint-keyed cache in front of AIPort.suggest_recipes.
+
+Two tiers:
+- household tier: per-household LRU with a TTL. Catches page reloads,
+  retried requests and double submits for the same household.
+- shared tier (opt-in): context-free requests — no preferences, no week
+  context, no recent history — keyed without member details so households
+  on a default template share one answer. Hits are returned with fresh
+  recipe ids so two households never confirm the same recipe row.
+
+The fingerprint already covers preferences, slots and members, so a change to
+any of them misses naturally; invalidate_household() also drops the stale
+entries right away when those are saved.
+"""
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from typing import AsyncIterator, Callable, List, Optional, Tuple
+from uuid import UUID, uuid4
+
+from application.ports.ai_port import AIPort, SuggestionRequest
+from domain.entities.recipe import Recipe
+from .forwarding import ForwardingAIAdapter
+
+Groups = List[List[Recipe]]
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    shared_hits: int = 0
+    misses: int = 0  # model calls whose result was stored
+    invalidations: int = 0
+
+
+class _TTLCache:
+    """Small LRU map with per-entry expiry."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float, clock: Callable[[], float]):
+        self._entries: "OrderedDict[str, Tuple[float, Groups]]" = OrderedDict()
+        self._max_entries = max_entries
+        self._ttl = ttl_seconds
+        self._clock = clock
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[Groups]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= self._clock():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def put(self, key: str, value: Groups) -> None:
+        self._entries[key] = (self._clock() + self._ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+
+class SuggestionCache:
+    """Process-wide store backing CachingAIAdapter. Not thread-safe; one event loop per worker."""
+
+    def __init__(
+        self,
+        ttl_seconds: float = 1800,
+        max_entries_per_household: int = 8,
+        max_households: int = 1000,
+        shared_enabled: bool = False,
+        shared_ttl_seconds: float = 6 * 3600,
+        shared_max_entries: int = 256,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._ttl = ttl_seconds
+        self._max_entries = max_entries_per_household
+        self._max_households = max_households
+        self._clock = clock
+        self._households: "OrderedDict[UUID, _TTLCache]" = OrderedDict()
+        self._shared = (
+            _TTLCache(shared_max_entries, shared_ttl_seconds, clock) if shared_enabled else None
+        )
+        self.stats = CacheStats()
+
+    def get(self, request: SuggestionRequest) -> Optional[Groups]:
+        if request.household_id is not None:
+            tier = self._households.get(request.household_id)
+            if tier is not None:
+                hit = tier.get(request.fingerprint())
+                if hit is not None:
+                    self._households.move_to_end(request.household_id)
+                    self.stats.hits += 1
+                    return _copy(hit, new_ids=False)
+        if self._shared is not None and request.is_context_free:
+            hit = self._shared.get(request.fingerprint(shared=True))
+            if hit is not None:
+                self.stats.shared_hits += 1
+                return _copy(hit, new_ids=True)
+        return None
+
+    def put(self, request: SuggestionRequest, groups: Groups) -> None:
+        self.stats.misses += 1  # every put follows a real model call
+        if request.household_id is not None:
+            tier = self._households.get(request.household_id)
+            if tier is None:
+                tier = _TTLCache(self._max_entries, self._ttl, self._clock)
+                self._households[request.household_id] = tier
+            self._households.move_to_end(request.household_id)
+            tier.put(request.fingerprint(), _copy(groups, new_ids=False))
+            while len(self._households) > self._max_households:
+                self._households.popitem(last=False)
+        if self._shared is not None and request.is_context_free:
+            self._shared.put(request.fingerprint(shared=True), _copy(groups, new_ids=False))
+
+    def invalidate_household(self, household_id: UUID) -> None:
+        """Drop every cached answer for a household (preferences, template or members changed)."""
+        if self._households.pop(household_id, None) is not None:
+            self.stats.invalidations += 1
+
+
+def _copy(groups: Groups, new_ids: bool) -> Groups:
+    return [
+        [
+            replace(
+                r,
+                id=uuid4() if new_ids else r.id,
+                ingredients=list(r.ingredients),
+                key_ingredients=list(r.key_ingredients),
+            )
+            for r in group
+        ]
+        for group in groups
+    ]
+
+
+class CachingAIAdapter(ForwardingAIAdapter):
+    """AIPort decorator serving suggest_recipes from a SuggestionCache; other calls pass through."""
+
+    def __init__(self, inner: AIPort, cache: SuggestionCache):
+        super().__init__(inner)
+        self._cache = cache
+
+    async def peek_suggestions(self, request: SuggestionRequest) -> Optional[Groups]:
+        if not request.allow_cached:
+            return None
+        cached = self._cache.get(request)
+        if cached is not None:
+            return cached
+        return await self._inner.peek_suggestions(request)
+
+    async def suggest_recipes(self, request: SuggestionRequest) -> Groups:
+        cached = await self.peek_suggestions(request)
+        if cached is not None:
+            return cached
+        groups = await self._inner.suggest_recipes(request)
+        self._cache.put(request, groups)
+        return groups
+
+    async def stream_suggest_recipes(
+        self, request: SuggestionRequest
+    ) -> AsyncIterator[List[Recipe]]:
+        cached = await self.peek_suggestions(request)
+        if cached is not None:
+            for group in cached:
+                yield group
+            return
+        groups: Groups = []
+        async for group in self._inner.stream_suggest_recipes(request):
+            groups.append(group)
+            yield group
+        self._cache.put(request, groups)
@@ -0,0 +1,143 @@
+"""
+Per-call AI usage ledger.
+
+ClaudeAdapter records every model call here: use case, model, token counts
+(prompt-cache reads and writes included), the input estimate made before
+sending, latency, stop_reason, hedged attempts, whether the output failed to
+parse (and, for slot answers, whether it came as tool input or text), and the
+household whose request made it. The ledger keeps per-use-case totals for
+/metrics/ai and buffers the records for UsageLedgerFlusher (api.usage_flush)
+to write to the ai_usage_ledger table in batches, off the request path.
+
+The household comes from a context variable bound when the request's
+household is resolved (and by background jobs that work for one household),
+so adapters, which are shared and household-agnostic, need no extra argument.
+"""
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from typing import Dict, Iterator, List, Optional
+from uuid import UUID
+
+from domain.entities.ai_usage import AIUsageRecord
+from .hedging import LatencyTracker
+
+_household: ContextVar[Optional[UUID]] = ContextVar("ai_usage_household", default=None)
+
+
+def bind_household(household_id: Optional[UUID]) -> None:
+    """Attribute the current request's model calls (and the tasks it spawns) to a household."""
+    _household.set(household_id)
+
+
+@contextmanager
+def household_context(household_id: Optional[UUID]) -> Iterator[None]:
+    token = _household.set(household_id)
+    try:
+        yield
+    finally:
+        _household.reset(token)
+
+
+def current_household() -> Optional[UUID]:
+    return _household.get()
+
+
+@dataclass
+class UseCaseUsage:
+    calls: int = 0
+    errors: int = 0
+    parse_failures: int = 0
+    extra_attempts: int = 0  # hedged duplicates sent
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cache_read_input_tokens: int = 0
+    cache_creation_input_tokens: int = 0
+    # Over the calls that returned usage, next to the prompt tokens they reported
+    estimated_input_tokens: int = 0
+    reported_input_tokens: int = 0
+    stop_reasons: Dict[str, int] = field(default_factory=dict)
+    # Answered calls and parse failures per slot output format ("tool", "text")
+    answered_by_output_format: Dict[str, int] = field(default_factory=dict)
+    parse_failures_by_output_format: Dict[str, int] = field(default_factory=dict)
+
+
+class UsageLedger:
+    """Process-wide (shared through AIClients). Buffer is bounded: oldest unflushed records drop first."""
+
+    def __init__(self, buffer_size: int = 10_000, latency_window: int = 500) -> None:
+        self._by_use_case: Dict[str, UseCaseUsage] = {}
+        self._latency: Dict[str, LatencyTracker] = {}
+        self._latency_window = latency_window
+        self._pending: deque = deque(maxlen=buffer_size)
+        self.dropped = 0
+
+    def record(self, record: AIUsageRecord) -> None:
+        usage = self._by_use_case.setdefault(record.use_case, UseCaseUsage())
+        usage.calls += 1
+        usage.errors += record.error is not None
+        usage.parse_failures += record.parse_failed
+        usage.extra_attempts += max(0, record.attempts - 1)
+        usage.input_tokens += record.input_tokens
+        usage.output_tokens += record.output_tokens
+        usage.cache_read_input_tokens += record.cache_read_input_tokens
+        usage.cache_creation_input_tokens += record.cache_creation_input_tokens
+        if record.estimated_input_tokens is not None and record.error is None:
+            usage.estimated_input_tokens += record.estimated_input_tokens
+            usage.reported_input_tokens += (
+                record.input_tokens + record.cache_read_input_tokens + record.cache_creation_input_tokens
+            )
+        if record.output_format and record.error is None:
+            fmt = record.output_format
+            usage.answered_by_output_format[fmt] = usage.answered_by_output_format.get(fmt, 0) + 1
+            usage.parse_failures_by_output_format[fmt] = (
+                usage.parse_failures_by_output_format.get(fmt, 0) + record.parse_failed
+            )
+        if record.stop_reason:
+            usage.stop_reasons[record.stop_reason] = usage.stop_reasons.get(record.stop_reason, 0) + 1
+        if record.error is None:
+            tracker = self._latency.setdefault(record.use_case, LatencyTracker(self._latency_window))
+            tracker.record(record.latency_ms / 1000)
+        self._enqueue(record)
+
+    def drain(self, limit: int = 500) -> List[AIUsageRecord]:
+        """Up to `limit` unflushed records, oldest first."""
+        return [self._pending.popleft() for _ in range(min(limit, len(self._pending)))]
+
+    def requeue(self, records: List[AIUsageRecord]) -> None:
+        """Put back records whose write failed, ahead of newer ones."""
+        for record in reversed(records):
+            if len(self._pending) == self._pending.maxlen:
+                self.dropped += 1
+                continue
+            self._pending.appendleft(record)
+
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def snapshot(self) -> dict:
+        by_use_case = {}
+        for name, usage in sorted(self._by_use_case.items()):
+            tracker = self._latency.get(name)
+            by_use_case[name] = {
+                **asdict(usage),
+                # Above 1 the local estimate runs high (safe); below 1 budgets are too loose
+                "input_estimate_ratio": (
+                    round(usage.estimated_input_tokens / usage.reported_input_tokens, 3)
+                    if usage.reported_input_tokens else None
+                ),
+                # Share of answers that could not be used, per slot output format
+                "parse_failure_rate_by_output_format": {
+                    fmt: round(usage.parse_failures_by_output_format[fmt] / answered, 3)
+                    for fmt, answered in sorted(usage.answered_by_output_format.items())
+                },
+                "latency_p50_seconds": tracker.percentile(0.5) if tracker else None,
+                "latency_p95_seconds": tracker.percentile(0.95) if tracker else None,
+            }
+        return {"by_use_case": by_use_case, "pending": self.pending(), "dropped": self.dropped}
+
+    def _enqueue(self, record: AIUsageRecord) -> None:
+        if len(self._pending) == self._pending.maxlen:
+            self.dropped += 1
+        self._pending.append(record)
@@ -0,0 +1,38 @@
+"""add_pregenerated_suggestions
+
+Revision ID: 7b1d3f5a9c2e
+Revises: 5c7d9e1f2a3b
+Create Date: 2026-03-02
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+
+# revision identifiers, used by Alembic.
+revision: str = "7b1d3f5a9c2e"
+down_revision: Union[str, None] = "5c7d9e1f2a3b"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "pregenerated_suggestions",
+        sa.Column(
+            "household_id",
+            UUID(as_uuid=True),
+            sa.ForeignKey("households.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("week_start_date", sa.String(10), nullable=False),
+        sa.Column("fingerprint", sa.String(64), nullable=False),
+        sa.Column("options", JSONB, nullable=False),
+        sa.Column("created_at", sa.DateTime, nullable=False, server_default=sa.func.now()),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("pregenerated_suggestions")
@@ -0,0 +1,39 @@
+"""add_recipe_import_cache
+
+Revision ID: 9d4e6f8a1b2c
+Revises: 7b1d3f5a9c2e
+Create Date: 2026-03-09
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects.postgresql import JSONB
+
+# revision identifiers, used by Alembic.
+revision: str = "9d4e6f8a1b2c"
+down_revision: Union[str, None] = "7b1d3f5a9c2e"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "recipe_import_cache",
+        sa.Column("url_key", sa.Text, primary_key=True),
+        sa.Column("recipe", JSONB, nullable=False),
+        sa.Column("etag", sa.Text, nullable=True),
+        sa.Column("last_modified", sa.String(64), nullable=True),
+        sa.Column("fetched_at", sa.DateTime, nullable=False),
+        sa.Column("last_hit_at", sa.DateTime, nullable=False),
+        sa.Column("hits", sa.Integer, nullable=False, server_default="0"),
+    )
+    op.create_index(
+        "ix_recipe_import_cache_last_hit_at", "recipe_import_cache", ["last_hit_at"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_recipe_import_cache_last_hit_at", table_name="recipe_import_cache")
+    op.drop_table("recipe_import_cache")
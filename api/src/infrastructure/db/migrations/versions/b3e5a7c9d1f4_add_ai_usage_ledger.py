@@ -0,0 +1,47 @@
+"""add_ai_usage_ledger
+
+Revision ID: b3e5a7c9d1f4
+Revises: 9d4e6f8a1b2c
+Create Date: 2026-03-12
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects.postgresql import UUID
+
+# revision identifiers, used by Alembic.
+revision: str = "b3e5a7c9d1f4"
+down_revision: Union[str, None] = "9d4e6f8a1b2c"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "ai_usage_ledger",
+        sa.Column("id", sa.Integer, primary_key=True, autoincrement=True),
+        sa.Column("household_id", UUID(as_uuid=True), sa.ForeignKey("households.id"), nullable=True),
+        sa.Column("use_case", sa.String(32), nullable=False),
+        sa.Column("model", sa.String(64), nullable=False),
+        sa.Column("input_tokens", sa.Integer, nullable=False, server_default="0"),
+        sa.Column("output_tokens", sa.Integer, nullable=False, server_default="0"),
+        sa.Column("cache_read_input_tokens", sa.Integer, nullable=False, server_default="0"),
+        sa.Column("cache_creation_input_tokens", sa.Integer, nullable=False, server_default="0"),
+        sa.Column("latency_ms", sa.Integer, nullable=False),
+        sa.Column("stop_reason", sa.String(32), nullable=True),
+        sa.Column("attempts", sa.Integer, nullable=False, server_default="1"),
+        sa.Column("streamed", sa.Boolean, nullable=False, server_default=sa.false()),
+        sa.Column("parse_failed", sa.Boolean, nullable=False, server_default=sa.false()),
+        sa.Column("error", sa.String(64), nullable=True),
+        sa.Column("created_at", sa.DateTime, nullable=False),
+    )
+    op.create_index(
+        "ix_ai_usage_ledger_household_created", "ai_usage_ledger", ["household_id", "created_at"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_ai_usage_ledger_household_created", table_name="ai_usage_ledger")
+    op.drop_table("ai_usage_ledger")
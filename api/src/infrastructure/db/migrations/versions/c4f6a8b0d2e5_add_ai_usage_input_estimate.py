@@ -0,0 +1,28 @@
+"""add_ai_usage_input_estimate
+
+Revision ID: c4f6a8b0d2e5
+Revises: b3e5a7c9d1f4
+Create Date: 2026-03-14
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "c4f6a8b0d2e5"
+down_revision: Union[str, None] = "b3e5a7c9d1f4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Local estimate of the prompt's size, to compare with the reported input tokens
+    op.add_column(
+        "ai_usage_ledger",
+        sa.Column("estimated_input_tokens", sa.Integer, nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("ai_usage_ledger", "estimated_input_tokens")
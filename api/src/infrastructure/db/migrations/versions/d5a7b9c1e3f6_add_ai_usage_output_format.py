@@ -0,0 +1,28 @@
+"""add_ai_usage_output_format
+
+Revision ID: d5a7b9c1e3f6
+Revises: c4f6a8b0d2e5
+Create Date: 2026-03-15
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "d5a7b9c1e3f6"
+down_revision: Union[str, None] = "c4f6a8b0d2e5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # How a suggest/refine answer came back ("tool" or "text"), to compare parse failures
+    op.add_column(
+        "ai_usage_ledger",
+        sa.Column("output_format", sa.String(8), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("ai_usage_ledger", "output_format")
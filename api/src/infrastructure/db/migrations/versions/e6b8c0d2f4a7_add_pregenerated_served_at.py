@@ -0,0 +1,28 @@
+"""add_pregenerated_served_at
+
+Revision ID: e6b8c0d2f4a7
+Revises: d5a7b9c1e3f6
+Create Date: 2026-03-16
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "e6b8c0d2f4a7"
+down_revision: Union[str, None] = "d5a7b9c1e3f6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # A stored set is served once; the row stays so the scheduler does not regenerate it
+    op.add_column(
+        "pregenerated_suggestions",
+        sa.Column("served_at", sa.DateTime, nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("pregenerated_suggestions", "served_at")
@@ -0,0 +1,41 @@
+from datetime import timezone
+from typing import List
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from domain.entities.ai_usage import AIUsageRecord
+from domain.repositories.ai_usage_repository import AIUsageRepository
+from .models import AIUsageRow
+
+
+class PostgresAIUsageRepository(AIUsageRepository):
+    def __init__(self, session: AsyncSession):
+        self._session = session
+
+    async def add_many(self, records: List[AIUsageRecord]) -> None:
+        if not records:
+            return
+        # One multi-row INSERT per flush
+        await self._session.execute(insert(AIUsageRow), [
+            dict(
+                household_id=r.household_id,
+                use_case=r.use_case,
+                model=r.model,
+                input_tokens=r.input_tokens,
+                output_tokens=r.output_tokens,
+                cache_read_input_tokens=r.cache_read_input_tokens,
+                cache_creation_input_tokens=r.cache_creation_input_tokens,
+                latency_ms=r.latency_ms,
+                stop_reason=r.stop_reason,
+                attempts=r.attempts,
+                streamed=r.streamed,
+                parse_failed=r.parse_failed,
+                error=r.error,
+                estimated_input_tokens=r.estimated_input_tokens,
+                output_format=r.output_format,
+                # Stored as naive UTC, like every other timestamp column
+                created_at=r.created_at.astimezone(timezone.utc).replace(tzinfo=None),
+            )
+            for r in records
+        ])
@@ -1,11 +1,11 @@
-from datetime import datetime, timedelta
-from typing import Optional
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
 from uuid import UUID, uuid4
 
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from .models import HouseholdRow, MagicLinkTokenRow, MealPlanTemplateRow
+from .models import HouseholdRow, MagicLinkTokenRow, MealPlanTemplateRow, WeeklyPlanRow
 
 TOKEN_TTL_MINUTES = 15
 
@@ -74,3 +74,21 @@ class AuthRepository:
             select(MealPlanTemplateRow.id).where(MealPlanTemplateRow.household_id == household_id)
         )
         return result.scalar_one_or_none() is not None
+
+    async def active_household_ids(self, since: datetime) -> List[UUID]:
+        """Households with a meal template that confirmed a plan, or signed up, after `since`."""
+        # The columns hold naive UTC; asyncpg refuses to compare them with an aware value
+        since = since.astimezone(timezone.utc).replace(tzinfo=None) if since.tzinfo else since
+        recent_plan = (
+            select(WeeklyPlanRow.id)
+            .where(WeeklyPlanRow.household_id == HouseholdRow.id)
+            .where(WeeklyPlanRow.created_at >= since)
+            .exists()
+        )
+        result = await self._session.execute(
+            select(HouseholdRow.id)
+            .join(MealPlanTemplateRow, MealPlanTemplateRow.household_id == HouseholdRow.id)
+            .where(recent_plan | (HouseholdRow.created_at >= since))
+            .order_by(HouseholdRow.created_at)
+        )
+        return list(result.scalars().all())
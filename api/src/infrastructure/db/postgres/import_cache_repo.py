@@ -0,0 +1,63 @@
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from domain.entities.import_cache import CachedImport
+from domain.repositories.import_cache_repository import ImportCacheRepository
+from .models import ImportCacheRow
+from .recipe_json import recipe_from_json, recipe_to_json
+
+
+class PostgresImportCacheRepository(ImportCacheRepository):
+    def __init__(self, session: AsyncSession):
+        self._session = session
+
+    async def get(self, url_key: str) -> Optional[CachedImport]:
+        row = await self._session.get(ImportCacheRow, url_key)
+        return self._to_entity(row) if row else None
+
+    async def save(self, entry: CachedImport) -> None:
+        values = dict(
+            recipe=recipe_to_json(entry.recipe),
+            etag=entry.etag,
+            last_modified=entry.last_modified,
+            fetched_at=_naive_utc(entry.fetched_at),
+            last_hit_at=_naive_utc(entry.last_hit_at),
+            hits=entry.hits,
+        )
+        # Upsert: two households may import the same new URL at once
+        stmt = insert(ImportCacheRow).values(url_key=entry.url_key, **values)
+        await self._session.execute(
+            stmt.on_conflict_do_update(index_elements=[ImportCacheRow.url_key], set_=values)
+        )
+
+    async def prune(self, max_entries: int) -> int:
+        keep = (
+            select(ImportCacheRow.url_key)
+            .order_by(ImportCacheRow.last_hit_at.desc())
+            .limit(max_entries)
+        )
+        result = await self._session.execute(
+            delete(ImportCacheRow).where(ImportCacheRow.url_key.not_in(keep))
+        )
+        return result.rowcount or 0
+
+    @staticmethod
+    def _to_entity(row: ImportCacheRow) -> CachedImport:
+        return CachedImport(
+            url_key=row.url_key,
+            recipe=recipe_from_json(row.recipe),
+            etag=row.etag,
+            last_modified=row.last_modified,
+            fetched_at=row.fetched_at.replace(tzinfo=timezone.utc),
+            last_hit_at=row.last_hit_at.replace(tzinfo=timezone.utc),
+            hits=row.hits,
+        )
+
+
+def _naive_utc(moment: datetime) -> datetime:
+    # Stored as naive UTC, like every other timestamp column
+    return moment.astimezone(timezone.utc).replace(tzinfo=None)
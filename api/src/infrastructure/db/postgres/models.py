@@ -10,12 +10,13 @@ from sqlalchemy import (
     DateTime,
     Float,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
     UniqueConstraint,
 )
-from sqlalchemy.dialects.postgresql import ARRAY, UUID as PG_UUID
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, UUID as PG_UUID
 from sqlalchemy.orm import DeclarativeBase, relationship
 
 
@@ -178,3 +179,62 @@ class UserPreferencesRow(Base):
     liked_ingredients = Column(ARRAY(String), nullable=False, default=list)
     disliked_ingredients = Column(ARRAY(String), nullable=False, default=list)
     cuisine_preferences = Column(ARRAY(String), nullable=False, default=list)
+
+
+# ---------------------------------------------------------------------------
+# Pre-generated suggestions
+# ---------------------------------------------------------------------------
+
+class PregeneratedSuggestionsRow(Base):
+    __tablename__ = "pregenerated_suggestions"
+
+    household_id = Column(PG_UUID(as_uuid=True), ForeignKey("households.id"), primary_key=True)
+    week_start_date = Column(String(10), nullable=False)  # 'YYYY-MM-DD'
+    fingerprint = Column(String(64), nullable=False)
+    options = Column(JSONB, nullable=False)  # [[recipe, ...], ...] per AI-filled slot
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    served_at = Column(DateTime, nullable=True)  # set when a suggest consumed the set
+
+
+# ---------------------------------------------------------------------------
+# URL import cache (shared across households)
+# ---------------------------------------------------------------------------
+
+class ImportCacheRow(Base):
+    __tablename__ = "recipe_import_cache"
+
+    url_key = Column(Text, primary_key=True)  # canonical URL
+    recipe = Column(JSONB, nullable=False)  # the parsed draft, per-serving quantities
+    etag = Column(Text, nullable=True)
+    last_modified = Column(String(64), nullable=True)  # HTTP-date, sent back verbatim
+    fetched_at = Column(DateTime, nullable=False)
+    last_hit_at = Column(DateTime, nullable=False, index=True)
+    hits = Column(Integer, nullable=False, default=0)
+
+
+# ---------------------------------------------------------------------------
+# AI usage ledger
+# ---------------------------------------------------------------------------
+
+class AIUsageRow(Base):
+    __tablename__ = "ai_usage_ledger"
+    __table_args__ = (Index("ix_ai_usage_ledger_household_created", "household_id", "created_at"),)
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    # Null for calls made outside a household's request
+    household_id = Column(PG_UUID(as_uuid=True), ForeignKey("households.id"), nullable=True)
+    use_case = Column(String(32), nullable=False)
+    model = Column(String(64), nullable=False)
+    input_tokens = Column(Integer, nullable=False, default=0)
+    output_tokens = Column(Integer, nullable=False, default=0)
+    cache_read_input_tokens = Column(Integer, nullable=False, default=0)
+    cache_creation_input_tokens = Column(Integer, nullable=False, default=0)
+    latency_ms = Column(Integer, nullable=False)
+    stop_reason = Column(String(32), nullable=True)
+    attempts = Column(Integer, nullable=False, default=1)
+    streamed = Column(Boolean, nullable=False, default=False)
+    parse_failed = Column(Boolean, nullable=False, default=False)
+    error = Column(String(64), nullable=True)
+    estimated_input_tokens = Column(Integer, nullable=True)
+    output_format = Column(String(8), nullable=True)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
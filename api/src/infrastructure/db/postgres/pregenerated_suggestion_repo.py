@@ -0,0 +1,58 @@
+from datetime import datetime, timezone
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from domain.entities.pregenerated_suggestions import PregeneratedSuggestions
+from domain.repositories.pregenerated_suggestion_repository import (
+    PregeneratedSuggestionRepository,
+)
+from .models import PregeneratedSuggestionsRow
+from .recipe_json import recipe_from_json, recipe_to_json
+
+
+class PostgresPregeneratedSuggestionRepository(PregeneratedSuggestionRepository):
+    def __init__(self, session: AsyncSession, household_id: UUID):
+        self._session = session
+        self._household_id = household_id
+
+    async def get(self) -> Optional[PregeneratedSuggestions]:
+        row = await self._session.get(PregeneratedSuggestionsRow, self._household_id)
+        return self._to_entity(row) if row else None
+
+    async def save(self, suggestions: PregeneratedSuggestions) -> None:
+        row = await self._session.get(PregeneratedSuggestionsRow, self._household_id)
+        if row is None:
+            row = PregeneratedSuggestionsRow(household_id=self._household_id)
+            self._session.add(row)
+        row.week_start_date = suggestions.week_start_date
+        row.fingerprint = suggestions.fingerprint
+        row.options = [[recipe_to_json(r) for r in group] for group in suggestions.options]
+        row.created_at = _naive_utc(suggestions.created_at)
+        row.served_at = _naive_utc(suggestions.served_at) if suggestions.served_at else None
+        await self._session.flush()
+
+    async def delete(self) -> None:
+        await self._session.execute(
+            delete(PregeneratedSuggestionsRow).where(
+                PregeneratedSuggestionsRow.household_id == self._household_id
+            )
+        )
+
+    @staticmethod
+    def _to_entity(row: PregeneratedSuggestionsRow) -> PregeneratedSuggestions:
+        return PregeneratedSuggestions(
+            week_start_date=row.week_start_date,
+            fingerprint=row.fingerprint,
+            options=[[recipe_from_json(d) for d in group] for group in row.options],
+            created_at=row.created_at.replace(tzinfo=timezone.utc),
+            served_at=row.served_at.replace(tzinfo=timezone.utc) if row.served_at else None,
+        )
+
+
+def _naive_utc(value: datetime) -> datetime:
+    # Stored as naive UTC, like every other timestamp column
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
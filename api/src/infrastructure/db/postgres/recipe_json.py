@@ -0,0 +1,48 @@
+"""Draft recipes as JSONB, for tables that hold recipes not (yet) in the recipes table."""
+from typing import List
+from uuid import UUID
+
+from domain.entities.recipe import GroceryCategory, Ingredient, Recipe
+
+
+def recipe_to_json(recipe: Recipe) -> dict:
+    return {
+        "id": str(recipe.id),
+        "name": recipe.name,
+        "emoji": recipe.emoji,
+        "prep_time": recipe.prep_time,
+        "key_ingredients": list(recipe.key_ingredients),
+        "ingredients": [
+            {
+                "name": i.name,
+                "quantity": i.quantity,
+                "unit": i.unit,
+                "category": i.category.value,
+            }
+            for i in recipe.ingredients
+        ],
+        "source_url": recipe.source_url,
+        "cooking_instructions": recipe.cooking_instructions,
+    }
+
+
+def recipe_from_json(data: dict) -> Recipe:
+    ingredients: List[Ingredient] = [
+        Ingredient(
+            name=i["name"],
+            quantity=float(i["quantity"]),
+            unit=i["unit"],
+            category=GroceryCategory(i["category"]),
+        )
+        for i in data["ingredients"]
+    ]
+    return Recipe(
+        id=UUID(data["id"]),
+        name=data["name"],
+        emoji=data["emoji"],
+        prep_time=int(data["prep_time"]),
+        ingredients=ingredients,
+        key_ingredients=list(data["key_ingredients"]),
+        source_url=data.get("source_url"),
+        cooking_instructions=data.get("cooking_instructions"),
+    )
@@ -156,6 +156,31 @@ class PostgresRecipeRepository(RecipeRepository):
         existing = await self._find_row_by_name(recipe.name)
         if existing is not None:
             raise ValueError(f"A recipe named '{recipe.name}' already exists.")
+        row = self._new_row(recipe)
+        self._session.add(row)
+        await self._session.flush()
+        return self._to_entity(row)
+
+    async def create_recipes(self, recipes: List[Recipe]) -> List[Recipe]:
+        names = {r.name for r in recipes}
+        result = await self._session.execute(
+            select(RecipeRow.name).where(
+                RecipeRow.household_id == self._household_id,
+                RecipeRow.name.in_(names),
+            )
+        )
+        taken = set(result.scalars().all())
+        rows = []
+        for recipe in recipes:
+            if recipe.name in taken:
+                continue
+            taken.add(recipe.name)
+            rows.append(self._new_row(recipe))
+        self._session.add_all(rows)
+        await self._session.flush()
+        return [self._to_entity(row) for row in rows]
+
+    def _new_row(self, recipe: Recipe) -> RecipeRow:
         row = RecipeRow(
             id=recipe.id,
             household_id=self._household_id,
@@ -171,9 +196,7 @@ class PostgresRecipeRepository(RecipeRepository):
         )
         for ing in recipe.ingredients:
             row.ingredients.append(self._ingredient_row(ing))
-        self._session.add(row)
-        await self._session.flush()
-        return self._to_entity(row)
+        return row
 
     async def full_update_recipe(
         self,
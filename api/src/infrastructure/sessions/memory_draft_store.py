@@ -0,0 +1,57 @@
+"""
+In-process DraftSessionStore: an LRU map with a sliding TTL.
+
+Every save restarts the session's TTL, so a household that keeps refining
+keeps its draft; one left idle expires and the client falls back to sending
+full recipes. Sessions live in this worker only, like the rate limiter and
+the suggestion cache, so a multi-worker deployment needs sticky sessions (or
+another DraftSessionStore).
+"""
+import time
+from collections import OrderedDict
+from typing import Callable, Optional, Tuple
+from uuid import UUID
+
+from application.ports.draft_session_store import DraftSession, DraftSessionStore
+
+DEFAULT_TTL_SECONDS = 6 * 3600
+DEFAULT_MAX_SESSIONS = 5000
+
+
+class InMemoryDraftSessionStore(DraftSessionStore):
+    """Process-wide. Not thread-safe; one event loop per worker."""
+
+    def __init__(
+        self,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        max_sessions: int = DEFAULT_MAX_SESSIONS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._ttl = ttl_seconds
+        self._max_sessions = max_sessions
+        self._clock = clock
+        self._sessions: "OrderedDict[UUID, Tuple[float, DraftSession]]" = OrderedDict()
+        self.evicted = 0  # dropped to stay under max_sessions before they expired
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    async def get(self, session_id: UUID) -> Optional[DraftSession]:
+        entry = self._sessions.get(session_id)
+        if entry is None:
+            return None
+        expires_at, session = entry
+        if expires_at <= self._clock():
+            del self._sessions[session_id]
+            return None
+        return session
+
+    async def save(self, session: DraftSession) -> None:
+        self._sessions[session.id] = (self._clock() + self._ttl, session)
+        self._sessions.move_to_end(session.id)
+        while len(self._sessions) > self._max_sessions:
+            self._sessions.popitem(last=False)
+            self.evicted += 1
+
+    async def delete(self, session_id: UUID) -> None:
+        self._sessions.pop(session_id, None)
@@ -0,0 +1,192 @@
+"""
+Reduce a fetched recipe page to the text the model needs.
+
+Raw pages are mostly scripts, styles, navigation, ads and comment threads;
+sent as-is and cut at a fixed length, the recipe card (usually below a long
+story) is often past the cutoff. HtmlReducer is a streaming HTMLParser: feed
+it chunks as they arrive and it keeps only visible content text, one line per
+block element. text() then narrows that to the recipe region — the span of
+lines inside elements whose class/id/itemtype mentions the recipe, else
+<main>/<article>, else the whole page — keeps the page's <h1>, and caps the
+result at a line boundary.
+"""
+import re
+from html.parser import HTMLParser
+from typing import AsyncIterator, List, Optional, Tuple
+
+from .html_structure import BLOCK_TAGS, IMPLIED_END, VOID_TAGS
+
+# Roughly 10k tokens — the old raw cap, now spent on content only
+MAX_REDUCED_CHARS = 40_000
+# Stop reading the response after this much raw HTML
+MAX_PAGE_CHARS = 2_000_000
+
+# Never content, wherever they appear
+_SKIP_TAGS = {
+    "script", "style", "noscript", "template", "svg", "canvas", "iframe", "object",
+    "nav", "aside", "form", "button", "select", "dialog",
+}
+# Site chrome at page level; inside <main>/<article> these are the recipe's own title bits
+_CHROME_TAGS = {"header", "footer"}
+_CONTENT_TAGS = {"main", "article"}
+_SKIP_CLASS = re.compile(
+    r"(?:^|[\s_-])(?:ads?|advert\w*|banner|comments?|comment-\w+|share|sharing|social|"
+    r"newsletter|subscribe|related|sidebar|cookies?|popup|modal|promo\w*|sponsor\w*|"
+    r"breadcrumbs?|jump-to-recipe)(?:$|[\s_-])",
+    re.I,
+)
+_RECIPE_HINT = re.compile(r"recipe|ingredient|instruction|direction", re.I)
+# A hinted span shorter than this is a widget (rating, print button), not the recipe
+_MIN_REGION_CHARS = 200
+
+
+class HtmlReducer(HTMLParser):
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        # Open elements: (tag, skips content, recipe hint, content region)
+        self._open: List[Tuple[str, bool, bool, bool]] = []
+        self._skipping = 0
+        self._hints = 0
+        self._regions = 0
+        self._parts: List[str] = []
+        self._line_hint = False
+        self._line_region = False
+        self._prefix = ""
+        # (text, inside a recipe-hinted element, inside <main>/<article>)
+        self._lines: List[Tuple[str, bool, bool]] = []
+        self._title: Optional[str] = None
+        self._in_h1 = False
+
+    def text(self, max_chars: int = MAX_REDUCED_CHARS) -> str:
+        """The reduced page. Call after close()."""
+        self._flush()
+        lines = self._lines
+        hinted = [i for i, (_, hint, _) in enumerate(lines) if hint]
+        region = [line for line, _, _ in lines[hinted[0]:hinted[-1] + 1]] if hinted else []
+        if sum(len(line) for line in region) < _MIN_REGION_CHARS:
+            region = [line for line, _, in_region in lines if in_region]
+        if sum(len(line) for line in region) < _MIN_REGION_CHARS:
+            region = [line for line, _, _ in lines]
+        if self._title and self._title not in region:
+            region.insert(0, self._title)
+
+        kept: List[str] = []
+        size = 0
+        for line in region:
+            if kept and line == kept[-1]:
+                continue
+            if size + len(line) + 1 > max_chars:
+                break
+            kept.append(line)
+            size += len(line) + 1
+        return "\n".join(kept)
+
+    def handle_starttag(self, tag: str, attrs: list) -> None:
+        a = {k: (v or "") for k, v in attrs}
+        self._close_implied(tag)
+        if tag in BLOCK_TAGS:
+            self._flush()
+        if tag == "li":
+            self._prefix = "- "
+        if tag in VOID_TAGS:
+            return
+
+        marker = " ".join((a.get("class", ""), a.get("id", "")))
+        hint = bool(
+            _RECIPE_HINT.search(marker)
+            or _RECIPE_HINT.search(a.get("itemtype", ""))
+            or _RECIPE_HINT.search(a.get("itemprop", ""))
+        )
+        skip = (
+            tag in _SKIP_TAGS
+            or (tag in _CHROME_TAGS and not self._regions)
+            or "hidden" in a
+            or a.get("aria-hidden") == "true"
+            or re.search(r"display\s*:\s*none", a.get("style", "")) is not None
+            or (not hint and _SKIP_CLASS.search(marker) is not None)
+        )
+        region = tag in _CONTENT_TAGS
+        self._open.append((tag, skip, hint, region))
+        self._skipping += skip
+        self._hints += hint
+        self._regions += region
+        if tag == "h1" and self._title is None:
+            self._in_h1 = True
+
+    def handle_startendtag(self, tag: str, attrs: list) -> None:
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_TAGS:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag in BLOCK_TAGS:
+            self._flush()
+        # HTML in the wild leaves elements unclosed: pop back to the matching tag
+        for index in range(len(self._open) - 1, -1, -1):
+            if self._open[index][0] == tag:
+                self._pop_to(index)
+                return
+
+    def handle_data(self, data: str) -> None:
+        if self._skipping or not data.strip():
+            if data and self._parts:
+                self._parts.append(" ")
+            return
+        self._parts.append(data)
+        self._line_hint = self._line_hint or self._hints > 0
+        self._line_region = self._line_region or self._regions > 0
+
+    def _flush(self) -> None:
+        line = " ".join("".join(self._parts).split())
+        if line:
+            if self._in_h1 and self._title is None:
+                self._title = line
+            self._lines.append((self._prefix + line, self._line_hint, self._line_region))
+        self._parts = []
+        self._line_hint = False
+        self._line_region = False
+        self._prefix = ""
+
+    def _close_implied(self, tag: str) -> None:
+        closes, stop_at = IMPLIED_END.get(tag, ((), ()))
+        for index in range(len(self._open) - 1, -1, -1):
+            open_tag = self._open[index][0]
+            if open_tag in stop_at:
+                return
+            if open_tag in closes:
+                self._pop_to(index)
+                return
+
+    def _pop_to(self, index: int) -> None:
+        while len(self._open) > index:
+            tag, skip, hint, region = self._open.pop()
+            self._skipping -= skip
+            self._hints -= hint
+            self._regions -= region
+            if tag == "h1":
+                self._flush()
+                self._in_h1 = False
+
+
+def reduce_html(page: str, max_chars: int = MAX_REDUCED_CHARS) -> str:
+    reducer = HtmlReducer()
+    reducer.feed(page)
+    reducer.close()
+    return reducer.text(max_chars)
+
+
+async def reduce_html_stream(
+    chunks: AsyncIterator[str],
+    max_chars: int = MAX_REDUCED_CHARS,
+    max_page_chars: int = MAX_PAGE_CHARS,
+) -> str:
+    """reduce_html over a response body as it downloads; stops reading at max_page_chars."""
+    reducer = HtmlReducer()
+    received = 0
+    async for chunk in chunks:
+        reducer.feed(chunk[: max_page_chars - received])
+        received += len(chunk)
+        if received >= max_page_chars:
+            break
+    reducer.close()
+    return reducer.text(max_chars)
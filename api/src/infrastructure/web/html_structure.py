@@ -0,0 +1,26 @@
+"""Tag tables shared by the stdlib HTMLParser passes over fetched recipe pages."""
+
+VOID_TAGS = {
+    "area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta",
+    "param", "source", "track", "wbr",
+}
+# Text on either side of these is a separate line (instruction steps are often <p>s)
+BLOCK_TAGS = {
+    "address", "article", "aside", "blockquote", "br", "dd", "div", "dl", "dt", "figure",
+    "footer", "h1", "h2", "h3", "h4", "h5", "h6", "header", "hr", "li", "main", "nav",
+    "ol", "p", "section", "table", "td", "th", "tr", "ul",
+}
+# Start tag -> open elements it implicitly closes, and the containers that stop the search
+IMPLIED_END = {
+    "li": ({"li"}, {"ul", "ol"}),
+    "dt": ({"dt", "dd"}, {"dl"}),
+    "dd": ({"dt", "dd"}, {"dl"}),
+    "tr": ({"tr", "td", "th"}, {"table"}),
+    "td": ({"td", "th"}, {"tr", "table"}),
+    "th": ({"td", "th"}, {"tr", "table"}),
+    "option": ({"option"}, {"select"}),
+    **{
+        tag: ({"p"}, {"div", "li", "td", "section", "article"})
+        for tag in ("p", "div", "ul", "ol", "table", "h1", "h2", "h3", "h4", "h5", "h6")
+    },
+}
@@ -0,0 +1,39 @@
+from typing import Optional
+
+import httpx
+
+from application.ports.recipe_page_port import RecipePage, RecipePagePort
+from .html_reducer import MAX_PAGE_CHARS
+from .schema_org import extract_recipe_draft
+
+USER_AGENT = "Mozilla/5.0 (compatible; DinnerSolvedBot/1.0)"
+
+
+class HttpRecipePageReader(RecipePagePort):
+    """Reads schema.org recipe data with the shared fetch client (see infrastructure.ai.clients)."""
+
+    def __init__(self, http_client: httpx.AsyncClient):
+        self._http = http_client
+
+    async def read_recipe(
+        self, url: str, etag: Optional[str] = None, last_modified: Optional[str] = None
+    ) -> RecipePage:
+        headers = {"User-Agent": USER_AGENT}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        response = await self._http.get(url, headers=headers)
+        if response.status_code == 304:
+            return RecipePage(
+                draft=None,
+                etag=response.headers.get("ETag", etag),
+                last_modified=response.headers.get("Last-Modified", last_modified),
+                not_modified=True,
+            )
+        response.raise_for_status()
+        return RecipePage(
+            draft=extract_recipe_draft(response.text[:MAX_PAGE_CHARS], url),
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+        )
@@ -9,15 +9,21 @@ from uuid import UUID
 
 from domain.entities.grocery import GroceryListItem
 from domain.entities.household import HouseholdMember
+from domain.entities.import_cache import CachedImport
 from domain.entities.meal_plan import MealSlot
+from domain.entities.pregenerated_suggestions import PregeneratedSuggestions
 from domain.entities.preferences import UserPreferences
 from domain.entities.recipe import Recipe
 from domain.repositories.household_repository import HouseholdRepository
+from domain.repositories.import_cache_repository import ImportCacheRepository
 from domain.repositories.meal_plan_repository import (
     MealPlanTemplateRepository,
     WeeklyPlanRepository,
 )
 from domain.entities.meal_plan import MealPlanTemplate, WeeklyPlan
+from domain.repositories.pregenerated_suggestion_repository import (
+    PregeneratedSuggestionRepository,
+)
 from domain.repositories.preference_repository import PreferenceRepository
 from domain.repositories.recipe_repository import RecipeRepository
 from application.ports.ai_port import AIPort, RefinementRequest, SuggestionRequest
@@ -140,6 +146,15 @@ class InMemoryRecipeRepository(RecipeRepository):
         self._recipes[new.id] = new
         return new
 
+    async def create_recipes(self, recipes: List[Recipe]) -> List[Recipe]:
+        created = []
+        for recipe in recipes:
+            try:
+                created.append(await self.create_recipe(recipe))
+            except ValueError:
+                continue
+        return created
+
     async def full_update_recipe(
         self,
         recipe_id: UUID,
@@ -207,13 +222,45 @@ class InMemoryPreferenceRepository(PreferenceRepository):
         self._preferences = preferences
 
 
+class InMemoryPregeneratedSuggestionRepository(PregeneratedSuggestionRepository):
+    def __init__(self):
+        self.stored: Optional[PregeneratedSuggestions] = None
+
+    async def get(self) -> Optional[PregeneratedSuggestions]:
+        return self.stored
+
+    async def save(self, suggestions: PregeneratedSuggestions) -> None:
+        self.stored = suggestions
+
+    async def delete(self) -> None:
+        self.stored = None
+
+
+class InMemoryImportCacheRepository(ImportCacheRepository):
+    def __init__(self):
+        self.entries: Dict[str, CachedImport] = {}
+
+    async def get(self, url_key: str) -> Optional[CachedImport]:
+        entry = self.entries.get(url_key)
+        return replace(entry) if entry else None  # callers mutate what they get, like a fresh row
+
+    async def save(self, entry: CachedImport) -> None:
+        self.entries[entry.url_key] = replace(entry)
+
+    async def prune(self, max_entries: int) -> int:
+        by_recency = sorted(self.entries.values(), key=lambda e: e.last_hit_at, reverse=True)
+        for entry in by_recency[max_entries:]:
+            del self.entries[entry.url_key]
+        return max(0, len(by_recency) - max_entries)
+
+
 class FakeAIPort(AIPort):
     """
     Returns fixed recipes regardless of the request.
 
     suggest_recipes / refine_recipes both return List[List[Recipe]]:
-    each recipe in `recipes_to_return` becomes a 3-item inner list
-    (the same recipe repeated for simplicity in tests).
+    each recipe in `recipes_to_return` becomes an inner list of
+    request.options_per_slot (3 for refine) copies of itself.
 
     For refine_recipes the fake respects locked_slot_ids, filtering slots
     so the returned list length matches the number of unlocked slots.
@@ -227,7 +274,8 @@ class FakeAIPort(AIPort):
 
     async def suggest_recipes(self, request: SuggestionRequest) -> List[List[Recipe]]:
         self.last_suggestion_request = request
-        return [[r, r, r] for r in self._recipes[: len(request.slots)]]
+        n = request.options_per_slot
+        return [[r] * n for r in self._recipes[: len(request.slots)]]
 
     async def refine_recipes(self, request: RefinementRequest) -> List[List[Recipe]]:
         self.last_refinement_request = request
@@ -0,0 +1,90 @@
+"""
+Shared AI client registry: pool configuration, stats, lifecycle, and adapters
+borrowing the pooled clients.
+"""
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+from infrastructure.ai import clients as ai_clients
+from infrastructure.ai.claude_adapter import ClaudeAdapter
+from infrastructure.ai.clients import FETCH_POOL, AIClients, PoolConfig
+
+
+class TestPoolConfig:
+    def test_from_env_overrides_defaults(self, monkeypatch):
+        monkeypatch.setenv("FETCH_HTTP_MAX_CONNECTIONS", "3")
+        monkeypatch.setenv("FETCH_HTTP_TIMEOUT_SECONDS", "2.5")
+
+        config = PoolConfig.from_env("FETCH_HTTP", FETCH_POOL)
+
+        assert config.max_connections == 3
+        assert config.timeout == 2.5
+        assert config.max_keepalive_connections == FETCH_POOL.max_keepalive_connections
+
+
+class TestRegistry:
+    async def test_stats_report_limits_and_empty_pools(self):
+        clients = AIClients(api_key="test")
+        try:
+            stats = clients.stats()
+        finally:
+            await clients.aclose()
+
+        fetch = stats["pools"]["fetch"]
+        assert fetch["max_connections"] == FETCH_POOL.max_connections
+        assert fetch["connections"] == 0 and fetch["queued_requests"] == 0
+        assert stats["tokens"]["calls"] == 0
+        assert stats["hedging"]["calls"] == 0
+
+    async def test_get_before_init_raises(self):
+        await ai_clients.close_ai_clients()
+        with pytest.raises(RuntimeError, match="not initialised"):
+            ai_clients.get_ai_clients()
+
+    async def test_init_then_close(self):
+        created = ai_clients.init_ai_clients("test")
+        assert ai_clients.get_ai_clients() is created
+
+        await ai_clients.close_ai_clients()
+        await ai_clients.close_ai_clients()  # second close is a no-op
+
+        assert created.fetch_http.is_closed
+
+
+class TestAdapterBorrowsClients:
+    async def test_recipe_fetch_uses_shared_http_client(self):
+        seen = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen.append(str(request.url))
+            return httpx.Response(200, text="<h1>Soup</h1>")
+
+        responses = iter([
+            SimpleNamespace(
+                stop_reason="tool_use",
+                content=[SimpleNamespace(
+                    type="tool_use", name="fetch_webpage", id="t1",
+                    input={"url": "https://example.com/soup"},
+                )],
+            ),
+            SimpleNamespace(
+                stop_reason="end_turn",
+                content=[SimpleNamespace(type="text", text='{"name": "Soup", "ingredients": []}')],
+            ),
+        ])
+
+        async def create(**kwargs):
+            return next(responses)
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as http_client:
+            adapter = ClaudeAdapter(
+                client=SimpleNamespace(messages=SimpleNamespace(create=create)),
+                http_client=http_client,
+            )
+            recipe = await adapter.parse_recipe_from_url("https://example.com/soup")
+
+        assert recipe.name == "Soup"
+        assert seen == ["https://example.com/soup"]
+        assert adapter.usage.calls == 2
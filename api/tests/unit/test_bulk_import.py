@@ -0,0 +1,154 @@
+import asyncio
+from uuid import uuid4
+
+import pytest
+
+from application.use_cases.bulk_import_recipes import MAX_BULK_URLS, BulkImportRecipesUseCase
+from application.use_cases.create_recipe import CreateRecipeUseCase
+from domain.entities.recipe import GroceryCategory, Ingredient, Recipe
+from tests.unit.fakes import InMemoryRecipeRepository
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def make_recipe(name: str) -> Recipe:
+    return Recipe(
+        id=uuid4(),
+        name=name,
+        emoji="🍲",
+        prep_time=30,
+        ingredients=[Ingredient("onion", 1.0, "whole", GroceryCategory.PRODUCE)],
+        key_ingredients=["onion"],
+    )
+
+
+class FakeImporter:
+    """Stands in for one ImportRecipeUseCase run; tracks calls and concurrency."""
+
+    def __init__(self, failures=None, delay: float = 0.01):
+        self.failures = dict(failures or {})  # url -> exceptions to raise, in order
+        self.delay = delay
+        self.calls = []
+        self.running = 0
+        self.peak = 0
+
+    async def __call__(self, url: str) -> Recipe:
+        self.calls.append(url)
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        try:
+            await asyncio.sleep(self.delay)
+            pending = self.failures.get(url)
+            if pending:
+                raise pending.pop(0)
+            return make_recipe(url.rsplit("/", 1)[-1])
+        finally:
+            self.running -= 1
+
+
+async def collect(use_case, urls):
+    return [item async for item in use_case.execute(urls)]
+
+
+# ---------------------------------------------------------------------------
+# BulkImportRecipesUseCase
+# ---------------------------------------------------------------------------
+
+async def test_imports_every_url_with_bounded_concurrency():
+    importer = FakeImporter()
+    use_case = BulkImportRecipesUseCase(importer, concurrency=3)
+    urls = [f"https://example.com/r{i}" for i in range(10)]
+
+    items = await collect(use_case, urls)
+
+    assert sorted(i.index for i in items) == list(range(10))
+    assert all(i.ok and i.recipe.name == f"r{i.index}" for i in items)
+    assert importer.peak == 3
+
+
+async def test_transient_errors_are_retried_and_value_errors_are_not():
+    importer = FakeImporter(failures={
+        "https://example.com/flaky": [TimeoutError("slow")],
+        "https://example.com/down": [OSError("refused")] * 3,
+        "https://example.com/blog": [ValueError("No recipe found")],
+    })
+    use_case = BulkImportRecipesUseCase(importer, max_attempts=2, retry_delay_seconds=0)
+
+    items = {i.url: i for i in await collect(use_case, [
+        "https://example.com/flaky", "https://example.com/down", "https://example.com/blog",
+    ])}
+
+    assert items["https://example.com/flaky"].ok and items["https://example.com/flaky"].attempts == 2
+    assert items["https://example.com/down"].error == "refused" and items["https://example.com/down"].attempts == 2
+    assert items["https://example.com/blog"].error == "No recipe found"
+    assert items["https://example.com/blog"].attempts == 1
+
+
+async def test_duplicate_urls_are_imported_once():
+    importer = FakeImporter()
+    use_case = BulkImportRecipesUseCase(importer)
+
+    items = await collect(use_case, [
+        "https://example.com/chili", "https://www.example.com/chili/?utm_source=x", "",
+    ])
+
+    assert len(importer.calls) == 1
+    by_index = {i.index: i for i in items}
+    assert by_index[0].ok and by_index[1].ok
+    assert by_index[1].url == "https://www.example.com/chili/?utm_source=x"
+    assert by_index[2].error == "Empty URL."
+
+
+async def test_results_stream_as_they_finish():
+    importer = FakeImporter()
+    importer.delay = 0
+    slow = FakeImporter(delay=0.2)
+
+    async def import_one(url):
+        return await (slow if url.endswith("slow") else importer)(url)
+
+    use_case = BulkImportRecipesUseCase(import_one, concurrency=2)
+    items = await collect(use_case, ["https://example.com/slow", "https://example.com/fast"])
+
+    assert [i.url for i in items] == ["https://example.com/fast", "https://example.com/slow"]
+
+
+async def test_closing_the_stream_cancels_pending_imports():
+    importer = FakeImporter(delay=10)
+    use_case = BulkImportRecipesUseCase(importer, concurrency=2)
+    stream = use_case.execute([f"https://example.com/r{i}" for i in range(4)])
+
+    first = asyncio.ensure_future(stream.__anext__())
+    await asyncio.sleep(0.01)
+    first.cancel()  # as when the client disconnects mid-stream
+    with pytest.raises(asyncio.CancelledError):
+        await first
+    await asyncio.sleep(0)
+
+    assert importer.running == 0
+
+
+@pytest.mark.parametrize("urls", [[], ["  "], ["https://example.com/x"] * (MAX_BULK_URLS + 1)])
+def test_rejects_empty_and_oversized_lists(urls):
+    with pytest.raises(ValueError):
+        BulkImportRecipesUseCase(FakeImporter()).execute(urls)
+
+
+# ---------------------------------------------------------------------------
+# Bulk save
+# ---------------------------------------------------------------------------
+
+async def test_bulk_save_skips_existing_and_repeated_names():
+    repo = InMemoryRecipeRepository()
+    await repo.create_recipe(make_recipe("Chili"))
+    use_case = CreateRecipeUseCase(recipe_repo=repo)
+
+    saved, skipped = await use_case.execute_many(
+        [make_recipe("Chili"), make_recipe("Dal"), make_recipe("Dal"), make_recipe("Soup")]
+    )
+
+    assert [r.name for r in saved] == ["Dal", "Soup"]
+    assert skipped == ["Chili", "Dal"]
+    assert len(await repo.get_recipes()) == 3
@@ -0,0 +1,153 @@
+"""
+Record/replay cassette adapters: exchanges round-trip through the file with no network.
+"""
+import uuid
+
+import pytest
+
+from application.ports.ai_port import SuggestionRequest
+from domain.entities.household import HouseholdMember
+from domain.entities.meal_plan import DayOfWeek, MealSlot, MealType
+from domain.entities.recipe import GroceryCategory, Ingredient, Recipe
+from infrastructure.ai.cassette import Cassette, CassetteMiss, RecordingAIAdapter, ReplayAIAdapter
+from tests.unit.fakes import FakeAIPort
+
+
+def make_recipe(name: str) -> Recipe:
+    return Recipe(
+        id=uuid.uuid4(),
+        name=name,
+        emoji="🍲",
+        prep_time=20,
+        ingredients=[Ingredient("rice", 0.5, "cups", GroceryCategory.PANTRY)],
+        key_ingredients=["rice"],
+    )
+
+
+def make_request(n_slots: int, member: str = "Sam") -> SuggestionRequest:
+    return SuggestionRequest(
+        slots=[
+            MealSlot(id=uuid.uuid4(), name=f"Slot {i}", meal_type=MealType.DINNER,
+                     days=[DayOfWeek.MON], member_ids=[])
+            for i in range(n_slots)
+        ],
+        members=[HouseholdMember(id=uuid.uuid4(), name=member, emoji="🙂", serving_size=1.0)],
+        disliked_ingredients=["olives"],
+        liked_ingredients=[],
+        cuisine_preferences=[],
+    )
+
+
+class Ticker:
+    """Clock that advances a fixed step per reading."""
+
+    def __init__(self, step: float) -> None:
+        self.now = 0.0
+        self.step = step
+
+    def __call__(self) -> float:
+        self.now += self.step
+        return self.now
+
+
+class FakeSleep:
+    def __init__(self) -> None:
+        self.slept: list = []
+
+    async def __call__(self, seconds: float) -> None:
+        self.slept.append(round(seconds, 3))
+
+
+class NoRecipeAIPort(FakeAIPort):
+    async def parse_recipe_from_url(self, url: str) -> Recipe:
+        raise ValueError("No recipe found")
+
+
+async def record(tmp_path, inner=None, step: float = 0.25) -> Cassette:
+    cassette = Cassette(tmp_path / "ai.jsonl")
+    recorder = RecordingAIAdapter(
+        inner or FakeAIPort([make_recipe("Stew"), make_recipe("Curry")]), cassette, clock=Ticker(step)
+    )
+    request = make_request(2)
+    await recorder.suggest_recipes(request)
+    _ = [g async for g in recorder.stream_suggest_recipes(request)]
+    await recorder.generate_instructions(make_recipe("Stew"))
+    return cassette
+
+
+class TestRecordAndReplay:
+    async def test_replays_from_the_file_with_fresh_ids(self, tmp_path):
+        recorded = await record(tmp_path)
+        replay = ReplayAIAdapter(Cassette(recorded.path), latency="none")
+        request = make_request(2)
+
+        groups = await replay.suggest_recipes(request)
+
+        assert [g[0].name for g in groups] == ["Stew", "Curry"]
+        assert len({r.id for g in groups for r in g}) == 6  # every option its own id
+        assert await replay.generate_instructions(make_recipe("stew ")) == [
+            "Step 1: Prepare Stew.", "Step 2: Cook and serve."
+        ]
+
+    async def test_other_household_gets_a_recording_of_the_same_shape(self, tmp_path):
+        cassette = Cassette((await record(tmp_path)).path)
+        replay = ReplayAIAdapter(cassette, latency="none")
+
+        groups = await replay.suggest_recipes(make_request(2, member="Alex"))
+
+        assert len(groups) == 2
+        assert (cassette.stats.exact_hits, cassette.stats.shape_hits) == (0, 1)
+
+    async def test_unknown_shape_is_a_miss(self, tmp_path):
+        replay = ReplayAIAdapter(Cassette((await record(tmp_path)).path), latency="none")
+
+        with pytest.raises(CassetteMiss):
+            await replay.suggest_recipes(make_request(5))
+
+    async def test_recorded_value_error_is_replayed(self, tmp_path):
+        cassette = Cassette(tmp_path / "ai.jsonl")
+        recorder = RecordingAIAdapter(NoRecipeAIPort(), cassette)
+        with pytest.raises(ValueError):
+            await recorder.parse_recipe_from_url("https://example.com/about?utm_source=x")
+
+        replay = ReplayAIAdapter(Cassette(cassette.path), latency="none")
+        with pytest.raises(ValueError, match="No recipe found"):
+            await replay.parse_recipe_from_url("https://www.example.com/about")
+
+
+class TestReplayLatency:
+    async def test_recorded_latency_is_scaled(self, tmp_path):
+        sleep = FakeSleep()
+        replay = ReplayAIAdapter(
+            Cassette((await record(tmp_path)).path), latency="recorded", latency_scale=2.0, sleep=sleep
+        )
+
+        await replay.suggest_recipes(make_request(2))
+
+        assert sleep.slept == [0.5]  # recorded 250 ms, doubled
+
+    async def test_stream_keeps_the_recorded_rhythm(self, tmp_path):
+        sleep = FakeSleep()
+        replay = ReplayAIAdapter(Cassette((await record(tmp_path)).path), sleep=sleep)
+
+        groups = [g async for g in replay.stream_suggest_recipes(make_request(2))]
+
+        assert len(groups) == 2
+        assert sleep.slept == [0.25, 0.25]  # one tick before each group arrived
+
+    async def test_sampled_latency_is_deterministic_per_seed(self, tmp_path):
+        path = (await record(tmp_path)).path
+        runs = []
+        for _ in range(2):
+            sleep = FakeSleep()
+            replay = ReplayAIAdapter(Cassette(path), latency="sampled", seed=7, sleep=sleep)
+            for _ in range(5):
+                await replay.suggest_recipes(make_request(2))
+            runs.append(sleep.slept)
+
+        assert runs[0] == runs[1]
+        assert set(runs[0]) <= {0.25}  # only latencies the cassette actually holds
+
+    def test_rejects_unknown_latency_mode(self, tmp_path):
+        with pytest.raises(ValueError, match="latency mode"):
+            ReplayAIAdapter(Cassette(tmp_path / "none.jsonl"), latency="gaussian")
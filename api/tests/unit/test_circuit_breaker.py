@@ -0,0 +1,270 @@
+import uuid
+
+import pytest
+
+from application.ports.ai_port import AIUnavailable, SuggestionRequest
+from application.use_cases.suggest_recipes import SuggestRecipesUseCase
+from domain.entities.meal_plan import DayOfWeek, MealPlanTemplate, MealSlot, MealType
+from domain.entities.recipe import GroceryCategory, Ingredient, Recipe
+from infrastructure.ai.circuit_breaker import (
+    BreakerPolicy,
+    CircuitBreaker,
+    CircuitBreakingAIAdapter,
+    CircuitState,
+)
+from tests.unit.fakes import (
+    FakeAIPort,
+    InMemoryHouseholdRepository,
+    InMemoryMealPlanTemplateRepository,
+    InMemoryPreferenceRepository,
+    InMemoryRecipeRepository,
+)
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FlakyAIPort(FakeAIPort):
+    """Raises `error` from every call while it is set."""
+
+    def __init__(self, recipes_to_return=None):
+        super().__init__(recipes_to_return)
+        self.error = None
+        self.calls = 0
+
+    async def suggest_recipes(self, request):
+        self.calls += 1
+        if self.error is not None:
+            raise self.error
+        return await super().suggest_recipes(request)
+
+    async def stream_suggest_recipes(self, request):
+        for group in await self.suggest_recipes(request):
+            yield group
+
+
+def make_slot(name: str = "Dinner") -> MealSlot:
+    return MealSlot(uuid.uuid4(), name, MealType.DINNER, [DayOfWeek.MON], [])
+
+
+def make_recipe(name: str = "Pasta") -> Recipe:
+    return Recipe(
+        id=uuid.uuid4(),
+        name=name,
+        emoji="🍝",
+        prep_time=30,
+        ingredients=[Ingredient("Pasta", 2.0, "oz", GroceryCategory.PANTRY)],
+        key_ingredients=["pasta"],
+    )
+
+
+def make_request() -> SuggestionRequest:
+    return SuggestionRequest(
+        slots=[make_slot()], members=[], disliked_ingredients=[],
+        liked_ingredients=[], cuisine_preferences=[],
+    )
+
+
+def breaker_adapter(inner, clock):
+    breaker = CircuitBreaker(BreakerPolicy(min_calls=3, open_seconds=30, slow_call_seconds=10), clock=clock)
+    return CircuitBreakingAIAdapter(inner, breaker), breaker
+
+
+async def trip(adapter, inner):
+    inner.error = ConnectionError("overloaded")
+    for _ in range(3):
+        with pytest.raises(ConnectionError):
+            await adapter.suggest_recipes(make_request())
+
+
+# ---------------------------------------------------------------------------
+# Breaker
+# ---------------------------------------------------------------------------
+
+class TestCircuitBreaker:
+    async def test_opens_on_errors_and_then_fails_fast(self):
+        inner = FlakyAIPort([make_recipe()])
+        adapter, breaker = breaker_adapter(inner, Clock())
+
+        await trip(adapter, inner)
+
+        with pytest.raises(AIUnavailable) as exc_info:
+            await adapter.suggest_recipes(make_request())
+        assert inner.calls == 3  # the fourth call never reached the API
+        assert exc_info.value.retry_after_seconds == 30
+        assert not adapter.available()
+        assert (breaker.stats.opened, breaker.stats.rejected) == (1, 1)
+
+    async def test_unusable_answers_do_not_open_it(self):
+        inner = FlakyAIPort([make_recipe()])
+        adapter, breaker = breaker_adapter(inner, Clock())
+        inner.error = ValueError("bad JSON")
+
+        for _ in range(5):
+            with pytest.raises(ValueError):
+                await adapter.suggest_recipes(make_request())
+
+        assert breaker.state is CircuitState.CLOSED
+
+    async def test_slow_calls_count_as_failures(self):
+        clock = Clock()
+
+        class SlowAIPort(FakeAIPort):
+            async def suggest_recipes(self, request):
+                clock.now += 11
+                return await super().suggest_recipes(request)
+
+        adapter, breaker = breaker_adapter(SlowAIPort([make_recipe()]), clock)
+
+        for _ in range(3):
+            await adapter.suggest_recipes(make_request())
+
+        assert breaker.state is CircuitState.OPEN
+        assert breaker.stats.slow_calls == 3
+
+    async def test_half_open_probe_closes_on_success(self):
+        clock = Clock()
+        inner = FlakyAIPort([make_recipe()])
+        adapter, breaker = breaker_adapter(inner, clock)
+        await trip(adapter, inner)
+
+        clock.now = 31
+        inner.error = None
+        assert breaker.state is CircuitState.HALF_OPEN
+        await adapter.suggest_recipes(make_request())
+
+        assert breaker.state is CircuitState.CLOSED
+        assert breaker.stats.probes == 1
+
+    async def test_failed_probe_stays_open_for_another_round(self):
+        clock = Clock()
+        inner = FlakyAIPort([make_recipe()])
+        adapter, breaker = breaker_adapter(inner, clock)
+        await trip(adapter, inner)
+
+        clock.now = 31
+        with pytest.raises(ConnectionError):
+            await adapter.suggest_recipes(make_request())
+
+        assert breaker.state is CircuitState.OPEN
+        assert breaker.retry_after() == 30
+
+    async def test_instruction_failures_do_not_open_the_suggest_breaker(self):
+        class FailingInstructionsPort(FlakyAIPort):
+            async def generate_instructions_batch(self, recipes):
+                raise ConnectionError("overloaded")
+
+        clock = Clock()
+        policy = BreakerPolicy(min_calls=3, open_seconds=30)
+        suggest, instructions = CircuitBreaker(policy, clock=clock), CircuitBreaker(policy, clock=clock)
+        adapter = CircuitBreakingAIAdapter(
+            FailingInstructionsPort([make_recipe()]), suggest, instructions_breaker=instructions
+        )
+
+        for _ in range(3):
+            with pytest.raises(ConnectionError):
+                await adapter.generate_instructions_batch([make_recipe()])
+
+        assert instructions.state is CircuitState.OPEN
+        assert suggest.state is CircuitState.CLOSED and adapter.available()
+        assert len(await adapter.suggest_recipes(make_request())) == 1
+
+    def test_policy_is_opt_in(self, monkeypatch):
+        monkeypatch.delenv("AI_BREAKER_ENABLED", raising=False)
+        assert BreakerPolicy.from_env("AI_BREAKER") is None
+
+        monkeypatch.setenv("AI_BREAKER_ENABLED", "true")
+        assert BreakerPolicy.from_env("AI_BREAKER").min_calls == 10
+
+    async def test_stream_closed_early_is_not_an_outcome(self):
+        adapter, breaker = breaker_adapter(FlakyAIPort([make_recipe(), make_recipe()]), Clock())
+        request = make_request()
+        request.slots = [make_slot(), make_slot()]
+
+        stream = adapter.stream_suggest_recipes(request)
+        await anext(stream)
+        await stream.aclose()
+
+        assert breaker.stats.calls == 0
+
+
+# ---------------------------------------------------------------------------
+# Library fallback
+# ---------------------------------------------------------------------------
+
+class OpenCircuitAIPort(FakeAIPort):
+    def available(self) -> bool:
+        return False
+
+    async def suggest_recipes(self, request):
+        raise AIUnavailable("AI is temporarily unavailable; try again shortly.", retry_after_seconds=30)
+
+
+def build_use_case(template, recipe_repo) -> SuggestRecipesUseCase:
+    return SuggestRecipesUseCase(
+        ai_adapter=OpenCircuitAIPort(),
+        template_repo=InMemoryMealPlanTemplateRepository(template),
+        household_repo=InMemoryHouseholdRepository(),
+        preference_repo=InMemoryPreferenceRepository(),
+        recipe_repo=recipe_repo,
+    )
+
+
+def library(*names: str) -> InMemoryRecipeRepository:
+    repo = InMemoryRecipeRepository()
+    for name in names:
+        r = make_recipe(name)
+        repo._recipes[r.id] = r  # never cooked, so not excluded as recent
+    return repo
+
+
+class TestLibraryFallback:
+    async def test_suggest_serves_the_library_flagged_degraded(self):
+        template = MealPlanTemplate(id=uuid.uuid4(), slots=[make_slot("Mon"), make_slot("Tue")])
+        use_case = build_use_case(template, library("Lasagna", "Chili", "Risotto", "Paella"))
+
+        result = await use_case.execute()
+        streamed = [so async for so in await use_case.stream()]
+
+        assert not use_case.ai_available
+        assert [len(so.options) for so in result] == [3, 1]
+        assert all(so.degraded for so in result + streamed)
+
+    async def test_regenerate_skips_recipes_chosen_elsewhere(self):
+        template = MealPlanTemplate(id=uuid.uuid4(), slots=[make_slot("Mon"), make_slot("Tue")])
+        repo = library("Lasagna", "Chili")
+        use_case = build_use_case(template, repo)
+        chili = next(r for r in repo._recipes.values() if r.name == "Chili")
+
+        result = await use_case.execute_for_slot(
+            slot_id=str(template.slots[0].id), existing_chosen={str(template.slots[1].id): chili}
+        )
+
+        assert [r.name for r in result.options] == ["Lasagna"]
+        assert result.degraded
+
+    async def test_empty_library_surfaces_the_outage(self):
+        template = MealPlanTemplate(id=uuid.uuid4(), slots=[make_slot()])
+        use_case = build_use_case(template, InMemoryRecipeRepository())
+
+        with pytest.raises(AIUnavailable) as exc_info:
+            await use_case.execute()
+        assert exc_info.value.retry_after_seconds == 30
+
+    async def test_slot_left_empty_surfaces_the_outage(self):
+        template = MealPlanTemplate(id=uuid.uuid4(), slots=[make_slot("Mon"), make_slot("Tue")])
+        use_case = build_use_case(template, library("Lasagna"))
+
+        with pytest.raises(AIUnavailable):
+            await use_case.execute()
+        with pytest.raises(AIUnavailable):
+            await use_case.stream()
@@ -0,0 +1,548 @@
+"""
+ClaudeAdapter tests against a fake Anthropic client — no network.
+"""
+import json
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+
+from application.ports.ai_port import SuggestionRequest
+from domain.entities.meal_plan import DayOfWeek, MealSlot, MealType
+from infrastructure.ai.claude_adapter import ClaudeAdapter
+
+
+# ---------------------------------------------------------------------------
+# Fakes
+# ---------------------------------------------------------------------------
+
+def fake_usage(**counts) -> SimpleNamespace:
+    fields = ("input_tokens", "output_tokens", "cache_read_input_tokens", "cache_creation_input_tokens")
+    return SimpleNamespace(**{f: counts.get(f, 0) for f in fields})
+
+
+class FakeStream:
+    def __init__(self, chunks, usage=None):
+        self._chunks = chunks
+        self._usage = usage
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    @property
+    async def text_stream(self):
+        for chunk in self._chunks:
+            yield chunk
+
+    async def __aiter__(self):
+        # Tool input arrives as input_json events, like the SDK's MessageStream
+        for chunk in self._chunks:
+            yield SimpleNamespace(type="input_json", partial_json=chunk)
+
+    async def get_final_message(self):
+        return SimpleNamespace(usage=self._usage)
+
+
+class FakeMessages:
+    """
+    Stand-in for AsyncAnthropic().messages. Replies with fixed `text`, or with
+    `responder(kwargs)` when given — handy when each call needs its own answer.
+    A call that forces a tool gets the reply as that tool's {"slots": ...} input.
+    """
+
+    def __init__(self, text: str = "", chunk_size: int = 50, responder=None, usage=None):
+        self._text = text
+        self._chunk_size = chunk_size
+        self._responder = responder
+        self._usage = usage
+        self.calls: list = []
+
+    def _reply(self, kwargs) -> str:
+        return self._responder(kwargs) if self._responder else self._text
+
+    async def create(self, **kwargs):
+        self.calls.append(kwargs)
+        text = self._reply(kwargs)
+        if "tool_choice" in kwargs:
+            block = SimpleNamespace(
+                type="tool_use", id="toolu_1", name=kwargs["tool_choice"]["name"],
+                input={"slots": json.loads(text)},
+            )
+            return SimpleNamespace(content=[block], stop_reason="tool_use", usage=self._usage)
+        return SimpleNamespace(
+            content=[SimpleNamespace(type="text", text=text)],
+            stop_reason="end_turn",
+            usage=self._usage,
+        )
+
+    def stream(self, **kwargs):
+        self.calls.append(kwargs)
+        text = self._reply(kwargs)
+        if "tool_choice" in kwargs:
+            text = '{"slots": ' + text + "}"
+        chunks = [
+            text[i : i + self._chunk_size]
+            for i in range(0, len(text), self._chunk_size)
+        ]
+        return FakeStream(chunks, usage=self._usage)
+
+
+def make_adapter(text: str = "", responder=None, **adapter_kwargs) -> tuple[ClaudeAdapter, FakeMessages]:
+    adapter = ClaudeAdapter(api_key="test", **adapter_kwargs)
+    messages = FakeMessages(text, responder=responder)
+    adapter._client = SimpleNamespace(messages=messages)
+    return adapter, messages
+
+
+def prompt_text(call: dict) -> str:
+    content = call["messages"][-1]["content"]
+    if isinstance(content, str):
+        return content
+    return "\n".join(block.get("text", "") for block in content)
+
+
+def echo_slots_responder(call: dict) -> str:
+    """Answer with one group per slot named in the prompt, tagging recipes with the slot name."""
+    import re
+
+    names = re.findall(r"^- (Slot \d+) \(", prompt_text(call), flags=re.M)
+    return json.dumps([[recipe_dict(f"{n} #{i}") for i in range(3)] for n in names])
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def make_slot(name: str = "Dinner") -> MealSlot:
+    return MealSlot(
+        id=uuid4(),
+        name=name,
+        meal_type=MealType.DINNER,
+        days=[DayOfWeek.MON],
+        member_ids=[],
+    )
+
+
+def make_request(n_slots: int) -> SuggestionRequest:
+    return SuggestionRequest(
+        slots=[make_slot(f"Slot {i}") for i in range(n_slots)],
+        members=[],
+        disliked_ingredients=[],
+        liked_ingredients=[],
+        cuisine_preferences=[],
+    )
+
+
+def recipe_dict(name: str) -> dict:
+    return {
+        "name": name,
+        "emoji": "🍲",
+        "prep_time": 20,
+        "key_ingredients": ["rice"],
+        "ingredients": [{"name": "rice", "quantity": 0.5, "unit": "cups", "category": "pantry"}],
+    }
+
+
+def slots_json(n_slots: int, per_slot: int = 3) -> str:
+    return json.dumps(
+        [[recipe_dict(f"S{s}R{i}") for i in range(per_slot)] for s in range(n_slots)]
+    )
+
+
+# ---------------------------------------------------------------------------
+# Streaming
+# ---------------------------------------------------------------------------
+
+class TestStreamSuggestRecipes:
+    async def test_yields_one_group_per_slot(self):
+        adapter, _ = make_adapter(slots_json(3))
+
+        groups = [g async for g in adapter.stream_suggest_recipes(make_request(3))]
+
+        assert len(groups) == 3
+        assert [r.name for r in groups[2]] == ["S2R0", "S2R1", "S2R2"]
+
+    async def test_raises_when_short_stream_cannot_be_repaired(self):
+        # The same two-group answer comes back for the one missing slot
+        adapter, _ = make_adapter(slots_json(2))
+
+        with pytest.raises(ValueError, match="Expected 1 slot groups"):
+            _ = [g async for g in adapter.stream_suggest_recipes(make_request(3))]
+
+    async def test_raises_on_wrong_option_count(self):
+        adapter, _ = make_adapter(slots_json(1, per_slot=2))
+
+        with pytest.raises(ValueError, match="expected 3 recipe options"):
+            _ = [g async for g in adapter.stream_suggest_recipes(make_request(1))]
+
+
+# ---------------------------------------------------------------------------
+# Slot-level repair
+# ---------------------------------------------------------------------------
+
+def bad_category_group(name: str) -> list:
+    broken = recipe_dict(name)
+    broken["ingredients"][0]["category"] = "spices"
+    return [recipe_dict(f"{name}a"), broken, recipe_dict(f"{name}c")]
+
+
+def first_then_echo(first: str):
+    """Answer the first call with `first`, every later one by echoing its slots."""
+    def respond(call: dict) -> str:
+        respond.calls += 1
+        return first if respond.calls == 1 else echo_slots_responder(call)
+    respond.calls = 0
+    return respond
+
+
+class TestSlotRepair:
+    async def test_re_requests_only_the_broken_slot(self):
+        first = json.dumps([
+            [recipe_dict(f"S0R{i}") for i in range(3)],
+            bad_category_group("S1"),
+            [recipe_dict(f"S2R{i}") for i in range(3)],
+        ])
+        adapter, messages = make_adapter(responder=first_then_echo(first))
+
+        groups = await adapter.suggest_recipes(make_request(3))
+
+        assert [g[0].name for g in groups] == ["S0R0", "Slot 1 #0", "S2R0"]
+        repair_prompt = prompt_text(messages.calls[1])
+        assert "- Slot 1 (" in repair_prompt and "- Slot 0 (" not in repair_prompt
+        assert "exactly 1 slot lists" in repair_prompt
+        # Same household block as the first call, so the repair reads it from cache
+        assert messages.calls[1]["messages"][-1]["content"][0] == messages.calls[0]["messages"][-1]["content"][0]
+        assert (adapter.repair_stats.repaired, adapter.repair_stats.slots_repaired) == (1, 1)
+
+    async def test_repairs_slots_missing_from_a_short_answer(self):
+        adapter, messages = make_adapter(responder=first_then_echo(slots_json(1)))
+
+        groups = await adapter.suggest_recipes(make_request(3))
+
+        assert [g[0].name for g in groups] == ["S0R0", "Slot 1 #0", "Slot 2 #0"]
+        assert len(messages.calls) == 2  # both missing slots in one follow-up
+
+    async def test_valid_answer_needs_no_repair(self):
+        adapter, messages = make_adapter(slots_json(2))
+
+        await adapter.suggest_recipes(make_request(2))
+
+        assert len(messages.calls) == 1
+        assert adapter.repair_stats.responses == 1 and adapter.repair_stats.repair_rate == 0.0
+
+    async def test_failed_repair_fails_the_request(self):
+        first = json.dumps([bad_category_group("S0")])
+        adapter, _ = make_adapter(responder=lambda call: first)
+
+        with pytest.raises(ValueError):
+            await adapter.suggest_recipes(make_request(1))
+
+        assert adapter.repair_stats.repair_failures == 1
+
+    async def test_stream_keeps_slot_order_around_a_repair(self):
+        first = json.dumps([bad_category_group("S0")] + [[recipe_dict(f"S1R{i}") for i in range(3)]])
+        adapter, _ = make_adapter(responder=first_then_echo(first))
+
+        groups = [g async for g in adapter.stream_suggest_recipes(make_request(2))]
+
+        assert [g[0].name for g in groups] == ["Slot 0 #0", "S1R0"]
+        assert adapter.repair_stats.repaired == 1
+
+    async def test_refine_repair_asks_for_the_unlocked_slot_only(self):
+        replies = iter([json.dumps([bad_category_group("R")]), slots_json(1)])
+        adapter, messages = make_adapter(responder=lambda call: next(replies))
+
+        groups = await adapter.refine_recipes(make_refinement_request(2, locked=1))
+
+        assert [r.name for r in groups[0]] == ["S0R0", "S0R1", "S0R2"]
+        repair_prompt = prompt_text(messages.calls[1])
+        assert "- Slot 1 (dinner" in repair_prompt and "exactly 1 slot lists" in repair_prompt
+
+
+# ---------------------------------------------------------------------------
+# Tolerant parsing
+# ---------------------------------------------------------------------------
+
+def make_recipe():
+    from domain.entities.recipe import Recipe
+
+    return Recipe(
+        id=uuid4(), name="Soup", emoji="🍲", prep_time=20, ingredients=[], key_ingredients=[]
+    )
+
+
+class TestTolerantParsing:
+    async def test_suggest_accepts_prose_and_fences(self):
+        adapter, _ = make_adapter(
+            "Here are some ideas:\n```json\n" + slots_json(2) + "\n```", slot_output="text"
+        )
+
+        result = await adapter.suggest_recipes(make_request(2))
+
+        assert len(result) == 2
+
+    async def test_honours_requested_option_count(self):
+        adapter, messages = make_adapter(slots_json(2, per_slot=1))
+        request = make_request(2)
+        request.options_per_slot = 1
+
+        result = await adapter.suggest_recipes(request)
+
+        assert [len(g) for g in result] == [1, 1]
+        assert "each containing exactly 1 recipes" in prompt_text(messages.calls[0])
+
+    async def test_instructions_keep_steps_from_truncated_tail(self):
+        adapter, _ = make_adapter('["Chop the onion.", "Sweat in butter.", "Add sto')
+
+        steps = await adapter.generate_instructions(make_recipe())
+
+        assert steps == ["Chop the onion.", "Sweat in butter."]
+
+    async def test_instruction_batch_keeps_whole_recipes_from_truncated_tail(self):
+        adapter, messages = make_adapter('[["Boil.", "Serve."], ["Chop.", "Fry')
+
+        batch = await adapter.generate_instructions_batch([make_recipe(), make_recipe()])
+
+        assert batch == [["Boil.", "Serve."]]
+        assert len(messages.calls) == 1
+
+
+# ---------------------------------------------------------------------------
+# Fan-out
+# ---------------------------------------------------------------------------
+
+class TestFanout:
+    async def test_single_mode_makes_one_call(self):
+        adapter, messages = make_adapter(responder=echo_slots_responder)
+
+        await adapter.suggest_recipes(make_request(4))
+
+        assert len(messages.calls) == 1
+
+    async def test_fanout_makes_one_call_per_chunk_and_keeps_template_order(self):
+        adapter, messages = make_adapter(
+            responder=echo_slots_responder, suggest_mode="fanout", fanout_chunk_size=2
+        )
+
+        result = await adapter.suggest_recipes(make_request(5))
+
+        assert len(messages.calls) == 3
+        assert [g[0].name for g in result] == [f"Slot {i} #0" for i in range(5)]
+
+    async def test_fanout_prompts_mention_parallel_slots(self):
+        adapter, messages = make_adapter(
+            responder=echo_slots_responder, suggest_mode="fanout", fanout_chunk_size=1
+        )
+
+        await adapter.suggest_recipes(make_request(3))
+
+        first_prompt = prompt_text(messages.calls[0])
+        assert "planned separately: Slot 1 (dinner), Slot 2 (dinner)" in first_prompt
+
+    async def test_fanout_stream_yields_in_template_order(self):
+        adapter, _ = make_adapter(
+            responder=echo_slots_responder, suggest_mode="fanout", fanout_chunk_size=1
+        )
+
+        groups = [g async for g in adapter.stream_suggest_recipes(make_request(3))]
+
+        assert [g[0].name for g in groups] == ["Slot 0 #0", "Slot 1 #0", "Slot 2 #0"]
+
+    def test_unknown_mode_rejected(self):
+        with pytest.raises(ValueError, match="suggest_mode"):
+            ClaudeAdapter(api_key="test", suggest_mode="turbo")
+
+
+# ---------------------------------------------------------------------------
+# Structured output
+# ---------------------------------------------------------------------------
+
+class TestStructuredOutput:
+    async def test_slot_calls_force_the_recipe_tool(self):
+        from domain.entities.recipe import GroceryCategory
+
+        adapter, messages = make_adapter(slots_json(1))
+
+        await adapter.suggest_recipes(make_request(1))
+
+        call = messages.calls[0]
+        (tool,) = call["tools"]
+        assert call["tool_choice"] == {"type": "tool", "name": tool["name"]}
+        recipe_schema = tool["input_schema"]["properties"]["slots"]["items"]["items"]
+        category = recipe_schema["properties"]["ingredients"]["items"]["properties"]["category"]
+        assert category["enum"] == [c.value for c in GroceryCategory]
+        assert "ONLY with a valid JSON" not in call["system"][0]["text"]
+
+    async def test_answer_without_the_tool_call_is_a_parse_failure(self):
+        adapter, _ = make_adapter()
+
+        async def create(**kwargs):
+            text = SimpleNamespace(type="text", text=slots_json(1))
+            return SimpleNamespace(content=[text], stop_reason="end_turn", usage=None)
+
+        adapter._client.messages.create = create
+        with pytest.raises(ValueError, match="did not call submit_recipe_options"):
+            await adapter.refine_recipes(make_refinement_request(1))
+
+        [entry] = adapter.ledger.drain()
+        assert entry.parse_failed and entry.output_format == "tool"
+
+    async def test_truncated_tool_answer_keeps_complete_slots(self):
+        adapter, messages = make_adapter(responder=echo_slots_responder)
+        create = messages.create
+
+        async def cut_off_first_call(**kwargs):
+            if messages.calls:
+                return await create(**kwargs)
+            messages.calls.append(kwargs)
+            partial = [[recipe_dict(f"S0R{i}") for i in range(3)], [recipe_dict("S1R0")]]
+            block = SimpleNamespace(
+                type="tool_use", id="toolu_1", name=kwargs["tool_choice"]["name"], input={"slots": partial}
+            )
+            return SimpleNamespace(content=[block], stop_reason="max_tokens", usage=None)
+
+        messages.create = cut_off_first_call
+        groups = await adapter.suggest_recipes(make_request(3))
+
+        assert [g[0].name for g in groups] == ["S0R0", "Slot 1 #0", "Slot 2 #0"]
+        assert "- Slot 0 (" not in prompt_text(messages.calls[1])
+        assert adapter.repair_stats.slots_repaired == 2
+
+    async def test_tool_answer_cut_off_before_any_slot_is_repaired_whole(self):
+        adapter, messages = make_adapter(responder=echo_slots_responder)
+        create = messages.create
+
+        async def empty_first_call(**kwargs):
+            if messages.calls:
+                return await create(**kwargs)
+            messages.calls.append(kwargs)
+            block = SimpleNamespace(type="tool_use", id="toolu_1", name=kwargs["tool_choice"]["name"], input={})
+            return SimpleNamespace(content=[block], stop_reason="max_tokens", usage=None)
+
+        messages.create = empty_first_call
+        groups = await adapter.suggest_recipes(make_request(2))
+
+        assert [g[0].name for g in groups] == ["Slot 0 #0", "Slot 1 #0"]
+
+    async def test_text_output_keeps_the_json_prompt(self):
+        adapter, messages = make_adapter(slots_json(2), slot_output="text")
+
+        groups = [g async for g in adapter.stream_suggest_recipes(make_request(2))]
+
+        assert len(groups) == 2
+        assert "tools" not in messages.calls[0]
+        assert "exactly 2 inner arrays" in prompt_text(messages.calls[0])
+        assert adapter.ledger.drain()[0].output_format == "text"
+
+    def test_unknown_slot_output_rejected(self):
+        with pytest.raises(ValueError, match="slot_output"):
+            ClaudeAdapter(api_key="test", slot_output="xml")
+
+
+# ---------------------------------------------------------------------------
+# Prompt caching
+# ---------------------------------------------------------------------------
+
+def make_refinement_request(n_slots: int, locked: int = 0):
+    from application.ports.ai_port import RefinementRequest
+    from domain.entities.recipe import Recipe
+
+    slots = [make_slot(f"Slot {i}") for i in range(n_slots)]
+    return RefinementRequest(
+        slots=slots,
+        members=[],
+        disliked_ingredients=[],
+        liked_ingredients=[],
+        cuisine_preferences=[],
+        existing_assignments={
+            str(s.id): Recipe(uuid4(), f"Current {s.name}", "🍲", 20, [], [])
+            for s in slots
+        },
+        user_message="something lighter",
+        locked_slot_ids=[str(s.id) for s in slots[:locked]],
+    )
+
+
+class TestPromptCaching:
+    async def test_system_prompt_is_a_cached_block(self):
+        adapter, messages = make_adapter(slots_json(1))
+
+        await adapter.suggest_recipes(make_request(1))
+
+        (system_block,) = messages.calls[0]["system"]
+        assert system_block["cache_control"] == {"type": "ephemeral"}
+
+    async def test_household_context_is_cached_and_week_context_comes_last(self):
+        adapter, messages = make_adapter(slots_json(1))
+        request = make_request(1)
+        request.disliked_ingredients = ["olives"]
+        request.week_context = "busy Tuesday"
+
+        await adapter.suggest_recipes(request)
+
+        stable, variable = messages.calls[0]["messages"][-1]["content"]
+        assert stable["cache_control"] == {"type": "ephemeral"}
+        assert "olives" in stable["text"] and "busy Tuesday" not in stable["text"]
+        assert "busy Tuesday" in variable["text"] and "cache_control" not in variable
+
+    async def test_household_block_is_identical_across_fanout_chunks(self):
+        adapter, messages = make_adapter(
+            responder=echo_slots_responder, suggest_mode="fanout", fanout_chunk_size=1
+        )
+
+        await adapter.suggest_recipes(make_request(3))
+
+        stable_blocks = {call["messages"][-1]["content"][0]["text"] for call in messages.calls}
+        assert len(stable_blocks) == 1
+
+    async def test_refine_caches_plan_and_puts_user_message_last(self):
+        adapter, messages = make_adapter(slots_json(1))
+
+        await adapter.refine_recipes(make_refinement_request(2, locked=1))
+
+        stable, variable = messages.calls[0]["messages"][-1]["content"]
+        assert "Current Slot 0" in stable["text"] and "LOCKED" in stable["text"]
+        assert stable["cache_control"] == {"type": "ephemeral"}
+        assert variable["text"].startswith('User request: "something lighter"')
+
+    async def test_records_cache_token_counts(self):
+        adapter, _ = make_adapter(slots_json(1))
+        adapter._client.messages._usage = fake_usage(
+            input_tokens=40, cache_read_input_tokens=900, output_tokens=300
+        )
+
+        await adapter.suggest_recipes(make_request(1))
+        _ = [g async for g in adapter.stream_suggest_recipes(make_request(1))]
+
+        assert adapter.usage.calls == 2
+        assert adapter.usage.cache_read_input_tokens == 1800
+        assert adapter.usage.cache_creation_input_tokens == 0
+        assert adapter.usage.output_tokens == 600
+
+
+# ---------------------------------------------------------------------------
+# Structured-data drafts
+# ---------------------------------------------------------------------------
+
+class TestCompleteRecipeDraft:
+    async def test_fills_gaps_without_fetching_and_keeps_page_steps(self):
+        from application.ports.recipe_page_port import RecipeDraft
+
+        adapter, messages = make_adapter(json.dumps(recipe_dict("Model Name")))
+        draft = RecipeDraft(
+            source_url="https://example.com/stew",
+            name="Beef Stew",
+            ingredient_lines=["2 lbs beef", "a knob of butter"],
+            instructions=["Brown the beef.", "Simmer."],
+        )
+
+        recipe = await adapter.complete_recipe_draft(draft)
+
+        call = messages.calls[0]
+        assert "tools" not in call
+        assert "a knob of butter" in prompt_text(call) and "estimate" in prompt_text(call)
+        assert recipe.source_url == "https://example.com/stew"
+        assert recipe.cooking_instructions == ["Brown the beef.", "Simmer."]
@@ -0,0 +1,270 @@
+"""
+Disliked-ingredient matching and the guard that replaces offending AI options.
+"""
+import uuid
+from typing import List
+
+import pytest
+
+from application.ports.ai_port import AIDeadlineExceeded, AIPort, SuggestionRequest
+from application.use_cases.dislike_guard import DislikeGuard
+from application.use_cases.suggest_recipes import SuggestRecipesUseCase
+from domain.entities.meal_plan import DayOfWeek, MealPlanTemplate, MealSlot, MealType
+from domain.entities.preferences import UserPreferences
+from domain.entities.recipe import GroceryCategory, Ingredient, Recipe
+from domain.services.dislike_matcher import DislikeMatcher, dislike_matcher
+from tests.unit.fakes import (
+    InMemoryHouseholdRepository,
+    InMemoryMealPlanTemplateRepository,
+    InMemoryPreferenceRepository,
+    InMemoryRecipeRepository,
+)
+
+
+def make_slot(name: str = "Dinner") -> MealSlot:
+    return MealSlot(id=uuid.uuid4(), name=name, meal_type=MealType.DINNER,
+                    days=[DayOfWeek.MON], member_ids=[])
+
+
+def make_recipe(name: str, *ingredients: str, key: List[str] = ()) -> Recipe:
+    return Recipe(
+        id=uuid.uuid4(),
+        name=name,
+        emoji="🍲",
+        prep_time=30,
+        ingredients=[Ingredient(i, 1.0, "cups", GroceryCategory.PRODUCE) for i in ingredients],
+        key_ingredients=list(key),
+    )
+
+
+def make_request(slots: List[MealSlot], disliked: List[str]) -> SuggestionRequest:
+    return SuggestionRequest(slots=slots, members=[], disliked_ingredients=disliked,
+                             liked_ingredients=[], cuisine_preferences=[])
+
+
+class ScriptedAI(AIPort):
+    """Answers each suggest call with the next scripted list of groups."""
+
+    def __init__(self, *answers: List[List[Recipe]]):
+        self._answers = list(answers)
+        self.requests: List[SuggestionRequest] = []
+
+    async def suggest_recipes(self, request: SuggestionRequest) -> List[List[Recipe]]:
+        self.requests.append(request)
+        return self._answers.pop(0)
+
+    async def refine_recipes(self, request):
+        raise NotImplementedError
+
+    async def generate_instructions(self, recipe):
+        raise NotImplementedError
+
+    async def parse_recipe_from_url(self, url):
+        raise NotImplementedError
+
+
+class TestDislikeMatcher:
+    def test_matches_whole_words_and_plurals(self):
+        matcher = DislikeMatcher(["Pea", "olive", "blue cheese"])
+
+        assert matcher.find("Snap peas") == "pea"
+        assert matcher.find("olives, pitted") == "olive"
+        assert matcher.find("crumbled blue cheese") == "blue cheese"
+        assert matcher.find("peanut butter") is None
+        assert matcher.find("chickpea flour") is None
+
+    def test_overlapping_terms_are_all_found(self):
+        matcher = DislikeMatcher(["he", "she", "hers", "ushers"])
+
+        assert matcher.find("the ushers") == "ushers"
+        assert matcher.find("hers") == "hers"
+
+    def test_checks_ingredient_names_and_key_ingredients(self):
+        matcher = DislikeMatcher(["cilantro", "shrimp"])
+        recipe = make_recipe("Tacos", "Fresh cilantro", key=["shrimp", "lime"])
+
+        assert matcher.violations(recipe) == ["cilantro", "shrimp"]
+        assert matcher.allows(make_recipe("Rice", "Rice"))
+
+    def test_compiled_once_per_set_of_dislikes(self):
+        assert dislike_matcher(["Olive", "pea"]) is dislike_matcher([" pea", "olive "])
+        assert not dislike_matcher([])
+
+
+class TestDislikeGuard:
+    async def test_clean_answer_is_untouched(self):
+        ai = ScriptedAI()
+        guard = DislikeGuard(ai)
+        groups = [[make_recipe("Rice bowl", "Rice")]]
+
+        assert await guard.clean([make_slot()], groups, make_request([make_slot()], ["olive"])) is groups
+        assert ai.requests == []
+
+    async def test_library_replaces_before_any_ai_call(self):
+        repo = InMemoryRecipeRepository()
+        for saved in (make_recipe("Family lasagne", "Pasta"), make_recipe("Olive tapenade pasta", "Olives")):
+            repo._recipes[saved.id] = saved  # never cooked, so not excluded as recent
+        ai = ScriptedAI()
+        guard = DislikeGuard(ai, recipe_repo=repo)
+        slot = make_slot()
+        groups = [[make_recipe("Rice bowl", "Rice"), make_recipe("Puttanesca", "Black olives")]]
+
+        cleaned = await guard.clean([slot], groups, make_request([slot], ["olive"]))
+
+        assert [r.name for r in cleaned[0]] == ["Rice bowl", "Family lasagne"]
+        assert ai.requests == []
+        assert (guard.stats.violations, guard.stats.from_library) == (1, 1)
+
+    async def test_one_targeted_call_for_every_short_slot(self):
+        slots = [make_slot("Mon"), make_slot("Tue"), make_slot("Wed")]
+        ai = ScriptedAI([
+            [make_recipe("Olive bread", "Olive"), make_recipe("Tomato soup", "Tomato")],
+            [make_recipe("Bean chili", "Beans")],
+        ])
+        guard = DislikeGuard(ai)
+        groups = [
+            [make_recipe("Niçoise", "Olives"), make_recipe("Pho", "Rice noodles")],
+            [make_recipe("Stir fry", "Rice")],
+            [make_recipe("Tapenade toast", key=["olive"])],
+        ]
+
+        cleaned = await guard.clean(slots, groups, make_request(slots, ["olive"]))
+
+        [replacement] = ai.requests
+        assert [s.name for s in replacement.slots] == ["Mon", "Wed"]
+        assert replacement.options_per_slot == 1 and not replacement.allow_cached
+        assert "Must not contain any of: olive" in replacement.week_context
+        assert [[r.name for r in g] for g in cleaned] == [
+            ["Pho", "Tomato soup"],  # the replacement's own olive option is skipped
+            ["Stir fry"],
+            ["Bean chili"],
+        ]
+        assert guard.stats.unresolved == 0
+
+    async def test_failed_replacement_drops_the_option(self):
+        class DownAI(ScriptedAI):
+            async def suggest_recipes(self, request):
+                raise AIDeadlineExceeded("suggest")
+
+        guard = DislikeGuard(DownAI())
+        slot = make_slot()
+        groups = [[make_recipe("Pho", "Rice noodles"), make_recipe("Niçoise", "Olives")]]
+
+        cleaned = await guard.clean([slot], groups, make_request([slot], ["olive"]))
+
+        assert [r.name for r in cleaned[0]] == ["Pho"]
+        assert guard.stats.unresolved == 1
+
+    async def test_unexpected_replacement_error_propagates(self):
+        class BrokenAI(ScriptedAI):
+            async def suggest_recipes(self, request):
+                raise TypeError("bug")
+
+        guard = DislikeGuard(BrokenAI())
+        slot = make_slot()
+
+        with pytest.raises(TypeError):
+            await guard.clean([slot], [[make_recipe("Niçoise", "Olives")]], make_request([slot], ["olive"]))
+
+    async def test_provider_errors_are_survivable(self):
+        class ProviderError(Exception):
+            pass
+
+        class OverloadedAI(ScriptedAI):
+            async def suggest_recipes(self, request):
+                raise ProviderError("overloaded")
+
+        guard = DislikeGuard(OverloadedAI(), provider_errors=(ProviderError,))
+        slot = make_slot()
+
+        cleaned = await guard.clean([slot], [[make_recipe("Niçoise", "Olives")]], make_request([slot], ["olive"]))
+
+        assert cleaned == [[]] and guard.stats.unresolved == 1
+
+    async def test_stream_replaces_in_slot_order(self):
+        slots = [make_slot("Mon"), make_slot("Tue")]
+        ai = ScriptedAI([[make_recipe("Bean chili", "Beans")]])
+        guard = DislikeGuard(ai)
+
+        async def groups():
+            yield [make_recipe("Niçoise", "Olives")]
+            yield [make_recipe("Stir fry", "Rice")]
+
+        cleaned = [g async for g in guard.stream(slots, groups(), make_request(slots, ["olive"]))]
+
+        assert [[r.name for r in g] for g in cleaned] == [["Bean chili"], ["Stir fry"]]
+        assert [s.name for s in ai.requests[0].slots] == ["Mon"]
+
+    async def test_prepared_stream_reads_no_database(self):
+        class ClosedSessionRepository(InMemoryRecipeRepository):
+            closed = False
+
+            async def get_recipes(self, **kwargs):
+                assert not self.closed, "library read after the session was released"
+                return await super().get_recipes(**kwargs)
+
+        repo = ClosedSessionRepository()
+        saved = make_recipe("Family lasagne", "Pasta")
+        repo._recipes[saved.id] = saved
+        guard = DislikeGuard(ScriptedAI(), recipe_repo=repo)
+        slot = make_slot()
+        request = make_request([slot], ["olive"])
+
+        async def groups():
+            yield [make_recipe("Niçoise", "Olives")]
+
+        await guard.prepare(request)
+        repo.closed = True
+        cleaned = [g async for g in guard.stream([slot], groups(), request)]
+
+        assert [[r.name for r in g] for g in cleaned] == [["Family lasagne"]]
+
+
+async def test_suggest_use_case_serves_cleaned_options():
+    slot = make_slot()
+    ai = ScriptedAI(
+        [[make_recipe("Niçoise", "Olives"), make_recipe("Pho", "Noodles"), make_recipe("Dal", "Lentils")]],
+        [[make_recipe("Bean chili", "Beans")]],
+    )
+    use_case = SuggestRecipesUseCase(
+        ai_adapter=ai,
+        template_repo=InMemoryMealPlanTemplateRepository(MealPlanTemplate(id=uuid.uuid4(), slots=[slot])),
+        household_repo=InMemoryHouseholdRepository(),
+        preference_repo=InMemoryPreferenceRepository(
+            UserPreferences(id=uuid.uuid4(), disliked_ingredients=["olive"])
+        ),
+        recipe_repo=InMemoryRecipeRepository(),
+        dislike_guard=DislikeGuard(ai),
+    )
+
+    [slot_options] = await use_case.execute()
+
+    assert [r.name for r in slot_options.options] == ["Pho", "Dal", "Bean chili"]
+
+
+async def test_clean_reserve_covers_a_disliked_option_without_a_model_call():
+    slot = make_slot()
+    ai = ScriptedAI([[
+        make_recipe("Niçoise", "Olives"),
+        make_recipe("Pho", "Noodles"),
+        make_recipe("Dal", "Lentils"),
+        make_recipe("Tapenade toast", "Olives"),
+        make_recipe("Stir fry", "Rice"),
+    ]])
+    use_case = SuggestRecipesUseCase(
+        ai_adapter=ai,
+        template_repo=InMemoryMealPlanTemplateRepository(MealPlanTemplate(id=uuid.uuid4(), slots=[slot])),
+        household_repo=InMemoryHouseholdRepository(),
+        preference_repo=InMemoryPreferenceRepository(
+            UserPreferences(id=uuid.uuid4(), disliked_ingredients=["olive"])
+        ),
+        recipe_repo=InMemoryRecipeRepository(),
+        dislike_guard=DislikeGuard(ai),
+        reserve_per_slot=2,
+    )
+
+    [slot_options] = await use_case.execute()
+
+    assert [r.name for r in slot_options.options] == ["Pho", "Dal", "Stir fry"]
+    assert slot_options.reserve == []
+    assert len(ai.requests) == 1  # no replacement call
@@ -0,0 +1,215 @@
+import uuid
+
+import pytest
+
+from application.ports.draft_session_store import DraftRecipeUnknown, DraftSession, DraftSessionExpired
+from application.use_cases.confirm_plan import ConfirmPlanUseCase
+from application.use_cases.draft_plan_session import DraftPlanSessionUseCase
+from application.use_cases.suggest_recipes import SlotOptions
+from domain.entities.meal_plan import DayOfWeek, MealPlanTemplate, MealSlot, MealType
+from domain.entities.recipe import GroceryCategory, Ingredient, Recipe
+from infrastructure.sessions.memory_draft_store import InMemoryDraftSessionStore
+from tests.unit.fakes import (
+    InMemoryMealPlanTemplateRepository,
+    InMemoryRecipeRepository,
+    InMemoryWeeklyPlanRepository,
+)
+
+HOUSEHOLD = uuid.uuid4()
+
+
+def make_slot(name: str = "Dinner") -> MealSlot:
+    return MealSlot(
+        id=uuid.uuid4(),
+        name=name,
+        meal_type=MealType.DINNER,
+        days=[DayOfWeek.MON],
+        member_ids=[],
+    )
+
+
+def make_recipe(name: str) -> Recipe:
+    return Recipe(
+        id=uuid.uuid4(),
+        name=name,
+        emoji="🍝",
+        prep_time=20,
+        ingredients=[Ingredient("Pasta", 2.0, "oz", GroceryCategory.PANTRY)],
+        key_ingredients=["pasta"],
+    )
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def slots():
+    return [make_slot("Monday dinner"), make_slot("Tuesday dinner")]
+
+
+@pytest.fixture
+def recipe_repo():
+    return InMemoryRecipeRepository()
+
+
+@pytest.fixture
+def store():
+    return InMemoryDraftSessionStore(ttl_seconds=60, clock=Clock())
+
+
+@pytest.fixture
+def drafts(store, recipe_repo, slots):
+    template = MealPlanTemplate(id=uuid.uuid4(), slots=slots)
+    return DraftPlanSessionUseCase(
+        store=store,
+        recipe_repo=recipe_repo,
+        template_repo=InMemoryMealPlanTemplateRepository(template),
+        household_id=HOUSEHOLD,
+    )
+
+
+class TestInMemoryDraftSessionStore:
+    async def test_session_expires_after_ttl_unless_saved_again(self):
+        clock = Clock()
+        store = InMemoryDraftSessionStore(ttl_seconds=60, clock=clock)
+        session = DraftSession(id=uuid.uuid4(), household_id=HOUSEHOLD)
+        await store.save(session)
+
+        clock.now = 50
+        await store.save(session)  # refine turn: TTL restarts
+        clock.now = 100
+        assert await store.get(session.id) is session
+
+        clock.now = 111
+        assert await store.get(session.id) is None
+        assert len(store) == 0
+
+    async def test_oldest_session_evicted_at_capacity(self):
+        store = InMemoryDraftSessionStore(max_sessions=2)
+        sessions = [DraftSession(id=uuid.uuid4(), household_id=HOUSEHOLD) for _ in range(3)]
+        for session in sessions:
+            await store.save(session)
+
+        assert await store.get(sessions[0].id) is None
+        assert await store.get(sessions[2].id) is sessions[2]
+        assert store.evicted == 1
+
+
+class TestDraftPlanSession:
+    async def test_recorded_options_resolve_by_id(self, drafts, slots):
+        options = [make_recipe(f"Option {i}") for i in range(3)]
+        session = await drafts.open(None)
+        await drafts.record(session, [SlotOptions(slot=slots[0], options=options)])
+
+        reopened = await drafts.open(session.id)
+        resolved = await drafts.resolve(reopened, {str(slots[0].id): options[1].id})
+
+        assert resolved == {str(slots[0].id): options[1]}
+        assert reopened.chosen == {str(slots[0].id): options[1].id}
+
+    async def test_earlier_options_stay_resolvable_after_refine(self, drafts, slots):
+        first = [make_recipe("First")]
+        session = await drafts.open(None)
+        await drafts.record(session, [SlotOptions(slot=slots[0], options=first)])
+        await drafts.record(session, [SlotOptions(slot=slots[0], options=[make_recipe("Second")])])
+
+        resolved = await drafts.resolve(session, {str(slots[0].id): first[0].id})
+
+        assert resolved[str(slots[0].id)].name == "First"
+
+    async def test_library_recipe_resolves_from_repository(self, drafts, recipe_repo, slots):
+        saved = await recipe_repo.save_recipe(make_recipe("Family lasagne"))
+        session = await drafts.open(None)
+
+        resolved = await drafts.resolve(session, {str(slots[0].id): saved.id})
+
+        assert resolved[str(slots[0].id)].name == "Family lasagne"
+
+    async def test_unknown_recipe_is_rejected(self, drafts, slots):
+        session = await drafts.open(None)
+
+        with pytest.raises(DraftRecipeUnknown, match="not in this draft"):
+            await drafts.resolve(session, {str(slots[0].id): uuid.uuid4()})
+
+    async def test_pool_recipe_from_an_earlier_answer_confirms(self, drafts, recipe_repo, slots):
+        # Generate, then Regenerate All in the same draft; the client's pool keeps the first answer
+        first = [make_recipe("First answer")]
+        session = await drafts.open(None)
+        await drafts.record(session, [SlotOptions(slot=slots[0], options=first)])
+        session = await drafts.open(session.id)
+        await drafts.record(session, [SlotOptions(slot=slots[0], options=[make_recipe("Second answer")])])
+        plan_repo = InMemoryWeeklyPlanRepository()
+
+        suggestions = await drafts.suggestions(session, {str(slots[0].id): first[0].id})
+        plan = await ConfirmPlanUseCase(plan_repo=plan_repo, recipe_repo=recipe_repo).execute(
+            week_start_date="2026-03-09", suggestions=suggestions
+        )
+
+        saved = await recipe_repo.get_recipe(plan.assignments[0].recipe_id)
+        assert saved.name == "First answer"
+
+    async def test_expired_or_foreign_session_raises(self, drafts, store):
+        with pytest.raises(DraftSessionExpired):
+            await drafts.open(uuid.uuid4())
+
+        foreign = DraftSession(id=uuid.uuid4(), household_id=uuid.uuid4())
+        await store.save(foreign)
+        with pytest.raises(DraftSessionExpired):
+            await drafts.open(foreign.id)
+
+    async def test_suggestions_pair_choices_with_slots(self, drafts, recipe_repo, slots):
+        offered = make_recipe("Offered")
+        library = await recipe_repo.save_recipe(make_recipe("From the library"))
+        session = await drafts.open(None)
+        await drafts.record(session, [SlotOptions(slot=slots[0], options=[offered])])
+
+        suggestions = await drafts.suggestions(
+            session, {str(slots[0].id): offered.id, str(slots[1].id): library.id}
+        )
+
+        # Tuesday was never offered in the session: its slot comes from the template
+        assert [(s.slot.name, s.recipe.name) for s in suggestions] == [
+            ("Monday dinner", "Offered"),
+            ("Tuesday dinner", "From the library"),
+        ]
+
+    async def test_close_drops_the_session(self, drafts, slots):
+        session = await drafts.open(None)
+        await drafts.record(session, [SlotOptions(slot=slots[0], options=[make_recipe("A")])])
+
+        await drafts.close(session)
+
+        with pytest.raises(DraftSessionExpired):
+            await drafts.open(session.id)
+
+    async def test_regenerate_is_served_from_the_reserve_until_it_runs_out(self, drafts, slots):
+        shown = [make_recipe(f"Shown {i}") for i in range(3)]
+        reserve = [make_recipe(f"Spare {i}") for i in range(4)]
+        session = await drafts.open(None)
+        await drafts.record(session, [SlotOptions(slot=slots[0], options=shown, reserve=reserve)])
+        slot_id = str(slots[0].id)
+
+        served = drafts.from_reserve(session, slot_id, {str(slots[1].id): reserve[0]})
+        await drafts.record(session, [served])
+
+        # Spare 0 is already chosen for Tuesday, so it is skipped
+        assert [r.name for r in served.options] == ["Spare 1", "Spare 2", "Spare 3"]
+        assert drafts.from_reserve(session, slot_id, {}) is None
+        resolved = await drafts.resolve(session, {slot_id: reserve[2].id})
+        assert resolved[slot_id].name == "Spare 2"
+
+    async def test_new_options_replace_the_reserve(self, drafts, slots):
+        session = await drafts.open(None)
+        await drafts.record(
+            session,
+            [SlotOptions(slot=slots[0], options=[make_recipe("A")], reserve=[make_recipe("Spare")])],
+        )
+        # A refine answer has no surplus: the old spares no longer fit the request
+        await drafts.record(session, [SlotOptions(slot=slots[0], options=[make_recipe("Lighter")])])
+
+        assert drafts.from_reserve(session, str(slots[0].id), {}) is None
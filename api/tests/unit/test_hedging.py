@@ -0,0 +1,214 @@
+"""
+Deadline-bounded, hedged AI calls: the Hedger itself and its use by ClaudeAdapter.
+"""
+import asyncio
+import uuid
+from types import SimpleNamespace
+
+import pytest
+
+from application.ports.ai_port import AIDeadlineExceeded, SuggestionRequest
+from domain.entities.meal_plan import DayOfWeek, MealSlot, MealType
+from infrastructure.ai.claude_adapter import ClaudeAdapter
+from infrastructure.ai.hedging import HedgePolicy, Hedger, LatencyTracker
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+class SlowThenFast:
+    """Call factory: the first call takes `first` seconds, later ones `rest`."""
+
+    def __init__(self, first: float, rest: float = 0.0):
+        self.delays = [first]
+        self.rest = rest
+        self.started = 0
+        self.cancelled = 0
+
+    async def __call__(self):
+        delay = self.delays[self.started] if self.started < len(self.delays) else self.rest
+        call_number = self.started
+        self.started += 1
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        return call_number
+
+
+def warmed_hedger(kind: str = "suggest:1", latency: float = 0.01, **policy) -> Hedger:
+    policy = {"min_samples": 5, "min_delay_seconds": 0.0, **policy}
+    hedger = Hedger(HedgePolicy(**policy))
+    tracker = hedger._tracker(kind)
+    for _ in range(10):
+        tracker.record(latency)
+    return hedger
+
+
+# ---------------------------------------------------------------------------
+# LatencyTracker
+# ---------------------------------------------------------------------------
+
+class TestLatencyTracker:
+    def test_percentile_over_rolling_window(self):
+        tracker = LatencyTracker(window=4)
+        for seconds in (10, 1, 2, 3, 4):  # 10 falls out of the window
+            tracker.record(seconds)
+        assert len(tracker) == 4
+        assert tracker.percentile(0.5) == 3
+        assert tracker.percentile(1.0) == 4
+
+    def test_expected_remaining(self):
+        tracker = LatencyTracker()
+        for seconds in (1, 4, 6):
+            tracker.record(seconds)
+        assert tracker.expected_remaining(3) == pytest.approx(2.0)  # mean(4, 6) - 3
+        assert tracker.expected_remaining(10) == 0.0
+
+
+# ---------------------------------------------------------------------------
+# Hedger
+# ---------------------------------------------------------------------------
+
+class TestHedger:
+    async def test_no_policy_never_hedges(self):
+        hedger = Hedger()
+        call = SlowThenFast(first=0.02)
+        assert await hedger.run("suggest:1", call) == 0
+        assert call.started == 1
+        assert hedger.stats.hedged == 0
+
+    async def test_no_hedge_before_min_samples(self):
+        hedger = Hedger(HedgePolicy(min_samples=5, min_delay_seconds=0.0))
+        call = SlowThenFast(first=0.02)
+        await hedger.run("suggest:1", call)
+        assert call.started == 1
+
+    async def test_slow_call_is_hedged_and_loser_cancelled(self):
+        hedger = warmed_hedger()
+        call = SlowThenFast(first=1.0, rest=0.0)
+
+        assert await hedger.run("suggest:1", call) == 1
+
+        await asyncio.sleep(0)
+        assert call.started == 2 and call.cancelled == 1
+        assert hedger.stats.hedged == 1 and hedger.stats.hedge_wins == 1
+        assert hedger.stats.win_rate == 1.0
+
+    async def test_primary_can_still_win(self):
+        hedger = warmed_hedger()
+        call = SlowThenFast(first=0.03, rest=1.0)
+
+        assert await hedger.run("suggest:1", call) == 0
+
+        await asyncio.sleep(0)
+        assert call.cancelled == 1  # the hedge
+        assert hedger.stats.hedged == 1 and hedger.stats.hedge_wins == 0
+
+    async def test_thresholds_are_per_kind(self):
+        hedger = warmed_hedger(kind="suggest:1")
+        call = SlowThenFast(first=0.03)
+        await hedger.run("suggest:7", call)
+        assert call.started == 1
+
+    async def test_failed_primary_falls_back_to_hedge(self):
+        hedger = warmed_hedger()
+        calls = 0
+
+        async def call():
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                await asyncio.sleep(0.05)
+                raise ValueError("bad JSON")
+            await asyncio.sleep(0.1)
+            return "ok"
+
+        assert await hedger.run("suggest:1", call) == "ok"
+
+    async def test_every_call_failing_raises_the_first_error(self):
+        hedger = Hedger()
+
+        async def call():
+            raise ValueError("bad JSON")
+
+        with pytest.raises(ValueError, match="bad JSON"):
+            await hedger.run("suggest:1", call)
+
+    async def test_deadline_cancels_and_raises(self):
+        hedger = Hedger()
+        call = SlowThenFast(first=1.0)
+
+        with pytest.raises(AIDeadlineExceeded):
+            await hedger.run("suggest:1", call, deadline_seconds=0.01)
+
+        await asyncio.sleep(0)
+        assert call.cancelled == 1
+        assert hedger.stats.deadline_exceeded == 1
+
+    async def test_bounded_stream_deadline(self):
+        hedger = Hedger()
+
+        async def groups():
+            yield 1
+            await asyncio.sleep(1.0)
+            yield 2
+
+        received = []
+        with pytest.raises(AIDeadlineExceeded):
+            async for group in hedger.bounded(groups(), deadline_seconds=0.05):
+                received.append(group)
+        assert received == [1]
+
+    def test_snapshot(self):
+        hedger = warmed_hedger(latency=0.5)
+        snapshot = hedger.snapshot()
+        assert snapshot["hedge_rate"] == 0.0
+        assert snapshot["thresholds"] == {"suggest:1": 0.5}
+
+
+# ---------------------------------------------------------------------------
+# ClaudeAdapter integration
+# ---------------------------------------------------------------------------
+
+def make_request(**kwargs) -> SuggestionRequest:
+    slot = MealSlot(uuid.uuid4(), "Dinner", MealType.DINNER, [DayOfWeek.MON], [])
+    return SuggestionRequest(
+        slots=[slot],
+        members=[],
+        disliked_ingredients=[],
+        liked_ingredients=[],
+        cuisine_preferences=[],
+        **kwargs,
+    )
+
+
+class TestAdapterDeadlines:
+    def build_adapter(self, delay: float, **kwargs) -> ClaudeAdapter:
+        async def create(**params):
+            await asyncio.sleep(delay)
+            answer = SimpleNamespace(type="tool_use", name=params["tool_choice"]["name"], input={"slots": [[]]})
+            return SimpleNamespace(content=[answer], usage=None)
+
+        client = SimpleNamespace(messages=SimpleNamespace(create=create))
+        return ClaudeAdapter(client=client, **kwargs)
+
+    async def test_request_deadline_applies(self):
+        adapter = self.build_adapter(delay=1.0)
+        with pytest.raises(AIDeadlineExceeded):
+            await adapter.suggest_recipes(make_request(deadline_seconds=0.01))
+
+    async def test_adapter_default_deadline_applies(self):
+        adapter = self.build_adapter(delay=1.0, deadline_seconds=0.01)
+        with pytest.raises(AIDeadlineExceeded):
+            await adapter.suggest_recipes(make_request())
+
+    async def test_calls_are_recorded_on_shared_hedger(self):
+        hedger = Hedger()
+        adapter = self.build_adapter(delay=0.0, hedger=hedger)
+        with pytest.raises(ValueError):  # [[]] has no options; the call itself succeeded
+            await adapter.suggest_recipes(make_request(options_per_slot=3))
+        assert hedger.stats.calls == 2  # the answer and its (equally empty) slot repair
+        assert len(hedger._tracker("suggest:1")) == 1
@@ -0,0 +1,78 @@
+from infrastructure.web.html_reducer import HtmlReducer, reduce_html, reduce_html_stream
+
+STORY = "<p>" + "We made this every winter when the snow came in. " * 6 + "</p>"
+CARD = (
+    '<div class="wprm-recipe-container"><h2>Chili</h2>'
+    '<ul class="wprm-recipe-ingredients"><li>1 lb beef<li>2 cans beans</ul>'
+    '<div class="share-buttons">Pin it</div>'
+    '<ol><li>Brown the beef.</li><li>Add the beans and simmer for an hour, stirring now and then. '
+    "Taste, season and serve with rice or warm tortillas and plenty of grated cheese.</li>"
+    "<li>Leftovers keep for three days in the fridge and freeze well for a month.</li></ol></div>"
+)
+
+
+def page(article: str) -> str:
+    return (
+        "<html><head><style>.x{color:red}</style><script>var s = '<p>not text</p>';</script></head>"
+        "<body><header><h1>Site Name</h1><nav><a href='/'>Home</a></nav></header>"
+        f"<main><article>{article}</article></main>"
+        "<footer>© 2024 Site</footer></body></html>"
+    )
+
+
+def test_keeps_title_and_recipe_card_only():
+    text = reduce_html(page(
+        "<header><h1>Best   Chili &amp; Rice</h1></header>" + STORY
+        + "<div class='ad-slot'>BUY NOW</div><!-- tracking -->" + CARD
+        + "<section class='comments'><p>Loved it!</p></section>"
+    ))
+
+    lines = text.split("\n")
+    assert lines[:4] == ["Best Chili & Rice", "Chili", "- 1 lb beef", "- 2 cans beans"]
+    assert lines[4] == "- Brown the beef."
+    for dropped in ("Site Name", "Home", "not text", "every winter", "BUY NOW", "Pin it", "Loved it", "2024"):
+        assert dropped not in text
+
+
+def test_falls_back_to_article_without_recipe_markup():
+    text = reduce_html(page("<h1>Soup</h1>" + STORY + "<ul><li>2 cups stock</li></ul>"))
+
+    assert text.startswith("Soup\nWe made this")
+    assert "- 2 cups stock" in text
+    assert "Site Name" not in text
+
+
+def test_hidden_elements_are_dropped():
+    text = reduce_html(
+        "<div>" + STORY + "<p hidden>secret</p><p style='display: none'>gone</p>"
+        "<span aria-hidden='true'>icon</span></div>"
+    )
+    assert "secret" not in text and "gone" not in text and "icon" not in text
+
+
+def test_caps_at_a_line_boundary():
+    text = reduce_html("".join(f"<p>Line number {i}</p>" for i in range(100)), max_chars=50)
+    assert text.split("\n") == ["Line number 0", "Line number 1", "Line number 2"]
+
+
+def test_incremental_feed_matches_whole_page():
+    html = page(STORY + CARD)
+    reducer = HtmlReducer()
+    for i in range(0, len(html), 7):
+        reducer.feed(html[i:i + 7])
+    reducer.close()
+    assert reducer.text() == reduce_html(html)
+
+
+async def test_stream_stops_reading_at_page_cap():
+    consumed = []
+
+    async def chunks():
+        for i in range(100):
+            consumed.append(i)
+            yield f"<p>Paragraph {i}</p>"
+
+    text = await reduce_html_stream(chunks(), max_page_chars=100)
+
+    assert len(consumed) < 100
+    assert text.startswith("Paragraph 0")
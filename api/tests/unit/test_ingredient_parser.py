@@ -0,0 +1,44 @@
+import pytest
+
+from domain.entities.recipe import GroceryCategory
+from domain.services.ingredient_parser import ParsedIngredient, guess_category, parse_ingredient_line
+
+
+@pytest.mark.parametrize(
+    "line, expected",
+    [
+        ("2 cups flour", ParsedIngredient(2.0, "cups", "flour")),
+        ("1 ½ Tbsp. olive oil", ParsedIngredient(1.5, "tbsp", "olive oil")),
+        ("1½ cups milk", ParsedIngredient(1.5, "cups", "milk")),
+        ("1 1/2 lbs chicken thighs, boneless", ParsedIngredient(1.5, "lbs", "chicken thighs")),
+        ("2-3 cloves garlic, minced", ParsedIngredient(2.5, "cloves", "garlic")),
+        ("1 (14 oz) can diced tomatoes", ParsedIngredient(1.0, "cans", "diced tomatoes")),
+        ("3 large eggs", ParsedIngredient(3.0, "whole", "large eggs")),
+        ("200 g of spaghetti", ParsedIngredient(200.0, "g", "spaghetti")),
+        ("Salt and pepper, to taste", ParsedIngredient(0.0, "to taste", "Salt and pepper")),
+    ],
+)
+def test_parses_common_lines(line, expected):
+    assert parse_ingredient_line(line) == expected
+
+
+@pytest.mark.parametrize("line", ["", "a knob of butter", "Juice of one lemon", "2 cups"])
+def test_unmeasured_lines_need_the_model(line):
+    assert parse_ingredient_line(line) is None
+
+
+@pytest.mark.parametrize(
+    "name, category",
+    [
+        ("chicken thighs", GroceryCategory.MEAT),
+        ("chicken stock", GroceryCategory.PANTRY),
+        ("red bell pepper", GroceryCategory.PRODUCE),
+        ("ground black pepper", GroceryCategory.PANTRY),
+        ("frozen peas", GroceryCategory.FROZEN),
+        ("parmesan", GroceryCategory.DAIRY),
+        ("sourdough bread", GroceryCategory.BAKERY),
+        ("star anise pods", GroceryCategory.OTHER),
+    ],
+)
+def test_guess_category(name, category):
+    assert guess_category(name) == category
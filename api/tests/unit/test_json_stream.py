@@ -0,0 +1,155 @@
+import json
+
+import pytest
+
+from infrastructure.ai.json_stream import (
+    IncrementalJSONDecoder,
+    decode_json_array,
+    decode_json_object,
+)
+
+
+def make_recipe_dict(name: str) -> dict:
+    return {
+        "name": name,
+        "emoji": "🍝",
+        "prep_time": 30,
+        "key_ingredients": ["a", "b"],
+        "ingredients": [
+            {"name": "pasta [dry]", "quantity": 2, "unit": "oz", "category": "pantry"}
+        ],
+    }
+
+
+def payload(n_slots: int) -> str:
+    return json.dumps(
+        [[make_recipe_dict(f"R{s}-{i}") for i in range(3)] for s in range(n_slots)]
+    )
+
+
+def slot_decoder() -> IncrementalJSONDecoder:
+    return IncrementalJSONDecoder(root="[", emit_depths=(2,), recover_depth=2)
+
+
+def feed_in_chunks(decoder: IncrementalJSONDecoder, text: str, size: int) -> list:
+    out = []
+    for i in range(0, len(text), size):
+        out.extend(value for _, value in decoder.feed(text[i : i + size]))
+    return out
+
+
+# ---------------------------------------------------------------------------
+# Incremental emission
+# ---------------------------------------------------------------------------
+
+class TestIncrementalEmission:
+    def test_emits_each_inner_array(self):
+        decoder = slot_decoder()
+        groups = [v for _, v in decoder.feed(payload(3))]
+        assert len(groups) == 3
+        assert groups[1][0]["name"] == "R1-0"
+        assert decoder.complete
+
+    @pytest.mark.parametrize("size", [1, 7, 64])
+    def test_chunk_boundaries_do_not_matter(self, size):
+        groups = feed_in_chunks(slot_decoder(), payload(4), size)
+        assert [g[2]["name"] for g in groups] == ["R0-2", "R1-2", "R2-2", "R3-2"]
+
+    def test_emits_group_before_outer_array_closes(self):
+        text = payload(2)
+        first_group = json.dumps([make_recipe_dict(f"R0-{i}") for i in range(3)])
+        cut = 1 + len(first_group)  # just past the first inner array
+        decoder = slot_decoder()
+        assert len(decoder.feed(text[:cut])) == 1
+        assert not decoder.complete
+
+    def test_can_emit_recipe_objects(self):
+        decoder = IncrementalJSONDecoder(root="[", emit_depths=(2, 3))
+        events = decoder.feed(payload(1))
+        assert [d for d, _ in events] == [3, 3, 3, 2]
+        assert events[0][1]["name"] == "R0-0"
+
+    def test_ignores_brackets_and_escaped_quotes_in_strings(self):
+        recipe = make_recipe_dict('Mom\'s "best" [sic] stew \\ {v2}')
+        text = json.dumps([[recipe, recipe, recipe]])
+        groups = feed_in_chunks(slot_decoder(), text, 3)
+        assert groups[0][0]["name"] == 'Mom\'s "best" [sic] stew \\ {v2}'
+
+    def test_scan_buffer_holds_only_the_open_group(self):
+        text = payload(12)
+        group_len = len(json.dumps([make_recipe_dict("R0-0")] * 3))
+        decoder = slot_decoder()
+        peak = 0
+        for i in range(0, len(text), 16):
+            decoder.feed(text[i : i + 16])
+            peak = max(peak, len(decoder._text))
+        assert peak < group_len + 32
+        assert len(decoder.finish()) == 12
+
+    def test_truncated_stream_recovers_from_moved_out_text(self):
+        text = payload(3)
+        decoder = slot_decoder()
+        feed_in_chunks(decoder, text[: len(text) * 3 // 4], 5)
+        assert [g[0]["name"] for g in decoder.finish()] == ["R0-0", "R1-0"]
+
+
+# ---------------------------------------------------------------------------
+# Tolerance
+# ---------------------------------------------------------------------------
+
+class TestTolerance:
+    def test_skips_code_fence_and_prose(self):
+        text = "Here you go:\n```json\n" + payload(2) + "\n```\nEnjoy!"
+        assert len(decode_json_array(text)) == 2
+
+    def test_trailing_comma(self):
+        assert decode_json_array('["a", "b",]') == ["a", "b"]
+
+    def test_object_with_surrounding_prose(self):
+        assert decode_json_object('Sure!\n{"name": "Soup"}\nThanks') == {"name": "Soup"}
+
+    def test_skips_bracketed_prose_before_the_payload(self):
+        text = "Three ideas per slot (see [1] for notes, {x} for extras):\n" + payload(2)
+        assert len(decode_json_array(text, elements="[")) == 2
+        assert decode_json_object('Note {x}: {"name": "Soup"}') == {"name": "Soup"}
+
+    def test_streamed_prose_bracket_waits_for_the_first_element(self):
+        decoder = IncrementalJSONDecoder(root="[", emit_depths=(2,), recover_depth=2, elements="[")
+        text = "See [1]:\n" + payload(2)
+        groups = [v for i in range(0, len(text), 3) for _, v in decoder.feed(text[i : i + 3])]
+        assert len(groups) == 2 and len(decoder.finish()) == 2
+
+    def test_no_json_raises(self):
+        with pytest.raises(ValueError, match="No JSON array"):
+            decode_json_array("I couldn't come up with anything.")
+
+
+# ---------------------------------------------------------------------------
+# Truncation recovery
+# ---------------------------------------------------------------------------
+
+class TestTruncationRecovery:
+    def test_recovers_complete_slots_and_recipes(self):
+        text = payload(3)
+        cut = text.index("R2-1")  # slot 2 has one complete recipe, second is cut off
+        data = decode_json_array(text[:cut], recover_depth=2)
+        assert len(data) == 3
+        assert [len(g) for g in data] == [3, 3, 1]
+
+    def test_never_keeps_half_written_recipe(self):
+        text = payload(1)
+        cut = text.index("pasta [dry]", text.index("R0-1"))  # mid-ingredients of 2nd recipe
+        data = decode_json_array(text[:cut], recover_depth=2)
+        assert [r["name"] for r in data[0]] == ["R0-0"]
+
+    def test_recovers_complete_string_steps(self):
+        data = decode_json_array('```json\n["Boil water.", "Add pasta.", "Drain th', recover_depth=1)
+        assert data == ["Boil water.", "Add pasta."]
+
+    def test_no_recovery_when_disabled(self):
+        with pytest.raises(ValueError, match="truncated"):
+            decode_json_array(payload(2)[:-40], recover_depth=None)
+
+    def test_truncated_object_raises(self):
+        with pytest.raises(ValueError):
+            decode_json_object('{"name": "Soup", "ingredients": [')
@@ -0,0 +1,125 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from domain.entities.meal_plan import DayOfWeek, MealSlot, MealType
+from domain.entities.recipe import GroceryCategory, Ingredient, Recipe
+from domain.services.library_ranker import LibraryRanker, meal_fit
+
+NOW = datetime(2026, 3, 2, tzinfo=timezone.utc)
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def recipe(
+    name: str,
+    prep_time: int = 40,
+    times_used: int = 1,
+    is_favorite: bool = False,
+    days_ago: int | None = 30,
+    ingredients: tuple = (),
+) -> Recipe:
+    return Recipe(
+        id=uuid.uuid4(),
+        name=name,
+        emoji="🍲",
+        prep_time=prep_time,
+        ingredients=[Ingredient(i, 1.0, "whole", GroceryCategory.OTHER) for i in ingredients],
+        key_ingredients=list(ingredients[:2]),
+        is_favorite=is_favorite,
+        times_used=times_used,
+        last_used_at=None if days_ago is None else NOW - timedelta(days=days_ago),
+    )
+
+
+def slot(meal_type: MealType = MealType.DINNER) -> MealSlot:
+    return MealSlot(uuid.uuid4(), "Slot", meal_type, [DayOfWeek.MON], [])
+
+
+def pick(slots, recipes, per_slot=3, liked=(), disliked=(), recent_names=()):
+    return LibraryRanker().pick(
+        slots, recipes, per_slot, list(liked), list(disliked), list(recent_names), NOW
+    )
+
+
+# ---------------------------------------------------------------------------
+# Tests
+# ---------------------------------------------------------------------------
+
+class TestLibraryRanker:
+    def test_favorite_and_frequently_used_rank_first(self):
+        s = slot()
+        plain = recipe("Plain")
+        favorite = recipe("Favorite", is_favorite=True)
+        staple = recipe("Staple", times_used=12)
+
+        names = [r.name for r in pick([s], [plain, favorite, staple])[s.id]]
+
+        assert names == ["Favorite", "Staple", "Plain"]
+
+    def test_disliked_ingredients_are_excluded(self):
+        s = slot()
+        olives = recipe("Tapenade Pasta", is_favorite=True, ingredients=("Kalamata Olives",))
+
+        assert pick([s], [olives], disliked=["olives"])[s.id] == []
+
+    def test_dislikes_match_whole_words_like_the_dislike_guard(self):
+        s = slot()
+        smores = recipe("S'mores Bars", ingredients=("Graham crackers", "Chocolate"))
+        ratatouille = recipe("Ratatouille", ingredients=("Eggplant", "Zucchini"))
+        omelette = recipe("Omelette", ingredients=("Eggs", "Chives"))
+
+        names = {r.name for r in pick([s], [smores, ratatouille, omelette], disliked=["ham", "egg"])[s.id]}
+
+        assert names == {"S'mores Bars", "Ratatouille"}
+
+    def test_recently_cooked_recipes_are_excluded(self):
+        s = slot()
+        this_week = recipe("Tacos", is_favorite=True, days_ago=3)
+        by_name = recipe("Curry", days_ago=None)
+
+        assert pick([s], [this_week, by_name], recent_names=["curry"])[s.id] == []
+
+    def test_liked_ingredients_boost(self):
+        s = slot()
+        plain = recipe("Plain")
+        salmon = recipe("Salmon Bowl", ingredients=("salmon", "rice"))
+
+        assert pick([s], [plain, salmon], liked=["Salmon"])[s.id][0].name == "Salmon Bowl"
+
+    def test_liked_terms_match_whole_words(self):
+        s = slot()
+        stew = recipe("Bean Stew", ingredients=("beans", "rice"))
+        pineapple = recipe("Pineapple Fried Rice", ingredients=("pineapple", "rice"))
+
+        # No boost for "pineapple", so the tie breaks by name
+        assert pick([s], [pineapple, stew], liked=["apple"])[s.id][0].name == "Bean Stew"
+
+    def test_meal_type_fit_uses_prep_time(self):
+        quick = recipe("Overnight Oats", prep_time=5)
+        slow = recipe("Braised Short Ribs", prep_time=180)
+
+        assert meal_fit(quick, MealType.BREAKFAST) == 1.0
+        assert meal_fit(slow, MealType.BREAKFAST) == 0.0
+        breakfast, dinner = slot(MealType.BREAKFAST), slot(MealType.DINNER)
+        picks = pick([breakfast, dinner], [slow, quick], per_slot=1)
+        assert picks[breakfast.id][0].name == "Overnight Oats"
+        assert picks[dinner.id][0].name == "Braised Short Ribs"
+
+    def test_recipe_offered_for_one_slot_only(self):
+        a, b = slot(), slot()
+        recipes = [recipe(f"R{i}") for i in range(4)]
+
+        picks = pick([a, b], recipes, per_slot=3)
+
+        assert len(picks[a.id]) == 3
+        assert len(picks[b.id]) == 1
+        assert not {r.id for r in picks[a.id]} & {r.id for r in picks[b.id]}
+
+    def test_naive_timestamps_are_treated_as_utc(self):
+        s = slot()
+        naive = recipe("Stew")
+        naive.last_used_at = naive.last_used_at.replace(tzinfo=None)
+
+        assert pick([s], [naive])[s.id][0].name == "Stew"
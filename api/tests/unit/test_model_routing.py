@@ -0,0 +1,142 @@
+"""
+Model routing: per-kind tiers, downgrade on latency/error budgets, upstream fallback.
+"""
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from anthropic import APIConnectionError
+
+from infrastructure.ai.claude_adapter import ClaudeAdapter
+from infrastructure.ai.model_routing import ModelRouter, RoutingPolicy, parse_routes
+
+ROUTES = {
+    "instructions": ("claude-haiku-4-5",),
+    "suggest:1": ("claude-haiku-4-5", "claude-sonnet-4-6"),
+    "suggest": ("claude-sonnet-4-6", "claude-haiku-4-5"),
+}
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_router(**policy) -> tuple[ModelRouter, FakeClock]:
+    clock = FakeClock()
+    return ModelRouter(RoutingPolicy(routes=ROUTES, min_samples=3, **policy), clock=clock), clock
+
+
+class TestParseRoutes:
+    def test_parses_tiers_in_order(self):
+        assert parse_routes(" instructions=claude-haiku-4-5 ; suggest=a, b ;") == {
+            "instructions": ("claude-haiku-4-5",),
+            "suggest": ("a", "b"),
+        }
+
+    def test_rejects_route_without_models(self):
+        with pytest.raises(ValueError, match="Bad model route"):
+            parse_routes("suggest=")
+
+
+class TestModelRouter:
+    def test_most_specific_route_wins(self):
+        router, _ = make_router()
+
+        assert router.tiers("suggest:1", "default")[0] == "claude-haiku-4-5"
+        assert router.tiers("suggest:4", "default")[0] == "claude-sonnet-4-6"
+        assert router.tiers("import", "default") == ["default"]
+
+    def test_error_budget_downgrades_until_cooldown(self):
+        router, clock = make_router(error_budget=0.5, cooldown_seconds=60)
+        for failed in (True, True, False):
+            router.record("suggest:3", "claude-sonnet-4-6", 1.0, failed=failed)
+
+        assert router.tiers("suggest:3", "default") == ["claude-haiku-4-5", "claude-sonnet-4-6"]
+        assert router.snapshot()["routes"]["suggest"]["serving"] == "claude-haiku-4-5"
+        clock.now += 61
+        assert router.tiers("suggest:3", "default")[0] == "claude-sonnet-4-6"
+
+    def test_latency_budget_downgrades(self):
+        router, _ = make_router(latency_budget_seconds=5.0)
+        for _ in range(3):
+            router.record("suggest:1", "claude-haiku-4-5", 9.0, failed=False)
+
+        assert router.tiers("suggest:1", "default")[0] == "claude-sonnet-4-6"
+
+    def test_snapshot_shows_latency_and_cost_per_model(self):
+        router, _ = make_router()
+        router.record("instructions", "claude-haiku-4-5", 0.8, failed=False,
+                      input_tokens=1_000_000, output_tokens=100_000)
+        router.record("import", "custom-model", 2.0, failed=False, input_tokens=10)
+
+        routes = router.snapshot()["routes"]
+        haiku = routes["instructions"]["models"]["claude-haiku-4-5"]
+        assert haiku["latency_p50_seconds"] == 0.8
+        assert haiku["estimated_cost_usd"] == 1.5
+        # Unrouted kinds are still measured, for a before/after comparison
+        assert routes["import"]["models"]["custom-model"]["estimated_cost_usd"] is None
+        assert routes["import"]["serving"] is None
+
+
+class FlakyMessages:
+    """Fails every call to the models in `down`; otherwise answers `text`."""
+
+    def __init__(self, text: str, down: tuple = ()):
+        self.text = text
+        self.down = down
+        self.models: list = []
+
+    async def create(self, **kwargs):
+        self.models.append(kwargs["model"])
+        if kwargs["model"] in self.down:
+            raise APIConnectionError(request=httpx.Request("POST", "https://api.anthropic.com"))
+        return SimpleNamespace(
+            content=[SimpleNamespace(type="text", text=self.text)], stop_reason="end_turn", usage=None
+        )
+
+
+def recipe(name: str = "Soup") -> SimpleNamespace:
+    return SimpleNamespace(name=name, prep_time=20, ingredients=[])
+
+
+class TestAdapterRouting:
+    def make_adapter(self, messages: FlakyMessages) -> ClaudeAdapter:
+        adapter = ClaudeAdapter(
+            api_key="test", model="default-model", router=ModelRouter(RoutingPolicy(routes=ROUTES))
+        )
+        adapter._client = SimpleNamespace(messages=messages)
+        return adapter
+
+    async def test_uses_the_routed_model_per_kind(self):
+        messages = FlakyMessages('["Boil."]')
+        adapter = self.make_adapter(messages)
+
+        await adapter.generate_instructions(recipe())
+        messages.text = '[["Boil."]]'
+        await adapter.generate_instructions_batch([recipe()])
+
+        assert messages.models == ["claude-haiku-4-5", "default-model"]
+
+    async def test_falls_back_to_next_tier_on_upstream_failure(self):
+        messages = FlakyMessages("[]", down=("claude-sonnet-4-6",))
+        adapter = self.make_adapter(messages)
+
+        await adapter._create("suggest:2", None, max_tokens=10, messages=[])
+
+        assert messages.models == ["claude-sonnet-4-6", "claude-haiku-4-5"]
+        entries = adapter.ledger.drain()
+        assert [(e.model, e.error) for e in entries] == [
+            ("claude-sonnet-4-6", "APIConnectionError"),
+            ("claude-haiku-4-5", None),
+        ]
+
+    async def test_last_tier_failure_propagates(self):
+        messages = FlakyMessages("[]", down=("claude-haiku-4-5",))
+        adapter = self.make_adapter(messages)
+
+        with pytest.raises(APIConnectionError):
+            await adapter.generate_instructions(recipe())
@@ -0,0 +1,265 @@
+import asyncio
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from sqlalchemy.dialects import postgresql
+
+from api.pregeneration import PregenerationScheduler, next_week_start
+from application.use_cases.suggest_recipes import SuggestRecipesUseCase
+from domain.entities.meal_plan import DayOfWeek, MealPlanTemplate, MealSlot, MealType
+from domain.entities.preferences import UserPreferences
+from domain.entities.recipe import GroceryCategory, Ingredient, Recipe
+from infrastructure.db.postgres.auth_repo import AuthRepository
+from tests.unit.fakes import (
+    FakeAIPort,
+    InMemoryHouseholdRepository,
+    InMemoryMealPlanTemplateRepository,
+    InMemoryPregeneratedSuggestionRepository,
+    InMemoryPreferenceRepository,
+    InMemoryRecipeRepository,
+)
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+class CountingAIPort(FakeAIPort):
+    def __init__(self, recipes_to_return=None):
+        super().__init__(recipes_to_return)
+        self.suggest_calls = 0
+
+    async def suggest_recipes(self, request):
+        self.suggest_calls += 1
+        return await super().suggest_recipes(request)
+
+
+def make_recipe(name: str) -> Recipe:
+    return Recipe(
+        id=uuid.uuid4(),
+        name=name,
+        emoji="🍝",
+        prep_time=30,
+        ingredients=[Ingredient("Pasta", 2.0, "oz", GroceryCategory.PANTRY)],
+        key_ingredients=["pasta"],
+    )
+
+
+WEEK = "2026-03-09"
+
+
+def build(store=None, preferences=None):
+    template = MealPlanTemplate(
+        id=uuid.uuid4(),
+        slots=[MealSlot(uuid.uuid4(), "Dinner", MealType.DINNER, [DayOfWeek.MON], [])],
+    )
+    ai = CountingAIPort(recipes_to_return=[make_recipe("Lasagna")])
+    prefs_repo = InMemoryPreferenceRepository(preferences=preferences)
+    use_case = SuggestRecipesUseCase(
+        ai_adapter=ai,
+        template_repo=InMemoryMealPlanTemplateRepository(template=template),
+        household_repo=InMemoryHouseholdRepository(),
+        preference_repo=prefs_repo,
+        recipe_repo=InMemoryRecipeRepository(),
+        pregenerated_repo=store or InMemoryPregeneratedSuggestionRepository(),
+    )
+    return use_case, ai, prefs_repo
+
+
+# ---------------------------------------------------------------------------
+# Use case
+# ---------------------------------------------------------------------------
+
+class TestPregenerate:
+    async def test_stored_options_serve_the_first_suggest(self):
+        store = InMemoryPregeneratedSuggestionRepository()
+        use_case, ai, _ = build(store)
+
+        assert await use_case.pregenerate(WEEK) is True
+        result = await use_case.execute(week_start_date=WEEK)
+
+        assert ai.suggest_calls == 1
+        assert store.stored.week_start_date == WEEK
+        assert result[0].options[0].id == store.stored.options[0][0].id
+
+    async def test_peek_serves_stored_options(self):
+        use_case, ai, _ = build()
+        await use_case.pregenerate(WEEK)
+
+        peeked = await use_case.peek(week_start_date=WEEK)
+
+        assert peeked[0].options[0].name == "Lasagna"
+        assert ai.suggest_calls == 1
+
+    async def test_stored_options_are_served_once(self):
+        store = InMemoryPregeneratedSuggestionRepository()
+        use_case, ai, _ = build(store)
+        await use_case.pregenerate(WEEK)
+
+        first = await use_case.peek(week_start_date=WEEK)
+        second = await use_case.peek(week_start_date=WEEK)
+        await use_case.execute(week_start_date=WEEK)
+
+        assert first is not None and second is None
+        assert ai.suggest_calls == 2
+        assert store.stored.served_at is not None
+
+    async def test_served_set_is_not_regenerated(self):
+        use_case, ai, _ = build()
+        await use_case.pregenerate(WEEK)
+        await use_case.execute(week_start_date=WEEK)
+
+        assert await use_case.pregenerate(WEEK) is False
+        assert ai.suggest_calls == 1
+
+    async def test_other_weeks_do_not_get_the_stored_options(self):
+        use_case, ai, _ = build()
+        await use_case.pregenerate(WEEK)
+
+        assert await use_case.peek(week_start_date="2026-03-16") is None
+        assert await use_case.peek() is None
+        await use_case.execute(week_start_date="2026-03-02")
+        assert ai.suggest_calls == 2
+
+    async def test_second_run_skips_while_still_valid(self):
+        use_case, ai, _ = build()
+        await use_case.pregenerate(WEEK)
+
+        assert await use_case.pregenerate(WEEK) is False
+        assert ai.suggest_calls == 1
+
+    async def test_preference_change_makes_stored_options_stale(self):
+        use_case, ai, prefs_repo = build()
+        await use_case.pregenerate(WEEK)
+
+        await prefs_repo.save_preferences(
+            UserPreferences(id=uuid.uuid4(), disliked_ingredients=["mushrooms"])
+        )
+
+        assert await use_case.peek(week_start_date=WEEK) is None
+        await use_case.execute(week_start_date=WEEK)
+        assert ai.suggest_calls == 2
+
+    async def test_old_options_are_stale(self):
+        store = InMemoryPregeneratedSuggestionRepository()
+        use_case, _, _ = build(store)
+        await use_case.pregenerate(WEEK)
+
+        store.stored.created_at -= timedelta(days=8)
+
+        assert await use_case.peek(week_start_date=WEEK) is None
+
+    async def test_fresh_ignores_stored_options(self):
+        use_case, ai, _ = build()
+        await use_case.pregenerate(WEEK)
+
+        await use_case.execute(fresh=True, week_start_date=WEEK)
+
+        assert ai.suggest_calls == 2
+
+    async def test_stream_serves_stored_options(self):
+        use_case, ai, _ = build()
+        await use_case.pregenerate(WEEK)
+
+        result = [so async for so in await use_case.stream(week_start_date=WEEK)]
+
+        assert result[0].options[0].name == "Lasagna"
+        assert ai.suggest_calls == 1
+
+
+# ---------------------------------------------------------------------------
+# Scheduler
+# ---------------------------------------------------------------------------
+
+def fixed_clock(hour: int):
+    return lambda: datetime(2026, 3, 5, hour, tzinfo=timezone.utc)  # a Thursday
+
+
+class TestScheduler:
+    def test_next_week_start_is_following_monday(self):
+        assert next_week_start(date(2026, 3, 5)) == "2026-03-09"
+        assert next_week_start(date(2026, 3, 9)) == "2026-03-16"
+
+    def test_quiet_hours_may_wrap_midnight(self):
+        scheduler = PregenerationScheduler(None, None, quiet_hours=(22, 4))
+        at = lambda h: datetime(2026, 3, 5, h, tzinfo=timezone.utc)
+
+        assert scheduler.in_quiet_hours(at(23))
+        assert scheduler.in_quiet_hours(at(3))
+        assert not scheduler.in_quiet_hours(at(12))
+
+    async def test_run_counts_outcomes_and_respects_concurrency(self):
+        households = [uuid.uuid4() for _ in range(5)]
+        in_flight = 0
+        peak = 0
+
+        async def list_households(since):
+            return households
+
+        async def pregenerate(household_id, week_start_date):
+            nonlocal in_flight, peak
+            assert week_start_date == "2026-03-09"
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            if household_id == households[0]:
+                raise ValueError("No meal plan template configured.")
+            return household_id != households[1]
+
+        scheduler = PregenerationScheduler(
+            list_households, pregenerate, concurrency=2, clock=fixed_clock(3)
+        )
+        run = await scheduler.run_once()
+
+        assert (run.households, run.generated, run.skipped, run.failed) == (5, 3, 1, 1)
+        assert peak == 2
+        assert scheduler.last_run is run
+
+    async def test_aware_clock_queries_households_in_naive_utc(self):
+        class CapturingSession:
+            statement = None
+
+            async def execute(self, statement):
+                self.statement = statement
+                return SimpleNamespace(scalars=lambda: SimpleNamespace(all=lambda: []))
+
+        session = CapturingSession()
+        scheduler = PregenerationScheduler(
+            AuthRepository(session).active_household_ids, None, clock=fixed_clock(3)
+        )
+
+        await scheduler.run_once()
+
+        params = session.statement.compile(dialect=postgresql.asyncpg.dialect()).params
+        assert set(params.values()) == {datetime(2026, 2, 5, 3)}  # 28 days back, naive UTC
+
+    async def test_loop_logs_a_failed_run(self, caplog):
+        async def list_households(since):
+            raise ConnectionError("database unavailable")
+
+        scheduler = PregenerationScheduler(
+            list_households, None, clock=fixed_clock(3), interval_seconds=0.01
+        )
+        scheduler.start()
+        await asyncio.sleep(0.03)
+        await scheduler.stop()
+
+        assert "Pre-generation run failed" in caplog.text
+
+    async def test_loop_only_runs_in_quiet_hours(self):
+        calls = []
+
+        async def list_households(since):
+            calls.append(since)
+            return []
+
+        scheduler = PregenerationScheduler(
+            list_households, None, clock=fixed_clock(18), interval_seconds=0.01
+        )
+        scheduler.start()
+        await asyncio.sleep(0.05)
+        await scheduler.stop()
+
+        assert calls == []
@@ -0,0 +1,213 @@
+"""
+Prompt token budget: context trimming, max_tokens sizing, downshifting and rejection.
+"""
+import json
+import re
+import uuid
+from types import SimpleNamespace
+
+import pytest
+
+from application.ports.ai_port import RefinementRequest, SuggestionRequest
+from domain.entities.ai_usage import AIUsageRecord
+from domain.entities.meal_plan import DayOfWeek, MealSlot, MealType
+from infrastructure.ai.claude_adapter import ClaudeAdapter
+from infrastructure.ai.prompt_budget import (
+    PromptBudget,
+    PromptBudgetExceeded,
+    PromptContext,
+    estimate_tokens,
+)
+from infrastructure.ai.usage_ledger import UsageLedger
+
+
+def recipe_dict(name: str) -> dict:
+    return {
+        "name": name,
+        "emoji": "🍲",
+        "prep_time": 20,
+        "key_ingredients": ["rice"],
+        "ingredients": [{"name": "rice", "quantity": 0.5, "unit": "cups", "category": "pantry"}],
+    }
+
+
+def make_slot(name: str) -> MealSlot:
+    return MealSlot(id=uuid.uuid4(), name=name, meal_type=MealType.DINNER,
+                    days=[DayOfWeek.MON], member_ids=[])
+
+
+def make_request(n_slots: int, **fields) -> SuggestionRequest:
+    return SuggestionRequest(
+        slots=[make_slot(f"Slot {i}") for i in range(n_slots)],
+        members=[],
+        disliked_ingredients=fields.pop("disliked_ingredients", []),
+        liked_ingredients=fields.pop("liked_ingredients", []),
+        cuisine_preferences=[],
+        **fields,
+    )
+
+
+def user_text(call: dict) -> str:
+    return "\n".join(block["text"] for block in call["messages"][-1]["content"])
+
+
+class FakeMessages:
+    """Answers every call with one group per "- Slot N (" line in its prompt, as the forced tool's input."""
+
+    def __init__(self):
+        self.calls: list = []
+
+    async def create(self, **kwargs):
+        self.calls.append(kwargs)
+        names = re.findall(r"^- (Slot \d+) \(", user_text(kwargs), flags=re.M)
+        slots = [[recipe_dict(f"{n} #{i}") for i in range(3)] for n in names]
+        usage = SimpleNamespace(input_tokens=40, output_tokens=900,
+                                cache_read_input_tokens=400, cache_creation_input_tokens=0)
+        answer = SimpleNamespace(type="tool_use", name=kwargs["tool_choice"]["name"], input={"slots": slots})
+        return SimpleNamespace(content=[answer], stop_reason="tool_use", usage=usage)
+
+
+def make_adapter(**kwargs) -> tuple:
+    adapter = ClaudeAdapter(api_key="test", **kwargs)
+    messages = FakeMessages()
+    adapter._client = SimpleNamespace(messages=messages)
+    return adapter, messages
+
+
+class TestPromptContext:
+    def test_everything_kept_when_it_fits(self):
+        context = PromptContext()
+        context.line("Household context:")
+        context.items(["cilantro"], lambda v: f"- Disliked ingredients: {v}")
+        context.items([], lambda v: f"- Liked ingredients: {v}", priority=1)
+
+        text, dropped = context.build(1000)
+
+        assert text == "Household context:\n- Disliked ingredients: ['cilantro']"
+        assert dropped == 0
+
+    def test_lowest_priority_list_is_cut_from_the_end_first(self):
+        recent = [f"Recent dish number {i}" for i in range(200)]
+        context = PromptContext()
+        context.items(["peanuts"] * 3, lambda v: f"- Disliked: {v}")
+        context.items(["tofu", "miso"], lambda v: f"- Liked: {v}", priority=2)
+        context.items(recent, lambda v: f"- Recent: {', '.join(v)}", priority=1)
+
+        text, dropped = context.build(300)
+
+        assert "- Liked: ['tofu', 'miso']" in text
+        assert "Recent dish number 0," in text  # newest kept
+        assert "Recent dish number 199" not in text
+        assert dropped > 0
+        assert estimate_tokens(text) <= 300
+
+    def test_required_lines_survive_any_budget(self):
+        context = PromptContext()
+        context.items(["shellfish"], lambda v: f"- Disliked: {v}")
+        context.items(["tofu"], lambda v: f"- Liked: {v}", priority=1)
+
+        text, dropped = context.build(0)
+
+        assert text == "- Disliked: ['shellfish']"
+        assert dropped == 1
+
+
+class TestPromptBudget:
+    def test_max_tokens_follows_the_answer_size(self):
+        budget = PromptBudget()
+        assert budget.slot_tokens(1, 3) == budget.min_output_tokens
+        assert budget.slot_tokens(1, 3) < budget.slot_tokens(6, 3) < budget.max_output_tokens
+        assert budget.slot_tokens(40, 3) == budget.max_output_tokens
+
+    def test_slots_per_call_fits_the_output_ceiling(self):
+        budget = PromptBudget()
+        per_call = budget.slots_per_call(3)
+        assert budget.slot_tokens(per_call, 3) <= budget.max_output_tokens
+        assert budget.slots_per_call(1000) == 0
+
+
+class TestAdapterBudget:
+    async def test_long_preferences_are_trimmed_but_dislikes_kept(self):
+        adapter, messages = make_adapter(prompt_budget=PromptBudget(context_tokens=120))
+        request = make_request(
+            1,
+            disliked_ingredients=["peanuts"],
+            recent_recipe_names=[f"Weeknight dish {i}" for i in range(300)],
+        )
+
+        await adapter.suggest_recipes(request)
+
+        prompt = user_text(messages.calls[0])
+        assert "- Disliked ingredients: ['peanuts']" in prompt
+        assert "Weeknight dish 0" in prompt and "Weeknight dish 299" not in prompt
+        assert adapter.budget_stats.trimmed_prompts == 1
+
+    async def test_call_sizes_max_tokens_from_slot_count(self):
+        adapter, messages = make_adapter()
+
+        await adapter.suggest_recipes(make_request(1))
+        await adapter.suggest_recipes(make_request(5))
+
+        assert messages.calls[0]["max_tokens"] < messages.calls[1]["max_tokens"] <= 8192
+
+    async def test_answer_too_long_for_one_call_is_split(self):
+        adapter, messages = make_adapter(prompt_budget=PromptBudget(max_output_tokens=3000))
+        request = make_request(7)
+
+        groups = await adapter.suggest_recipes(request)
+
+        assert len(messages.calls) > 1
+        assert all(call["max_tokens"] <= 3000 for call in messages.calls)
+        assert [g[0].name for g in groups] == [f"Slot {i} #0" for i in range(7)]
+        assert adapter.budget_stats.downshifted == 1
+
+    async def test_streamed_refine_is_split_too(self):
+        adapter, messages = make_adapter(prompt_budget=PromptBudget(max_output_tokens=3000))
+        slots = [make_slot(f"Slot {i}") for i in range(5)]
+        request = RefinementRequest(
+            slots=slots, members=[], disliked_ingredients=[], liked_ingredients=[],
+            cuisine_preferences=[], existing_assignments={}, user_message="lighter please",
+        )
+
+        groups = [g async for g in adapter.stream_refine_recipes(request)]
+
+        assert len(messages.calls) > 1
+        assert [g[0].name for g in groups] == [f"Slot {i} #0" for i in range(5)]
+
+    async def test_oversized_prompt_is_rejected_before_sending(self):
+        adapter, messages = make_adapter()
+        request = make_request(1, week_context="guests " * 20_000)
+
+        with pytest.raises(PromptBudgetExceeded):
+            await adapter.suggest_recipes(request)
+
+        assert messages.calls == []
+        assert adapter.budget_stats.rejected == 1
+
+    async def test_slot_that_cannot_fit_any_call_is_rejected(self):
+        adapter, messages = make_adapter()
+
+        with pytest.raises(PromptBudgetExceeded):
+            await adapter.suggest_recipes(make_request(1, options_per_slot=100))
+
+        assert messages.calls == []
+
+    async def test_estimate_is_recorded_next_to_reported_tokens(self):
+        ledger = UsageLedger()
+        adapter, _ = make_adapter(ledger=ledger)
+
+        await adapter.suggest_recipes(make_request(2))
+
+        [entry] = ledger.drain()
+        assert entry.estimated_input_tokens > 0
+        suggest = ledger.snapshot()["by_use_case"]["suggest"]
+        assert suggest["reported_input_tokens"] == 440  # uncached + cache reads
+        assert suggest["input_estimate_ratio"] == round(entry.estimated_input_tokens / 440, 3)
+
+
+def test_failed_calls_do_not_count_towards_the_estimate_ratio():
+    ledger = UsageLedger()
+    ledger.record(AIUsageRecord(use_case="suggest", model="m", household_id=None, latency_ms=5,
+                                estimated_input_tokens=500, error="APIConnectionError"))
+
+    assert ledger.snapshot()["by_use_case"]["suggest"]["input_estimate_ratio"] is None
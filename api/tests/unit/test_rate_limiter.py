@@ -94,3 +94,11 @@ class TestRateLimiter:
 
         # Only 3 should be allowed (budget = 3.0, cost = 1.0 each)
         assert allowed_count == 3
+
+    async def test_remaining_does_not_consume(self):
+        rl = RateLimiter()
+        await rl.check_and_consume("hh-1", cost=1.0)
+
+        assert await rl.remaining("hh-1") == pytest.approx(BUDGET - 1.0)
+        assert await rl.remaining("hh-1") == pytest.approx(BUDGET - 1.0)
+        assert await rl.remaining("hh-2") == pytest.approx(BUDGET)
@@ -227,6 +227,126 @@ async def test_generate_instructions_returns_none_for_unknown_id():
     assert await use_case.execute(uuid4()) is None
 
 
+# ---------------------------------------------------------------------------
+# Eager instructions — batched generation after a plan is confirmed
+# ---------------------------------------------------------------------------
+
+class BatchAIPort(FakeAIPort):
+    """Answers batches with `batch_size` entries at most, or fails them all."""
+
+    def __init__(self, batch_size=None, fail_batch=False):
+        super().__init__()
+        self.batch_size = batch_size
+        self.fail_batch = fail_batch
+        self.batch_calls = []
+        self.single_calls = 0
+
+    async def generate_instructions_batch(self, recipes):
+        self.batch_calls.append(len(recipes))
+        if self.fail_batch:
+            raise ValueError("bad JSON")
+        return [[f"Cook {r.name}."] for r in recipes[: self.batch_size]]
+
+    async def generate_instructions(self, recipe):
+        self.single_calls += 1
+        return await super().generate_instructions(recipe)
+
+
+class RecordingQueue:
+    def __init__(self):
+        self.enqueued = []
+
+    def enqueue(self, recipe_ids):
+        self.enqueued.append(recipe_ids)
+
+
+async def save_recipes(repo, n):
+    return [await repo.save_recipe(make_recipe(f"Recipe {i}")) for i in range(n)]
+
+
+async def test_execute_many_uses_one_batch_per_chunk():
+    repo = InMemoryRecipeRepository()
+    ai = BatchAIPort()
+    recipes = await save_recipes(repo, 10)
+
+    saved = await GenerateInstructionsUseCase(repo, ai).execute_many([r.id for r in recipes])
+
+    assert saved == 10
+    assert ai.batch_calls == [8, 2] and ai.single_calls == 0
+    assert (await repo.get_recipe(recipes[9].id)).cooking_instructions == ["Cook Recipe 9."]
+
+
+async def test_execute_many_falls_back_per_recipe_when_batch_fails(caplog):
+    repo = InMemoryRecipeRepository()
+    ai = BatchAIPort(fail_batch=True)
+    recipes = await save_recipes(repo, 3)
+
+    saved = await GenerateInstructionsUseCase(repo, ai).execute_many([r.id for r in recipes])
+
+    assert saved == 3 and ai.single_calls == 3
+    assert "Batched instructions failed for 3 recipe(s)" in caplog.text
+
+
+async def test_execute_many_retries_recipes_missing_from_a_truncated_batch():
+    repo = InMemoryRecipeRepository()
+    ai = BatchAIPort(batch_size=2)
+    recipes = await save_recipes(repo, 3)
+
+    await GenerateInstructionsUseCase(repo, ai).execute_many([r.id for r in recipes])
+
+    assert ai.single_calls == 1
+    assert (await repo.get_recipe(recipes[0].id)).cooking_instructions == ["Cook Recipe 0."]
+    assert (await repo.get_recipe(recipes[2].id)).cooking_instructions is not None
+
+
+async def test_execute_many_skips_recipes_with_instructions_and_duplicates():
+    repo = InMemoryRecipeRepository()
+    ai = BatchAIPort()
+    done, todo = await save_recipes(repo, 2)
+    await repo.save_instructions(done.id, ["Already done."])
+
+    saved = await GenerateInstructionsUseCase(repo, ai).execute_many([done.id, todo.id, todo.id])
+
+    assert saved == 1 and ai.batch_calls == [1]
+    assert (await repo.get_recipe(done.id)).cooking_instructions == ["Already done."]
+
+
+async def test_confirm_enqueues_recipes_without_instructions():
+    repo = InMemoryRecipeRepository()
+    queue = RecordingQueue()
+    known = await repo.save_recipe(make_recipe("Known"))
+    await repo.save_instructions(known.id, ["Already done."])
+    new = make_recipe("New")
+    use_case = ConfirmPlanUseCase(
+        plan_repo=InMemoryWeeklyPlanRepository(), recipe_repo=repo, instruction_queue=queue
+    )
+
+    await use_case.execute(
+        "2026-02-23",
+        [
+            RecipeSuggestion(slot=make_slot(), recipe=known),
+            RecipeSuggestion(slot=make_slot(), recipe=new),
+            RecipeSuggestion(slot=make_slot(), recipe=new),
+        ],
+    )
+
+    assert queue.enqueued == [[new.id]]
+
+
+async def test_confirm_enqueues_nothing_when_all_recipes_have_instructions():
+    repo = InMemoryRecipeRepository()
+    queue = RecordingQueue()
+    known = await repo.save_recipe(make_recipe("Known"))
+    await repo.save_instructions(known.id, ["Already done."])
+    use_case = ConfirmPlanUseCase(
+        plan_repo=InMemoryWeeklyPlanRepository(), recipe_repo=repo, instruction_queue=queue
+    )
+
+    await use_case.execute("2026-02-23", [RecipeSuggestion(slot=make_slot(), recipe=known)])
+
+    assert queue.enqueued == []
+
+
 # ---------------------------------------------------------------------------
 # GetRecipeUseCase — immediate return without generation
 # ---------------------------------------------------------------------------
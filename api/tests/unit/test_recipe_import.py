@@ -1,21 +1,25 @@
 """
 Tests for user-added recipe use cases:
-  - ImportRecipeUseCase (AI URL parsing)
+  - ImportRecipeUseCase (structured data first, AI URL parsing as fallback,
+    cross-household import cache)
   - CreateRecipeUseCase (manual / post-import save)
   - FullUpdateRecipeUseCase (full field edit)
 
 Also covers the new InMemoryRecipeRepository methods: create_recipe, full_update_recipe.
 """
 from dataclasses import replace
+from datetime import datetime, timedelta, timezone
 from uuid import uuid4
 
 import pytest
 
 from application.use_cases.create_recipe import CreateRecipeUseCase
 from application.use_cases.full_update_recipe import FullUpdateRecipeUseCase
+from application.ports.recipe_page_port import RecipeDraft, RecipePage, RecipePagePort
 from application.use_cases.import_recipe import ImportRecipeUseCase
 from domain.entities.recipe import GroceryCategory, Ingredient, Recipe
-from tests.unit.fakes import FakeAIPort, InMemoryRecipeRepository
+from domain.services.url_canonical import canonical_url
+from tests.unit.fakes import FakeAIPort, InMemoryImportCacheRepository, InMemoryRecipeRepository
 
 
 # ---------------------------------------------------------------------------
@@ -39,6 +43,50 @@ def make_ingredient(name: str = "garlic") -> Ingredient:
     return Ingredient(name=name, quantity=2, unit="cloves", category=GroceryCategory.PRODUCE)
 
 
+def make_draft(**overrides) -> RecipeDraft:
+    fields = dict(
+        source_url="https://example.com/recipe",
+        name="Garlic Chicken",
+        ingredient_lines=["2 lbs chicken thighs", "4 cloves garlic", "salt, to taste"],
+        instructions=["Roast."],
+        servings=4,
+        prep_time=50,
+    )
+    fields.update(overrides)
+    return RecipeDraft(**fields)
+
+
+class FakePagePort(RecipePagePort):
+    def __init__(self, draft=None, error=None, etag=None, unchanged=False):
+        self._draft = draft
+        self._error = error
+        self._etag = etag
+        self.unchanged = unchanged
+        self.requests = []
+
+    async def read_recipe(self, url: str, etag=None, last_modified=None):
+        self.requests.append((url, etag))
+        if self._error:
+            raise self._error
+        if self.unchanged and etag == self._etag:
+            return RecipePage(draft=None, etag=etag, not_modified=True)
+        return RecipePage(draft=self._draft, etag=self._etag)
+
+
+class RecordingAIPort(FakeAIPort):
+    def __init__(self):
+        super().__init__()
+        self.calls = []
+
+    async def parse_recipe_from_url(self, url: str) -> Recipe:
+        self.calls.append("parse")
+        return await super().parse_recipe_from_url(url)
+
+    async def complete_recipe_draft(self, draft: RecipeDraft) -> Recipe:
+        self.calls.append("complete")
+        return replace(make_recipe(draft.name), source_url=draft.source_url)
+
+
 # ---------------------------------------------------------------------------
 # ImportRecipeUseCase
 # ---------------------------------------------------------------------------
@@ -70,6 +118,137 @@ async def test_import_recipe_does_not_persist():
     # If it did, it would require a repo arg and the test would fail to construct.
 
 
+async def test_import_uses_structured_data_without_the_ai():
+    ai = RecordingAIPort()
+    use_case = ImportRecipeUseCase(ai_port=ai, page_port=FakePagePort(make_draft()))
+
+    recipe = await use_case.execute("https://example.com/recipe")
+
+    assert ai.calls == []
+    assert recipe.name == "Garlic Chicken"
+    assert recipe.prep_time == 50
+    assert recipe.cooking_instructions == ["Roast."]
+    assert recipe.source_url == "https://example.com/recipe"
+    chicken, garlic, salt = recipe.ingredients
+    assert (chicken.quantity, chicken.unit, chicken.category) == (0.5, "lbs", GroceryCategory.MEAT)
+    assert (garlic.quantity, garlic.unit) == (1.0, "cloves")
+    assert salt.quantity == 0
+    assert recipe.key_ingredients == ["chicken thighs", "garlic"]
+
+
+async def test_import_asks_ai_to_complete_draft_with_gaps():
+    ai = RecordingAIPort()
+    for draft in (make_draft(servings=None), make_draft(ingredient_lines=["a knob of butter"])):
+        use_case = ImportRecipeUseCase(ai_port=ai, page_port=FakePagePort(draft))
+        await use_case.execute("https://example.com/recipe")
+    assert ai.calls == ["complete", "complete"]
+
+
+async def test_import_falls_back_to_full_parse_without_structured_data():
+    ai = RecordingAIPort()
+    for page_port in (FakePagePort(None), FakePagePort(error=OSError("timeout"))):
+        result = await ImportRecipeUseCase(ai_port=ai, page_port=page_port).execute("https://x.test")
+        assert result.name == "Parsed Recipe"
+    assert ai.calls == ["parse", "parse"]
+
+
+# ---------------------------------------------------------------------------
+# Import cache
+# ---------------------------------------------------------------------------
+
+URL = "https://www.example.com/chili/?utm_source=pinterest#recipe"
+
+
+def age_cache(cache: InMemoryImportCacheRepository, by: timedelta) -> None:
+    for entry in cache.entries.values():
+        entry.fetched_at -= by
+
+
+def test_canonical_url_merges_spellings_of_one_page():
+    assert canonical_url(URL) == "https://example.com/chili"
+    assert canonical_url("http://EXAMPLE.com:80/chili?b=2&a=1&fbclid=x") == "https://example.com/chili?a=1&b=2"
+    assert canonical_url("https://example.com/chili?page=2") != canonical_url("https://example.com/chili")
+
+
+async def test_repeat_import_is_served_from_cache_without_fetching():
+    ai, cache = RecordingAIPort(), InMemoryImportCacheRepository()
+    pages = FakePagePort(make_draft(servings=None))
+    use_case = ImportRecipeUseCase(ai_port=ai, page_port=pages, cache=cache)
+
+    first = await use_case.execute(URL)
+    second = await use_case.execute("https://example.com/chili")
+
+    assert ai.calls == ["complete"]
+    assert len(pages.requests) == 1
+    assert second.name == first.name and second.id != first.id
+    assert second.source_url == "https://example.com/chili"
+    assert cache.entries["https://example.com/chili"].hits == 1
+
+
+async def test_stale_entry_is_revalidated_and_kept_when_unchanged():
+    ai, cache = RecordingAIPort(), InMemoryImportCacheRepository()
+    pages = FakePagePort(make_draft(servings=None), etag='"v1"', unchanged=True)
+    use_case = ImportRecipeUseCase(ai_port=ai, page_port=pages, cache=cache)
+    await use_case.execute(URL)
+    age_cache(cache, timedelta(days=2))
+
+    await use_case.execute(URL)
+
+    assert pages.requests[-1] == (URL, '"v1"')
+    assert ai.calls == ["complete"]
+    entry = cache.entries["https://example.com/chili"]
+    assert datetime.now(timezone.utc) - entry.fetched_at < timedelta(minutes=1)
+
+
+async def test_stale_entry_is_reparsed_when_page_changed():
+    ai, cache = RecordingAIPort(), InMemoryImportCacheRepository()
+    pages = FakePagePort(make_draft(servings=None), etag='"v1"')
+    use_case = ImportRecipeUseCase(ai_port=ai, page_port=pages, cache=cache)
+    await use_case.execute(URL)
+    age_cache(cache, timedelta(days=2))
+
+    await use_case.execute(URL)
+
+    assert ai.calls == ["complete", "complete"]
+
+
+async def test_stale_entry_is_served_when_site_is_down():
+    ai, cache = RecordingAIPort(), InMemoryImportCacheRepository()
+    use_case = ImportRecipeUseCase(ai_port=ai, page_port=FakePagePort(make_draft()), cache=cache)
+    await use_case.execute(URL)
+    age_cache(cache, timedelta(days=2))
+
+    down = ImportRecipeUseCase(ai_port=ai, page_port=FakePagePort(error=OSError("down")), cache=cache)
+    recipe = await down.execute(URL)
+
+    assert recipe.name == "Garlic Chicken"
+    assert ai.calls == []
+
+
+async def test_cache_evicts_least_recently_imported():
+    ai, cache = RecordingAIPort(), InMemoryImportCacheRepository()
+    use_case = ImportRecipeUseCase(ai_port=ai, page_port=FakePagePort(make_draft()), cache=cache, max_cached=2)
+
+    await use_case.execute("https://example.com/a")
+    await use_case.execute("https://example.com/b")
+    await use_case.execute("https://example.com/a")  # hit: b is now the oldest
+    await use_case.execute("https://example.com/c")
+
+    assert set(cache.entries) == {"https://example.com/a", "https://example.com/c"}
+
+
+async def test_failed_import_is_not_cached():
+    class FailingAIPort(FakeAIPort):
+        async def parse_recipe_from_url(self, url: str) -> Recipe:
+            raise ValueError("No recipe found")
+
+    cache = InMemoryImportCacheRepository()
+    use_case = ImportRecipeUseCase(ai_port=FailingAIPort(), page_port=FakePagePort(None), cache=cache)
+    with pytest.raises(ValueError):
+        await use_case.execute(URL)
+    assert cache.entries == {}
+
+
 # ---------------------------------------------------------------------------
 # CreateRecipeUseCase
 # ---------------------------------------------------------------------------
@@ -178,3 +178,18 @@ class TestRefineRecipes:
         )
 
         assert str(template.slots[0].id) in ai.last_refinement_request.existing_assignments
+
+    async def test_stream_yields_only_unlocked_slots(self):
+        template = make_template(3)
+        locked_slot = template.slots[0]
+        recipes = [make_recipe(f"R{i}") for i in range(2)]
+        use_case = build_use_case(template=template, recipes_to_return=recipes)
+
+        stream = await use_case.stream(
+            existing_assignments={},
+            user_message="more vegetables",
+            locked_slot_ids=[str(locked_slot.id)],
+        )
+        result = [so async for so in stream]
+
+        assert [so.slot.id for so in result] == [template.slots[1].id, template.slots[2].id]
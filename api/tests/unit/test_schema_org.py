@@ -0,0 +1,103 @@
+import json
+
+from infrastructure.web.schema_org import extract_recipe_draft
+
+URL = "https://example.com/recipe"
+
+
+def page(body: str) -> str:
+    return f"<html><head><title>Recipe</title></head><body>{body}</body></html>"
+
+
+def json_ld(data) -> str:
+    return f'<script type="application/ld+json">{json.dumps(data)}</script>'
+
+
+def test_reads_json_ld_recipe():
+    draft = extract_recipe_draft(page(json_ld({
+        "@context": "https://schema.org",
+        "@type": "Recipe",
+        "name": "Lemon &amp; Garlic Chicken",
+        "recipeYield": ["4", "4 servings"],
+        "prepTime": "PT15M",
+        "cookTime": "PT1H",
+        "recipeIngredient": ["1 ½ lbs chicken", "2 lemons"],
+        "recipeInstructions": [
+            {"@type": "HowToSection", "itemListElement": [
+                {"@type": "HowToStep", "text": "Season the chicken ."},
+                {"@type": "HowToStep", "text": "Roast."},
+            ]},
+        ],
+    })), URL)
+
+    assert draft.name == "Lemon & Garlic Chicken"
+    assert draft.servings == 4
+    assert draft.prep_time == 75
+    assert draft.ingredient_lines == ["1 ½ lbs chicken", "2 lemons"]
+    assert draft.instructions == ["Season the chicken.", "Roast."]
+    assert draft.source_url == URL
+
+
+def test_finds_recipe_inside_graph_and_skips_broken_blocks():
+    body = '<script type="application/ld+json">{not json</script>' + json_ld({
+        "@graph": [
+            {"@type": "WebPage", "name": "Home"},
+            {"@type": ["Recipe", "NewsArticle"], "name": "Dal", "recipeIngredient": ["1 cup lentils"],
+             "recipeInstructions": "<p>Rinse.</p><p>Simmer.</p>", "totalTime": "PT40M"},
+        ]
+    })
+
+    draft = extract_recipe_draft(page(body), URL)
+
+    assert draft.name == "Dal"
+    assert draft.instructions == ["Rinse.", "Simmer."]
+    assert draft.prep_time == 40
+    assert draft.servings is None
+
+
+def test_reads_microdata_with_unclosed_elements():
+    body = """
+    <div itemscope itemtype="https://schema.org/Recipe">
+      <h1 itemprop="name">Pancakes</h1>
+      <meta itemprop="totalTime" content="PT20M">
+      <span itemprop="recipeYield">Serves 2</span>
+      <ul>
+        <li itemprop="recipeIngredient">1 cup flour
+        <li itemprop="recipeIngredient">1 egg
+      </ul>
+      <div itemprop="recipeInstructions"><p>Whisk.<p>Fry.</div>
+    </div>
+    """
+
+    draft = extract_recipe_draft(page(body), URL)
+
+    assert draft.name == "Pancakes"
+    assert draft.servings == 2
+    assert draft.prep_time == 20
+    assert draft.ingredient_lines == ["1 cup flour", "1 egg"]
+    assert draft.instructions == ["Whisk.", "Fry."]
+
+
+def test_page_without_recipe_data_returns_none():
+    body = json_ld({"@type": "Article", "name": "Ten dinners"}) + "<p>1 cup flour</p>"
+    assert extract_recipe_draft(page(body), URL) is None
+
+
+async def test_page_reader_sends_validators_and_reports_not_modified():
+    import httpx
+
+    from infrastructure.web.page_reader import HttpRecipePageReader
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304)
+        body = page(json_ld({"@type": "Recipe", "name": "Dal", "recipeIngredient": ["1 cup lentils"]}))
+        return httpx.Response(200, text=body, headers={"ETag": '"v1"', "Last-Modified": "Mon, 02 Mar 2026 10:00:00 GMT"})
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        reader = HttpRecipePageReader(client)
+        fresh = await reader.read_recipe(URL)
+        again = await reader.read_recipe(URL, etag=fresh.etag, last_modified=fresh.last_modified)
+
+    assert fresh.draft.name == "Dal" and fresh.etag == '"v1"' and not fresh.not_modified
+    assert again.not_modified and again.draft is None and again.last_modified == fresh.last_modified
@@ -0,0 +1,220 @@
+import asyncio
+import uuid
+
+import pytest
+
+from application.ports.ai_port import SuggestionRequest
+from application.use_cases.generate_instructions import GenerateInstructionsUseCase
+from domain.entities.meal_plan import DayOfWeek, MealSlot, MealType
+from domain.entities.recipe import GroceryCategory, Ingredient, Recipe
+from infrastructure.ai.single_flight import CoalescingAIAdapter, SingleFlight
+from tests.unit.fakes import FakeAIPort, InMemoryRecipeRepository
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+class SlowAIPort(FakeAIPort):
+    """Counts upstream calls and holds each one open until `release` is set."""
+
+    def __init__(self, recipes_to_return=None):
+        super().__init__(recipes_to_return)
+        self.release = asyncio.Event()
+        self.instruction_calls = 0
+        self.suggest_calls = 0
+        self.fail = False
+
+    async def generate_instructions(self, recipe):
+        self.instruction_calls += 1
+        await self.release.wait()
+        return ["Boil", "Serve"]
+
+    async def suggest_recipes(self, request):
+        self.suggest_calls += 1
+        await self.release.wait()
+        if self.fail:
+            raise ValueError("bad JSON")
+        return await super().suggest_recipes(request)
+
+    async def stream_suggest_recipes(self, request):
+        self.suggest_calls += 1
+        for group in await super().suggest_recipes(request):
+            await self.release.wait()
+            yield group
+
+
+def make_recipe(name: str = "Pasta") -> Recipe:
+    return Recipe(
+        id=uuid.uuid4(),
+        name=name,
+        emoji="🍝",
+        prep_time=30,
+        ingredients=[Ingredient("Pasta", 2.0, "oz", GroceryCategory.PANTRY)],
+        key_ingredients=["pasta"],
+    )
+
+
+def make_request(household_id=None, slots=None) -> SuggestionRequest:
+    return SuggestionRequest(
+        slots=slots or [MealSlot(uuid.uuid4(), "Dinner", MealType.DINNER, [DayOfWeek.MON], [])],
+        members=[],
+        disliked_ingredients=[],
+        liked_ingredients=[],
+        cuisine_preferences=[],
+        household_id=household_id,
+    )
+
+
+def build_adapter():
+    inner = SlowAIPort(recipes_to_return=[make_recipe("A"), make_recipe("B")])
+    flight = SingleFlight()
+    return CoalescingAIAdapter(inner, flight), inner, flight
+
+
+async def run_together(*coros):
+    tasks = [asyncio.create_task(c) for c in coros]
+    await asyncio.sleep(0)
+    return tasks
+
+
+# ---------------------------------------------------------------------------
+# Instructions
+# ---------------------------------------------------------------------------
+
+class TestInstructions:
+    async def test_concurrent_calls_for_one_recipe_share_a_request(self):
+        adapter, inner, flight = build_adapter()
+        recipe = make_recipe()
+
+        tasks = await run_together(
+            adapter.generate_instructions(recipe), adapter.generate_instructions(recipe)
+        )
+        inner.release.set()
+        results = await asyncio.gather(*tasks)
+
+        assert inner.instruction_calls == 1
+        assert results == [["Boil", "Serve"], ["Boil", "Serve"]]
+        assert results[0] is not results[1]
+        assert flight.stats.coalesced == 1 and flight.stats.by_kind == {"instructions": 1}
+        assert flight.in_flight() == 0
+
+    async def test_different_recipes_are_not_shared(self):
+        adapter, inner, _ = build_adapter()
+        tasks = await run_together(
+            adapter.generate_instructions(make_recipe()),
+            adapter.generate_instructions(make_recipe()),
+        )
+        inner.release.set()
+        await asyncio.gather(*tasks)
+        assert inner.instruction_calls == 2
+
+    async def test_sequential_calls_are_not_shared(self):
+        adapter, inner, _ = build_adapter()
+        inner.release.set()
+        recipe = make_recipe()
+        await adapter.generate_instructions(recipe)
+        await adapter.generate_instructions(recipe)
+        assert inner.instruction_calls == 2
+
+    async def test_use_case_double_load(self):
+        adapter, inner, _ = build_adapter()
+        recipe = make_recipe()
+        repo = InMemoryRecipeRepository()
+        await repo.save_recipe(recipe)
+        use_case = GenerateInstructionsUseCase(recipe_repo=repo, ai_port=adapter)
+
+        tasks = await run_together(use_case.execute(recipe.id), use_case.execute(recipe.id))
+        inner.release.set()
+        results = await asyncio.gather(*tasks)
+
+        assert inner.instruction_calls == 1
+        assert all(r.cooking_instructions == ["Boil", "Serve"] for r in results)
+
+    async def test_cancelled_caller_does_not_cancel_shared_call(self):
+        adapter, inner, _ = build_adapter()
+        recipe = make_recipe()
+        first, second = await run_together(
+            adapter.generate_instructions(recipe), adapter.generate_instructions(recipe)
+        )
+
+        first.cancel()
+        inner.release.set()
+
+        assert await second == ["Boil", "Serve"]
+
+
+# ---------------------------------------------------------------------------
+# Suggestions
+# ---------------------------------------------------------------------------
+
+class TestSuggestions:
+    async def test_double_submit_shares_one_request(self):
+        adapter, inner, flight = build_adapter()
+        household_id = uuid.uuid4()
+        slots = make_request().slots
+
+        tasks = await run_together(
+            adapter.suggest_recipes(make_request(household_id, slots)),
+            adapter.suggest_recipes(make_request(household_id, slots)),
+        )
+        inner.release.set()
+        first, second = await asyncio.gather(*tasks)
+
+        assert inner.suggest_calls == 1
+        assert first == second
+        assert flight.stats.leaders == 1 and flight.stats.coalesced == 1
+
+    async def test_other_households_are_not_shared(self):
+        adapter, inner, _ = build_adapter()
+        slots = make_request().slots
+        tasks = await run_together(
+            adapter.suggest_recipes(make_request(uuid.uuid4(), slots)),
+            adapter.suggest_recipes(make_request(uuid.uuid4(), slots)),
+        )
+        inner.release.set()
+        await asyncio.gather(*tasks)
+        assert inner.suggest_calls == 2
+
+    async def test_failure_reaches_every_caller(self):
+        adapter, inner, _ = build_adapter()
+        request = make_request(uuid.uuid4())
+        inner.fail = True
+
+        tasks = await run_together(adapter.suggest_recipes(request), adapter.suggest_recipes(request))
+        inner.release.set()
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+
+        assert inner.suggest_calls == 1
+        assert all(isinstance(r, ValueError) for r in results)
+
+    async def test_streams_are_shared_from_the_start(self):
+        adapter, inner, flight = build_adapter()
+        slots = make_request().slots + make_request().slots
+        request = make_request(uuid.uuid4(), slots)
+
+        async def collect():
+            return [g async for g in adapter.stream_suggest_recipes(request)]
+
+        tasks = await run_together(collect(), collect())
+        inner.release.set()
+        first, second = await asyncio.gather(*tasks)
+
+        assert inner.suggest_calls == 1
+        assert len(first) == len(second) == 2
+        assert flight.stats.by_kind == {"suggest-stream": 1}
+
+    async def test_stream_failure_reaches_joiners(self):
+        flight = SingleFlight()
+
+        async def failing():
+            yield [make_recipe()]
+            raise ValueError("truncated")
+
+        async def collect():
+            return [g async for g in flight.stream("suggest-stream:x", failing)]
+
+        tasks = await run_together(collect(), collect())
+        for task in tasks:
+            with pytest.raises(ValueError, match="truncated"):
+                await task
@@ -63,13 +63,18 @@ def build_use_case(
     preferences=None,
     recipes_to_return=None,
     recipe_repo=None,
+    ai=None,
+    library_options_per_slot=0,
+    reserve_per_slot=0,
 ) -> SuggestRecipesUseCase:
     return SuggestRecipesUseCase(
-        ai_adapter=FakeAIPort(recipes_to_return=recipes_to_return or []),
+        ai_adapter=ai or FakeAIPort(recipes_to_return=recipes_to_return or []),
         template_repo=InMemoryMealPlanTemplateRepository(template=template),
         household_repo=InMemoryHouseholdRepository(members=members or []),
         preference_repo=InMemoryPreferenceRepository(preferences=preferences),
         recipe_repo=recipe_repo or InMemoryRecipeRepository(),
+        library_options_per_slot=library_options_per_slot,
+        reserve_per_slot=reserve_per_slot,
     )
 
 
@@ -272,3 +277,171 @@ class TestSuggestRecipes:
         await use_case.execute()
 
         assert "Old Favourite" in ai.last_suggestion_request.recent_recipe_names
+
+    async def test_stream_yields_slot_options_in_template_order(self):
+        template = make_template(n_slots=3)
+        recipes = [make_recipe(f"Recipe {i}") for i in range(3)]
+        use_case = build_use_case(template=template, recipes_to_return=recipes)
+
+        stream = await use_case.stream()
+        result = [so async for so in stream]
+
+        assert [so.slot.id for so in result] == [s.id for s in template.slots]
+        assert [so.options[0].name for so in result] == ["Recipe 0", "Recipe 1", "Recipe 2"]
+
+    async def test_stream_raises_before_streaming_when_no_template(self):
+        use_case = build_use_case(template=None)
+
+        with pytest.raises(ValueError, match="template"):
+            await use_case.stream()
+
+    async def test_stream_for_slot_yields_single_slot(self):
+        template = make_template(n_slots=2)
+        use_case = build_use_case(template=template, recipes_to_return=[make_recipe("Tacos")])
+
+        stream = await use_case.stream_for_slot(
+            slot_id=str(template.slots[1].id), existing_chosen={}
+        )
+        result = [so async for so in stream]
+
+        assert len(result) == 1
+        assert result[0].slot.id == template.slots[1].id
+
+
+# ---------------------------------------------------------------------------
+# Library-first suggestions
+# ---------------------------------------------------------------------------
+
+def library_repo(*names: str) -> InMemoryRecipeRepository:
+    from datetime import datetime, timedelta, timezone
+
+    repo = InMemoryRecipeRepository()
+    for name in names:
+        r = make_recipe(name)
+        r.times_used = 2
+        r.last_used_at = datetime.now(timezone.utc) - timedelta(days=40)
+        repo._recipes[r.id] = r
+    return repo
+
+
+class TestLibraryFirst:
+    async def test_fills_from_library_and_asks_ai_for_the_rest(self):
+        template = make_template(n_slots=2)
+        ai = FakeAIPort(recipes_to_return=[make_recipe("AI 1"), make_recipe("AI 2")])
+        use_case = build_use_case(
+            template=template,
+            ai=ai,
+            recipe_repo=library_repo("Lasagna", "Chili", "Risotto", "Paella"),
+            library_options_per_slot=2,
+        )
+
+        result = await use_case.execute()
+
+        assert [len(so.options) for so in result] == [3, 3]
+        assert [r.name for r in result[0].options[2:]] == ["AI 1"]
+        assert ai.last_suggestion_request.options_per_slot == 1
+        assert "Lasagna" in ai.last_suggestion_request.week_context
+
+    async def test_full_library_needs_no_ai_call(self):
+        template = make_template(n_slots=1)
+        ai = FakeAIPort(recipes_to_return=[make_recipe("AI")])
+        use_case = build_use_case(
+            template=template,
+            ai=ai,
+            recipe_repo=library_repo("Lasagna", "Chili", "Risotto"),
+            library_options_per_slot=3,
+        )
+
+        result = await use_case.execute()
+        peeked = await use_case.peek()
+
+        assert ai.last_suggestion_request is None
+        assert {r.name for r in result[0].options} == {"Lasagna", "Chili", "Risotto"}
+        assert peeked is not None and len(peeked[0].options) == 3
+
+    async def test_small_library_only_asks_ai_for_short_slots(self):
+        template = make_template(n_slots=2)
+        ai = FakeAIPort(recipes_to_return=[make_recipe("AI")])
+        use_case = build_use_case(
+            template=template,
+            ai=ai,
+            recipe_repo=library_repo("Lasagna", "Chili", "Risotto", "Paella"),
+            library_options_per_slot=3,
+        )
+
+        result = await use_case.execute()
+
+        assert [s.id for s in ai.last_suggestion_request.slots] == [template.slots[1].id]
+        assert ai.last_suggestion_request.options_per_slot == 2
+        assert [len(so.options) for so in result] == [3, 3]
+
+    async def test_fresh_skips_the_library(self):
+        template = make_template(n_slots=1)
+        ai = FakeAIPort(recipes_to_return=[make_recipe("AI")])
+        use_case = build_use_case(
+            template=template,
+            ai=ai,
+            recipe_repo=library_repo("Lasagna", "Chili", "Risotto"),
+            library_options_per_slot=3,
+        )
+
+        result = await use_case.execute(fresh=True)
+
+        assert [r.name for r in result[0].options] == ["AI", "AI", "AI"]
+
+    async def test_stream_merges_in_template_order(self):
+        template = make_template(n_slots=2)
+        ai = FakeAIPort(recipes_to_return=[make_recipe("AI")])
+        use_case = build_use_case(
+            template=template,
+            ai=ai,
+            recipe_repo=library_repo("Lasagna", "Chili", "Risotto", "Paella"),
+            library_options_per_slot=3,
+        )
+
+        result = [so async for so in await use_case.stream()]
+
+        assert [so.slot.id for so in result] == [s.id for s in template.slots]
+        assert [r.name for r in result[1].options][1:] == ["AI", "AI"]
+
+
+# ---------------------------------------------------------------------------
+# Reserve pool
+# ---------------------------------------------------------------------------
+
+class TestReservePool:
+    async def test_surplus_options_are_held_in_reserve(self):
+        template = make_template(n_slots=2)
+        ai = FakeAIPort(recipes_to_return=[make_recipe("Chicken"), make_recipe("Salmon")])
+        use_case = build_use_case(template=template, ai=ai, reserve_per_slot=3)
+
+        result = await use_case.execute()
+
+        assert ai.last_suggestion_request.options_per_slot == 6
+        assert [(len(so.options), len(so.reserve)) for so in result] == [(3, 3), (3, 3)]
+
+    async def test_library_picks_are_shown_first(self):
+        template = make_template(n_slots=1)
+        ai = FakeAIPort(recipes_to_return=[make_recipe("AI")])
+        use_case = build_use_case(
+            template=template,
+            ai=ai,
+            recipe_repo=library_repo("Lasagna", "Chili"),
+            library_options_per_slot=2,
+            reserve_per_slot=2,
+        )
+
+        [slot_options] = await use_case.execute()
+
+        assert ai.last_suggestion_request.options_per_slot == 3
+        assert [r.name for r in slot_options.options][2:] == ["AI"]
+        assert [r.name for r in slot_options.reserve] == ["AI", "AI"]
+
+    async def test_regenerated_slot_carries_its_own_reserve(self):
+        template = make_template(n_slots=1)
+        ai = FakeAIPort(recipes_to_return=[make_recipe("Chicken")])
+        use_case = build_use_case(template=template, ai=ai, reserve_per_slot=3)
+
+        result = await use_case.execute_for_slot(slot_id=str(template.slots[0].id), existing_chosen={})
+
+        assert (len(result.options), len(result.reserve)) == (3, 3)
@@ -0,0 +1,247 @@
+import uuid
+
+from application.ports.ai_port import SuggestionRequest
+from application.use_cases.suggest_recipes import SuggestRecipesUseCase
+from domain.entities.household import HouseholdMember
+from domain.entities.meal_plan import DayOfWeek, MealPlanTemplate, MealSlot, MealType
+from domain.entities.recipe import GroceryCategory, Ingredient, Recipe
+from infrastructure.ai.suggestion_cache import CachingAIAdapter, SuggestionCache
+from tests.unit.fakes import (
+    FakeAIPort,
+    InMemoryHouseholdRepository,
+    InMemoryMealPlanTemplateRepository,
+    InMemoryPreferenceRepository,
+    InMemoryRecipeRepository,
+)
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class CountingAIPort(FakeAIPort):
+    def __init__(self, recipes_to_return=None):
+        super().__init__(recipes_to_return)
+        self.suggest_calls = 0
+
+    async def suggest_recipes(self, request):
+        self.suggest_calls += 1
+        return await super().suggest_recipes(request)
+
+
+def make_recipe(name: str = "Pasta") -> Recipe:
+    return Recipe(
+        id=uuid.uuid4(),
+        name=name,
+        emoji="🍝",
+        prep_time=30,
+        ingredients=[Ingredient("Pasta", 2.0, "oz", GroceryCategory.PANTRY)],
+        key_ingredients=["pasta"],
+    )
+
+
+def make_slot(name: str = "Dinner") -> MealSlot:
+    return MealSlot(uuid.uuid4(), name, MealType.DINNER, [DayOfWeek.MON], [])
+
+
+def make_request(household_id=None, slots=None, **kwargs) -> SuggestionRequest:
+    defaults = dict(
+        members=[],
+        disliked_ingredients=[],
+        liked_ingredients=[],
+        cuisine_preferences=[],
+    )
+    defaults.update(kwargs)
+    return SuggestionRequest(
+        slots=slots or [make_slot()],
+        household_id=household_id or uuid.uuid4(),
+        **defaults,
+    )
+
+
+def build_adapter(cache=None, **cache_kwargs):
+    inner = CountingAIPort(recipes_to_return=[make_recipe("A"), make_recipe("B")])
+    cache = cache or SuggestionCache(**cache_kwargs)
+    return CachingAIAdapter(inner, cache), inner, cache
+
+
+# ---------------------------------------------------------------------------
+# Fingerprint
+# ---------------------------------------------------------------------------
+
+class TestFingerprint:
+    def test_list_order_and_case_do_not_matter(self):
+        slots = [make_slot()]
+        a = make_request(slots=slots, disliked_ingredients=["Mushrooms", "olives"])
+        b = make_request(slots=slots, disliked_ingredients=["olives ", "mushrooms"])
+        assert a.fingerprint() == b.fingerprint()
+
+    def test_preferences_change_the_key(self):
+        slots = [make_slot()]
+        a = make_request(slots=slots)
+        b = make_request(slots=slots, liked_ingredients=["salmon"])
+        assert a.fingerprint() != b.fingerprint()
+
+    def test_shared_key_ignores_members(self):
+        member = HouseholdMember(uuid.uuid4(), "Sam", "🧑", 1.0)
+        a = make_request(slots=[make_slot()], members=[member])
+        b = make_request(slots=[make_slot()])
+        assert a.fingerprint() != b.fingerprint()
+        assert a.fingerprint(shared=True) == b.fingerprint(shared=True)
+
+    def test_context_free(self):
+        assert make_request().is_context_free
+        assert not make_request(week_context="busy week").is_context_free
+        assert not make_request(recent_recipe_names=["Tacos"]).is_context_free
+
+
+# ---------------------------------------------------------------------------
+# Household tier
+# ---------------------------------------------------------------------------
+
+class TestHouseholdTier:
+    async def test_repeat_request_is_served_from_cache(self):
+        adapter, inner, cache = build_adapter()
+        request = make_request()
+
+        first = await adapter.suggest_recipes(request)
+        second = await adapter.suggest_recipes(request)
+
+        assert inner.suggest_calls == 1
+        assert [r.id for g in second for r in g] == [r.id for g in first for r in g]
+        assert cache.stats.hits == 1 and cache.stats.misses == 1
+
+    async def test_allow_cached_false_bypasses_and_refreshes(self):
+        adapter, inner, _ = build_adapter()
+        request = make_request()
+        await adapter.suggest_recipes(request)
+
+        request.allow_cached = False
+        await adapter.suggest_recipes(request)
+
+        assert inner.suggest_calls == 2
+        request.allow_cached = True
+        assert await adapter.peek_suggestions(request) is not None
+
+    async def test_entries_expire(self):
+        clock = FakeClock()
+        adapter, inner, _ = build_adapter(ttl_seconds=60, clock=clock)
+        request = make_request()
+        await adapter.suggest_recipes(request)
+
+        clock.now = 61
+        assert await adapter.peek_suggestions(request) is None
+        await adapter.suggest_recipes(request)
+        assert inner.suggest_calls == 2
+
+    async def test_least_recently_used_entry_is_evicted(self):
+        adapter, _, _ = build_adapter(max_entries_per_household=2)
+        household_id = uuid.uuid4()
+        requests = [make_request(household_id, week_context=f"week {i}") for i in range(3)]
+        for request in requests:
+            await adapter.suggest_recipes(request)
+
+        assert await adapter.peek_suggestions(requests[0]) is None
+        assert await adapter.peek_suggestions(requests[2]) is not None
+
+    async def test_invalidate_household_drops_entries(self):
+        adapter, _, cache = build_adapter()
+        request = make_request()
+        await adapter.suggest_recipes(request)
+
+        cache.invalidate_household(request.household_id)
+
+        assert await adapter.peek_suggestions(request) is None
+        assert cache.stats.invalidations == 1
+
+    async def test_households_do_not_share_without_shared_tier(self):
+        adapter, inner, _ = build_adapter()
+        slots = [make_slot()]
+        await adapter.suggest_recipes(make_request(slots=slots))
+        await adapter.suggest_recipes(make_request(slots=slots))
+        assert inner.suggest_calls == 2
+
+    async def test_stream_populates_cache(self):
+        adapter, inner, _ = build_adapter()
+        request = make_request(slots=[make_slot(), make_slot("Lunch")])
+
+        streamed = [g async for g in adapter.stream_suggest_recipes(request)]
+        again = [g async for g in adapter.stream_suggest_recipes(request)]
+
+        assert len(streamed) == 2
+        assert [g[0].name for g in again] == ["A", "B"]
+        assert inner.suggest_calls == 1
+
+
+# ---------------------------------------------------------------------------
+# Shared tier
+# ---------------------------------------------------------------------------
+
+class TestSharedTier:
+    async def test_context_free_request_is_shared_with_new_ids(self):
+        adapter, inner, cache = build_adapter(shared_enabled=True)
+        slots = [make_slot()]
+
+        first = await adapter.suggest_recipes(make_request(slots=slots))
+        second = await adapter.suggest_recipes(make_request(slots=slots))
+
+        assert inner.suggest_calls == 1
+        assert cache.stats.shared_hits == 1
+        assert second[0][0].name == first[0][0].name
+        assert second[0][0].id != first[0][0].id
+
+    async def test_request_with_preferences_is_not_shared(self):
+        adapter, inner, _ = build_adapter(shared_enabled=True)
+        slots = [make_slot()]
+        await adapter.suggest_recipes(make_request(slots=slots, liked_ingredients=["salmon"]))
+        await adapter.suggest_recipes(make_request(slots=slots, liked_ingredients=["salmon"]))
+        assert inner.suggest_calls == 2
+
+
+# ---------------------------------------------------------------------------
+# Use case integration
+# ---------------------------------------------------------------------------
+
+class TestSuggestUseCaseCaching:
+    def build_use_case(self):
+        household_id = uuid.uuid4()
+        adapter, inner, _ = build_adapter()
+        use_case = SuggestRecipesUseCase(
+            ai_adapter=adapter,
+            template_repo=InMemoryMealPlanTemplateRepository(
+                template=MealPlanTemplate(id=uuid.uuid4(), slots=[make_slot()])
+            ),
+            household_repo=InMemoryHouseholdRepository(members=[]),
+            preference_repo=InMemoryPreferenceRepository(preferences=None),
+            recipe_repo=InMemoryRecipeRepository(),
+            household_id=household_id,
+        )
+        return use_case, inner
+
+    async def test_peek_is_none_before_first_call(self):
+        use_case, _ = self.build_use_case()
+        assert await use_case.peek() is None
+
+    async def test_peek_returns_previous_result(self):
+        use_case, inner = self.build_use_case()
+        result = await use_case.execute()
+
+        peeked = await use_case.peek()
+
+        assert peeked is not None
+        assert peeked[0].options[0].id == result[0].options[0].id
+        assert inner.suggest_calls == 1
+
+    async def test_fresh_calls_the_model_again(self):
+        use_case, inner = self.build_use_case()
+        await use_case.execute()
+        await use_case.execute(fresh=True)
+        assert inner.suggest_calls == 2
@@ -0,0 +1,246 @@
+"""
+AI usage ledger: per-call records from ClaudeAdapter, aggregates, and the flusher.
+"""
+import asyncio
+import json
+import uuid
+from types import SimpleNamespace
+
+import pytest
+
+from api.usage_flush import UsageLedgerFlusher
+from application.ports.ai_port import SuggestionRequest
+from domain.entities.ai_usage import AIUsageRecord
+from domain.entities.meal_plan import DayOfWeek, MealSlot, MealType
+from infrastructure.ai.claude_adapter import ClaudeAdapter
+from infrastructure.ai.usage_ledger import UsageLedger, bind_household, household_context
+
+
+def recipe_dict(name: str) -> dict:
+    return {
+        "name": name,
+        "emoji": "🍲",
+        "prep_time": 20,
+        "key_ingredients": ["rice"],
+        "ingredients": [{"name": "rice", "quantity": 0.5, "unit": "cups", "category": "pantry"}],
+    }
+
+
+def make_request(n_slots: int) -> SuggestionRequest:
+    return SuggestionRequest(
+        slots=[
+            MealSlot(id=uuid.uuid4(), name=f"Slot {i}", meal_type=MealType.DINNER,
+                     days=[DayOfWeek.MON], member_ids=[])
+            for i in range(n_slots)
+        ],
+        members=[],
+        disliked_ingredients=[],
+        liked_ingredients=[],
+        cuisine_preferences=[],
+    )
+
+
+USAGE = SimpleNamespace(
+    input_tokens=50, output_tokens=400, cache_read_input_tokens=1200, cache_creation_input_tokens=0
+)
+
+
+class FakeStream:
+    def __init__(self, text: str):
+        self._text = text
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    @property
+    async def text_stream(self):
+        for i in range(0, len(self._text), 40):
+            yield self._text[i:i + 40]
+
+    async def __aiter__(self):
+        async for chunk in self.text_stream:
+            yield SimpleNamespace(type="input_json", partial_json=chunk)
+
+    async def get_final_message(self):
+        return SimpleNamespace(usage=USAGE, stop_reason="end_turn")
+
+
+class FakeMessages:
+    def __init__(self, text: str, stop_reason: str = "end_turn"):
+        self.text = text
+        self.stop_reason = stop_reason
+
+    async def create(self, **kwargs):
+        if "tool_choice" in kwargs:  # suggest/refine: the answer is the forced tool's input
+            answer = SimpleNamespace(
+                type="tool_use", name=kwargs["tool_choice"]["name"], input={"slots": json.loads(self.text)}
+            )
+        else:
+            answer = SimpleNamespace(type="text", text=self.text)
+        return SimpleNamespace(content=[answer], stop_reason=self.stop_reason, usage=USAGE)
+
+    def stream(self, **kwargs):
+        if "tool_choice" in kwargs:
+            return FakeStream('{"slots": ' + self.text + "}")
+        return FakeStream(self.text)
+
+
+def make_adapter(text: str, **kwargs) -> ClaudeAdapter:
+    adapter = ClaudeAdapter(api_key="test", model="test-model", **kwargs)
+    adapter._client = SimpleNamespace(messages=FakeMessages(text))
+    return adapter
+
+
+def record(use_case: str = "suggest", **fields) -> AIUsageRecord:
+    return AIUsageRecord(use_case=use_case, model="m", household_id=None, latency_ms=100, **fields)
+
+
+class TestAdapterRecording:
+    async def test_records_tokens_stop_reason_and_household(self):
+        household = uuid.uuid4()
+        adapter = make_adapter(json.dumps([[recipe_dict(f"R{i}") for i in range(3)]]))
+
+        with household_context(household):
+            await adapter.suggest_recipes(make_request(1))
+
+        [entry] = adapter.ledger.drain()
+        assert entry.use_case == "suggest"  # size suffix of the hedge kind dropped
+        assert entry.model == "test-model"
+        assert entry.household_id == household
+        assert (entry.input_tokens, entry.output_tokens, entry.cache_read_input_tokens) == (50, 400, 1200)
+        assert entry.stop_reason == "end_turn"
+        assert entry.attempts == 1 and not entry.parse_failed and entry.error is None
+
+    async def test_records_parse_failure_and_reraises(self):
+        adapter = make_adapter("I'm sorry, I can't help with that.")
+
+        with pytest.raises(ValueError):
+            await adapter.generate_instructions(
+                SimpleNamespace(name="Stew", prep_time=30, ingredients=[])
+            )
+
+        [entry] = adapter.ledger.drain()
+        assert entry.use_case == "instructions"
+        assert entry.parse_failed and entry.error is None
+        assert entry.output_tokens == 400  # the unusable answer was still paid for
+
+    async def test_records_failed_call(self):
+        adapter = make_adapter("")
+
+        async def boom(**kwargs):
+            raise ConnectionError("upstream down")
+
+        adapter._client.messages.create = boom
+        with pytest.raises(ConnectionError):
+            await adapter.suggest_recipes(make_request(1))
+
+        [entry] = adapter.ledger.drain()
+        assert entry.error == "ConnectionError"
+        assert entry.input_tokens == 0 and entry.stop_reason is None
+
+    async def test_records_streamed_call_once_it_finishes(self):
+        adapter = make_adapter(json.dumps([[recipe_dict(f"R{i}") for i in range(3)]] * 2))
+
+        groups = [g async for g in adapter.stream_suggest_recipes(make_request(2))]
+
+        assert len(groups) == 2
+        [entry] = adapter.ledger.drain()
+        assert entry.streamed and entry.use_case == "suggest"
+        assert entry.output_tokens == 400
+
+    async def test_bound_household_reaches_tasks_spawned_later(self):
+        household = uuid.uuid4()
+        adapter = make_adapter(json.dumps([[recipe_dict(f"R{i}") for i in range(3)]]))
+
+        async def request():
+            bind_household(household)
+            # e.g. a background task started from the request
+            await asyncio.create_task(adapter.suggest_recipes(make_request(1)))
+
+        await asyncio.create_task(request())
+
+        assert adapter.ledger.drain()[0].household_id == household
+
+
+class TestUsageLedger:
+    def test_aggregates_per_use_case(self):
+        ledger = UsageLedger()
+        ledger.record(record(input_tokens=10, output_tokens=100, stop_reason="end_turn"))
+        ledger.record(record(input_tokens=10, output_tokens=8192, stop_reason="max_tokens",
+                             parse_failed=True, attempts=2))
+        ledger.record(record("import", error="AIDeadlineExceeded"))
+
+        snapshot = ledger.snapshot()["by_use_case"]
+        suggest = snapshot["suggest"]
+        assert suggest["calls"] == 2 and suggest["parse_failures"] == 1
+        assert suggest["extra_attempts"] == 1
+        assert suggest["output_tokens"] == 8292
+        assert suggest["stop_reasons"] == {"end_turn": 1, "max_tokens": 1}
+        assert suggest["latency_p50_seconds"] == 0.1
+        assert snapshot["import"]["errors"] == 1
+        assert snapshot["import"]["latency_p50_seconds"] is None  # failures skew latency
+
+    def test_parse_failure_rate_per_output_format(self):
+        ledger = UsageLedger()
+        ledger.record(record(output_format="text", parse_failed=True))
+        ledger.record(record(output_format="text"))
+        ledger.record(record(output_format="tool"))
+        ledger.record(record(output_format="tool", error="APIConnectionError"))  # never answered
+        ledger.record(record())  # not a slot answer
+
+        suggest = ledger.snapshot()["by_use_case"]["suggest"]
+        assert suggest["parse_failure_rate_by_output_format"] == {"text": 0.5, "tool": 0.0}
+
+    def test_buffer_drops_oldest_when_full(self):
+        ledger = UsageLedger(buffer_size=2)
+        for use_case in ("a", "b", "c"):
+            ledger.record(record(use_case))
+
+        assert [r.use_case for r in ledger.drain()] == ["b", "c"]
+        assert ledger.dropped == 1
+
+
+class TestFlusher:
+    async def test_writes_in_batches(self):
+        ledger = UsageLedger()
+        for _ in range(5):
+            ledger.record(record())
+        batches = []
+
+        async def write(records):
+            batches.append(len(records))
+
+        flusher = UsageLedgerFlusher(ledger, write, batch_size=2)
+        assert await flusher.flush() == 5
+        assert batches == [2, 2, 1]
+        assert ledger.pending() == 0
+
+    async def test_failed_write_is_requeued_in_order(self):
+        ledger = UsageLedger()
+        for use_case in ("a", "b", "c"):
+            ledger.record(record(use_case))
+
+        async def write(records):
+            raise ConnectionError("database down")
+
+        flusher = UsageLedgerFlusher(ledger, write, batch_size=2)
+        assert await flusher.flush() == 0
+        assert flusher.failed_writes == 1
+        assert [r.use_case for r in ledger.drain()] == ["a", "b", "c"]
+
+    async def test_stop_flushes_what_is_left(self):
+        ledger = UsageLedger()
+        written = []
+
+        async def write(records):
+            written.extend(records)
+
+        flusher = UsageLedgerFlusher(ledger, write, interval_seconds=3600)
+        flusher.start()
+        ledger.record(record())
+        await flusher.stop()
+
+        assert len(written) == 1
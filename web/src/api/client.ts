@@ -20,6 +20,7 @@ apiClient.interceptors.response.use(
   (error) => {
     const message =
       error.response?.data?.detail ?? error.message ?? 'Something went wrong'
-    return Promise.reject(new Error(String(message)))
+    // Keep the response so callers can branch on the status (429, 404, 409)
+    return Promise.reject(Object.assign(new Error(String(message)), { response: error.response }))
   },
 )
@@ -10,6 +10,20 @@ export interface SlotOptionsResponse {
   slot_options: SlotOptionsData[]
   budget_remaining: number
   budget_resets_at: string | null
+  session_id: string | null
+  // The AI was unavailable: options come from the saved library only
+  degraded?: boolean
+}
+
+/**
+ * Chosen recipes for a refine/regenerate/confirm call: within a draft session
+ * only their ids are sent; without one (or after it expired) the full recipes.
+ */
+function chosenPayload(sessionId: string | null, chosen: Record<string, Recipe>, field: string) {
+  if (!sessionId) return { [field]: chosen }
+  const ids: Record<string, string> = {}
+  for (const [slotId, recipe] of Object.entries(chosen)) ids[slotId] = recipe.id
+  return { session_id: sessionId, chosen: ids }
 }
 
 export const planApi = {
@@ -18,38 +32,51 @@ export const planApi = {
   saveTemplate: (template: MealPlanTemplate) =>
     apiClient.post<MealPlanTemplate>('/api/template', { template }),
 
-  suggest: (weekContext?: string) =>
+  suggest: (
+    weekContext?: string,
+    fresh = false,
+    sessionId: string | null = null,
+    weekStartDate: string | null = null,
+  ) =>
     apiClient.post<SlotOptionsResponse>('/api/plan/suggest', {
       week_context: weekContext ?? null,
+      fresh,
+      session_id: sessionId,
+      week_start_date: weekStartDate,
     }),
 
   refine: (
+    sessionId: string | null,
     existingAssignments: Record<string, Recipe>,
     userMessage: string,
     lockedSlotIds: string[] = [],
   ) =>
     apiClient.post<SlotOptionsResponse>('/api/plan/refine', {
-      existing_assignments: existingAssignments,
+      ...chosenPayload(sessionId, existingAssignments, 'existing_assignments'),
       user_message: userMessage,
       locked_slot_ids: lockedSlotIds,
     }),
 
   suggestSlot: (
+    sessionId: string | null,
     slotId: string,
     existingChosen: Record<string, Recipe>,
     weekContext?: string,
   ) =>
     apiClient.post<SlotOptionsResponse>('/api/plan/suggest-slot', {
+      ...chosenPayload(sessionId, existingChosen, 'existing_chosen'),
       slot_id: slotId,
-      existing_chosen: existingChosen,
       week_context: weekContext ?? null,
     }),
 
-  confirm: (weekStartDate: string, suggestions: RecipeSuggestion[]) =>
-    apiClient.post<WeeklyPlan>('/api/plan/confirm', {
+  confirm: (weekStartDate: string, sessionId: string | null, suggestions: RecipeSuggestion[]) => {
+    const chosen: Record<string, Recipe> = {}
+    for (const s of suggestions) chosen[s.slot.id] = s.recipe
+    return apiClient.post<WeeklyPlan>('/api/plan/confirm', {
       week_start_date: weekStartDate,
-      suggestions,
-    }),
+      ...(sessionId ? chosenPayload(sessionId, chosen, 'suggestions') : { suggestions }),
+    })
+  },
 
   getConfirmedPlan: (weekStartDate: string) =>
     apiClient.get<ConfirmedPlan>(`/api/plan/${weekStartDate}`),
@@ -28,12 +28,14 @@ function localKey(week: string) {
 interface PersistedState {
   slotStates: Omit<SlotState, 'regenerating'>[]
   sessionPool: Recipe[]
+  draftSessionId?: string | null
 }
 
-function serializeState(states: SlotState[], pool: Recipe[]): string {
+function serializeState(states: SlotState[], pool: Recipe[], draftSessionId: string | null): string {
   const data: PersistedState = {
     slotStates: states.map(({ regenerating: _r, ...rest }) => rest),
     sessionPool: pool,
+    draftSessionId,
   }
   return JSON.stringify(data)
 }
@@ -61,6 +63,10 @@ export const usePlanStore = defineStore('plan', () => {
   const chatLoading = ref(false)
   const error = ref<string | null>(null)
   const rateLimitError = ref<{ retryAfterSeconds: number } | null>(null)
+  // Server-held draft: once set, refine/regenerate/confirm send recipe ids only
+  const draftSessionId = ref<string | null>(null)
+  // Last suggestions came from the library alone because the AI was unavailable
+  const degraded = ref(false)
 
   // Auto-save slotStates to sessionStorage on any change
   watch(
@@ -68,7 +74,10 @@ export const usePlanStore = defineStore('plan', () => {
     (states) => {
       if (states.length > 0) {
         try {
-          sessionStorage.setItem(sessionKey(weekStartDate.value), serializeState(states, sessionPool.value))
+          sessionStorage.setItem(
+            sessionKey(weekStartDate.value),
+            serializeState(states, sessionPool.value, draftSessionId.value),
+          )
         } catch {
           // Storage might be full or unavailable — non-fatal
         }
@@ -96,6 +105,8 @@ export const usePlanStore = defineStore('plan', () => {
       remaining: data.budget_remaining,
       resetsAt: data.budget_resets_at,
     }
+    draftSessionId.value = data.session_id ?? null
+    degraded.value = data.degraded ?? false
     for (const so of data.slot_options) {
       seedPool(so.options)
     }
@@ -109,6 +120,22 @@ export const usePlanStore = defineStore('plan', () => {
     error.value = 'Rate limit reached — please wait before generating again.'
   }
 
+  /**
+   * Call with the draft session, retrying once with full recipes if the
+   * server no longer has it or does not hold one of the chosen recipes (404:
+   * expired, the server restarted, or a pool recipe from an older draft).
+   */
+  async function withDraftSession<T>(call: (sessionId: string | null) => Promise<T>): Promise<T> {
+    const sessionId = draftSessionId.value
+    try {
+      return await call(sessionId)
+    } catch (e: any) {
+      if (sessionId === null || e?.response?.status !== 404) throw e
+      draftSessionId.value = null
+      return call(null)
+    }
+  }
+
   // ──────────────────────────────────────────────────────────────────────────
   // Session persistence
   // ──────────────────────────────────────────────────────────────────────────
@@ -125,6 +152,7 @@ export const usePlanStore = defineStore('plan', () => {
 
     slotStates.value = saved.slotStates.map((s) => ({ ...s, regenerating: false }))
     sessionPool.value = saved.sessionPool ?? []
+    draftSessionId.value = saved.draftSessionId ?? null
     return true
   }
 
@@ -149,7 +177,10 @@ export const usePlanStore = defineStore('plan', () => {
   function saveProgress() {
     if (slotStates.value.length === 0) return
     try {
-      localStorage.setItem(localKey(weekStartDate.value), serializeState(slotStates.value, sessionPool.value))
+      localStorage.setItem(
+        localKey(weekStartDate.value),
+        serializeState(slotStates.value, sessionPool.value, draftSessionId.value),
+      )
     } catch {
       // Non-fatal
     }
@@ -170,6 +201,8 @@ export const usePlanStore = defineStore('plan', () => {
   function startOver() {
     slotStates.value = []
     sessionPool.value = []
+    draftSessionId.value = null
+    degraded.value = false
     error.value = null
     rateLimitError.value = null
     clearProgress()
@@ -219,12 +252,20 @@ export const usePlanStore = defineStore('plan', () => {
   // Suggestion actions
   // ──────────────────────────────────────────────────────────────────────────
 
-  async function suggest(weekContext?: string) {
+  /**
+   * Fetch options for every slot. `fresh` bypasses the server-side suggestion
+   * cache (Regenerate All); otherwise an identical recent request is served
+   * from cache without spending budget.
+   */
+  async function suggest(weekContext?: string, fresh = false) {
     loading.value = true
     error.value = null
     rateLimitError.value = null
     try {
-      const res = await planApi.suggest(weekContext)
+      // Same draft as before: recipes kept in the pool from earlier answers stay resolvable by id
+      const res = await withDraftSession((sessionId) =>
+        planApi.suggest(weekContext, fresh, sessionId, weekStartDate.value),
+      )
       const data = res.data
       slotStates.value = data.slot_options.map((so) => ({
         slot: so.slot,
@@ -262,7 +303,9 @@ export const usePlanStore = defineStore('plan', () => {
         }
       }
 
-      const res = await planApi.refine(existingAssignments, userMessage, lockedSlotIds)
+      const res = await withDraftSession((sessionId) =>
+        planApi.refine(sessionId, existingAssignments, userMessage, lockedSlotIds),
+      )
       const data = res.data
 
       // Merge: update only the unlocked slots returned by the API
@@ -305,7 +348,9 @@ export const usePlanStore = defineStore('plan', () => {
         }
       }
 
-      const res = await planApi.suggestSlot(slotId, existingChosen)
+      const res = await withDraftSession((sessionId) =>
+        planApi.suggestSlot(sessionId, slotId, existingChosen),
+      )
       const data = res.data
 
       if (data.slot_options.length > 0) {
@@ -378,7 +423,8 @@ export const usePlanStore = defineStore('plan', () => {
           slot: ss.slot,
           recipe: ss.options[ss.chosenIndex!],
         }))
-      await planApi.confirm(weekStartDate.value, suggestions)
+      await withDraftSession((sessionId) => planApi.confirm(weekStartDate.value, sessionId, suggestions))
+      draftSessionId.value = null
       clearProgress()
     } catch (e) {
       error.value = (e as Error).message
@@ -430,6 +476,7 @@ export const usePlanStore = defineStore('plan', () => {
     chatLoading,
     error,
     rateLimitError,
+    degraded,
     allSlotsChosen,
     hasGeneratedOptions,
     fetchTemplate,